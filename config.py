@@ -53,9 +53,228 @@ TEMPERATURA_MAX_PROJETO = 75
 # Distância entre pontos de discretização da linha (metros)
 DISTANCIA_DISCRETIZACAO = 1000  # 1 km
 
+# Discretização adaptativa: espaçamento entre os limites abaixo, refinado perto
+# de mudanças de azimute e onde os campos médios krigados variam mais
+DISCRETIZACAO_ADAPTATIVA = False
+DISTANCIA_DISCRETIZACAO_MINIMA = 250   # metros
+DISTANCIA_DISCRETIZACAO_MAXIMA = 5000  # metros
+
+# Mudança de azimute (graus) a partir da qual o vértice é mantido e refinado
+LIMIAR_AZIMUTE_DISCRETIZACAO = 2.0
+
+# Crescimento do espaçamento com a distância ao vértice (m de espaçamento por m)
+TAXA_CRESCIMENTO_DISCRETIZACAO = 0.5
+
+# Variação máxima da média climatológica krigada entre pontos consecutivos
+TOLERANCIA_CAMPOS_DISCRETIZACAO = {
+    'temperatura_ar': 0.25,    # °C
+    'radiacao_global': 10.0,   # W/m²
+    'vento_u': 0.1,            # m/s
+    'vento_v': 0.1             # m/s
+}
+
 # Corrente elétrica padrão (Amperes) - pode ser sobrescrita
 CORRENTE_PADRAO = 500
 
+# Calcula a ampacidade probabilística (corrente por nível de risco) por grupo de
+# pontos simulado em cada hora (NUM_ITERACOES_MC amostras por grupo; desligado por custo)
+AMPACIDADE_PROBABILISTICA_ATIVA = False
+
+# Probabilidades de excedência alvo padrão (a análise principal usa os limites
+# NBR 5422 do RiskAnalyzer)
+NIVEIS_RISCO_AMPACIDADE = [0.01, 0.05, 0.10]
+
+# Usa um único bloco pré-gerado de normais padrão em todos os cenários
+# (números aleatórios comuns entre horas, pontos e correntes)
+NUMEROS_ALEATORIOS_COMUNS = False
+
+# Gera o bloco comum por Sobol embaralhado (quasi-Monte Carlo)
+AMOSTRAGEM_QUASI_ALEATORIA = False
+
+# Semente do bloco de números aleatórios comuns
+SEMENTE_NUMEROS_COMUNS = 12345
+
+# Família de distribuição por variável no método de amostragem 'distribuicoes'
+# ('normal', 'normal_truncada', 'lognormal' ou 'empirica')
+DISTRIBUICOES_VARIAVEIS = {
+    'temperatura_ar': 'normal_truncada',
+    'radiacao_global': 'normal_truncada',
+    'vento_u': 'normal',
+    'vento_v': 'normal'
+}
+
+# Representação do vento: 'componentes' (u, v) ou 'weibull_polar' (velocidade
+# Weibull e direção normal em torno da direção média)
+REPRESENTACAO_VENTO = 'componentes'
+
+# Método de amostragem da análise principal ('normal', 'lognormal', 'triangular',
+# 'distribuicoes' ou 'bootstrap')
+METODO_AMOSTRAGEM_MC = 'normal'
+
+# Banco de resíduos de validação cruzada da krigagem (método 'bootstrap')
+ARQUIVO_BANCO_RESIDUOS = os.path.join(SAIDA_DIR, 'banco_residuos.npz')
+
+# Número máximo de horas usadas para construir o banco de resíduos
+BANCO_RESIDUOS_MAX_HORAS = 2000
+
+# Dispensa o Monte Carlo quando o canto pessimista (média + kσ) fica
+# abaixo da temperatura máxima com folga
+TRIAGEM_DETERMINISTICA_ATIVA = True
+K_SIGMA_TRIAGEM = 3.0
+MARGEM_TRIAGEM = 10.0  # °C
+
+# Métodos de amostragem cujas caudas a caixa média ± kσ cobre; os demais
+# (lognormal, triangular, distribuições ajustadas e bootstrap) sempre simulam
+METODOS_AMOSTRAGEM_TRIAGEM = ['normal']
+
+# =============================================================================
+# CACHE DE RESULTADOS DA SIMULAÇÃO
+# =============================================================================
+
+# Ativa o cache LRU de resultados do Monte Carlo
+CACHE_SIMULACAO_ATIVO = True
+
+# Resolução de quantização das médias ambientais usadas na chave do cache
+CACHE_RESOLUCAO_MEDIAS = {
+    'temperatura_ar': 0.1,     # °C
+    'radiacao_global': 5.0,    # W/m²
+    'vento_u': 0.05,           # m/s
+    'vento_v': 0.05            # m/s
+}
+
+# Resolução de quantização dos desvios padrão usados na chave do cache
+CACHE_RESOLUCAO_DESVIOS = {
+    'temperatura_ar': 0.05,    # °C
+    'radiacao_global': 2.5,    # W/m²
+    'vento_u': 0.025,          # m/s
+    'vento_v': 0.025           # m/s
+}
+
+# Resolução de quantização do azimute (graus) e da corrente (A)
+CACHE_RESOLUCAO_AZIMUTE = 1.0
+CACHE_RESOLUCAO_CORRENTE = 1.0
+
+# Limites de ocupação do cache em memória
+CACHE_MAX_ENTRADAS = 50000
+CACHE_MAX_MEMORIA_MB = 512
+
+# Diretório do cache persistente em disco (None desativa a camada em disco)
+CACHE_DIRETORIO_PERSISTENTE = None
+
+# =============================================================================
+# AGRUPAMENTO DE PONTOS DA LINHA
+# =============================================================================
+
+# Agrupa, a cada hora, pontos com entradas praticamente idênticas para
+# simulá-los uma única vez
+AGRUPAMENTO_PONTOS_ATIVO = True
+
+# Tolerâncias do agrupamento (da ordem da resolução de medição)
+TOLERANCIAS_AGRUPAMENTO_MEDIAS = {
+    'temperatura_ar': 0.1,     # °C
+    'radiacao_global': 5.0,    # W/m²
+    'vento_u': 0.1,            # m/s
+    'vento_v': 0.1             # m/s
+}
+
+TOLERANCIAS_AGRUPAMENTO_DESVIOS = {
+    'temperatura_ar': 0.05,    # °C
+    'radiacao_global': 2.5,    # W/m²
+    'vento_u': 0.05,           # m/s
+    'vento_v': 0.05            # m/s
+}
+
+# Tolerância do azimute (graus)
+TOLERANCIA_AGRUPAMENTO_AZIMUTE = 1.0
+
+# =============================================================================
+# SIMULAÇÃO CONJUNTA DA LINHA
+# =============================================================================
+
+# Executa também a simulação espacialmente correlacionada de toda a linha
+# (probabilidade de que algum vão exceda a temperatura máxima em cada hora)
+SIMULACAO_CONJUNTA_LINHA = False
+
+# Comprimento de correlação espacial dos erros de interpolação (metros)
+COMPRIMENTO_CORRELACAO_LINHA = {
+    'temperatura_ar': 50000,
+    'radiacao_global': 30000,
+    'vento_u': 20000,
+    'vento_v': 20000
+}
+
+# Número máximo de pontos fatorados por Cholesky completo; acima disso usa
+# fator de posto reduzido com esse número de componentes
+POSTO_MAXIMO_COVARIANCIA_LINHA = 500
+
+# Número máximo de elementos (amostras x pontos) resolvidos por bloco
+ELEMENTOS_BLOCO_SIMULACAO_LINHA = 2000000
+
+# =============================================================================
+# TRAJETÓRIAS TEMPORAIS (DURAÇÃO DAS EXCEDÊNCIAS)
+# =============================================================================
+
+# Executa também a simulação de trajetórias multi-horárias por ponto
+SIMULACAO_TRAJETORIAS = False
+
+# Ordem do processo autorregressivo dos resíduos ambientais
+ORDEM_PROCESSO_AR = 1
+
+# Número de trajetórias simuladas por ponto
+NUM_TRAJETORIAS = 1000
+
+# Período de contagem dos eventos de excedência ('D' diário, 'M' mensal)
+PERIODO_CONTAGEM_EVENTOS = 'D'
+
+# =============================================================================
+# MONTE CARLO MULTINÍVEL (MLMC)
+# =============================================================================
+
+# Tolerâncias do solver térmico por nível (°C), da mais grosseira à mais fina.
+# Todos os níveis usam a bissecção vetorizada; o último nível é a referência
+# (0,01 °C, a mesma xtol do brentq do solver escalar)
+MLMC_TOLERANCIAS = [4.0, 0.5, 0.01]
+
+# RMSE alvo da probabilidade de excedência estimada
+MLMC_RMSE_ALVO = 0.005
+
+# Amostras piloto por nível e limite de amostras por nível
+MLMC_AMOSTRAS_PILOTO = 500
+MLMC_MAX_AMOSTRAS_NIVEL = 2000000
+
+# Número máximo de rodadas de realocação de amostras
+MLMC_MAX_RODADAS = 10
+
+# =============================================================================
+# CAOS POLINOMIAL
+# =============================================================================
+
+# Grau total da expansão de Hermite nas entradas padronizadas
+PCE_ORDEM = 3
+
+# Número de soluções exatas do projeto experimental compartilhado
+PCE_PONTOS_PROJETO = 80
+
+# Amostras do polinômio para estatísticas e excedência
+PCE_AMOSTRAS_SUBSTITUTO = 1000000
+
+# Erro de validação cruzada relativo máximo aceito antes de recorrer ao Monte Carlo
+PCE_ERRO_MAXIMO = 0.01
+
+# =============================================================================
+# MÉTODO DE CONFIABILIDADE DE PRIMEIRA ORDEM (FORM)
+# =============================================================================
+
+# Número máximo de iterações HL-RF e tolerância de convergência
+FORM_MAX_ITERACOES = 30
+FORM_TOLERANCIA = 1e-3
+
+# Passo das diferenças finitas no espaço normal padrão
+FORM_PASSO_GRADIENTE = 0.05
+
+# Tolerância do solver térmico nas avaliações do FORM (°C)
+FORM_TOLERANCIA_SOLVER = 1e-4
+
 # =============================================================================
 # SISTEMAS DE COORDENADAS
 # =============================================================================
@@ -73,6 +292,61 @@ CRS_DESTINO = 'EPSG:5880'
 # Modelo de variograma para krigagem
 MODELO_VARIOGRAMA = 'linear'
 
+# Método de krigagem: 'matricial' (pesos pré-calculados aplicados à série inteira)
+# ou 'pykrige' (ajuste e solução independentes a cada hora). Para execuções rápidas,
+# interpoladores sem variograma: 'idw' (inverso da distância), 'vizinho_proximo'
+# (estação mais próxima) ou 'baricentrico' (linear nos triângulos de Delaunay)
+METODO_KRIGAGEM = 'matricial'
+
+# Krigagem em vizinhança móvel: cada ponto da linha usa apenas as k estações mais
+# próximas (cKDTree), para redes com centenas de estações. None = todas as estações
+NUM_VIZINHOS_KRIGAGEM = None
+
+# Inversas dos sistemas locais da vizinhança móvel mantidas em cache LRU, uma por
+# variograma e conjunto de vizinhos ((k+1)² valores cada)
+CACHE_INVERSAS_LOCAIS_MAX_ENTRADAS = 4096
+
+# Expoente do inverso da distância ('idw' e pontos fora do fecho das estações no 'baricentrico')
+POTENCIA_IDW = 2.0
+
+# Registro de variogramas selecionados por variável e estrato (mês, hora do dia),
+# persistido em disco e reutilizado entre execuções; a krigagem horária apenas consulta
+REGISTRO_VARIOGRAMAS_ATIVO = True
+ARQUIVO_REGISTRO_VARIOGRAMAS = os.path.join(SAIDA_DIR, 'registro_variogramas.json')
+
+# Mínimo de horas completas para um estrato ter variograma próprio (senão usa o global)
+VARIOGRAMA_MIN_HORAS_ESTRATO = 10
+
+# Krigagem hora a hora ('pykrige') em paralelo: número de processos (1 = sequencial)
+# e horas por bloco enviado a cada processo
+NUM_PROCESSOS_KRIGAGEM = 1
+TAMANHO_BLOCO_KRIGAGEM = 200
+
+# Resultados da krigagem: tensor (horas, variáveis, pontos, [média, variância]).
+# Precisão 'float32' reduz a memória à metade; com um arquivo .npy definido, o tensor
+# é mapeado em disco (np.memmap) em vez de residir em memória
+PRECISAO_RESULTADOS_KRIGAGEM = 'float64'
+ARQUIVO_RESULTADOS_KRIGAGEM = None
+
+# Covariância posterior dos erros de krigagem entre os pontos da linha (método
+# 'matricial'): um fator L (pontos × posto) por variável, variograma e padrão de
+# estações presentes, com Σ_hora = escala_hora · L·Lᵀ. Usada pela simulação conjunta
+# da linha no lugar do modelo exponencial e exportada em saida/. O posto limita os
+# pontos de referência da aproximação e a memória total dos fatores é limitada em MB
+COVARIANCIA_POSTERIOR_KRIGAGEM = False
+POSTO_COVARIANCIA_KRIGAGEM = 100
+MEMORIA_MAXIMA_COVARIANCIA_MB = 256
+
+# Estado da krigagem (estações, variogramas, pesos e resultados) salvo após cada
+# execução; atualizar_krigagem kriga então apenas as horas novas (None desativa)
+DIRETORIO_ESTADO_KRIGAGEM = None
+
+# Sincronização das estações: mantém as horas com pelo menos este número de estações
+# com dados (None exige todas as estações). Horas com estações ausentes usam os pesos
+# de krigagem do subconjunto presente, mantidos em cache LRU pela máscara de estações
+MIN_ESTACOES_SINCRONIZACAO = 3
+CACHE_PESOS_KRIGAGEM_MAX_ENTRADAS = 256
+
 # Variáveis ambientais para interpolação
 VARIAVEIS_AMBIENTAIS = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
 
@@ -311,8 +311,11 @@ class DataLoader:
 
     def sincronizar_dados_estacoes(self):
         """
-        Sincroniza dados de todas as estações por timestamp, removendo horas 
-        onde qualquer estação não tenha dados válidos.
+        Sincroniza dados de todas as estações por timestamp, mantendo as horas
+        com pelo menos config.MIN_ESTACOES_SINCRONIZACAO estações com dados.
+        
+        Horas com estações ausentes seguem sem as linhas dessas estações; a
+        krigagem usa os pesos do subconjunto presente.
         
         Returns:
             pandas.DataFrame: DataFrame consolidado com dados sincronizados
@@ -322,40 +325,32 @@ class DataLoader:
         if not self.dados_estacoes:
             raise ValueError("Nenhum dado de estação disponível para sincronização")
         
-        # Encontrar timestamps comuns a todas as estações
-        timestamps_comuns = None
-        
-        for nome_estacao, df_estacao in self.dados_estacoes.items():
-            if timestamps_comuns is None:
-                timestamps_comuns = set(df_estacao.index)
-            else:
-                timestamps_comuns &= set(df_estacao.index)
-        
-        if not timestamps_comuns:
-            raise ValueError("Nenhum timestamp comum encontrado entre as estações")
+        # Mínimo de estações por hora (None exige todas)
+        num_estacoes = len(self.dados_estacoes)
+        minimo_estacoes = config.MIN_ESTACOES_SINCRONIZACAO
+        minimo_estacoes = num_estacoes if minimo_estacoes is None else min(int(minimo_estacoes), num_estacoes)
         
-        timestamps_comuns = sorted(list(timestamps_comuns))
-        logger.info(f"Encontrados {len(timestamps_comuns)} timestamps comuns")
+        # Registros de todas as estações, na ordem das estações dentro de cada timestamp
+        df_consolidado = pd.concat(
+            [df_estacao.assign(estacao=nome_estacao) for nome_estacao, df_estacao in self.dados_estacoes.items()]
+        )
+        df_consolidado.index.name = 'data_hora'
         
-        # Consolidar dados das estações nos timestamps comuns
-        dados_consolidados = []
+        estacoes_por_hora = df_consolidado.groupby(level=0)['estacao'].nunique()
+        horas_validas = estacoes_por_hora.index[estacoes_por_hora >= minimo_estacoes]
         
-        for timestamp in timestamps_comuns:
-            for nome_estacao, df_estacao in self.dados_estacoes.items():
-                if timestamp in df_estacao.index:
-                    registro = df_estacao.loc[timestamp].copy()
-                    registro['estacao'] = nome_estacao
-                    registro['data_hora'] = timestamp
-                    dados_consolidados.append(registro)
+        if len(horas_validas) == 0:
+            raise ValueError(f"Nenhum timestamp com pelo menos {minimo_estacoes} estações encontrado")
         
-        df_consolidado = pd.DataFrame(dados_consolidados)
-        df_consolidado.set_index('data_hora', inplace=True)
+        df_consolidado = df_consolidado[df_consolidado.index.isin(horas_validas)].sort_index(kind='stable')
         
+        horas_completas = int(np.sum(estacoes_por_hora[horas_validas] == num_estacoes))
+        logger.info(f"Encontrados {len(horas_validas)} timestamps com pelo menos {minimo_estacoes} "
+                    f"de {num_estacoes} estações ({horas_completas} com todas)")
         logger.info(f"Dados sincronizados: {len(df_consolidado)} registros totais")
         
         # Estatísticas por estação
-        for estacao in df_consolidado['estacao'].unique():
-            count = (df_consolidado['estacao'] == estacao).sum()
+        for estacao, count in df_consolidado['estacao'].value_counts(sort=False).items():
             logger.info(f"Estação {estacao}: {count} registros sincronizados")
         
         return df_consolidado
@@ -0,0 +1,346 @@
+# Módulo com as famílias de distribuição das variáveis ambientais
+import hashlib
+import numpy as np
+import pandas as pd
+import logging
+from scipy import special
+import config
+
+logger = logging.getLogger(__name__)
+
+# Famílias suportadas por variável escalar
+FAMILIAS_DISTRIBUICAO = ['normal', 'normal_truncada', 'lognormal', 'empirica']
+
+# Representações suportadas para o vento
+REPRESENTACOES_VENTO = ['componentes', 'weibull_polar']
+
+
+class AmostradorDistribuicoes:
+    """
+    Motor vetorizado de amostragem das variáveis ambientais.
+
+    Cada variável é gerada pela inversa da CDF de sua família aplicada a normais
+    padrão, de modo que qualquer família custa apenas operações sobre arrays e
+    pode reutilizar o bloco de números aleatórios comuns do simulador.
+    """
+
+    def __init__(self, distribuicoes=None, representacao_vento=None):
+        """
+        Inicializa o amostrador.
+
+        Args:
+            distribuicoes (dict): Família por variável (padrão: config.DISTRIBUICOES_VARIAVEIS)
+            representacao_vento (str): 'componentes' (u, v pelas famílias configuradas) ou
+                'weibull_polar' (velocidade Weibull e direção normal)
+                (padrão: config.REPRESENTACAO_VENTO)
+        """
+        if distribuicoes is None:
+            distribuicoes = config.DISTRIBUICOES_VARIAVEIS
+        if representacao_vento is None:
+            representacao_vento = config.REPRESENTACAO_VENTO
+
+        for variavel, familia in distribuicoes.items():
+            if familia not in FAMILIAS_DISTRIBUICAO:
+                raise ValueError(f"Família de distribuição desconhecida para '{variavel}': {familia}")
+        if representacao_vento not in REPRESENTACOES_VENTO:
+            raise ValueError(f"Representação do vento desconhecida: {representacao_vento}")
+
+        self.distribuicoes = dict(distribuicoes)
+        self.representacao_vento = representacao_vento
+        self.limites = {
+            'temperatura_ar': (config.TEMP_AR_MIN, config.TEMP_AR_MAX),
+            'radiacao_global': (config.RADIACAO_MIN, config.RADIACAO_MAX),
+            'vento_u': (-config.VENTO_VEL_MAX, config.VENTO_VEL_MAX),
+            'vento_v': (-config.VENTO_VEL_MAX, config.VENTO_VEL_MAX)
+        }
+        self._quantis_empiricos = {}
+
+    def registrar_empirica(self, variavel, residuos_padronizados, num_quantis=1001):
+        """
+        Registra a distribuição empírica dos resíduos padronizados de uma variável.
+
+        A amostra é resumida por uma tabela de quantis; a variável é então gerada
+        como média + desvio·Q(u), sendo Q a inversa da CDF empírica.
+
+        Args:
+            variavel (str): Nome da variável ambiental
+            residuos_padronizados (np.array): Resíduos (x - média) / desvio observados
+            num_quantis (int): Número de quantis da tabela
+        """
+        residuos = np.asarray(residuos_padronizados, dtype=float)
+        residuos = residuos[np.isfinite(residuos)]
+        if len(residuos) < 2:
+            raise ValueError(f"Resíduos insuficientes para a distribuição empírica de '{variavel}'")
+
+        probabilidades = np.linspace(0, 1, num_quantis)
+        self._quantis_empiricos[variavel] = (probabilidades, np.quantile(residuos, probabilidades))
+        self.distribuicoes[variavel] = 'empirica'
+
+    def transformar(self, normais, medias, desvios):
+        """
+        Transforma normais padrão em amostras das variáveis ambientais.
+
+        Args:
+            normais (np.array): Normais padrão com a última dimensão de tamanho 4,
+                na ordem temperatura_ar, radiacao_global, vento_u, vento_v
+            medias (dict): Médias por variável (escalares ou arrays com broadcast)
+            desvios (dict): Desvios padrão por variável (escalares ou arrays com broadcast)
+
+        Returns:
+            dict: Arrays amostrados de cada variável
+        """
+        amostras = {}
+        for j, variavel in enumerate(['temperatura_ar', 'radiacao_global']):
+            amostras[variavel] = self._transformar_variavel(
+                variavel, normais[..., j], medias[variavel], desvios[variavel]
+            )
+
+        if self.representacao_vento == 'weibull_polar':
+            amostras['vento_u'], amostras['vento_v'] = self._transformar_vento_polar(
+                normais[..., 2], normais[..., 3], medias, desvios
+            )
+        else:
+            for j, variavel in [(2, 'vento_u'), (3, 'vento_v')]:
+                amostras[variavel] = self._transformar_variavel(
+                    variavel, normais[..., j], medias[variavel], desvios[variavel]
+                )
+
+        return amostras
+
+    def assinatura(self):
+        """
+        Resumo da configuração de amostragem (famílias, vento, limites e quantis empíricos).
+
+        Returns:
+            str: Hash hexadecimal da configuração
+        """
+        resumo = hashlib.sha1(repr((
+            sorted(self.distribuicoes.items()), self.representacao_vento, sorted(self.limites.items())
+        )).encode())
+        for variavel in sorted(self._quantis_empiricos):
+            resumo.update(variavel.encode())
+            resumo.update(np.ascontiguousarray(self._quantis_empiricos[variavel][1]).tobytes())
+        return resumo.hexdigest()
+
+    def amostrar(self, medias, desvios, num_amostras, rng=None):
+        """
+        Gera amostras independentes das variáveis ambientais.
+
+        Args:
+            medias (dict): Médias por variável
+            desvios (dict): Desvios padrão por variável
+            num_amostras (int): Número de amostras
+            rng (np.random.Generator): Gerador (opcional; usa np.random global se omitido)
+
+        Returns:
+            dict: Arrays (num_amostras,) de cada variável
+        """
+        if rng is None:
+            normais = np.random.standard_normal((num_amostras, 4))
+        else:
+            normais = rng.standard_normal((num_amostras, 4))
+        return self.transformar(normais, medias, desvios)
+
+    def _transformar_variavel(self, variavel, z, media, desvio):
+        """Aplica a inversa da CDF da família configurada a uma coluna de normais."""
+        familia = self.distribuicoes.get(variavel, 'normal')
+        media = np.asarray(media, dtype=float)
+        desvio = np.asarray(desvio, dtype=float)
+
+        if familia == 'normal':
+            return media + desvio * z
+
+        if familia == 'normal_truncada':
+            return self._normal_truncada(variavel, z, media, desvio)
+
+        if familia == 'lognormal':
+            # Momentos casados; médias não positivas recaem na normal truncada
+            positiva = (media > 0) & (desvio > 0)
+            media_segura = np.where(positiva, media, 1.0)
+            razao = np.where(positiva, desvio, 0.0) / media_segura
+            sigma = np.sqrt(np.log1p(razao**2))
+            mu = np.log(media_segura) - 0.5 * sigma**2
+            lognormal = np.exp(mu + sigma * z)
+            if np.all(positiva):
+                return lognormal
+            return np.where(positiva, lognormal, self._normal_truncada(variavel, z, media, desvio))
+
+        # Empírica: quantis dos resíduos padronizados
+        if variavel not in self._quantis_empiricos:
+            raise ValueError(f"Distribuição empírica de '{variavel}' não registrada")
+        probabilidades, quantis = self._quantis_empiricos[variavel]
+        return media + desvio * np.interp(special.ndtr(z), probabilidades, quantis)
+
+    def _normal_truncada(self, variavel, z, media, desvio):
+        """Normal truncada aos limites físicos da variável pela inversa da CDF."""
+        inferior, superior = self.limites[variavel]
+        desvio_seguro = np.maximum(desvio, 1e-12)
+
+        p_inferior = special.ndtr((inferior - media) / desvio_seguro)
+        p_superior = special.ndtr((superior - media) / desvio_seguro)
+
+        u = p_inferior + special.ndtr(z) * (p_superior - p_inferior)
+        u = np.clip(u, 1e-15, 1 - 1e-15)
+
+        return np.clip(media + desvio_seguro * special.ndtri(u), inferior, superior)
+
+    def _transformar_vento_polar(self, z_velocidade, z_direcao, medias, desvios):
+        """
+        Gera o vento com velocidade Weibull e direção normal em torno da direção média.
+
+        A velocidade média é a magnitude do vetor médio e o desvio da velocidade é
+        o desvio médio das componentes; o fator de forma k vem da aproximação de
+        Justus pelo coeficiente de variação.
+
+        Returns:
+            tuple: Arrays (u, v) amostrados
+        """
+        media_u = np.asarray(medias['vento_u'], dtype=float)
+        media_v = np.asarray(medias['vento_v'], dtype=float)
+        desvio_vel = np.sqrt((np.asarray(desvios['vento_u'])**2 + np.asarray(desvios['vento_v'])**2) / 2)
+
+        velocidade_media = np.maximum(np.hypot(media_u, media_v), 1e-3)
+        coef_variacao = np.clip(desvio_vel / velocidade_media, 0.05, 5.0)
+
+        forma = coef_variacao**-1.086
+        escala = velocidade_media / special.gamma(1 + 1 / forma)
+
+        # Inversa da CDF de Weibull: c·(-ln(1 - F))^(1/k), com 1 - F = Φ(-z)
+        velocidade = escala * (-np.log(np.maximum(special.ndtr(-z_velocidade), 1e-300)))**(1 / forma)
+        velocidade = np.minimum(velocidade, config.VENTO_VEL_MAX)
+
+        direcao = np.arctan2(media_v, media_u) + np.minimum(desvio_vel / velocidade_media, np.pi) * z_direcao
+
+        return velocidade * np.cos(direcao), velocidade * np.sin(direcao)
+
+
+class BancoResiduos:
+    """
+    Banco de resíduos padronizados de validação cruzada da krigagem.
+
+    Os resíduos (M, 4) são ordenados por estrato (hora do dia x estação do ano)
+    e armazenados em float32 com os deslocamentos de cada estrato, de modo que
+    sortear perturbações é apenas um gather de índices inteiros.
+    """
+
+    NUM_ESTACOES_ANO = 4
+
+    def __init__(self, residuos, deslocamentos):
+        """
+        Inicializa o banco a partir dos arrays já estratificados.
+
+        Args:
+            residuos (np.array): Resíduos (M, 4) ordenados por estrato
+            deslocamentos (np.array): Início de cada estrato em residuos (estratos + 1,)
+        """
+        self.residuos = np.asarray(residuos, dtype=np.float32)
+        self.deslocamentos = np.asarray(deslocamentos, dtype=np.int64)
+        self._assinatura = None
+
+    @classmethod
+    def construir(cls, timestamps, residuos):
+        """
+        Constrói o banco a partir dos resíduos de validação cruzada.
+
+        Args:
+            timestamps (array-like): Timestamps (M,) de cada resíduo
+            residuos (np.array): Resíduos padronizados (M, 4); linhas com NaN são descartadas
+
+        Returns:
+            BancoResiduos: Banco estratificado
+        """
+        residuos = np.asarray(residuos, dtype=float)
+        completos = np.all(np.isfinite(residuos), axis=1)
+        if not np.any(completos):
+            raise ValueError("Nenhum resíduo completo para construir o banco")
+
+        estratos = cls.obter_estrato(pd.DatetimeIndex(timestamps)[completos])
+        ordem = np.argsort(estratos, kind='stable')
+        contagens = np.bincount(estratos, minlength=24 * cls.NUM_ESTACOES_ANO)
+        deslocamentos = np.concatenate([[0], np.cumsum(contagens)])
+
+        logger.info(f"Banco de resíduos construído: {np.sum(completos)} resíduos, "
+                   f"{np.sum(contagens > 0)} estratos preenchidos")
+
+        return cls(residuos[completos][ordem], deslocamentos)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Carrega um banco salvo com salvar()."""
+        with np.load(caminho) as dados:
+            return cls(dados['residuos'], dados['deslocamentos'])
+
+    def salvar(self, caminho):
+        """Salva o banco em formato .npz compacto."""
+        np.savez_compressed(caminho, residuos=self.residuos, deslocamentos=self.deslocamentos)
+        logger.info(f"Banco de resíduos salvo em {caminho}")
+
+    def assinatura(self):
+        """Hash hexadecimal dos resíduos e estratos do banco (calculado uma vez)."""
+        if self._assinatura is None:
+            resumo = hashlib.sha1(np.ascontiguousarray(self.residuos).tobytes())
+            resumo.update(self.deslocamentos.tobytes())
+            self._assinatura = resumo.hexdigest()
+        return self._assinatura
+
+    @classmethod
+    def obter_estrato(cls, timestamps):
+        """
+        Calcula o estrato (hora do dia x estação do ano) de timestamps.
+
+        As estações seguem os trimestres meteorológicos (DJF, MAM, JJA, SON).
+
+        Args:
+            timestamps (pd.Timestamp or pd.DatetimeIndex): Timestamps
+
+        Returns:
+            int or np.array: Índice do estrato
+        """
+        estacao_ano = (np.asarray(timestamps.month) % 12) // 3
+        return np.asarray(timestamps.hour) * cls.NUM_ESTACOES_ANO + estacao_ano
+
+    def intervalo_estrato(self, estrato=None):
+        """
+        Retorna o intervalo [inicio, fim) de resíduos usado para um estrato.
+
+        Estratos vazios recorrem aos resíduos da mesma hora em qualquer estação
+        e, por fim, ao banco inteiro.
+
+        Args:
+            estrato (int): Estrato desejado (None usa o banco inteiro)
+
+        Returns:
+            tuple: (inicio, fim)
+        """
+        if estrato is not None:
+            inicio, fim = self.deslocamentos[estrato], self.deslocamentos[estrato + 1]
+            if fim > inicio:
+                return int(inicio), int(fim)
+
+            # Estratos da mesma hora são contíguos
+            hora = estrato // self.NUM_ESTACOES_ANO
+            inicio = self.deslocamentos[hora * self.NUM_ESTACOES_ANO]
+            fim = self.deslocamentos[(hora + 1) * self.NUM_ESTACOES_ANO]
+            if fim > inicio:
+                return int(inicio), int(fim)
+
+        return 0, len(self.residuos)
+
+    def amostrar(self, num_amostras, estrato=None, rng=None):
+        """
+        Sorteia resíduos conjuntos (num_amostras, 4) com reposição.
+
+        Args:
+            num_amostras (int): Número de amostras
+            estrato (int): Estrato do cenário (opcional)
+            rng (np.random.Generator): Gerador (opcional; usa np.random global se omitido)
+
+        Returns:
+            np.array: Resíduos padronizados sorteados
+        """
+        inicio, fim = self.intervalo_estrato(estrato)
+        if rng is None:
+            indices = np.random.randint(inicio, fim, num_amostras)
+        else:
+            indices = rng.integers(inicio, fim, num_amostras)
+        return self.residuos[indices]
@@ -4,8 +4,17 @@ import numpy as np
 import pandas as pd
 from pykrige.ok import OrdinaryKriging
 import logging
+import gc
+import hashlib
+import json
+import os
+import pickle
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import config
-from sklearn.metrics import mean_squared_error
 import warnings
 
 # Configurar logging
@@ -16,8 +25,27 @@ class GeoProcessor:
     
     def __init__(self):
         self.transformer = None
+        self.registro_variogramas = None
+        
+        # Estado da última krigagem, reutilizado por atualizar_krigagem
+        self.estado_krigagem = None
+        self._motor_krigagem = None
+        self._variogramas_series = {}
+        
+        # Resumo da última discretização adaptativa
+        self.resumo_discretizacao = None
+        
+        self._reiniciar_registro_estacoes()
         self._inicializar_transformer()
     
+    def _reiniciar_registro_estacoes(self):
+        """Esvazia o registro de estações (coordenadas projetadas uma única vez por estação)."""
+        self.nomes_estacoes = []
+        self.coords_estacoes = np.empty((0, 2))
+        self.distancias_estacoes = np.empty((0, 0))
+        self._indice_estacoes = {}
+        self._distancias_linha = None
+    
     def _inicializar_transformer(self):
         """Inicializa o transformador de coordenadas."""
         try:
@@ -67,6 +95,85 @@ class GeoProcessor:
             logger.error(f"Erro na conversão em lote: {e}")
             raise
 
+    def _identificar_estacoes(self, dados_estacoes):
+        """Chave de estação de cada linha: coluna 'estacao' ou, na sua ausência, as coordenadas."""
+        if 'estacao' in dados_estacoes.columns:
+            return dados_estacoes['estacao'].astype(str).to_numpy()
+        return (dados_estacoes['latitude'].astype(str) + ',' +
+                dados_estacoes['longitude'].astype(str)).to_numpy()
+
+    def registrar_estacoes(self, dados_estacoes):
+        """
+        Registra as estações presentes nos dados e localiza cada linha no registro.
+        
+        As coordenadas projetadas são calculadas uma única vez por estação, em lote,
+        e a matriz de distâncias entre estações só é recalculada quando surgem
+        estações novas.
+        
+        Args:
+            dados_estacoes (pd.DataFrame): Dados com 'latitude', 'longitude' e,
+                opcionalmente, 'estacao'
+            
+        Returns:
+            np.array: Índice no registro da estação de cada linha (N,)
+        """
+        chaves = self._identificar_estacoes(dados_estacoes)
+        unicas, primeiras, inversa = np.unique(chaves, return_index=True, return_inverse=True)
+        novas = np.array([chave not in self._indice_estacoes for chave in unicas], dtype=bool)
+        
+        if np.any(novas):
+            latitudes = dados_estacoes['latitude'].to_numpy(dtype=float)[primeiras[novas]]
+            longitudes = dados_estacoes['longitude'].to_numpy(dtype=float)[primeiras[novas]]
+            x, y = self.converter_coordenadas_lote(latitudes, longitudes)
+            self._adicionar_estacoes(unicas[novas], np.column_stack([x, y]))
+        
+        indices_unicas = np.array([self._indice_estacoes[chave] for chave in unicas], dtype=int)
+        return indices_unicas[np.ravel(inversa)]
+
+    def _adicionar_estacoes(self, chaves, coords):
+        """Acrescenta estações já projetadas ao registro e recalcula as distâncias entre estações."""
+        for chave in chaves:
+            self._indice_estacoes[chave] = len(self.nomes_estacoes)
+            self.nomes_estacoes.append(chave)
+        self.coords_estacoes = np.vstack([self.coords_estacoes, np.asarray(coords, dtype=float)])
+        self.distancias_estacoes = np.linalg.norm(
+            self.coords_estacoes[:, None, :] - self.coords_estacoes[None, :, :], axis=2
+        )
+        self._distancias_linha = None
+        logger.info(f"{len(chaves)} estações registradas ({len(self.nomes_estacoes)} no total)")
+
+    def obter_distancias_estacoes_linha(self, coords_linha):
+        """
+        Distâncias entre os pontos da linha e as estações registradas.
+        
+        Calculadas uma vez por traçado e reutilizadas enquanto a linha e o
+        registro de estações não mudarem.
+        
+        Args:
+            coords_linha (np.array): Coordenadas projetadas dos pontos da linha (P, 2)
+            
+        Returns:
+            np.array: Distâncias (P, estações registradas)
+        """
+        coords_linha = np.asarray(coords_linha, dtype=float)
+        if self._distancias_linha is None or not np.array_equal(self._distancias_linha[0], coords_linha):
+            distancias = np.linalg.norm(coords_linha[:, None, :] - self.coords_estacoes[None, :, :], axis=2)
+            self._distancias_linha = (coords_linha.copy(), distancias)
+        return self._distancias_linha[1]
+
+    def _criar_motor_krigagem(self, indices_estacoes, coords_linha=None):
+        """Motor de krigagem matricial sobre estações do registro, com distâncias pré-calculadas."""
+        num_vizinhos = config.NUM_VIZINHOS_KRIGAGEM
+        distancias_pontos = None
+        # Na vizinhança móvel as distâncias aos vizinhos vêm da árvore; a matriz completa é dispensada
+        if coords_linha is not None and not num_vizinhos:
+            distancias_pontos = self.obter_distancias_estacoes_linha(coords_linha)[:, indices_estacoes]
+        return MotorKrigagemMatricial(
+            self.coords_estacoes[indices_estacoes], coords_linha,
+            distancias_estacoes=self.distancias_estacoes[np.ix_(indices_estacoes, indices_estacoes)],
+            distancias_pontos=distancias_pontos, num_vizinhos=num_vizinhos
+        )
+
     def discretizar_linha(self, dados_linha, distancia_entre_pontos=None):
         """
         Discretiza o traçado da linha em pontos equidistantes.
@@ -83,82 +190,189 @@ class GeoProcessor:
             
         logger.info(f"Discretizando linha com pontos a cada {distancia_entre_pontos}m")
         
-        pontos_discretizados = []
+        latitudes = dados_linha['latitude'].to_numpy(dtype=float)
+        longitudes = dados_linha['longitude'].to_numpy(dtype=float)
+        azimutes = dados_linha['azimute'].to_numpy(dtype=float)
+        progressivas = dados_linha['Progressiva'].to_numpy(dtype=float)
+        
+        # Comprimento projetado de cada segmento
+        x_vertices, y_vertices = self.converter_coordenadas_lote(latitudes, longitudes)
+        x_vertices, y_vertices = np.asarray(x_vertices, dtype=float), np.asarray(y_vertices, dtype=float)
+        distancias_segmentos = np.sqrt(np.diff(x_vertices)**2 + np.diff(y_vertices)**2)
+        
+        # Número de pontos por segmento e fração de cada ponto no seu segmento
+        num_pontos_segmento = np.maximum(1, (distancias_segmentos / distancia_entre_pontos).astype(int))
+        segmentos = np.repeat(np.arange(len(dados_linha) - 1), num_pontos_segmento)
+        inicio_segmentos = np.cumsum(num_pontos_segmento) - num_pontos_segmento
+        posicoes = np.arange(len(segmentos)) - np.repeat(inicio_segmentos, num_pontos_segmento)
+        fracoes = posicoes / num_pontos_segmento[segmentos]
+        
+        # Interpolação linear (azimute constante no segmento) e último ponto do traçado
+        def interpolar(valores):
+            interpolados = valores[segmentos] + fracoes * (valores[segmentos + 1] - valores[segmentos])
+            return np.append(interpolados, valores[-1])
+        
+        lat_pontos = interpolar(latitudes)
+        lon_pontos = interpolar(longitudes)
+        x_pontos, y_pontos = self.converter_coordenadas_lote(lat_pontos, lon_pontos)
+        
+        pontos_discretizados = {
+            'ponto_id': np.arange(len(segmentos) + 1),
+            'segmento': np.append(segmentos, len(dados_linha) - 1),
+            'fracao_segmento': np.append(fracoes, 1.0),
+            'latitude': lat_pontos,
+            'longitude': lon_pontos,
+            'x': np.asarray(x_pontos, dtype=float),
+            'y': np.asarray(y_pontos, dtype=float),
+            'azimute': np.append(azimutes[segmentos], azimutes[-1]),
+            'progressiva_aprox': interpolar(progressivas)
+        }
+        
+        df_pontos = pd.DataFrame(pontos_discretizados)
+        logger.info(f"Linha discretizada em {len(df_pontos)} pontos")
+        
+        return df_pontos
+
+    def discretizar_linha_adaptativa(self, dados_linha, dados_sincronizados=None, distancia_minima=None,
+                                     distancia_maxima=None, variaveis_ambientais=None):
+        """
+        Discretiza o traçado com espaçamento variável entre os limites mínimo e máximo.
         
-        for i in range(len(dados_linha) - 1):
-            ponto_inicial = dados_linha.iloc[i]
-            ponto_final = dados_linha.iloc[i + 1]
+        O traçado é discretizado no espaçamento mínimo e cada ponto recebe um
+        espaçamento alvo: cresce com a distância ao vértice com mudança de azimute
+        mais próximo e é limitado pelo gradiente das médias climatológicas krigadas
+        (tolerância por variável). Os pontos são então escolhidos em sequência, cada
+        um o mais distante possível do anterior sem exceder o menor alvo do trecho.
+        Vértices com mudança de azimute e as extremidades são sempre mantidos.
+        
+        Args:
+            dados_linha (pd.DataFrame): DataFrame com colunas 'Progressiva', 'azimute', 'latitude', 'longitude'
+            dados_sincronizados (pd.DataFrame): Dados das estações para a climatologia
+                (None: apenas a geometria orienta o refinamento)
+            distancia_minima (float): Espaçamento mínimo em metros (padrão: config.DISTANCIA_DISCRETIZACAO_MINIMA)
+            distancia_maxima (float): Espaçamento máximo em metros (padrão: config.DISTANCIA_DISCRETIZACAO_MAXIMA)
+            variaveis_ambientais (list): Variáveis da climatologia (padrão: config.VARIAVEIS_AMBIENTAIS)
             
-            # Converter coordenadas
-            x_inicial, y_inicial = self.converter_coordenadas(
-                ponto_inicial['latitude'], ponto_inicial['longitude']
-            )
-            x_final, y_final = self.converter_coordenadas(
-                ponto_final['latitude'], ponto_final['longitude']
+        Returns:
+            pd.DataFrame: Pontos discretizados, com as colunas de discretizar_linha
+        """
+        if distancia_minima is None:
+            distancia_minima = config.DISTANCIA_DISCRETIZACAO_MINIMA
+        if distancia_maxima is None:
+            distancia_maxima = config.DISTANCIA_DISCRETIZACAO_MAXIMA
+        if variaveis_ambientais is None:
+            variaveis_ambientais = config.VARIAVEIS_AMBIENTAIS
+        # Passos da malha fina ficam em [mínimo, 2 × mínimo) nos segmentos longos
+        if distancia_maxima < 2 * distancia_minima:
+            raise ValueError("Espaçamento máximo deve ser ao menos o dobro do mínimo")
+        
+        logger.info(f"Discretização adaptativa entre {distancia_minima}m e {distancia_maxima}m")
+        pontos_finos = self.discretizar_linha(dados_linha, distancia_minima)
+        
+        coords = pontos_finos[['x', 'y']].to_numpy(dtype=float)
+        passos = np.sqrt(np.sum(np.diff(coords, axis=0) ** 2, axis=1))
+        distancia_acumulada = np.concatenate([[0.0], np.cumsum(passos)])
+        
+        # Vértices onde o azimute muda além do limiar (início dos segmentos seguintes)
+        azimutes = dados_linha['azimute'].to_numpy(dtype=float)
+        mudancas = np.abs((np.diff(azimutes) + 180.0) % 360.0 - 180.0)
+        vertices = np.flatnonzero(mudancas > config.LIMIAR_AZIMUTE_DISCRETIZACAO) + 1
+        segmentos = pontos_finos['segmento'].to_numpy()
+        inicio_vertice = (pontos_finos['fracao_segmento'].to_numpy() == 0) & np.isin(segmentos, vertices)
+        obrigatorios = np.flatnonzero(inicio_vertice)
+        obrigatorios = np.union1d(obrigatorios, [0, len(pontos_finos) - 1])
+        
+        espacamento_alvo = np.full(len(pontos_finos), float(distancia_maxima))
+        if len(obrigatorios) > 2:
+            vertices_mudanca = distancia_acumulada[obrigatorios[1:-1]]
+            distancia_vertice = np.min(np.abs(distancia_acumulada[:, None] - vertices_mudanca[None, :]), axis=1)
+            espacamento_alvo = np.minimum(
+                espacamento_alvo,
+                distancia_minima + config.TAXA_CRESCIMENTO_DISCRETIZACAO * distancia_vertice
             )
-            
-            # Calcular distância do segmento
-            distancia_segmento = np.sqrt(
-                (x_final - x_inicial)**2 + (y_final - y_inicial)**2
+        
+        if dados_sincronizados is not None:
+            medias = self._krigar_climatologia(dados_sincronizados, coords, variaveis_ambientais)
+            for variavel, campo in medias.items():
+                tolerancia = config.TOLERANCIA_CAMPOS_DISCRETIZACAO.get(variavel)
+                if tolerancia is None:
+                    continue
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    gradiente = np.abs(np.diff(campo)) / passos
+                gradiente = np.nan_to_num(gradiente, nan=0.0)
+                # Gradiente de cada ponto: o maior dos passos adjacentes
+                gradiente_ponto = np.maximum(np.append(gradiente, 0.0), np.insert(gradiente, 0, 0.0))
+                with np.errstate(divide='ignore'):
+                    espacamento_alvo = np.minimum(espacamento_alvo, tolerancia / gradiente_ponto)
+        espacamento_alvo = np.clip(espacamento_alvo, distancia_minima, distancia_maxima)
+        
+        # Seleção sequencial: o ponto mais distante dentro do menor alvo do trecho,
+        # sem ultrapassar o próximo vértice obrigatório
+        selecionados = [0]
+        atual = 0
+        ultimo = len(pontos_finos) - 1
+        while atual < ultimo:
+            proximo_obrigatorio = obrigatorios[np.searchsorted(obrigatorios, atual, side='right')]
+            limite = min(
+                proximo_obrigatorio,
+                np.searchsorted(distancia_acumulada, distancia_acumulada[atual] + distancia_maxima, side='right') - 1
             )
-            
-            # Número de pontos no segmento
-            num_pontos_segmento = max(1, int(distancia_segmento / distancia_entre_pontos))
-            
-            # Interpolar pontos ao longo do segmento
-            for j in range(num_pontos_segmento):
-                fracao = j / num_pontos_segmento if num_pontos_segmento > 1 else 0
-                
-                # Interpolação linear
-                lat_interp = ponto_inicial['latitude'] + fracao * (
-                    ponto_final['latitude'] - ponto_inicial['latitude']
-                )
-                lon_interp = ponto_inicial['longitude'] + fracao * (
-                    ponto_final['longitude'] - ponto_inicial['longitude']
-                )
-                
-                # Azimute interpolado (assumindo constante no segmento)
-                azimute_interp = ponto_inicial['azimute']
-                
-                # Converter coordenadas interpoladas
-                x_interp, y_interp = self.converter_coordenadas(lat_interp, lon_interp)
-                
-                pontos_discretizados.append({
-                    'ponto_id': len(pontos_discretizados),
-                    'segmento': i,
-                    'fracao_segmento': fracao,
-                    'latitude': lat_interp,
-                    'longitude': lon_interp,
-                    'x': x_interp,
-                    'y': y_interp,
-                    'azimute': azimute_interp,
-                    'progressiva_aprox': ponto_inicial['Progressiva'] + fracao * (
-                        ponto_final['Progressiva'] - ponto_inicial['Progressiva']
-                    )
-                })
+            trecho = slice(atual, limite + 1)
+            alcance = distancia_acumulada[trecho] - distancia_acumulada[atual]
+            admissiveis = np.flatnonzero(alcance <= np.minimum.accumulate(espacamento_alvo[trecho]))
+            atual = max(atual + 1, atual + admissiveis[-1])
+            selecionados.append(atual)
         
-        # Adicionar último ponto
-        ultimo_ponto = dados_linha.iloc[-1]
-        x_ultimo, y_ultimo = self.converter_coordenadas(
-            ultimo_ponto['latitude'], ultimo_ponto['longitude']
+        df_pontos = pontos_finos.iloc[selecionados].reset_index(drop=True)
+        df_pontos['ponto_id'] = np.arange(len(df_pontos))
+        
+        # Comparação com a discretização de espaçamento fixo
+        x_vertices, y_vertices = self.converter_coordenadas_lote(
+            dados_linha['latitude'].to_numpy(dtype=float), dados_linha['longitude'].to_numpy(dtype=float)
         )
+        distancias_segmentos = np.hypot(np.diff(x_vertices), np.diff(y_vertices))
+        pontos_fixos = int(np.sum(np.maximum(1, (distancias_segmentos / config.DISTANCIA_DISCRETIZACAO).astype(int)))) + 1
+        espacamentos = np.diff(distancia_acumulada[selecionados])
+        self.resumo_discretizacao = {
+            'pontos': len(df_pontos),
+            'pontos_espacamento_fixo': pontos_fixos,
+            'reducao_percentual': 100.0 * (1.0 - len(df_pontos) / pontos_fixos),
+            'espacamento_minimo': float(espacamentos.min()) if len(espacamentos) else 0.0,
+            'espacamento_maximo': float(espacamentos.max()) if len(espacamentos) else 0.0
+        }
+        logger.info(f"Linha discretizada em {len(df_pontos)} pontos contra {pontos_fixos} com espaçamento fixo "
+                    f"de {config.DISTANCIA_DISCRETIZACAO}m (redução de "
+                    f"{self.resumo_discretizacao['reducao_percentual']:.1f}%)")
         
-        pontos_discretizados.append({
-            'ponto_id': len(pontos_discretizados),
-            'segmento': len(dados_linha) - 1,
-            'fracao_segmento': 1.0,
-            'latitude': ultimo_ponto['latitude'],
-            'longitude': ultimo_ponto['longitude'],
-            'x': x_ultimo,
-            'y': y_ultimo,
-            'azimute': ultimo_ponto['azimute'],
-            'progressiva_aprox': ultimo_ponto['Progressiva']
-        })
+        return df_pontos
+
+    def _krigar_climatologia(self, dados_sincronizados, coords_pontos, variaveis_ambientais):
+        """
+        Krigagem da média temporal de cada estação (climatologia) nos pontos informados.
         
-        df_pontos = pd.DataFrame(pontos_discretizados)
-        logger.info(f"Linha discretizada em {len(df_pontos)} pontos")
+        O variograma é ajustado às próprias médias das estações: a estrutura
+        persistente entre estações, e não a variação horária, define o campo
+        médio. Variáveis sem ajuste possível são omitidas.
         
-        return df_pontos
+        Returns:
+            dict: Variável -> média climatológica krigada (P,)
+        """
+        _, indices_estacoes, valores = self._montar_matriz_estacoes(dados_sincronizados, variaveis_ambientais)
+        motor = self._criar_motor_krigagem(indices_estacoes, coords_pontos)
+        
+        medias = {}
+        for variavel, serie in valores.items():
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", category=RuntimeWarning)
+                    climatologia = np.nanmean(serie, axis=1)
+                parametros, _ = motor.ajustar_variograma(climatologia[:, None])
+                campo, _ = motor.krigar_series(climatologia[:, None], config.MODELO_VARIOGRAMA, parametros, np.ones(1))
+                medias[variavel] = campo[:, 0]
+            except Exception as e:
+                logger.warning(f"Climatologia de {variavel} indisponível para a discretização: {e}")
+        
+        return medias
 
     def executar_krigagem_horaria(self, dados_sincronizados, pontos_linha, 
                                  variaveis_ambientais=None):
@@ -171,503 +385,2758 @@ class GeoProcessor:
             variaveis_ambientais (list): Lista de variáveis para krigagem
             
         Returns:
-            dict: Resultados da krigagem para cada hora/variável
+            ResultadosKrigagem: Médias e variâncias por hora, variável e ponto
         """
         if variaveis_ambientais is None:
             variaveis_ambientais = config.VARIAVEIS_AMBIENTAIS
+        
+        self._motor_krigagem = None
+        self._variogramas_series = {}
+        
+        if config.COVARIANCIA_POSTERIOR_KRIGAGEM and config.METODO_KRIGAGEM != 'matricial':
+            logger.info("Covariância posterior da krigagem disponível apenas no método 'matricial'")
+        
+        # Interpoladores alternativos dispensam variogramas
+        if config.METODO_KRIGAGEM in INTERPOLADORES:
+            resultados_krigagem = self._executar_interpolacao_alternativa(
+                dados_sincronizados, pontos_linha, variaveis_ambientais, config.METODO_KRIGAGEM
+            )
+        else:
+            if config.REGISTRO_VARIOGRAMAS_ATIVO:
+                self.preparar_registro_variogramas(dados_sincronizados, variaveis_ambientais)
+            
+            if config.METODO_KRIGAGEM == 'matricial':
+                resultados_krigagem = self._executar_krigagem_matricial(
+                    dados_sincronizados, pontos_linha, variaveis_ambientais
+                )
+            else:
+                resultados_krigagem = self._executar_krigagem_pykrige(
+                    dados_sincronizados, pontos_linha, variaveis_ambientais
+                )
+        
+        self._registrar_estado_krigagem(resultados_krigagem, pontos_linha, variaveis_ambientais)
+        return resultados_krigagem
+
+    def _executar_krigagem_pykrige(self, dados_sincronizados, pontos_linha, variaveis_ambientais,
+                                   resultados_em_memoria=False):
+        """
+        Krigagem hora a hora com o pykrige, sequencial ou em processos paralelos.
+        
+        Args:
+            dados_sincronizados (pd.DataFrame): Dados sincronizados das estações
+            pontos_linha (pd.DataFrame): Pontos discretizados da linha
+            variaveis_ambientais (list): Lista de variáveis para krigagem
+            resultados_em_memoria (bool): Ignora config.ARQUIVO_RESULTADOS_KRIGAGEM
             
+        Returns:
+            ResultadosKrigagem: Médias e variâncias por hora, variável e ponto
+        """
         logger.info("Iniciando krigagem horária...")
         logger.info(f"Variáveis: {variaveis_ambientais}")
         
-        resultados_krigagem = {}
-        
-        # Obter timestamps únicos
-        horas_unicas = dados_sincronizados.index.unique().sort_values()
+        # Obter timestamps únicos e as linhas de cada um
+        codigos_hora, horas_unicas = pd.factorize(dados_sincronizados.index, sort=True)
+        ordem = np.argsort(codigos_hora, kind='stable')
+        limites = np.searchsorted(codigos_hora[ordem], np.arange(len(horas_unicas) + 1))
         logger.info(f"Processando {len(horas_unicas)} timestamps")
         
+        # Estações do registro e valores em arrays, indexados por linha
+        indices_estacao = self.registrar_estacoes(dados_sincronizados)
+        colunas = {
+            variavel: dados_sincronizados[variavel].to_numpy(dtype=float)
+            for variavel in variaveis_ambientais if variavel in dados_sincronizados.columns
+        }
+        
         # Coordenadas dos pontos da linha
         coords_linha = pontos_linha[['x', 'y']].values
+        if resultados_em_memoria:
+            resultados_krigagem = ResultadosKrigagem.criar(horas_unicas, variaveis_ambientais, len(coords_linha))
+        else:
+            resultados_krigagem = self._criar_resultados_krigagem(horas_unicas, variaveis_ambientais, len(coords_linha))
+        
+        # Blocos contíguos de horas, cada um com os dados apenas das suas horas
+        posicoes_blocos = np.array_split(np.arange(len(horas_unicas)),
+                                         max(1, int(np.ceil(len(horas_unicas) / config.TAMANHO_BLOCO_KRIGAGEM))))
+        blocos = []
+        for posicoes in posicoes_blocos:
+            bloco = []
+            for i in posicoes:
+                linhas = ordem[limites[i]:limites[i + 1]]
+                bloco.append((horas_unicas[i], indices_estacao[linhas], {v: c[linhas] for v, c in colunas.items()}))
+            blocos.append(bloco)
+        
+        def gravar_bloco(k, resultados_bloco):
+            # Cada bloco grava nas posições das suas horas, independente da ordem de conclusão
+            for posicao in posicoes_blocos[k]:
+                resultados_krigagem.definir_hora(posicao, resultados_bloco[horas_unicas[posicao]])
+        
+        num_processos = max(1, min(int(config.NUM_PROCESSOS_KRIGAGEM), len(blocos)))
+        horas_concluidas = 0
+        
+        if num_processos == 1:
+            for k, bloco in enumerate(blocos):
+                gravar_bloco(k, self._krigar_bloco_horas(bloco, coords_linha, variaveis_ambientais))
+                horas_concluidas += len(bloco)
+                logger.info(f"Krigagem: {horas_concluidas}/{len(horas_unicas)} horas processadas")
+        else:
+            logger.info(f"Krigagem em {num_processos} processos ({len(blocos)} blocos)")
+            with ProcessPoolExecutor(
+                max_workers=num_processos,
+                initializer=_inicializar_processo_krigagem,
+                initargs=(self.coords_estacoes, coords_linha, self.registro_variogramas, variaveis_ambientais)
+            ) as executor:
+                futuros = {executor.submit(_krigar_bloco_processo, bloco): k for k, bloco in enumerate(blocos)}
+                for futuro in as_completed(futuros):
+                    k = futuros[futuro]
+                    gravar_bloco(k, futuro.result())
+                    horas_concluidas += len(blocos[k])
+                    logger.info(f"Krigagem: {horas_concluidas}/{len(horas_unicas)} horas processadas")
+        
+        logger.info("Krigagem horária concluída")
+        return resultados_krigagem
+
+    def _criar_resultados_krigagem(self, horas_unicas, variaveis_ambientais, num_pontos):
+        """Cria o tensor de resultados, em disco quando config.ARQUIVO_RESULTADOS_KRIGAGEM é definido."""
+        caminho = config.ARQUIVO_RESULTADOS_KRIGAGEM
+        if caminho:
+            logger.info(f"Resultados da krigagem mapeados em disco: {caminho}")
+        return ResultadosKrigagem.criar(horas_unicas, variaveis_ambientais, num_pontos, caminho=caminho)
+
+    def _krigar_bloco_horas(self, bloco, coords_linha, variaveis_ambientais):
+        """
+        Krigagem sequencial de um bloco de horas.
         
-        # Processar cada timestamp
-        for i, hora in enumerate(horas_unicas):
-            if i % 100 == 0:  # Log a cada 100 horas
-                logger.info(f"Processando hora {i+1}/{len(horas_unicas)}: {hora}")
+        Args:
+            bloco (list): Tuplas (hora, índices das estações, dict variável -> valores)
+            coords_linha (np.array): Coordenadas dos pontos da linha
+            variaveis_ambientais (list): Variáveis para interpolar
             
+        Returns:
+            dict: Resultados da krigagem de cada hora do bloco
+        """
+        resultados_bloco = {}
+        for hora, indices_estacao, valores_hora in bloco:
             try:
-                resultados_hora = self._processar_hora_krigagem(
-                    dados_sincronizados, hora, coords_linha, variaveis_ambientais
+                resultados_bloco[hora] = self._processar_hora_krigagem(
+                    hora, indices_estacao, valores_hora, coords_linha, variaveis_ambientais
                 )
-                resultados_krigagem[hora] = resultados_hora
-                
             except Exception as e:
                 logger.warning(f"Erro na krigagem para {hora}: {e}")
                 # Preencher com NaN em caso de erro
-                resultados_krigagem[hora] = self._criar_resultado_nan(
+                resultados_bloco[hora] = self._criar_resultado_nan(
                     variaveis_ambientais, len(coords_linha)
                 )
-        
-        logger.info("Krigagem horária concluída")
-        return resultados_krigagem
+        return resultados_bloco
 
-    def _processar_hora_krigagem(self, dados_sincronizados, hora, coords_linha, 
-                                variaveis_ambientais):
+    def _executar_krigagem_matricial(self, dados_sincronizados, pontos_linha, variaveis_ambientais):
         """
-        Processa krigagem para uma hora específica.
+        Realiza a krigagem de toda a série com pesos pré-calculados.
+        
+        Um variograma normalizado é ajustado por variável sobre todas as horas;
+        as médias de todas as horas resultam de um produto matricial e as
+        variâncias do vetor de variância de krigagem escalado pela variância
+        espacial de cada hora.
         
         Args:
-            dados_sincronizados (pd.DataFrame): Dados das estações
-            hora (datetime): Timestamp para processar
-            coords_linha (np.array): Coordenadas dos pontos da linha
-            variaveis_ambientais (list): Variáveis para interpolar
+            dados_sincronizados (pd.DataFrame): Dados sincronizados das estações
+            pontos_linha (pd.DataFrame): Pontos discretizados da linha
+            variaveis_ambientais (list): Lista de variáveis para krigagem
             
         Returns:
-            dict: Resultados da krigagem para a hora
+            ResultadosKrigagem: Médias e variâncias por hora, variável e ponto
         """
-        # Filtrar dados para a hora específica
-        dados_hora = dados_sincronizados.loc[dados_sincronizados.index == hora]
+        logger.info("Iniciando krigagem matricial...")
+        logger.info(f"Variáveis: {variaveis_ambientais}")
         
-        if dados_hora.empty:
-            raise ValueError(f"Nenhum dado encontrado para {hora}")
+        horas_unicas, indices_estacoes, valores = self._montar_matriz_estacoes(
+            dados_sincronizados, variaveis_ambientais
+        )
+        coords_linha = pontos_linha[['x', 'y']].values
+        num_pontos = len(coords_linha)
+        logger.info(f"Processando {len(horas_unicas)} timestamps com {len(indices_estacoes)} estações")
         
-        # Preparar coordenadas das estações
-        coords_estacoes = []
-        for _, row in dados_hora.iterrows():
-            x, y = self.converter_coordenadas(row['latitude'], row['longitude'])
-            coords_estacoes.append([x, y])
+        motor = self._criar_motor_krigagem(indices_estacoes, coords_linha)
+        resultados_krigagem = self._criar_resultados_krigagem(horas_unicas, variaveis_ambientais, num_pontos)
+        self._motor_krigagem = (motor, indices_estacoes)
         
-        coords_estacoes = np.array(coords_estacoes)
+        if config.COVARIANCIA_POSTERIOR_KRIGAGEM:
+            resultados_krigagem.covariancia = CovarianciaPosteriorKrigagem(
+                horas_unicas, variaveis_ambientais, num_pontos
+            )
         
-        if len(coords_estacoes) < 2:
-            raise ValueError(f"Insuficientes estações ({len(coords_estacoes)}) para krigagem")
+        self._krigar_variaveis_matricial(
+            motor, horas_unicas, valores, variaveis_ambientais, resultados_krigagem, self._variogramas_series,
+            covariancia=resultados_krigagem.covariancia
+        )
+        if resultados_krigagem.covariancia is not None:
+            logger.info(f"Covariância posterior: {len(resultados_krigagem.covariancia.fatores)} fatores, "
+                        f"{resultados_krigagem.covariancia.memoria_bytes / 1024**2:.1f} MB")
         
-        resultados_hora = {}
+        logger.info("Krigagem matricial concluída")
+        return resultados_krigagem
+
+    def _krigar_variaveis_matricial(self, motor, horas_unicas, valores, variaveis_ambientais,
+                                    resultados_krigagem, variogramas_series, covariancia=None):
+        """
+        Krigagem matricial de cada variável, gravada no tensor de resultados.
+        
+        Args:
+            motor (MotorKrigagemMatricial): Motor das estações e pontos da linha
+            horas_unicas (pd.DatetimeIndex): Horas da série (T,)
+            valores (dict): Variável -> valores nas estações do motor (S, T)
+            variaveis_ambientais (list): Variáveis para krigagem
+            resultados_krigagem (ResultadosKrigagem): Tensor de destino
+            variogramas_series (dict): Variável -> (modelo, parâmetros) ajustados à série;
+                variáveis ausentes do registro e deste dicionário são ajustadas e incluídas
+            covariancia (CovarianciaPosteriorKrigagem): Destino dos fatores da covariância
+                posterior entre os pontos da linha (opcional)
+        """
+        num_pontos = len(motor.coords_pontos)
         
-        # Processar cada variável ambiental
         for variavel in variaveis_ambientais:
             try:
-                if variavel not in dados_hora.columns:
-                    logger.warning(f"Variável {variavel} não encontrada nos dados")
-                    resultados_hora[variavel] = self._criar_resultado_nan_variavel(len(coords_linha))
-                    continue
+                if variavel not in valores:
+                    raise ValueError(f"Variável {variavel} não encontrada nos dados")
                 
-                valores_estacoes = dados_hora[variavel].values
-                
-                # Verificar e remover NaNs
-                indices_validos = ~np.isnan(valores_estacoes)
-                valores_validos = valores_estacoes[indices_validos]
-                coords_validas = coords_estacoes[indices_validos]
+                escalas = motor.calcular_escalas(valores[variavel])
                 
-                if len(valores_validos) < 2:
-                    logger.warning(f"Dados insuficientes para {variavel} em {hora}")
-                    resultados_hora[variavel] = self._criar_resultado_nan_variavel(len(coords_linha))
-                    continue
+                # Horas agrupadas pelo variograma: do registro por estrato ou ajuste único da série
+                if self.registro_variogramas is not None and self.registro_variogramas.contem([variavel]):
+                    grupos = {}
+                    for t, hora in enumerate(horas_unicas):
+                        grupos.setdefault(self.registro_variogramas.obter(variavel, hora), []).append(t)
+                else:
+                    if variavel not in variogramas_series:
+                        parametros, _ = motor.ajustar_variograma(valores[variavel])
+                        logger.info(f"Variograma {config.MODELO_VARIOGRAMA} normalizado de {variavel}: "
+                                    f"{np.round(parametros, 6).tolist()}")
+                        variogramas_series[variavel] = (config.MODELO_VARIOGRAMA, parametros)
+                    grupos = {variogramas_series[variavel]: np.arange(len(horas_unicas))}
                 
-                # Executar krigagem
-                resultado_krigagem = self._executar_krigagem_variavel(
-                    coords_validas, valores_validos, coords_linha, variavel
-                )
+                medias = np.full((num_pontos, len(horas_unicas)), np.nan)
+                variancias = np.full((num_pontos, len(horas_unicas)), np.nan)
+                for (modelo, parametros), horas in grupos.items():
+                    medias[:, horas], variancias[:, horas] = motor.krigar_series(
+                        valores[variavel][:, horas], modelo, parametros, escalas[horas]
+                    )
+                    if covariancia is not None:
+                        self._registrar_covariancia_posterior(
+                            covariancia, motor, variavel, modelo, parametros,
+                            valores[variavel][:, horas], np.asarray(horas), escalas[horas]
+                        )
                 
-                resultados_hora[variavel] = resultado_krigagem
+                # Validar valores físicos por variável
+                medias = self._validar_valores_fisicos(medias, variavel)
                 
+                resultados_krigagem.definir_serie(variavel, medias.T, variancias.T)
+                    
             except Exception as e:
-                logger.warning(f"Erro na krigagem de {variavel} em {hora}: {e}")
-                resultados_hora[variavel] = self._criar_resultado_nan_variavel(len(coords_linha))
-        
-        return resultados_hora
+                # A variável permanece com NaN no tensor de resultados
+                logger.warning(f"Erro na krigagem matricial de {variavel}: {e}")
 
-    def _executar_krigagem_variavel(self, coords_estacoes, valores_estacoes, 
-                                   coords_linha, variavel):
+    def _criar_interpolador(self, metodo, indices_estacoes, coords_linha=None):
+        """Interpolador alternativo sobre estações do registro, com distâncias pré-calculadas."""
+        distancias_pontos = None
+        if coords_linha is not None:
+            distancias_pontos = self.obter_distancias_estacoes_linha(coords_linha)[:, indices_estacoes]
+        return INTERPOLADORES[metodo](
+            self.coords_estacoes[indices_estacoes], coords_linha,
+            distancias_estacoes=self.distancias_estacoes[np.ix_(indices_estacoes, indices_estacoes)],
+            distancias_pontos=distancias_pontos
+        )
+
+    def _registrar_covariancia_posterior(self, covariancia, motor, variavel, modelo, parametros,
+                                         valores, horas, escalas):
+        """Fatores da covariância posterior de um grupo de horas, um por padrão de estações presentes."""
+        padroes, grupo = np.unique(np.isfinite(valores).T, axis=0, return_inverse=True)
+        grupo = np.ravel(grupo)
+        for k, padrao in enumerate(padroes):
+            if np.sum(padrao) < 2:
+                continue
+            selecao = grupo == k
+            covariancia.registrar(
+                variavel, (modelo, tuple(parametros), np.packbits(padrao).tobytes()),
+                lambda: motor.fator_covariancia_posterior(modelo, parametros, padrao,
+                                                          config.POSTO_COVARIANCIA_KRIGAGEM),
+                horas[selecao], escalas[selecao]
+            )
+
+    def _executar_interpolacao_alternativa(self, dados_sincronizados, pontos_linha,
+                                           variaveis_ambientais, metodo):
         """
-        Executa krigagem para uma variável específica.
+        Interpola toda a série com um interpolador alternativo à krigagem.
+        
+        Mesmo contrato de saída da krigagem: médias e variâncias por hora,
+        variável e ponto. As variâncias são uma aproximação (ver
+        InterpoladorEspacial) e não variâncias de krigagem.
         
         Args:
-            coords_estacoes (np.array): Coordenadas das estações
-            valores_estacoes (np.array): Valores da variável nas estações
-            coords_linha (np.array): Coordenadas dos pontos da linha
-            variavel (str): Nome da variável
+            dados_sincronizados (pd.DataFrame): Dados sincronizados das estações
+            pontos_linha (pd.DataFrame): Pontos discretizados da linha
+            variaveis_ambientais (list): Lista de variáveis para interpolar
+            metodo (str): Chave de INTERPOLADORES
             
         Returns:
-            dict: Resultados da krigagem (média e variância)
+            ResultadosKrigagem: Médias e variâncias por hora, variável e ponto
         """
-        try:
-            # Suprimir warnings da pykrige
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                
-                # Ajustar variograma automaticamente
-                melhor_modelo = self._ajustar_variograma_automatico(
-                    coords_estacoes, valores_estacoes, variavel
-                )
-                
-                # Criar objeto de krigagem
-                OK = OrdinaryKriging(
-                    coords_estacoes[:, 0],  # X coordinates
-                    coords_estacoes[:, 1],  # Y coordinates
-                    valores_estacoes,       # Values
-                    variogram_model=melhor_modelo,
-                    verbose=False,
-                    enable_plotting=False,
-                    coordinates_type='euclidean'
-                )
+        logger.info(f"Iniciando interpolação '{metodo}'...")
+        logger.info(f"Variáveis: {variaveis_ambientais}")
+        
+        horas_unicas, indices_estacoes, valores = self._montar_matriz_estacoes(
+            dados_sincronizados, variaveis_ambientais
+        )
+        coords_linha = pontos_linha[['x', 'y']].values
+        logger.info(f"Processando {len(horas_unicas)} timestamps com {len(indices_estacoes)} estações")
+        
+        interpolador = self._criar_interpolador(metodo, indices_estacoes, coords_linha)
+        resultados_krigagem = self._criar_resultados_krigagem(horas_unicas, variaveis_ambientais, len(coords_linha))
+        self._motor_krigagem = (interpolador, indices_estacoes)
+        
+        self._interpolar_variaveis(interpolador, valores, variaveis_ambientais, resultados_krigagem, metodo)
+        
+        logger.info(f"Interpolação '{metodo}' concluída")
+        return resultados_krigagem
+
+    def _interpolar_variaveis(self, interpolador, valores, variaveis_ambientais, resultados_krigagem, metodo):
+        """Interpola cada variável com um interpolador alternativo, gravando no tensor de resultados."""
+        for variavel in variaveis_ambientais:
+            try:
+                if variavel not in valores:
+                    raise ValueError(f"Variável {variavel} não encontrada nos dados")
                 
-                # Executar krigagem
-                z_pred, ss_pred = OK.execute(
-                    'points',
-                    coords_linha[:, 0],
-                    coords_linha[:, 1]
+                medias, variancias = interpolador.interpolar_series(
+                    valores[variavel], interpolador.calcular_escalas(valores[variavel])
                 )
+                medias = self._validar_valores_fisicos(medias, variavel)
+                resultados_krigagem.definir_serie(variavel, medias.T, variancias.T)
                 
-                # Verificar qualidade dos resultados
-                if hasattr(z_pred, 'data'):
-                    z_pred = z_pred.data
-                if hasattr(ss_pred, 'data'):
-                    ss_pred = ss_pred.data
-                
-                # Validar resultados
-                if np.any(np.isnan(z_pred)) or np.any(np.isnan(ss_pred)):
-                    logger.warning(f"NaN encontrados nos resultados de {variavel}")
-                
-                # Garantir que variâncias sejam positivas
-                ss_pred = np.maximum(ss_pred, 0)
-                
-                # Validar valores físicos por variável
-                if variavel == 'radiacao_global':
-                    z_pred = self._validar_radiacao_krigagem(z_pred)
-                elif variavel == 'temperatura_ar':
-                    z_pred = self._validar_temperatura_krigagem(z_pred)
-                elif variavel in ['vento_u', 'vento_v', 'vento_velocidade']:
-                    z_pred = self._validar_vento_krigagem(z_pred, variavel)
-                
-                return {
-                    'media': z_pred,
-                    'variancia': ss_pred,
-                    'desvio_padrao': np.sqrt(ss_pred)
-                }
-                
-        except Exception as e:
-            logger.error(f"Erro na krigagem de {variavel}: {e}")
-            raise
-    
-    def _ajustar_variograma_automatico(self, coords_estacoes, valores_estacoes, variavel):
+            except Exception as e:
+                # A variável permanece com NaN no tensor de resultados
+                logger.warning(f"Erro na interpolação '{metodo}' de {variavel}: {e}")
+
+    def comparar_interpoladores(self, dados_sincronizados, pontos_linha, variaveis_ambientais=None,
+                                metodos=None):
         """
-        Ajusta automaticamente o modelo de variograma testando diferentes opções.
+        Compara tempo e precisão da krigagem matricial e dos interpoladores alternativos.
+        
+        O tempo cobre o cálculo dos pesos e a interpolação da série inteira de
+        cada variável nos pontos da linha; a precisão é o RMSE da validação
+        cruzada deixa-uma-estação-fora nas horas sem faltas.
         
         Args:
-            coords_estacoes (np.array): Coordenadas das estações
-            valores_estacoes (np.array): Valores da variável
-            variavel (str): Nome da variável
+            dados_sincronizados (pd.DataFrame): Dados sincronizados das estações
+            pontos_linha (pd.DataFrame): Pontos discretizados da linha
+            variaveis_ambientais (list): Variáveis a comparar (padrão: config.VARIAVEIS_AMBIENTAIS)
+            metodos (list): Métodos a comparar (padrão: 'matricial' e todos os INTERPOLADORES)
             
         Returns:
-            str: Melhor modelo de variograma
+            pd.DataFrame: Uma linha por método e variável com tempo_s e rmse_validacao_cruzada
         """
-        # Modelos específicos por variável - radiação tem comportamento especial
-        if variavel == 'radiacao_global':
-            # Para radiação, preferir modelos mais suaves que reduzem variância
-            modelos_testar = ['gaussian', 'spherical', 'exponential', 'linear']
-        else:
-            modelos_testar = ['linear', 'power', 'gaussian', 'spherical', 'exponential']
+        
+        if variaveis_ambientais is None:
+            variaveis_ambientais = config.VARIAVEIS_AMBIENTAIS
+        if metodos is None:
+            metodos = ['matricial'] + list(INTERPOLADORES)
+        
+        horas_unicas, indices_estacoes, valores = self._montar_matriz_estacoes(
+            dados_sincronizados, variaveis_ambientais
+        )
+        coords_linha = pontos_linha[['x', 'y']].values
+        
+        linhas = []
+        for metodo in metodos:
+            for variavel in variaveis_ambientais:
+                if variavel not in valores:
+                    continue
+                serie = valores[variavel]
+                
+                inicio = time.perf_counter()
+                if metodo == 'matricial':
+                    motor = self._criar_motor_krigagem(indices_estacoes, coords_linha)
+                    parametros, escalas = motor.ajustar_variograma(serie)
+                    motor.krigar_series(serie, config.MODELO_VARIOGRAMA, parametros, escalas)
+                    tempo = time.perf_counter() - inicio
+                    residuos, _ = motor.residuos_validacao_cruzada_padroes(
+                        config.MODELO_VARIOGRAMA, parametros, serie
+                    )
+                else:
+                    interpolador = self._criar_interpolador(metodo, indices_estacoes, coords_linha)
+                    interpolador.interpolar_series(serie, interpolador.calcular_escalas(serie))
+                    tempo = time.perf_counter() - inicio
+                    residuos = interpolador.residuos_validacao_cruzada(serie)
+                
+                # Horas parciais entram com as estações presentes em cada hora
+                residuos = residuos[np.isfinite(residuos)]
+                linhas.append({
+                    'metodo': metodo,
+                    'variavel': variavel,
+                    'tempo_s': tempo,
+                    'rmse_validacao_cruzada': float(np.sqrt(np.mean(residuos ** 2))) if residuos.size else np.nan
+                })
+        
+        comparacao = pd.DataFrame(linhas)
+        for _, linha in comparacao.iterrows():
+            logger.info(f"{linha['metodo']:>16} | {linha['variavel']:<16} | "
+                        f"{linha['tempo_s'] * 1000:8.1f} ms | RMSE {linha['rmse_validacao_cruzada']:.4f}")
+        return comparacao
+
+    def _registrar_estado_krigagem(self, resultados_krigagem, pontos_linha, variaveis_ambientais):
+        """Guarda o estado da krigagem executada e o salva em config.DIRETORIO_ESTADO_KRIGAGEM."""
+        motor, indices_estacoes = self._motor_krigagem or (None, np.arange(len(self.nomes_estacoes)))
+        self.estado_krigagem = EstadoKrigagem(
+            metodo=config.METODO_KRIGAGEM,
+            variaveis=variaveis_ambientais,
+            nomes_estacoes=[self.nomes_estacoes[i] for i in indices_estacoes],
+            coords_estacoes=self.coords_estacoes[indices_estacoes],
+            coords_linha=pontos_linha[['x', 'y']].to_numpy(dtype=float),
+            variogramas_series=self._variogramas_series,
+            registro_variogramas=self.registro_variogramas,
+            motor=motor,
+            resultados=resultados_krigagem
+        )
+        if config.DIRETORIO_ESTADO_KRIGAGEM:
+            self.salvar_estado_krigagem(config.DIRETORIO_ESTADO_KRIGAGEM)
+
+    def salvar_estado_krigagem(self, diretorio=None):
+        """
+        Salva o estado da última krigagem (estações, variogramas, pesos e resultados).
+        
+        Args:
+            diretorio (str): Diretório do estado (padrão: config.DIRETORIO_ESTADO_KRIGAGEM)
+        """
+        if self.estado_krigagem is None:
+            raise ValueError("Nenhuma krigagem executada para salvar")
+        diretorio = diretorio or config.DIRETORIO_ESTADO_KRIGAGEM
+        self.estado_krigagem.salvar(diretorio)
+        logger.info(f"Estado da krigagem salvo em {diretorio} ({len(self.estado_krigagem.resultados)} horas)")
+
+    def carregar_estado_krigagem(self, diretorio=None):
+        """
+        Carrega um estado salvo e restaura as estações e variogramas correspondentes.
+        
+        Args:
+            diretorio (str): Diretório do estado (padrão: config.DIRETORIO_ESTADO_KRIGAGEM)
             
-        melhor_modelo = config.MODELO_VARIOGRAMA  # Default
-        melhor_score = float('inf')
-        melhor_variancia_media = float('inf')
+        Returns:
+            EstadoKrigagem: Estado carregado, ou None se não houver estado salvo
+        """
+        diretorio = diretorio or config.DIRETORIO_ESTADO_KRIGAGEM
+        if not diretorio or not EstadoKrigagem.existe(diretorio):
+            return None
+        try:
+            estado = EstadoKrigagem.carregar(diretorio)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Erro ao carregar estado da krigagem: {e}")
+            return None
         
-        # Se temos muitas poucas estações, usar modelo linear
-        if len(coords_estacoes) < 4:
-            return 'linear'
+        # Estações do estado no registro, com as coordenadas salvas
+        ausentes = [k for k, nome in enumerate(estado.nomes_estacoes) if nome not in self._indice_estacoes]
+        if ausentes:
+            self._adicionar_estacoes([estado.nomes_estacoes[k] for k in ausentes], estado.coords_estacoes[ausentes])
+        if estado.registro_variogramas is not None:
+            self.registro_variogramas = estado.registro_variogramas
         
-        # Calcular variância dos dados para normalização
-        variancia_dados = np.var(valores_estacoes)
+        self.estado_krigagem = estado
+        logger.info(f"Estado da krigagem carregado de {diretorio} ({len(estado.resultados)} horas)")
+        return estado
+
+    def atualizar_krigagem(self, novos_dados, pontos_linha=None, variaveis_ambientais=None):
+        """
+        Kriga apenas as horas ainda não armazenadas e as acrescenta aos resultados.
         
-        # Dividir dados em treino e validação (cross-validation simples)
-        n_estacoes = len(coords_estacoes)
-        indices = np.arange(n_estacoes)
-        np.random.shuffle(indices)
+        Reutiliza o estado da última krigagem (em memória ou salvo em
+        config.DIRETORIO_ESTADO_KRIGAGEM): estações, variogramas ajustados, pesos
+        já calculados (apenas em memória) e o tensor de resultados. Horas de novos_dados já presentes
+        nos resultados não são recalculadas. Se o método, as variáveis, o traçado
+        da linha ou as estações mudaram, o estado é descartado e novos_dados é
+        krigado por completo.
         
-        # Usar 80% para treino, 20% para validação
-        n_treino = max(2, int(0.8 * n_estacoes))
-        indices_treino = indices[:n_treino]
-        indices_validacao = indices[n_treino:]
+        Args:
+            novos_dados (pd.DataFrame): Dados sincronizados com as horas novas
+                (podem incluir horas já krigadas)
+            pontos_linha (pd.DataFrame): Pontos da linha (padrão: os do estado)
+            variaveis_ambientais (list): Variáveis (padrão: config.VARIAVEIS_AMBIENTAIS)
+            
+        Returns:
+            ResultadosKrigagem: Resultados de todas as horas armazenadas
+        """
+        if variaveis_ambientais is None:
+            variaveis_ambientais = config.VARIAVEIS_AMBIENTAIS
         
-        if len(indices_validacao) == 0:
-            return melhor_modelo
+        estado = self.estado_krigagem or self.carregar_estado_krigagem()
+        if pontos_linha is None:
+            if estado is None:
+                raise ValueError("Sem estado de krigagem: informe os pontos da linha")
+            pontos_linha = pd.DataFrame(estado.coords_linha, columns=['x', 'y'])
         
-        coords_treino = coords_estacoes[indices_treino]
-        valores_treino = valores_estacoes[indices_treino]
-        coords_validacao = coords_estacoes[indices_validacao]
-        valores_validacao = valores_estacoes[indices_validacao]
+        motivo = 'nenhum estado anterior' if estado is None else self._verificar_estado_krigagem(
+            estado, novos_dados, pontos_linha, variaveis_ambientais
+        )
+        if motivo:
+            logger.info(f"Krigagem completa ({motivo})")
+            if estado is not None:
+                # Estações reprojetadas a partir dos novos dados
+                self.estado_krigagem = None
+                self._reiniciar_registro_estacoes()
+            return self.executar_krigagem_horaria(novos_dados, pontos_linha, variaveis_ambientais)
         
-        # Testar cada modelo
-        for modelo in modelos_testar:
-            try:
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    
-                    # Criar krigagem com dados de treino
-                    OK = OrdinaryKriging(
-                        coords_treino[:, 0],
-                        coords_treino[:, 1],
-                        valores_treino,
-                        variogram_model=modelo,
-                        verbose=False,
-                        enable_plotting=False,
-                        coordinates_type='euclidean'
-                    )
-                    
-                    # Predizer nos pontos de validação
-                    pred_validacao, var_validacao = OK.execute(
-                        'points',
-                        coords_validacao[:, 0],
-                        coords_validacao[:, 1]
-                    )
-                    
-                    if hasattr(pred_validacao, 'data'):
-                        pred_validacao = pred_validacao.data
-                    if hasattr(var_validacao, 'data'):
-                        var_validacao = var_validacao.data
-                    
-                    # Calcular métricas
-                    if not np.any(np.isnan(pred_validacao)) and not np.any(np.isnan(var_validacao)):
-                        rmse = np.sqrt(mean_squared_error(valores_validacao, pred_validacao))
-                        variancia_media = np.mean(var_validacao)
-                        
-                        # Para radiação, penalizar modelos com variância muito alta
-                        if variavel == 'radiacao_global':
-                            # Score combinado: RMSE + penalidade por variância alta
-                            penalidade_variancia = min(variancia_media / variancia_dados, 10.0)
-                            score_combinado = rmse * (1 + 0.1 * penalidade_variancia)
-                        else:
-                            score_combinado = rmse
-                        
-                        if score_combinado < melhor_score:
-                            melhor_score = score_combinado
-                            melhor_modelo = modelo
-                            melhor_variancia_media = variancia_media
-                            
-            except Exception:
-                continue
+        horas_novas = pd.DatetimeIndex(novos_dados.index.unique()).difference(estado.resultados.horas)
+        if len(horas_novas) == 0:
+            logger.info("Nenhuma hora nova para krigar")
+            return estado.resultados
         
-        # Log apenas para primeira vez por variável (evitar spam)
-        if not hasattr(self, '_variograma_logged'):
-            self._variograma_logged = set()
+        logger.info(f"Krigagem incremental: {len(horas_novas)} horas novas "
+                    f"({len(estado.resultados)} já armazenadas)")
+        dados_novos = novos_dados[novos_dados.index.isin(horas_novas)]
+        indices_estacoes = np.array([self._indice_estacoes[nome] for nome in estado.nomes_estacoes], dtype=int)
         
-        if variavel not in self._variograma_logged:
-            if variavel == 'radiacao_global':
-                logger.info(f"Melhor modelo de variograma para {variavel}: {melhor_modelo} "
-                           f"(RMSE: {melhor_score:.3f}, Var.média: {melhor_variancia_media:.1f})")
+        if estado.metodo == 'matricial' or estado.metodo in INTERPOLADORES:
+            horas_unicas, _, valores = self._montar_matriz_estacoes(
+                dados_novos, variaveis_ambientais, indices_estacoes
+            )
+            resultados_novos = ResultadosKrigagem.criar(
+                horas_unicas, variaveis_ambientais, len(estado.coords_linha), dtype=estado.resultados.tensor.dtype
+            )
+            if estado.metodo == 'matricial':
+                if config.COVARIANCIA_POSTERIOR_KRIGAGEM:
+                    # Fatores já calculados para as horas armazenadas são reaproveitados
+                    resultados_novos.covariancia = CovarianciaPosteriorKrigagem(
+                        horas_unicas, variaveis_ambientais, len(estado.coords_linha)
+                    )
+                    if estado.resultados.covariancia is not None:
+                        resultados_novos.covariancia.herdar_fatores(estado.resultados.covariancia)
+                self._krigar_variaveis_matricial(
+                    estado.motor, horas_unicas, valores, variaveis_ambientais,
+                    resultados_novos, estado.variogramas_series, covariancia=resultados_novos.covariancia
+                )
             else:
-                logger.info(f"Melhor modelo de variograma para {variavel}: {melhor_modelo} (RMSE: {melhor_score:.3f})")
-            self._variograma_logged.add(variavel)
+                self._interpolar_variaveis(
+                    estado.motor, valores, variaveis_ambientais, resultados_novos, estado.metodo
+                )
+        else:
+            resultados_novos = self._executar_krigagem_pykrige(
+                dados_novos, pontos_linha, variaveis_ambientais, resultados_em_memoria=True
+            )
         
-        return melhor_modelo
+        caminho = config.ARQUIVO_RESULTADOS_KRIGAGEM
+        if config.DIRETORIO_ESTADO_KRIGAGEM:
+            caminho = EstadoKrigagem.caminho_resultados(config.DIRETORIO_ESTADO_KRIGAGEM)
+        estado.resultados = ResultadosKrigagem.concatenar([estado.resultados, resultados_novos], caminho=caminho)
+        
+        if config.DIRETORIO_ESTADO_KRIGAGEM:
+            self.salvar_estado_krigagem(config.DIRETORIO_ESTADO_KRIGAGEM)
+        return estado.resultados
 
-    def _validar_radiacao_krigagem(self, valores_radiacao):
+    def _verificar_estado_krigagem(self, estado, novos_dados, pontos_linha, variaveis_ambientais):
         """
-        Valida valores de radiação da krigagem e anula valores fisicamente impossíveis.
+        Verifica se o estado da krigagem vale para os novos dados.
         
-        Args:
-            valores_radiacao (np.array): Valores de radiação interpolados
-            
         Returns:
-            np.array: Valores validados (valores inválidos substituídos por NaN)
+            str: Motivo da invalidação, ou None se o estado pode ser reutilizado
         """
-        valores_validados = valores_radiacao.copy()
+        if estado.metodo != config.METODO_KRIGAGEM:
+            return f"método alterado de '{estado.metodo}' para '{config.METODO_KRIGAGEM}'"
+        if list(estado.variaveis) != list(variaveis_ambientais):
+            return "variáveis ambientais alteradas"
+        if EstadoKrigagem.calcular_assinatura_linha(pontos_linha[['x', 'y']].to_numpy(dtype=float)) != \
+                EstadoKrigagem.calcular_assinatura_linha(estado.coords_linha):
+            return "traçado da linha alterado"
         
-        # Limites físicos para radiação solar (W/m²)
-        # Radiação máxima teórica ao nível do mar é ~1400 W/m²
-        # Radiação mínima é 0 (não pode ser negativa)
-        limite_min = 0.0
-        limite_max = 1400.0
+        chaves = self._identificar_estacoes(novos_dados)
+        unicas, primeiras = np.unique(chaves, return_index=True)
+        posicoes = {nome: k for k, nome in enumerate(estado.nomes_estacoes)}
+        novas = [chave for chave in unicas if chave not in posicoes]
+        if novas:
+            return f"estações novas: {', '.join(novas)}"
         
-        # Contar valores inválidos antes da correção
-        mask_invalidos = (valores_validados < limite_min) | (valores_validados > limite_max)
-        num_invalidos = np.sum(mask_invalidos)
+        x, y = self.converter_coordenadas_lote(
+            novos_dados['latitude'].to_numpy(dtype=float)[primeiras],
+            novos_dados['longitude'].to_numpy(dtype=float)[primeiras]
+        )
+        deslocamentos = np.linalg.norm(
+            np.column_stack([x, y]) - estado.coords_estacoes[[posicoes[chave] for chave in unicas]], axis=1
+        )
+        if np.any(deslocamentos > 1.0):
+            return f"coordenadas alteradas: {', '.join(unicas[deslocamentos > 1.0])}"
+        return None
+
+    def _montar_matriz_estacoes(self, dados_sincronizados, variaveis_ambientais, indices_estacoes=None):
+        """
+        Reorganiza os dados sincronizados em matrizes estações × horas.
         
-        if num_invalidos > 0:
-            # Log dos valores problemáticos para análise
-            valores_problematicos = valores_validados[mask_invalidos]
-            logger.warning(f"Krigagem de radiação: {num_invalidos} valores inválidos detectados")
-            logger.warning(f"Valores problemáticos: min={valores_problematicos.min():.1f}, "
-                          f"max={valores_problematicos.max():.1f} W/m²")
-            
-            # Substituir valores inválidos por NaN
-            valores_validados[mask_invalidos] = np.nan
+        Args:
+            dados_sincronizados (pd.DataFrame): Dados sincronizados das estações
+            variaveis_ambientais (list): Variáveis a extrair
+            indices_estacoes (np.array): Estações do registro nas linhas das matrizes
+                (padrão: as estações presentes nos dados)
             
-            logger.info(f"Valores de radiação fora do intervalo [{limite_min}, {limite_max}] W/m² "
-                       f"foram anulados ({num_invalidos} pontos)")
+        Returns:
+            tuple: (horas (T,), índices no registro das estações (S,),
+                dict variável -> valores (S, T))
+        """
+        codigos_hora, horas_unicas = pd.factorize(dados_sincronizados.index, sort=True)
+        indices_linhas = self.registrar_estacoes(dados_sincronizados)
+        if indices_estacoes is None:
+            indices_presentes, codigos_estacao = np.unique(indices_linhas, return_inverse=True)
+            codigos_estacao = np.ravel(codigos_estacao)
+        else:
+            indices_presentes = np.asarray(indices_estacoes, dtype=int)
+            posicoes = np.full(len(self.nomes_estacoes), -1)
+            posicoes[indices_presentes] = np.arange(len(indices_presentes))
+            codigos_estacao = posicoes[indices_linhas]
+            if np.any(codigos_estacao < 0):
+                raise ValueError("Dados contêm estações fora do conjunto informado")
         
-        return valores_validados
+        valores = {}
+        for variavel in variaveis_ambientais:
+            if variavel not in dados_sincronizados.columns:
+                continue
+            matriz = np.full((len(indices_presentes), len(horas_unicas)), np.nan)
+            matriz[codigos_estacao, codigos_hora] = dados_sincronizados[variavel].to_numpy(dtype=float)
+            valores[variavel] = matriz
+        
+        return horas_unicas, indices_presentes, valores
 
-    def _validar_temperatura_krigagem(self, valores_temperatura):
+    def preparar_registro_variogramas(self, dados_sincronizados, variaveis_ambientais=None):
         """
-        Valida valores de temperatura da krigagem e anula valores fisicamente impossíveis.
+        Carrega o registro de variogramas do disco ou o constrói e salva.
+        
+        O registro salvo é reutilizado quando corresponde ao mesmo conjunto de
+        estações e contém todas as variáveis; caso contrário é reconstruído.
         
         Args:
-            valores_temperatura (np.array): Valores de temperatura interpolados
+            dados_sincronizados (pd.DataFrame): Dados sincronizados das estações
+            variaveis_ambientais (list): Variáveis (padrão: config.VARIAVEIS_AMBIENTAIS)
             
         Returns:
-            np.array: Valores validados (valores inválidos substituídos por NaN)
+            RegistroVariogramas: Registro em uso
         """
-        valores_validados = valores_temperatura.copy()
+        if variaveis_ambientais is None:
+            variaveis_ambientais = config.VARIAVEIS_AMBIENTAIS
         
-        # Limites físicos para temperatura do ar (°C)
-        # Considerando faixa realista para condições meteorológicas no Brasil
-        limite_min = -10.0  # Temperatura mínima extrema
-        limite_max = 55.0   # Temperatura máxima extrema
+        horas_unicas, indices_estacoes, valores = self._montar_matriz_estacoes(
+            dados_sincronizados, variaveis_ambientais
+        )
+        assinatura = RegistroVariogramas.calcular_assinatura(
+            [self.nomes_estacoes[i] for i in indices_estacoes], self.coords_estacoes[indices_estacoes]
+        )
+        variaveis_presentes = [v for v in variaveis_ambientais if v in valores]
+        caminho = config.ARQUIVO_REGISTRO_VARIOGRAMAS
         
-        # Contar valores inválidos antes da correção
-        mask_invalidos = (valores_validados < limite_min) | (valores_validados > limite_max)
-        num_invalidos = np.sum(mask_invalidos)
+        if (self.registro_variogramas is not None and self.registro_variogramas.assinatura == assinatura
+                and self.registro_variogramas.contem(variaveis_presentes)):
+            return self.registro_variogramas
         
-        if num_invalidos > 0:
-            # Log dos valores problemáticos para análise
-            valores_problematicos = valores_validados[mask_invalidos]
-            logger.warning(f"Krigagem de temperatura: {num_invalidos} valores inválidos detectados")
-            logger.warning(f"Valores problemáticos: min={valores_problematicos.min():.1f}, "
-                          f"max={valores_problematicos.max():.1f} °C")
-            
-            # Substituir valores inválidos por NaN
-            valores_validados[mask_invalidos] = np.nan
-            
-            logger.info(f"Valores de temperatura fora do intervalo [{limite_min}, {limite_max}] °C "
-                       f"foram anulados ({num_invalidos} pontos)")
+        if os.path.exists(caminho):
+            try:
+                registro = RegistroVariogramas.carregar(caminho)
+                if registro.assinatura == assinatura and registro.contem(variaveis_presentes):
+                    logger.info(f"Registro de variogramas carregado de {caminho}")
+                    self.registro_variogramas = registro
+                    return registro
+                logger.info("Registro de variogramas salvo não corresponde às estações atuais; reconstruindo")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Erro ao carregar registro de variogramas: {e}")
         
-        return valores_validados
+        registro = self._construir_registro_variogramas(horas_unicas, indices_estacoes, valores, assinatura)
+        try:
+            registro.salvar(caminho)
+            logger.info(f"Registro de variogramas salvo em {caminho}")
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar o registro de variogramas: {e}")
+        
+        self.registro_variogramas = registro
+        return registro
 
-    def _validar_vento_krigagem(self, valores_vento, variavel):
+    def _construir_registro_variogramas(self, horas_unicas, indices_estacoes, valores, assinatura):
         """
-        Valida valores de vento da krigagem e anula valores fisicamente impossíveis.
+        Seleciona e ajusta o variograma de cada variável por estrato (mês, hora do dia).
+        
+        Cada estrato agrupa as horas com ao menos três estações presentes, mesmo
+        que parciais (estações com períodos diferentes); estratos com menos de
+        config.VARIOGRAMA_MIN_HORAS_ESTRATO horas recorrem ao ajuste global da variável.
         
         Args:
-            valores_vento (np.array): Valores de vento interpolados
-            variavel (str): Nome da variável (vento_u, vento_v, vento_velocidade)
+            horas_unicas (pd.DatetimeIndex): Horas da série (T,)
+            indices_estacoes (np.array): Índices no registro das estações (S,)
+            valores (dict): Variável -> valores nas estações (S, T)
+            assinatura (str): Assinatura do conjunto de estações
             
         Returns:
-            np.array: Valores validados (valores inválidos substituídos por NaN)
+            RegistroVariogramas: Registro construído
         """
-        valores_validados = valores_vento.copy()
+        logger.info("Construindo registro de variogramas por estrato...")
+        registro = RegistroVariogramas(assinatura)
+        motor = self._criar_motor_krigagem(indices_estacoes)
+        estratos = np.array([RegistroVariogramas.obter_estrato(hora) for hora in horas_unicas])
         
-        # Limites físicos para vento
-        if variavel == 'vento_velocidade':
-            # Velocidade do vento não pode ser negativa e raramente excede 50 m/s
-            limite_min = 0.0
-            limite_max = 50.0
-        else:  # vento_u, vento_v (componentes)
-            # Componentes podem ser negativas, mas limitadas por velocidade máxima
-            limite_min = -50.0
-            limite_max = 50.0
+        for variavel, valores_variavel in valores.items():
+            uteis = np.sum(np.isfinite(valores_variavel), axis=0) >= 3
+            
+            selecao = self._selecionar_variograma_estrato(motor, valores_variavel[:, uteis], variavel)
+            if selecao is None:
+                logger.warning(f"Não foi possível ajustar variograma global para {variavel}")
+                continue
+            registro.registrar(variavel, 'global', *selecao)
+            
+            num_estratos = 0
+            for estrato in np.unique(estratos[uteis]):
+                horas_estrato = uteis & (estratos == estrato)
+                if np.sum(horas_estrato) < config.VARIOGRAMA_MIN_HORAS_ESTRATO:
+                    continue
+                selecao = self._selecionar_variograma_estrato(motor, valores_variavel[:, horas_estrato], variavel)
+                if selecao is not None:
+                    registro.registrar(variavel, estrato, *selecao)
+                    num_estratos += 1
+            
+            modelos = pd.Series([e['modelo'] for e in registro.variogramas[variavel].values()]).value_counts()
+            logger.info(f"Variogramas de {variavel}: {num_estratos} estratos, modelos {modelos.to_dict()}")
         
-        # Contar valores inválidos antes da correção
-        mask_invalidos = (valores_validados < limite_min) | (valores_validados > limite_max)
-        num_invalidos = np.sum(mask_invalidos)
+        return registro
+
+    def _selecionar_variograma_estrato(self, motor, valores, variavel):
+        """
+        Seleciona o modelo de variograma de um conjunto de horas agrupadas.
         
-        if num_invalidos > 0:
-            # Log dos valores problemáticos para análise
-            valores_problematicos = valores_validados[mask_invalidos]
-            logger.warning(f"Krigagem de {variavel}: {num_invalidos} valores inválidos detectados")
-            logger.warning(f"Valores problemáticos: min={valores_problematicos.min():.1f}, "
-                          f"max={valores_problematicos.max():.1f} m/s")
+        Args:
+            motor (MotorKrigagemMatricial): Motor com as coordenadas das estações
+            valores (np.array): Valores nas estações (S, T), NaN nas faltas
+            variavel (str): Nome da variável
             
-            # Substituir valores inválidos por NaN
-            valores_validados[mask_invalidos] = np.nan
+        Returns:
+            tuple: (modelo, parâmetros normalizados, pontuação) ou None
+        """
+        if valores.shape[1] == 0:
+            return None
+        
+        modelos = self._modelos_variograma_candidatos(variavel)
+        if len(motor.coords_estacoes) < 4:
+            modelos = ['linear']
+        
+        melhor = None
+        for modelo in modelos:
+            try:
+                parametros, escalas = motor.ajustar_variograma(valores, modelo)
+                rmse, variancia_media = motor.validacao_cruzada(modelo, parametros, valores, escalas)
+            except (ValueError, np.linalg.LinAlgError):
+                continue
             
-            logger.info(f"Valores de {variavel} fora do intervalo [{limite_min}, {limite_max}] m/s "
-                       f"foram anulados ({num_invalidos} pontos)")
+            # Variograma normalizado: variância dos dados unitária
+            pontuacao = self._pontuar_variograma(variavel, rmse, variancia_media, 1.0)
+            if np.isfinite(pontuacao) and (melhor is None or pontuacao < melhor[2]):
+                melhor = (modelo, parametros, pontuacao)
         
-        return valores_validados
-
-    def _criar_resultado_nan(self, variaveis_ambientais, num_pontos):
-        """Cria resultado preenchido com NaN para todas as variáveis."""
-        resultado = {}
-        for variavel in variaveis_ambientais:
-            resultado[variavel] = self._criar_resultado_nan_variavel(num_pontos)
-        return resultado
-
-    def _criar_resultado_nan_variavel(self, num_pontos):
-        """Cria resultado preenchido com NaN para uma variável."""
-        return {
-            'media': np.full(num_pontos, np.nan),
-            'variancia': np.full(num_pontos, np.nan),
-            'desvio_padrao': np.full(num_pontos, np.nan)
-        }
+        return melhor
 
-    def validar_resultados_krigagem(self, resultados_krigagem, pontos_linha):
+    def _processar_hora_krigagem(self, hora, indices_estacao, valores_hora, coords_linha, 
+                                variaveis_ambientais):
         """
-        Valida os resultados da krigagem e fornece estatísticas.
+        Processa krigagem para uma hora específica.
         
         Args:
-            resultados_krigagem (dict): Resultados da krigagem
-            pontos_linha (pd.DataFrame): Pontos da linha
+            hora (datetime): Timestamp para processar
+            indices_estacao (np.array): Índices no registro das estações da hora
+            valores_hora (dict): Variável -> valores das estações da hora
+            coords_linha (np.array): Coordenadas dos pontos da linha
+            variaveis_ambientais (list): Variáveis para interpolar
             
         Returns:
-            dict: Estatísticas de validação
+            dict: Resultados da krigagem para a hora
         """
-        logger.info("Validando resultados da krigagem...")
+        if len(indices_estacao) == 0:
+            raise ValueError(f"Nenhum dado encontrado para {hora}")
         
-        estatisticas = {
-            'total_horas': len(resultados_krigagem),
-            'total_pontos': len(pontos_linha),
-            'variaveis': {},
-            'horas_com_erro': 0,
-            'qualidade_geral': 'boa'
-        }
+        # Coordenadas das estações a partir do registro
+        coords_estacoes = self.coords_estacoes[indices_estacao]
         
-        horas_com_nan = 0
+        if len(coords_estacoes) < 2:
+            raise ValueError(f"Insuficientes estações ({len(coords_estacoes)}) para krigagem")
         
-        for hora, resultados_hora in resultados_krigagem.items():
-            hora_tem_nan = False
-            
-            for variavel, resultado_var in resultados_hora.items():
-                if variavel not in estatisticas['variaveis']:
-                    estatisticas['variaveis'][variavel] = {
-                        'media_min': np.inf,
-                        'media_max': -np.inf,
-                        'variancia_media': 0,
-                        'pontos_com_nan': 0
-                    }
+        resultados_hora = {}
+        
+        # Processar cada variável ambiental
+        for variavel in variaveis_ambientais:
+            try:
+                if variavel not in valores_hora:
+                    logger.warning(f"Variável {variavel} não encontrada nos dados")
+                    resultados_hora[variavel] = self._criar_resultado_nan_variavel(len(coords_linha))
+                    continue
                 
-                media = resultado_var['media']
-                variancia = resultado_var['variancia']
+                valores_estacoes = valores_hora[variavel]
                 
-                # Contar NaNs
-                nan_count = np.sum(np.isnan(media))
-                if nan_count > 0:
-                    hora_tem_nan = True
-                    estatisticas['variaveis'][variavel]['pontos_com_nan'] += nan_count
+                # Verificar e remover NaNs
+                indices_validos = ~np.isnan(valores_estacoes)
+                valores_validos = valores_estacoes[indices_validos]
+                coords_validas = coords_estacoes[indices_validos]
                 
-                # Estatísticas dos valores válidos
-                valores_validos = media[~np.isnan(media)]
-                if len(valores_validos) > 0:
-                    estatisticas['variaveis'][variavel]['media_min'] = min(
-                        estatisticas['variaveis'][variavel]['media_min'],
-                        np.min(valores_validos)
+                if len(valores_validos) < 2:
+                    logger.warning(f"Dados insuficientes para {variavel} em {hora}")
+                    resultados_hora[variavel] = self._criar_resultado_nan_variavel(len(coords_linha))
+                    continue
+                
+                # Executar krigagem
+                resultado_krigagem = self._executar_krigagem_variavel(
+                    coords_validas, valores_validos, coords_linha, variavel, hora=hora
+                )
+                
+                resultados_hora[variavel] = resultado_krigagem
+                
+            except Exception as e:
+                logger.warning(f"Erro na krigagem de {variavel} em {hora}: {e}")
+                resultados_hora[variavel] = self._criar_resultado_nan_variavel(len(coords_linha))
+        
+        return resultados_hora
+
+    def calcular_residuos_validacao_cruzada(self, dados_sincronizados, variaveis_ambientais=None,
+                                            max_horas=None):
+        """
+        Calcula resíduos padronizados de validação cruzada (deixa-uma-estação-fora) da krigagem.
+        
+        Usa as mesmas séries de calcular_series_residuos_validacao_cruzada (forma
+        fechada com o variograma normalizado da série), de modo que o banco e o
+        processo AR partem dos mesmos resíduos. Os resíduos das quatro variáveis
+        de uma mesma estação-hora são mantidos juntos para preservar a
+        dependência entre elas.
+        
+        Args:
+            dados_sincronizados (pd.DataFrame): Dados sincronizados das estações
+            variaveis_ambientais (list): Variáveis (padrão: config.VARIAVEIS_AMBIENTAIS)
+            max_horas (int): Número máximo de horas usadas, uniformemente espaçadas
+                (padrão: config.BANCO_RESIDUOS_MAX_HORAS)
+            
+        Returns:
+            tuple: (timestamps (M,), resíduos padronizados (M, variáveis))
+        """
+        if variaveis_ambientais is None:
+            variaveis_ambientais = config.VARIAVEIS_AMBIENTAIS
+        if max_horas is None:
+            max_horas = config.BANCO_RESIDUOS_MAX_HORAS
+        
+        horas_unicas, series = self.calcular_series_residuos_validacao_cruzada(
+            dados_sincronizados, variaveis_ambientais
+        )
+        
+        posicoes_horas = np.arange(len(horas_unicas))
+        if max_horas is not None and len(horas_unicas) > max_horas:
+            posicoes_horas = np.linspace(0, len(horas_unicas) - 1, max_horas).astype(int)
+        
+        logger.info(f"Resíduos de validação cruzada em {len(posicoes_horas)} horas")
+        
+        # Tensor (estações, horas, variáveis); NaN para variáveis sem resíduos
+        num_estacoes = len(next(iter(series.values()))) if series else 0
+        residuos = np.full((num_estacoes, len(posicoes_horas), len(variaveis_ambientais)), np.nan)
+        for j, variavel in enumerate(variaveis_ambientais):
+            if variavel in series:
+                residuos[:, :, j] = series[variavel][:, posicoes_horas]
+        
+        # Uma linha por estação-hora com algum resíduo
+        estacoes, horas = np.nonzero(np.any(np.isfinite(residuos), axis=2))
+        ordem = np.lexsort((estacoes, horas))
+        estacoes, horas = estacoes[ordem], horas[ordem]
+        
+        return pd.DatetimeIndex(horas_unicas[posicoes_horas[horas]]), residuos[estacoes, horas]
+
+    def calcular_series_residuos_validacao_cruzada(self, dados_sincronizados, variaveis_ambientais=None):
+        """
+        Séries horárias de resíduos padronizados deixa-uma-estação-fora, por estação.
+        
+        Ao contrário do banco de resíduos, as horas não são amostradas e cada
+        estação mantém sua série, de modo que a persistência temporal dos resíduos
+        pode ser estimada. Usa o variograma normalizado da série e a forma fechada
+        por padrão de estações presentes.
+        
+        Args:
+            dados_sincronizados (pd.DataFrame): Dados sincronizados das estações
+            variaveis_ambientais (list): Variáveis (padrão: config.VARIAVEIS_AMBIENTAIS)
+            
+        Returns:
+            tuple: (horas (T,), dict variável -> resíduos padronizados (S, T), NaN nas faltas)
+        """
+        if variaveis_ambientais is None:
+            variaveis_ambientais = config.VARIAVEIS_AMBIENTAIS
+        
+        horas_unicas, indices_estacoes, valores = self._montar_matriz_estacoes(
+            dados_sincronizados, variaveis_ambientais
+        )
+        motor = self._criar_motor_krigagem(indices_estacoes)
+        
+        series = {}
+        for variavel, serie in valores.items():
+            try:
+                parametros, escalas = motor.ajustar_variograma(serie)
+                residuos, variancias = motor.residuos_validacao_cruzada_padroes(
+                    config.MODELO_VARIOGRAMA, parametros, serie
+                )
+                desvios = np.sqrt(variancias * escalas[None, :])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    series[variavel] = np.where(desvios > 1e-9, residuos / desvios, np.nan)
+            except Exception as e:
+                logger.warning(f"Resíduos de validação cruzada de {variavel} indisponíveis: {e}")
+        
+        return horas_unicas, series
+
+    def _executar_krigagem_variavel(self, coords_estacoes, valores_estacoes, 
+                                   coords_linha, variavel, hora=None):
+        """
+        Executa krigagem para uma variável específica.
+        
+        Com registro de variogramas e hora informada, o variograma do estrato é
+        consultado em vez de ajustado.
+        
+        Args:
+            coords_estacoes (np.array): Coordenadas das estações
+            valores_estacoes (np.array): Valores da variável nas estações
+            coords_linha (np.array): Coordenadas dos pontos da linha
+            variavel (str): Nome da variável
+            hora (pd.Timestamp): Hora da krigagem, para consulta ao registro
+            
+        Returns:
+            dict: Resultados da krigagem (média e variância)
+        """
+        try:
+            # Suprimir warnings da pykrige
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                
+                consulta = None
+                if self.registro_variogramas is not None and hora is not None:
+                    consulta = self.registro_variogramas.obter(variavel, hora)
+                
+                if consulta is not None:
+                    melhor_modelo, parametros = consulta
+                    escala = max(float(np.var(valores_estacoes)), 1e-9)
+                    parametros_variograma = parametros_variograma_pykrige(
+                        melhor_modelo, escalar_parametros_variograma(melhor_modelo, parametros, escala)
                     )
-                    estatisticas['variaveis'][variavel]['media_max'] = max(
-                        estatisticas['variaveis'][variavel]['media_max'],
-                        np.max(valores_validos)
+                else:
+                    # Ajustar variograma automaticamente
+                    melhor_modelo = self._ajustar_variograma_automatico(
+                        coords_estacoes, valores_estacoes, variavel
                     )
+                    parametros_variograma = None
+                
+                # Criar objeto de krigagem
+                OK = OrdinaryKriging(
+                    coords_estacoes[:, 0],  # X coordinates
+                    coords_estacoes[:, 1],  # Y coordinates
+                    valores_estacoes,       # Values
+                    variogram_model=melhor_modelo,
+                    variogram_parameters=parametros_variograma,
+                    verbose=False,
+                    enable_plotting=False,
+                    coordinates_type='euclidean'
+                )
+                
+                # Executar krigagem
+                # Vizinhança móvel: o pykrige só a suporta no backend 'loop'
+                opcoes_execucao = {}
+                if config.NUM_VIZINHOS_KRIGAGEM and len(coords_estacoes) > config.NUM_VIZINHOS_KRIGAGEM:
+                    opcoes_execucao = {'backend': 'loop', 'n_closest_points': config.NUM_VIZINHOS_KRIGAGEM}
+                
+                z_pred, ss_pred = OK.execute(
+                    'points',
+                    coords_linha[:, 0],
+                    coords_linha[:, 1],
+                    **opcoes_execucao
+                )
+                
+                # Verificar qualidade dos resultados
+                if hasattr(z_pred, 'data'):
+                    z_pred = z_pred.data
+                if hasattr(ss_pred, 'data'):
+                    ss_pred = ss_pred.data
+                
+                # Validar resultados
+                if np.any(np.isnan(z_pred)) or np.any(np.isnan(ss_pred)):
+                    logger.warning(f"NaN encontrados nos resultados de {variavel}")
+                
+                # Garantir que variâncias sejam positivas
+                ss_pred = np.maximum(ss_pred, 0)
+                
+                # Validar valores físicos por variável
+                z_pred = self._validar_valores_fisicos(z_pred, variavel)
                 
-                # Variância média
-                var_validas = variancia[~np.isnan(variancia)]
-                if len(var_validas) > 0:
-                    estatisticas['variaveis'][variavel]['variancia_media'] += np.mean(var_validas)
+                return {
+                    'media': z_pred,
+                    'variancia': ss_pred,
+                    'desvio_padrao': np.sqrt(ss_pred)
+                }
+                
+        except Exception as e:
+            logger.error(f"Erro na krigagem de {variavel}: {e}")
+            raise
+    
+    def _ajustar_variograma_automatico(self, coords_estacoes, valores_estacoes, variavel):
+        """
+        Ajusta automaticamente o modelo de variograma testando diferentes opções.
+        
+        Args:
+            coords_estacoes (np.array): Coordenadas das estações
+            valores_estacoes (np.array): Valores da variável
+            variavel (str): Nome da variável
+            
+        Returns:
+            str: Melhor modelo de variograma
+        """
+        modelos_testar = self._modelos_variograma_candidatos(variavel)
             
-            if hora_tem_nan:
-                horas_com_nan += 1
+        melhor_modelo = config.MODELO_VARIOGRAMA  # Default
+        melhor_score = float('inf')
+        melhor_variancia_media = float('inf')
         
-        estatisticas['horas_com_erro'] = horas_com_nan
+        # Se temos muitas poucas estações, usar modelo linear
+        if len(coords_estacoes) < 4:
+            return 'linear'
         
-        # Finalizar cálculo de variância média
-        for variavel in estatisticas['variaveis']:
-            estatisticas['variaveis'][variavel]['variancia_media'] /= len(resultados_krigagem)
+        # Calcular variância dos dados para normalização
+        variancia_dados = np.var(valores_estacoes)
         
-        # Determinar qualidade geral
-        taxa_erro = horas_com_nan / len(resultados_krigagem)
-        if taxa_erro > 0.1:
-            estatisticas['qualidade_geral'] = 'ruim'
-        elif taxa_erro > 0.05:
-            estatisticas['qualidade_geral'] = 'regular'
+        # Validação cruzada deixa-uma-estação-fora em forma fechada: uma fatoração por modelo,
+        # determinística e sem consumir o gerador aleatório global
+        motor = MotorKrigagemMatricial(coords_estacoes)
         
-        logger.info(f"Validação concluída: {taxa_erro:.1%} horas com problemas")
-        logger.info(f"Qualidade geral: {estatisticas['qualidade_geral']}")
+        # Testar cada modelo
+        for modelo in modelos_testar:
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    
+                    # Ajustar o variograma do modelo com todas as estações
+                    OK = OrdinaryKriging(
+                        coords_estacoes[:, 0],
+                        coords_estacoes[:, 1],
+                        valores_estacoes,
+                        variogram_model=modelo,
+                        verbose=False,
+                        enable_plotting=False,
+                        coordinates_type='euclidean'
+                    )
+                    
+                    residuos, variancias = motor.residuos_validacao_cruzada(
+                        modelo, OK.variogram_model_parameters, valores_estacoes
+                    )
+                    
+                    # Calcular métricas
+                    if np.all(np.isfinite(residuos)) and np.all(np.isfinite(variancias)):
+                        rmse = np.sqrt(np.mean(residuos ** 2))
+                        variancia_media = np.mean(variancias)
+                        
+                        score_combinado = self._pontuar_variograma(
+                            variavel, rmse, variancia_media, variancia_dados
+                        )
+                        
+                        if score_combinado < melhor_score:
+                            melhor_score = score_combinado
+                            melhor_modelo = modelo
+                            melhor_variancia_media = variancia_media
+                            
+            except Exception:
+                continue
+        
+        # Log apenas para primeira vez por variável (evitar spam)
+        if not hasattr(self, '_variograma_logged'):
+            self._variograma_logged = set()
+        
+        if variavel not in self._variograma_logged:
+            if variavel == 'radiacao_global':
+                logger.info(f"Melhor modelo de variograma para {variavel}: {melhor_modelo} "
+                           f"(RMSE: {melhor_score:.3f}, Var.média: {melhor_variancia_media:.1f})")
+            else:
+                logger.info(f"Melhor modelo de variograma para {variavel}: {melhor_modelo} (RMSE: {melhor_score:.3f})")
+            self._variograma_logged.add(variavel)
+        
+        return melhor_modelo
+
+    def _modelos_variograma_candidatos(self, variavel):
+        """Modelos de variograma testados na seleção automática de cada variável."""
+        # Modelos específicos por variável - radiação tem comportamento especial
+        if variavel == 'radiacao_global':
+            # Para radiação, preferir modelos mais suaves que reduzem variância
+            return ['gaussian', 'spherical', 'exponential', 'linear']
+        return ['linear', 'power', 'gaussian', 'spherical', 'exponential']
+
+    def _pontuar_variograma(self, variavel, rmse, variancia_media, variancia_dados):
+        """Pontuação de validação cruzada de um variograma (menor é melhor)."""
+        # Para radiação, penalizar modelos com variância muito alta
+        if variavel == 'radiacao_global':
+            # Score combinado: RMSE + penalidade por variância alta
+            penalidade_variancia = min(variancia_media / variancia_dados, 10.0)
+            return rmse * (1 + 0.1 * penalidade_variancia)
+        return rmse
+
+    def _validar_valores_fisicos(self, valores, variavel):
+        """Aplica os limites físicos da variável aos valores interpolados."""
+        if variavel == 'radiacao_global':
+            return self._validar_radiacao_krigagem(valores)
+        if variavel == 'temperatura_ar':
+            return self._validar_temperatura_krigagem(valores)
+        if variavel in ['vento_u', 'vento_v', 'vento_velocidade']:
+            return self._validar_vento_krigagem(valores, variavel)
+        return valores
+    
+    def _validar_radiacao_krigagem(self, valores_radiacao):
+        """
+        Valida valores de radiação da krigagem e anula valores fisicamente impossíveis.
+        
+        Args:
+            valores_radiacao (np.array): Valores de radiação interpolados
+            
+        Returns:
+            np.array: Valores validados (valores inválidos substituídos por NaN)
+        """
+        valores_validados = valores_radiacao.copy()
+        
+        # Limites físicos para radiação solar (W/m²)
+        # Radiação máxima teórica ao nível do mar é ~1400 W/m²
+        # Radiação mínima é 0 (não pode ser negativa)
+        limite_min = 0.0
+        limite_max = 1400.0
+        
+        # Contar valores inválidos antes da correção
+        mask_invalidos = (valores_validados < limite_min) | (valores_validados > limite_max)
+        num_invalidos = np.sum(mask_invalidos)
+        
+        if num_invalidos > 0:
+            # Log dos valores problemáticos para análise
+            valores_problematicos = valores_validados[mask_invalidos]
+            logger.warning(f"Krigagem de radiação: {num_invalidos} valores inválidos detectados")
+            logger.warning(f"Valores problemáticos: min={valores_problematicos.min():.1f}, "
+                          f"max={valores_problematicos.max():.1f} W/m²")
+            
+            # Substituir valores inválidos por NaN
+            valores_validados[mask_invalidos] = np.nan
+            
+            logger.info(f"Valores de radiação fora do intervalo [{limite_min}, {limite_max}] W/m² "
+                       f"foram anulados ({num_invalidos} pontos)")
+        
+        return valores_validados
+
+    def _validar_temperatura_krigagem(self, valores_temperatura):
+        """
+        Valida valores de temperatura da krigagem e anula valores fisicamente impossíveis.
+        
+        Args:
+            valores_temperatura (np.array): Valores de temperatura interpolados
+            
+        Returns:
+            np.array: Valores validados (valores inválidos substituídos por NaN)
+        """
+        valores_validados = valores_temperatura.copy()
+        
+        # Limites físicos para temperatura do ar (°C)
+        # Considerando faixa realista para condições meteorológicas no Brasil
+        limite_min = -10.0  # Temperatura mínima extrema
+        limite_max = 55.0   # Temperatura máxima extrema
+        
+        # Contar valores inválidos antes da correção
+        mask_invalidos = (valores_validados < limite_min) | (valores_validados > limite_max)
+        num_invalidos = np.sum(mask_invalidos)
         
-        return estatisticas
\ No newline at end of file
+        if num_invalidos > 0:
+            # Log dos valores problemáticos para análise
+            valores_problematicos = valores_validados[mask_invalidos]
+            logger.warning(f"Krigagem de temperatura: {num_invalidos} valores inválidos detectados")
+            logger.warning(f"Valores problemáticos: min={valores_problematicos.min():.1f}, "
+                          f"max={valores_problematicos.max():.1f} °C")
+            
+            # Substituir valores inválidos por NaN
+            valores_validados[mask_invalidos] = np.nan
+            
+            logger.info(f"Valores de temperatura fora do intervalo [{limite_min}, {limite_max}] °C "
+                       f"foram anulados ({num_invalidos} pontos)")
+        
+        return valores_validados
+
+    def _validar_vento_krigagem(self, valores_vento, variavel):
+        """
+        Valida valores de vento da krigagem e anula valores fisicamente impossíveis.
+        
+        Args:
+            valores_vento (np.array): Valores de vento interpolados
+            variavel (str): Nome da variável (vento_u, vento_v, vento_velocidade)
+            
+        Returns:
+            np.array: Valores validados (valores inválidos substituídos por NaN)
+        """
+        valores_validados = valores_vento.copy()
+        
+        # Limites físicos para vento
+        if variavel == 'vento_velocidade':
+            # Velocidade do vento não pode ser negativa e raramente excede 50 m/s
+            limite_min = 0.0
+            limite_max = 50.0
+        else:  # vento_u, vento_v (componentes)
+            # Componentes podem ser negativas, mas limitadas por velocidade máxima
+            limite_min = -50.0
+            limite_max = 50.0
+        
+        # Contar valores inválidos antes da correção
+        mask_invalidos = (valores_validados < limite_min) | (valores_validados > limite_max)
+        num_invalidos = np.sum(mask_invalidos)
+        
+        if num_invalidos > 0:
+            # Log dos valores problemáticos para análise
+            valores_problematicos = valores_validados[mask_invalidos]
+            logger.warning(f"Krigagem de {variavel}: {num_invalidos} valores inválidos detectados")
+            logger.warning(f"Valores problemáticos: min={valores_problematicos.min():.1f}, "
+                          f"max={valores_problematicos.max():.1f} m/s")
+            
+            # Substituir valores inválidos por NaN
+            valores_validados[mask_invalidos] = np.nan
+            
+            logger.info(f"Valores de {variavel} fora do intervalo [{limite_min}, {limite_max}] m/s "
+                       f"foram anulados ({num_invalidos} pontos)")
+        
+        return valores_validados
+
+    def _criar_resultado_nan(self, variaveis_ambientais, num_pontos):
+        """Cria resultado preenchido com NaN para todas as variáveis."""
+        resultado = {}
+        for variavel in variaveis_ambientais:
+            resultado[variavel] = self._criar_resultado_nan_variavel(num_pontos)
+        return resultado
+
+    def _criar_resultado_nan_variavel(self, num_pontos):
+        """Cria resultado preenchido com NaN para uma variável."""
+        return {
+            'media': np.full(num_pontos, np.nan),
+            'variancia': np.full(num_pontos, np.nan),
+            'desvio_padrao': np.full(num_pontos, np.nan)
+        }
+
+    def validar_resultados_krigagem(self, resultados_krigagem, pontos_linha):
+        """
+        Valida os resultados da krigagem e fornece estatísticas.
+        
+        Args:
+            resultados_krigagem (ResultadosKrigagem): Resultados da krigagem (ou dicionário
+                hora -> variável -> {'media', 'variancia'})
+            pontos_linha (pd.DataFrame): Pontos da linha
+            
+        Returns:
+            dict: Estatísticas de validação
+        """
+        logger.info("Validando resultados da krigagem...")
+        
+        if not isinstance(resultados_krigagem, ResultadosKrigagem):
+            resultados_krigagem = ResultadosKrigagem.de_dicionario(resultados_krigagem)
+        
+        estatisticas = {
+            'total_horas': len(resultados_krigagem),
+            'total_pontos': len(pontos_linha),
+            'variaveis': {},
+            'horas_com_erro': 0,
+            'qualidade_geral': 'boa'
+        }
+        
+        num_horas = len(resultados_krigagem)
+        hora_tem_nan = np.zeros(num_horas, dtype=bool)
+        
+        for variavel in resultados_krigagem.variaveis:
+            estatisticas_variavel = {
+                'media_min': np.inf,
+                'media_max': -np.inf,
+                'variancia_media': 0,
+                'pontos_com_nan': 0
+            }
+            
+            # Leitura em blocos de horas, para tensores mapeados em disco
+            for inicio in range(0, num_horas, config.TAMANHO_BLOCO_KRIGAGEM):
+                fim = min(inicio + config.TAMANHO_BLOCO_KRIGAGEM, num_horas)
+                media = np.asarray(resultados_krigagem.media(variavel)[inicio:fim], dtype=float)
+                variancia = np.asarray(resultados_krigagem.variancia(variavel)[inicio:fim], dtype=float)
+                
+                # Contar NaNs
+                nan_media = np.isnan(media)
+                estatisticas_variavel['pontos_com_nan'] += int(np.sum(nan_media))
+                hora_tem_nan[inicio:fim] |= np.any(nan_media, axis=1)
+                
+                # Estatísticas dos valores válidos
+                if not np.all(nan_media):
+                    estatisticas_variavel['media_min'] = min(estatisticas_variavel['media_min'], np.nanmin(media))
+                    estatisticas_variavel['media_max'] = max(estatisticas_variavel['media_max'], np.nanmax(media))
+                
+                # Variância média de cada hora (horas sem valores válidos contribuem com zero)
+                validos_variancia = ~np.isnan(variancia)
+                contagem = np.sum(validos_variancia, axis=1)
+                soma = np.sum(np.where(validos_variancia, variancia, 0.0), axis=1)
+                estatisticas_variavel['variancia_media'] += float(
+                    np.sum(soma[contagem > 0] / contagem[contagem > 0])
+                )
+            
+            # Finalizar cálculo de variância média
+            estatisticas_variavel['variancia_media'] /= num_horas
+            estatisticas['variaveis'][variavel] = estatisticas_variavel
+        
+        horas_com_nan = int(np.sum(hora_tem_nan))
+        estatisticas['horas_com_erro'] = horas_com_nan
+        
+        # Determinar qualidade geral
+        taxa_erro = horas_com_nan / num_horas
+        if taxa_erro > 0.1:
+            estatisticas['qualidade_geral'] = 'ruim'
+        elif taxa_erro > 0.05:
+            estatisticas['qualidade_geral'] = 'regular'
+        
+        logger.info(f"Validação concluída: {taxa_erro:.1%} horas com problemas")
+        logger.info(f"Qualidade geral: {estatisticas['qualidade_geral']}")
+        
+        return estatisticas
+
+
+# =============================================================================
+# KRIGAGEM EM PROCESSOS PARALELOS
+# =============================================================================
+
+# Estado de cada processo de krigagem, definido uma única vez na inicialização
+_estado_processo_krigagem = {}
+
+
+def _inicializar_processo_krigagem(coords_estacoes, coords_linha, registro_variogramas, variaveis_ambientais):
+    """Inicializa um processo com o registro de estações, os pontos da linha e os variogramas."""
+    geo = GeoProcessor()
+    geo.coords_estacoes = coords_estacoes
+    geo.registro_variogramas = registro_variogramas
+    _estado_processo_krigagem.update(
+        geo=geo, coords_linha=coords_linha, variaveis_ambientais=variaveis_ambientais
+    )
+
+
+def _krigar_bloco_processo(bloco):
+    """Krigagem de um bloco de horas em um processo inicializado."""
+    return _estado_processo_krigagem['geo']._krigar_bloco_horas(
+        bloco, _estado_processo_krigagem['coords_linha'], _estado_processo_krigagem['variaveis_ambientais']
+    )
+
+
+# =============================================================================
+# KRIGAGEM MATRICIAL
+# =============================================================================
+
+def _variograma_linear(parametros, distancias):
+    """Modelo linear, parâmetros [inclinação, pepita]."""
+    return parametros[0] * distancias + parametros[1]
+
+
+def _variograma_potencia(parametros, distancias):
+    """Modelo potência, parâmetros [escala, expoente, pepita]."""
+    return parametros[0] * distancias ** parametros[1] + parametros[2]
+
+
+def _variograma_gaussiano(parametros, distancias):
+    """Modelo gaussiano, parâmetros [patamar parcial, alcance, pepita]."""
+    return parametros[0] * (1.0 - np.exp(-distancias ** 2 / (parametros[1] * 4.0 / 7.0) ** 2)) + parametros[2]
+
+
+def _variograma_exponencial(parametros, distancias):
+    """Modelo exponencial, parâmetros [patamar parcial, alcance, pepita]."""
+    return parametros[0] * (1.0 - np.exp(-distancias / (parametros[1] / 3.0))) + parametros[2]
+
+
+def _variograma_esferico(parametros, distancias):
+    """Modelo esférico, parâmetros [patamar parcial, alcance, pepita]."""
+    razao = np.minimum(distancias / parametros[1], 1.0)
+    return parametros[0] * (1.5 * razao - 0.5 * razao ** 3) + parametros[2]
+
+
+# Mesmos nomes e parametrizações do pykrige
+MODELOS_VARIOGRAMA = {
+    'linear': _variograma_linear,
+    'power': _variograma_potencia,
+    'gaussian': _variograma_gaussiano,
+    'exponential': _variograma_exponencial,
+    'spherical': _variograma_esferico
+}
+
+
+def _armazenar_lru(cache, chave, valor, limite=None):
+    """Insere no cache LRU, descartando as entradas menos recentes além do limite."""
+    if limite is None:
+        limite = config.CACHE_PESOS_KRIGAGEM_MAX_ENTRADAS
+    cache[chave] = valor
+    while len(cache) > max(1, int(limite)):
+        cache.popitem(last=False)
+    return valor
+
+
+class MotorKrigagemMatricial:
+    """
+    Krigagem Ordinária em forma matricial para séries temporais completas.
+    
+    Com as estações e os pontos da linha fixos, os pesos da krigagem dependem
+    apenas do variograma. A matriz de pesos (pontos × estações) e o vetor de
+    variâncias são calculados uma vez por modelo/parâmetros, e as médias de
+    todas as horas saem de um único produto com a matriz de valores
+    (estações × horas).
+    
+    Com num_vizinhos definido, cada ponto usa apenas as k estações mais
+    próximas (vizinhança móvel). Os sistemas locais são resolvidos em lote,
+    um por conjunto distinto de vizinhos, e a matriz de pesos é esparsa.
+    
+    Os caches de pesos e de inversas locais são LRU limitados e não são
+    serializados com pickle: um motor carregado recalcula os pesos no uso.
+    """
+    
+    def __init__(self, coords_estacoes, coords_pontos=None, distancias_estacoes=None,
+                 distancias_pontos=None, num_vizinhos=None):
+        """
+        Args:
+            coords_estacoes (np.array): Coordenadas projetadas das estações (S, 2)
+            coords_pontos (np.array): Coordenadas projetadas dos pontos da linha (P, 2);
+                opcional quando o motor é usado apenas para ajustar variogramas
+            distancias_estacoes (np.array): Distâncias entre estações (S, S), se já calculadas
+            distancias_pontos (np.array): Distâncias pontos-estações (P, S), se já calculadas
+            num_vizinhos (int): Estações por ponto na vizinhança móvel (None: todas)
+        """
+        self.coords_estacoes = np.asarray(coords_estacoes, dtype=float)
+        if distancias_estacoes is None:
+            distancias_estacoes = np.linalg.norm(
+                self.coords_estacoes[:, None, :] - self.coords_estacoes[None, :, :], axis=2
+            )
+        self.distancias_estacoes = distancias_estacoes
+        self.coords_pontos = None
+        self.distancias_pontos = None
+        if coords_pontos is not None:
+            self.coords_pontos = np.asarray(coords_pontos, dtype=float)
+            if distancias_pontos is None and not num_vizinhos:
+                distancias_pontos = np.linalg.norm(
+                    self.coords_pontos[:, None, :] - self.coords_estacoes[None, :, :], axis=2
+                )
+            self.distancias_pontos = distancias_pontos
+        self.num_vizinhos = num_vizinhos
+        self._pesos = OrderedDict()
+        self._inversas_locais = OrderedDict()
+    
+    def __getstate__(self):
+        """Estado para pickle, sem os caches de pesos."""
+        estado = self.__dict__.copy()
+        estado['_pesos'] = OrderedDict()
+        estado['_inversas_locais'] = OrderedDict()
+        return estado
+    
+    @staticmethod
+    def calcular_escalas(valores):
+        """Variância espacial entre estações de cada hora (T,), ignorando faltas."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            return np.nanvar(np.asarray(valores, dtype=float), axis=0)
+    
+    def ajustar_variograma(self, valores, modelo=None):
+        """
+        Ajusta um variograma normalizado comum a todas as horas da série.
+        
+        A semivariância de cada par de estações é dividida pela variância espacial
+        da hora antes da média temporal; assim o formato do variograma é comum e
+        cada hora difere apenas por um fator de escala, que não altera os pesos.
+        
+        Args:
+            valores (np.array): Valores nas estações (S, T)
+            modelo (str): Modelo de variograma (padrão: config.MODELO_VARIOGRAMA)
+            
+        Returns:
+            tuple: (parâmetros do variograma normalizado, escalas por hora (T,))
+        """
+        from scipy.optimize import least_squares
+        
+        if modelo is None:
+            modelo = config.MODELO_VARIOGRAMA
+        if modelo not in MODELOS_VARIOGRAMA:
+            raise ValueError(f"Modelo de variograma não suportado: {modelo}")
+        
+        valores = np.asarray(valores, dtype=float)
+        escalas = self.calcular_escalas(valores)
+        
+        i, j = np.triu_indices(len(self.coords_estacoes), k=1)
+        distancias = self.distancias_estacoes[i, j]
+        horas_uteis = np.isfinite(escalas) & (escalas > 1e-12)
+        
+        # Pares em lotes: com centenas de estações, pares × horas não cabe de uma vez
+        valores_uteis = valores[:, horas_uteis]
+        escalas_uteis = escalas[horas_uteis]
+        semivariancias = np.empty(len(i))
+        tamanho_lote = max(1, 2_000_000 // max(valores_uteis.shape[1], 1))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            for inicio in range(0, len(i), tamanho_lote):
+                lote = slice(inicio, inicio + tamanho_lote)
+                semivariancias[lote] = np.nanmean(
+                    0.5 * (valores_uteis[i[lote]] - valores_uteis[j[lote]]) ** 2 / escalas_uteis, axis=1
+                )
+        
+        validos = np.isfinite(semivariancias) & (distancias > 0)
+        if np.sum(validos) < 2:
+            raise ValueError("Pares de estações insuficientes para ajustar o variograma")
+        distancias, semivariancias = distancias[validos], semivariancias[validos]
+        
+        # Ajuste em distâncias adimensionais (d / d_max) para um problema bem escalado
+        dist_max = distancias.max()
+        distancias = distancias / dist_max
+        
+        # Chute inicial e limites nos moldes do pykrige
+        gamma_min, gamma_max = semivariancias.min(), semivariancias.max()
+        inclinacao = (gamma_max - gamma_min) / max(1.0 - distancias.min(), 1e-12)
+        if modelo == 'linear':
+            x0 = [inclinacao, gamma_min]
+            limites = ([0.0, 0.0], [np.inf, gamma_max])
+        elif modelo == 'power':
+            x0 = [inclinacao, 1.1, gamma_min]
+            limites = ([0.0, 0.001, 0.0], [np.inf, 1.999, gamma_max])
+        else:
+            x0 = [gamma_max - gamma_min, 0.25, gamma_min]
+            limites = ([0.0, 1e-6, 0.0], [10.0 * gamma_max, 1.0, gamma_max])
+        x0 = np.clip(x0, limites[0], limites[1])
+        
+        funcao = MODELOS_VARIOGRAMA[modelo]
+        ajuste = least_squares(
+            lambda p: funcao(p, distancias) - semivariancias, x0, bounds=limites, loss='soft_l1'
+        )
+        
+        # Retorno às unidades de distância originais
+        parametros = ajuste.x.copy()
+        if modelo == 'linear':
+            parametros[0] /= dist_max
+        elif modelo == 'power':
+            parametros[0] /= dist_max ** parametros[1]
+        else:
+            parametros[1] *= dist_max
+        
+        return tuple(float(p) for p in parametros), escalas
+    
+    def calcular_pesos(self, modelo, parametros, mascara_estacoes=None):
+        """
+        Resolve o sistema da Krigagem Ordinária para todos os pontos de uma vez.
+        
+        Args:
+            modelo (str): Modelo de variograma
+            parametros (tuple): Parâmetros do variograma
+            mascara_estacoes (np.array): Estações disponíveis (padrão: todas)
+            
+        Returns:
+            tuple: (pesos (P, S_disponíveis), variância de krigagem (P,))
+        """
+        if mascara_estacoes is None:
+            mascara_estacoes = np.ones(len(self.coords_estacoes), dtype=bool)
+        mascara_estacoes = np.asarray(mascara_estacoes, dtype=bool)
+        
+        # Cache LRU pela máscara de bits das estações presentes
+        chave = (modelo, tuple(parametros), np.packbits(mascara_estacoes).tobytes())
+        if chave in self._pesos:
+            self._pesos.move_to_end(chave)
+            return self._pesos[chave]
+        
+        n = int(np.sum(mascara_estacoes))
+        if n < 2:
+            raise ValueError(f"Insuficientes estações ({n}) para krigagem")
+        
+        if self.num_vizinhos and n > self.num_vizinhos:
+            return _armazenar_lru(
+                self._pesos, chave, self._calcular_pesos_locais(modelo, parametros, mascara_estacoes)
+            )
+        
+        funcao = MODELOS_VARIOGRAMA[modelo]
+        
+        # Vizinhança móvel com k >= estações disponíveis recai na solução global
+        if self.distancias_pontos is None:
+            self.distancias_pontos = np.linalg.norm(
+                self.coords_pontos[:, None, :] - self.coords_estacoes[None, :, :], axis=2
+            )
+        
+        # Sistema com a convenção do pykrige: diagonal nula e restrição de soma unitária
+        sistema = np.zeros((n + 1, n + 1))
+        sistema[:n, :n] = -funcao(parametros, self.distancias_estacoes[np.ix_(mascara_estacoes, mascara_estacoes)])
+        np.fill_diagonal(sistema[:n, :n], 0.0)
+        sistema[n, :n] = 1.0
+        sistema[:n, n] = 1.0
+        
+        distancias_pontos = self.distancias_pontos[:, mascara_estacoes]
+        termos = np.ones((n + 1, len(self.coords_pontos)))
+        termos[:n] = -funcao(parametros, distancias_pontos).T
+        termos[:n][distancias_pontos.T <= 1e-10] = 0.0
+        
+        solucao = np.linalg.solve(sistema, termos)
+        pesos = solucao[:n].T
+        variancia = np.maximum(np.sum(solucao * -termos, axis=0), 0.0)
+        
+        return _armazenar_lru(self._pesos, chave, (pesos, variancia))
+    
+    def _calcular_pesos_locais(self, modelo, parametros, mascara_estacoes, tamanho_lote=4096):
+        """
+        Krigagem Ordinária em vizinhança móvel das k estações mais próximas.
+        
+        Os vizinhos de cada ponto vêm de uma cKDTree sobre as estações
+        disponíveis. A inversa do sistema de cada vizinhança distinta é
+        calculada uma vez (em lote) e guardada pela assinatura da vizinhança,
+        compartilhada entre padrões de ausência; os pesos dos pontos saem em
+        lotes de produtos matriz-vetor.
+        
+        Args:
+            modelo (str): Modelo de variograma
+            parametros (tuple): Parâmetros do variograma
+            mascara_estacoes (np.array): Estações disponíveis
+            tamanho_lote (int): Pontos por lote no cálculo dos pesos
+            
+        Returns:
+            tuple: (pesos esparsos (P, S_disponíveis), variância de krigagem (P,))
+        """
+        from scipy.sparse import csr_matrix
+        from scipy.spatial import cKDTree
+        
+        k = self.num_vizinhos
+        funcao = MODELOS_VARIOGRAMA[modelo]
+        disponiveis = np.flatnonzero(mascara_estacoes)
+        
+        distancias, vizinhos = cKDTree(self.coords_estacoes[disponiveis]).query(self.coords_pontos, k=k)
+        ordem = np.argsort(vizinhos, axis=1)
+        vizinhos = np.take_along_axis(vizinhos, ordem, axis=1)
+        distancias = np.take_along_axis(distancias, ordem, axis=1)
+        
+        # Uma assinatura por vizinhança distinta, em índices de todas as estações do motor
+        vizinhancas, grupo = np.unique(vizinhos, axis=0, return_inverse=True)
+        grupo = np.ravel(grupo)
+        estacoes_vizinhancas = disponiveis[vizinhancas]
+        chaves = [(modelo, tuple(parametros), v.tobytes()) for v in estacoes_vizinhancas]
+        
+        inversas = np.empty((len(chaves), k + 1, k + 1))
+        novas = []
+        for u, chave in enumerate(chaves):
+            if chave in self._inversas_locais:
+                self._inversas_locais.move_to_end(chave)
+                inversas[u] = self._inversas_locais[chave]
+            else:
+                novas.append(u)
+        if novas:
+            estacoes = estacoes_vizinhancas[novas]
+            sistemas = np.ones((len(novas), k + 1, k + 1))
+            sistemas[:, :k, :k] = -funcao(
+                parametros, self.distancias_estacoes[estacoes[:, :, None], estacoes[:, None, :]]
+            )
+            sistemas[:, np.arange(k), np.arange(k)] = 0.0
+            sistemas[:, k, k] = 0.0
+            inversas[novas] = np.linalg.inv(sistemas)
+            for u in novas:
+                _armazenar_lru(self._inversas_locais, chaves[u], inversas[u].copy(),
+                               config.CACHE_INVERSAS_LOCAIS_MAX_ENTRADAS)
+        
+        termos = np.ones((len(self.coords_pontos), k + 1))
+        termos[:, :k] = -funcao(parametros, distancias)
+        termos[:, :k][distancias <= 1e-10] = 0.0
+        
+        solucao = np.empty_like(termos)
+        for inicio in range(0, len(termos), tamanho_lote):
+            lote = slice(inicio, inicio + tamanho_lote)
+            solucao[lote] = np.einsum('pij,pj->pi', inversas[grupo[lote]], termos[lote])
+        
+        variancia = np.maximum(np.sum(solucao * -termos, axis=1), 0.0)
+        pesos = csr_matrix(
+            (solucao[:, :k].ravel(), vizinhos.ravel(), np.arange(0, k * len(vizinhos) + 1, k)),
+            shape=(len(self.coords_pontos), len(disponiveis))
+        )
+        return pesos, variancia
+    
+    def krigar_series(self, valores, modelo, parametros, escalas):
+        """
+        Interpola a série completa de uma variável.
+        
+        Horas com estações faltantes usam os pesos do subconjunto disponível,
+        calculados uma vez por padrão de ausência e mantidos no cache LRU.
+        
+        Args:
+            valores (np.array): Valores nas estações (S, T)
+            modelo (str): Modelo de variograma
+            parametros (tuple): Parâmetros do variograma normalizado
+            escalas (np.array): Fator de escala do variograma por hora (T,)
+            
+        Returns:
+            tuple: (médias (P, T), variâncias (P, T))
+        """
+        valores = np.asarray(valores, dtype=float)
+        num_pontos, num_horas = len(self.coords_pontos), valores.shape[1]
+        medias = np.full((num_pontos, num_horas), np.nan)
+        variancias = np.full((num_pontos, num_horas), np.nan)
+        
+        disponiveis = np.isfinite(valores)
+        padroes, grupo = np.unique(disponiveis.T, axis=0, return_inverse=True)
+        grupo = np.ravel(grupo)
+        
+        for k, padrao in enumerate(padroes):
+            if np.sum(padrao) < 2:
+                continue
+            horas = np.flatnonzero(grupo == k)
+            pesos, variancia = self.calcular_pesos(modelo, parametros, padrao)
+            medias[:, horas] = pesos @ valores[np.ix_(padrao, horas)]
+            variancias[:, horas] = variancia[:, None] * escalas[None, horas]
+        
+        return medias, variancias
+    
+    def fator_covariancia_posterior(self, modelo, parametros, mascara_estacoes=None, posto=None,
+                                    tamanho_lote=4096):
+        """
+        Fator de posto reduzido da covariância dos erros de krigagem entre os pontos.
+        
+        Com pesos W fixos, o erro do ponto p é a combinação Σ_i w_pi Z_i - Z_p,
+        de coeficientes com soma nula; sua covariância com o erro do ponto q
+        sai do variograma: -(w_p Γ w_qᵀ - w_p γ_q - w_q γ_p + γ_pq). O fator é
+        uma aproximação de Nyström sobre até `posto` pontos de referência
+        igualmente espaçados na ordem da linha (exata quando posto >= pontos),
+        com as linhas reescaladas para reproduzir a variância de krigagem de
+        cada ponto.
+        
+        Args:
+            modelo (str): Modelo de variograma
+            parametros (tuple): Parâmetros do variograma (normalizado, como nos pesos)
+            mascara_estacoes (np.array): Estações disponíveis (padrão: todas)
+            posto (int): Número máximo de pontos de referência (padrão: todos)
+            tamanho_lote (int): Pontos por lote no cálculo dos variogramas ponto-estação
+            
+        Returns:
+            np.array: Fator L (P, r) com covariância ≈ L·Lᵀ
+        """
+        if mascara_estacoes is None:
+            mascara_estacoes = np.ones(len(self.coords_estacoes), dtype=bool)
+        mascara_estacoes = np.asarray(mascara_estacoes, dtype=bool)
+        pesos, variancia = self.calcular_pesos(modelo, parametros, mascara_estacoes)
+        funcao = MODELOS_VARIOGRAMA[modelo]
+        
+        def variograma(distancias):
+            # Convenção do pykrige: semivariância nula em distância nula
+            gamma = funcao(parametros, distancias)
+            return np.where(distancias <= 1e-10, 0.0, gamma)
+        
+        num_pontos = len(self.coords_pontos)
+        posto = num_pontos if posto is None else min(int(posto), num_pontos)
+        referencias = np.unique(np.round(np.linspace(0, num_pontos - 1, posto)).astype(int))
+        
+        coords_estacoes = self.coords_estacoes[mascara_estacoes]
+        coords_referencias = self.coords_pontos[referencias]
+        pesos_referencias = pesos[referencias]
+        if hasattr(pesos_referencias, 'toarray'):
+            pesos_referencias = pesos_referencias.toarray()
+        
+        gamma_estacoes = variograma(self.distancias_estacoes[np.ix_(mascara_estacoes, mascara_estacoes)])
+        gamma_estacoes_referencias = variograma(
+            np.linalg.norm(coords_estacoes[:, None, :] - coords_referencias[None, :, :], axis=2)
+        )
+        
+        # Colunas da covariância nos pontos de referência (P, r)
+        colunas = pesos @ (gamma_estacoes @ pesos_referencias.T - gamma_estacoes_referencias)
+        for inicio in range(0, num_pontos, tamanho_lote):
+            lote = slice(inicio, inicio + tamanho_lote)
+            coords_lote = self.coords_pontos[lote]
+            gamma_lote_estacoes = variograma(
+                np.linalg.norm(coords_lote[:, None, :] - coords_estacoes[None, :, :], axis=2)
+            )
+            gamma_lote_referencias = variograma(
+                np.linalg.norm(coords_lote[:, None, :] - coords_referencias[None, :, :], axis=2)
+            )
+            colunas[lote] += gamma_lote_referencias - gamma_lote_estacoes @ pesos_referencias.T
+        colunas = -colunas
+        
+        autovalores, autovetores = np.linalg.eigh(colunas[referencias])
+        mantidos = autovalores > max(autovalores.max(), 0.0) * 1e-10
+        fator = colunas @ (autovetores[:, mantidos] / np.sqrt(autovalores[mantidos]))
+        
+        # Variâncias pontuais exatas
+        normas = np.sum(fator ** 2, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ajuste = np.where(normas > 1e-300, np.sqrt(variancia / normas), 0.0)
+        return fator * ajuste[:, None]
+    
+    def residuos_validacao_cruzada(self, modelo, parametros, valores):
+        """
+        Resíduos de validação cruzada deixa-uma-estação-fora em forma fechada.
+        
+        Com B a inversa da matriz da Krigagem Ordinária completa, o resíduo da
+        estação i sem ela mesma é (B z)_i / B_ii e a variância de krigagem
+        correspondente é 1 / B_ii (Dubrule, 1983). Uma única fatoração fornece
+        os n resíduos de todas as horas com o mesmo conjunto de estações.
+        
+        Args:
+            modelo (str): Modelo de variograma
+            parametros (tuple): Parâmetros do variograma
+            valores (np.array): Valores nas estações (S,) ou (S, T), sem faltas
+            
+        Returns:
+            tuple: (resíduos observado - estimado com a forma de valores, variâncias (S,))
+        """
+        n = len(self.coords_estacoes)
+        sistema = np.ones((n + 1, n + 1))
+        sistema[:n, :n] = -MODELOS_VARIOGRAMA[modelo](parametros, self.distancias_estacoes)
+        np.fill_diagonal(sistema[:n, :n], 0.0)
+        sistema[n, n] = 0.0
+        
+        inversa = np.linalg.inv(sistema)
+        diagonal = np.diag(inversa)[:n]
+        valores = np.asarray(valores, dtype=float)
+        diagonal_formatada = diagonal if valores.ndim == 1 else diagonal[:, None]
+        
+        residuos = (inversa[:n, :n] @ valores) / diagonal_formatada
+        return residuos, np.maximum(1.0 / diagonal, 0.0)
+    
+    def residuos_validacao_cruzada_padroes(self, modelo, parametros, valores):
+        """
+        Resíduos deixa-uma-estação-fora de uma série com estações faltantes.
+        
+        Cada padrão de estações presentes usa a forma fechada sobre o seu
+        subconjunto de estações; padrões com menos de três estações ficam em NaN.
+        
+        Args:
+            modelo (str): Modelo de variograma
+            parametros (tuple): Parâmetros do variograma
+            valores (np.array): Valores nas estações (S, T), NaN nas faltas
+            
+        Returns:
+            tuple: (resíduos observado - estimado (S, T), variâncias de krigagem (S, T))
+        """
+        valores = np.asarray(valores, dtype=float)
+        residuos = np.full(valores.shape, np.nan)
+        variancias = np.full(valores.shape, np.nan)
+        
+        padroes, grupo = np.unique(np.isfinite(valores).T, axis=0, return_inverse=True)
+        grupo = np.ravel(grupo)
+        for k, padrao in enumerate(padroes):
+            if np.sum(padrao) < 3:
+                continue
+            horas = np.flatnonzero(grupo == k)
+            subconjunto = MotorKrigagemMatricial(
+                self.coords_estacoes[padrao], distancias_estacoes=self.distancias_estacoes[np.ix_(padrao, padrao)]
+            )
+            residuos_padrao, variancias_padrao = subconjunto.residuos_validacao_cruzada(
+                modelo, parametros, valores[np.ix_(padrao, horas)]
+            )
+            residuos[np.ix_(padrao, horas)] = residuos_padrao
+            variancias[np.ix_(padrao, horas)] = variancias_padrao[:, None]
+        
+        return residuos, variancias
+    
+    def validacao_cruzada(self, modelo, parametros, valores, escalas):
+        """
+        Validação cruzada deixa-uma-estação-fora agregada sobre as horas.
+        
+        Os resíduos de cada hora são divididos pelo desvio espacial da hora,
+        de modo que horas de magnitudes diferentes pesem igualmente. Horas com
+        estações faltantes usam a forma fechada do seu padrão de estações.
+        
+        Args:
+            modelo (str): Modelo de variograma
+            parametros (tuple): Parâmetros do variograma normalizado
+            valores (np.array): Valores nas estações (S, T), NaN nas faltas
+            escalas (np.array): Variância espacial por hora (T,)
+            
+        Returns:
+            tuple: (RMSE normalizado, variância de krigagem normalizada média)
+        """
+        uteis = escalas > 1e-12
+        residuos, variancias = self.residuos_validacao_cruzada_padroes(modelo, parametros, valores[:, uteis])
+        residuos /= np.sqrt(escalas[uteis])
+        validos = np.isfinite(residuos)
+        if not np.any(validos):
+            raise ValueError("Nenhuma hora com estações suficientes para a validação cruzada")
+        return float(np.sqrt(np.mean(residuos[validos] ** 2))), float(np.mean(variancias[validos]))
+
+
+def escalar_parametros_variograma(modelo, parametros, escala):
+    """
+    Escala um variograma normalizado pela variância espacial de uma hora.
+    
+    Args:
+        modelo (str): Modelo de variograma
+        parametros (tuple): Parâmetros do variograma normalizado
+        escala (float): Fator de escala
+        
+    Returns:
+        tuple: Parâmetros escalados (alcance e expoente preservados)
+    """
+    fixos = set() if modelo == 'linear' else {1}
+    return tuple(p if i in fixos else p * escala for i, p in enumerate(parametros))
+
+
+def parametros_variograma_pykrige(modelo, parametros):
+    """Converte parâmetros de variograma para o dicionário aceito pelo pykrige."""
+    if modelo == 'linear':
+        nomes = ['slope', 'nugget']
+    elif modelo == 'power':
+        nomes = ['scale', 'exponent', 'nugget']
+    else:
+        nomes = ['psill', 'range', 'nugget']
+    return dict(zip(nomes, [float(p) for p in parametros]))
+
+
+class RegistroVariogramas:
+    """
+    Registro persistente de variogramas por variável e estrato (mês, hora do dia).
+    
+    Cada estrato guarda o modelo selecionado e os parâmetros do variograma
+    normalizado (patamar unitário de variância espacial); na krigagem horária
+    os parâmetros são apenas consultados e escalados pela variância da hora.
+    O registro vale para um conjunto de estações, identificado pela assinatura.
+    """
+    
+    def __init__(self, assinatura, variogramas=None):
+        """
+        Args:
+            assinatura (str): Identificação do conjunto de estações
+            variogramas (dict): variável -> estrato -> {'modelo', 'parametros', 'pontuacao'}
+        """
+        self.assinatura = assinatura
+        self.variogramas = variogramas if variogramas is not None else {}
+    
+    @staticmethod
+    def obter_estrato(hora):
+        """Estrato 'MM-HH' (mês e hora do dia) de um timestamp."""
+        return f"{hora.month:02d}-{hora.hour:02d}"
+    
+    @staticmethod
+    def calcular_assinatura(nomes_estacoes, coords_estacoes):
+        """Assinatura do conjunto de estações (nomes e coordenadas arredondadas)."""
+        partes = [f"{nome}:{x:.0f}:{y:.0f}" for nome, (x, y) in zip(nomes_estacoes, coords_estacoes)]
+        return '|'.join(sorted(partes))
+    
+    def registrar(self, variavel, estrato, modelo, parametros, pontuacao):
+        """Registra o variograma de um estrato ('global' para o ajuste de todas as horas)."""
+        self.variogramas.setdefault(variavel, {})[estrato] = {
+            'modelo': modelo,
+            'parametros': [float(p) for p in parametros],
+            'pontuacao': float(pontuacao)
+        }
+    
+    def obter(self, variavel, hora):
+        """
+        Consulta o variograma de uma variável em uma hora.
+        
+        Args:
+            variavel (str): Nome da variável
+            hora (pd.Timestamp): Hora da krigagem
+            
+        Returns:
+            tuple: (modelo, parâmetros normalizados) ou None se a variável não estiver registrada
+        """
+        estratos = self.variogramas.get(variavel)
+        if not estratos:
+            return None
+        entrada = estratos.get(self.obter_estrato(hora), estratos.get('global'))
+        if entrada is None:
+            return None
+        return entrada['modelo'], tuple(entrada['parametros'])
+    
+    def contem(self, variaveis):
+        """Verifica se todas as variáveis possuem ao menos o variograma global."""
+        return all('global' in self.variogramas.get(v, {}) for v in variaveis)
+    
+    def salvar(self, caminho):
+        """Salva o registro em JSON."""
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'assinatura': self.assinatura, 'variogramas': self.variogramas}, f, indent=1)
+    
+    @classmethod
+    def carregar(cls, caminho):
+        """Carrega um registro salvo com salvar()."""
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        return cls(dados['assinatura'], dados['variogramas'])
+
+
+# =============================================================================
+# INTERPOLADORES ALTERNATIVOS
+# =============================================================================
+
+class InterpoladorEspacial(ABC):
+    """
+    Base dos interpoladores alternativos à krigagem.
+    
+    Como no MotorKrigagemMatricial, os pesos (pontos × estações) dependem só
+    da geometria e são calculados uma vez por padrão de estações disponíveis;
+    todas as horas saem de um produto matricial. A variância é uma aproximação:
+    a distância média ponderada às estações, relativa à distância média entre
+    estações e limitada a 1, multiplicada pela variância espacial da hora.
+    Nula sobre uma estação e igual à variância espacial longe de todas.
+    """
+    
+    def __init__(self, coords_estacoes, coords_pontos=None, distancias_estacoes=None,
+                 distancias_pontos=None):
+        """
+        Args:
+            coords_estacoes (np.array): Coordenadas projetadas das estações (S, 2)
+            coords_pontos (np.array): Coordenadas projetadas dos pontos da linha (P, 2)
+            distancias_estacoes (np.array): Distâncias entre estações (S, S), se já calculadas
+            distancias_pontos (np.array): Distâncias pontos-estações (P, S), se já calculadas
+        """
+        self.coords_estacoes = np.asarray(coords_estacoes, dtype=float)
+        if distancias_estacoes is None:
+            distancias_estacoes = np.linalg.norm(
+                self.coords_estacoes[:, None, :] - self.coords_estacoes[None, :, :], axis=2
+            )
+        self.distancias_estacoes = distancias_estacoes
+        self.coords_pontos = None
+        self.distancias_pontos = None
+        if coords_pontos is not None:
+            self.coords_pontos = np.asarray(coords_pontos, dtype=float)
+            if distancias_pontos is None:
+                distancias_pontos = np.linalg.norm(
+                    self.coords_pontos[:, None, :] - self.coords_estacoes[None, :, :], axis=2
+                )
+            self.distancias_pontos = distancias_pontos
+        self._pesos = OrderedDict()
+    
+    def __getstate__(self):
+        """Estado para pickle, sem os caches de pesos."""
+        estado = self.__dict__.copy()
+        estado['_pesos'] = OrderedDict()
+        return estado
+    
+    calcular_escalas = staticmethod(MotorKrigagemMatricial.calcular_escalas)
+    
+    @abstractmethod
+    def _calcular_pesos_alvos(self, coords_alvos, distancias_alvos, mascara_estacoes):
+        """
+        Pesos de interpolação em pontos arbitrários.
+        
+        Args:
+            coords_alvos (np.array): Coordenadas dos alvos (A, 2)
+            distancias_alvos (np.array): Distâncias alvos-estações disponíveis (A, S_disponíveis)
+            mascara_estacoes (np.array): Estações disponíveis
+            
+        Returns:
+            np.array: Pesos (A, S_disponíveis), cada linha somando 1
+        """
+    
+    def _variancia_relativa(self, pesos, distancias_alvos, mascara_estacoes):
+        """Aproximação da variância relativa à variância espacial, em [0, 1]."""
+        distancias = self.distancias_estacoes[np.ix_(mascara_estacoes, mascara_estacoes)]
+        n = len(distancias)
+        distancia_referencia = np.sum(distancias) / max(n * (n - 1), 1)
+        if distancia_referencia <= 0:
+            return np.zeros(len(pesos))
+        return np.clip(np.sum(pesos * distancias_alvos, axis=1) / distancia_referencia, 0.0, 1.0)
+    
+    def calcular_pesos(self, mascara_estacoes=None):
+        """
+        Pesos para todos os pontos da linha, com cache por padrão de estações.
+        
+        Args:
+            mascara_estacoes (np.array): Estações disponíveis (padrão: todas)
+            
+        Returns:
+            tuple: (pesos (P, S_disponíveis), variância relativa (P,))
+        """
+        if mascara_estacoes is None:
+            mascara_estacoes = np.ones(len(self.coords_estacoes), dtype=bool)
+        mascara_estacoes = np.asarray(mascara_estacoes, dtype=bool)
+        
+        chave = np.packbits(mascara_estacoes).tobytes()
+        if chave in self._pesos:
+            self._pesos.move_to_end(chave)
+            return self._pesos[chave]
+        
+        if not np.any(mascara_estacoes):
+            raise ValueError("Nenhuma estação disponível para interpolação")
+        
+        distancias_pontos = self.distancias_pontos[:, mascara_estacoes]
+        pesos = self._calcular_pesos_alvos(self.coords_pontos, distancias_pontos, mascara_estacoes)
+        variancia = self._variancia_relativa(pesos, distancias_pontos, mascara_estacoes)
+        
+        return _armazenar_lru(self._pesos, chave, (pesos, variancia))
+    
+    def interpolar_series(self, valores, escalas):
+        """
+        Interpola a série completa de uma variável.
+        
+        Args:
+            valores (np.array): Valores nas estações (S, T)
+            escalas (np.array): Variância espacial por hora (T,)
+            
+        Returns:
+            tuple: (médias (P, T), variâncias (P, T))
+        """
+        valores = np.asarray(valores, dtype=float)
+        num_pontos, num_horas = len(self.coords_pontos), valores.shape[1]
+        medias = np.full((num_pontos, num_horas), np.nan)
+        variancias = np.full((num_pontos, num_horas), np.nan)
+        
+        disponiveis = np.isfinite(valores)
+        padroes, grupo = np.unique(disponiveis.T, axis=0, return_inverse=True)
+        grupo = np.ravel(grupo)
+        
+        for k, padrao in enumerate(padroes):
+            if not np.any(padrao):
+                continue
+            horas = np.flatnonzero(grupo == k)
+            pesos, variancia = self.calcular_pesos(padrao)
+            medias[:, horas] = pesos @ valores[np.ix_(padrao, horas)]
+            variancias[:, horas] = variancia[:, None] * escalas[None, horas]
+        
+        return medias, variancias
+    
+    def residuos_validacao_cruzada(self, valores):
+        """
+        Resíduos de validação cruzada deixa-uma-estação-fora.
+        
+        Cada hora usa as estações presentes nela; padrões com menos de três
+        estações ficam em NaN.
+        
+        Args:
+            valores (np.array): Valores nas estações (S, T), NaN nas faltas
+            
+        Returns:
+            np.array: Resíduos observado - estimado (S, T)
+        """
+        valores = np.asarray(valores, dtype=float)
+        residuos = np.full(valores.shape, np.nan)
+        
+        padroes, grupo = np.unique(np.isfinite(valores).T, axis=0, return_inverse=True)
+        grupo = np.ravel(grupo)
+        for k, padrao in enumerate(padroes):
+            if np.sum(padrao) < 3:
+                continue
+            horas = np.flatnonzero(grupo == k)
+            for i in np.flatnonzero(padrao):
+                mascara = padrao.copy()
+                mascara[i] = False
+                pesos = self._calcular_pesos_alvos(
+                    self.coords_estacoes[i:i + 1], self.distancias_estacoes[i:i + 1, mascara], mascara
+                )
+                residuos[i, horas] = valores[i, horas] - pesos[0] @ valores[np.ix_(mascara, horas)]
+        return residuos
+
+
+def _pesos_vizinho_proximo(distancias):
+    """Peso unitário para a estação mais próxima de cada alvo."""
+    pesos = np.zeros_like(distancias, dtype=float)
+    pesos[np.arange(len(distancias)), np.argmin(distancias, axis=1)] = 1.0
+    return pesos
+
+
+def _pesos_idw(distancias, potencia):
+    """Pesos do inverso da distância; alvos sobre uma estação recebem o valor dela."""
+    coincidentes = distancias <= 1e-10
+    with np.errstate(divide='ignore'):
+        pesos = np.where(coincidentes, 0.0, 1.0 / np.maximum(distancias, 1e-10) ** potencia)
+    sobre_estacao = np.any(coincidentes, axis=1)
+    pesos[sobre_estacao] = _pesos_vizinho_proximo(distancias[sobre_estacao])
+    return pesos / np.sum(pesos, axis=1, keepdims=True)
+
+
+class InterpoladorIDW(InterpoladorEspacial):
+    """Inverso da distância ponderado, expoente config.POTENCIA_IDW."""
+    
+    def _calcular_pesos_alvos(self, coords_alvos, distancias_alvos, mascara_estacoes):
+        return _pesos_idw(distancias_alvos, config.POTENCIA_IDW)
+
+
+class InterpoladorVizinhoProximo(InterpoladorEspacial):
+    """Valor da estação mais próxima."""
+    
+    def _calcular_pesos_alvos(self, coords_alvos, distancias_alvos, mascara_estacoes):
+        return _pesos_vizinho_proximo(distancias_alvos)
+
+
+class InterpoladorBaricentrico(InterpoladorEspacial):
+    """
+    Interpolação linear nos triângulos de Delaunay das estações.
+    
+    Cada ponto recebe as coordenadas baricêntricas do triângulo que o contém;
+    fora do fecho convexo das estações (ou com menos de três estações não
+    colineares) usa o inverso da distância.
+    """
+    
+    def _calcular_pesos_alvos(self, coords_alvos, distancias_alvos, mascara_estacoes):
+        from scipy.spatial import Delaunay, QhullError
+        
+        pesos = _pesos_idw(distancias_alvos, config.POTENCIA_IDW)
+        try:
+            triangulacao = Delaunay(self.coords_estacoes[mascara_estacoes])
+        except (QhullError, ValueError):
+            return pesos
+        
+        simplexos = triangulacao.find_simplex(coords_alvos)
+        dentro = np.flatnonzero(simplexos >= 0)
+        transformacoes = triangulacao.transform[simplexos[dentro]]
+        parciais = np.einsum('aij,aj->ai', transformacoes[:, :2], coords_alvos[dentro] - transformacoes[:, 2])
+        
+        pesos[dentro] = 0.0
+        pesos[dentro[:, None], triangulacao.simplices[simplexos[dentro]]] = np.column_stack(
+            [parciais, 1.0 - np.sum(parciais, axis=1)]
+        )
+        return pesos
+
+
+# Interpoladores selecionáveis em config.METODO_KRIGAGEM
+INTERPOLADORES = {
+    'idw': InterpoladorIDW,
+    'vizinho_proximo': InterpoladorVizinhoProximo,
+    'baricentrico': InterpoladorBaricentrico
+}
+
+
+# =============================================================================
+# RESULTADOS DA KRIGAGEM
+# =============================================================================
+
+class ResultadosKrigagem(Mapping):
+    """
+    Resultados da krigagem em um tensor denso (horas, variáveis, pontos, 2).
+    
+    O último eixo guarda a média (0) e a variância (1); o desvio padrão é
+    derivado sob demanda. O tensor pode residir em memória ou em um arquivo
+    .npy mapeado em memória, com o índice de horas e variáveis em um arquivo
+    JSON ao lado. Como mapeamento, resultados[hora][variavel]['media'] devolve
+    visões do tensor, compatíveis com o formato de dicionários anterior.
+    """
+    
+    def __init__(self, horas, variaveis, tensor):
+        """
+        Args:
+            horas (pd.DatetimeIndex): Horas da série (T,)
+            variaveis (list): Variáveis ambientais (V,)
+            tensor (np.array): Tensor (T, V, P, 2), em memória ou np.memmap
+        """
+        self.horas = pd.DatetimeIndex(horas)
+        self.variaveis = list(variaveis)
+        self.tensor = tensor
+        self.covariancia = None
+        self._indice_variaveis = {variavel: i for i, variavel in enumerate(self.variaveis)}
+    
+    @classmethod
+    def criar(cls, horas, variaveis, num_pontos, dtype=None, caminho=None):
+        """
+        Cria um tensor de resultados preenchido com NaN.
+        
+        Args:
+            horas (pd.DatetimeIndex): Horas da série
+            variaveis (list): Variáveis ambientais
+            num_pontos (int): Número de pontos da linha
+            dtype (str): Precisão do tensor (padrão: config.PRECISAO_RESULTADOS_KRIGAGEM)
+            caminho (str): Arquivo .npy para mapear em memória (padrão: em memória)
+            
+        Returns:
+            ResultadosKrigagem: Resultados vazios
+        """
+        if dtype is None:
+            dtype = config.PRECISAO_RESULTADOS_KRIGAGEM
+        forma = (len(horas), len(variaveis), num_pontos, 2)
+        
+        if caminho:
+            diretorio = os.path.dirname(caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            tensor = np.lib.format.open_memmap(caminho, mode='w+', dtype=dtype, shape=forma)
+            tensor[:] = np.nan
+            cls._gravar_indice(caminho, horas, variaveis)
+        else:
+            tensor = np.full(forma, np.nan, dtype=dtype)
+        
+        return cls(horas, variaveis, tensor)
+    
+    @classmethod
+    def carregar(cls, caminho, modo='r'):
+        """Abre um tensor salvo em disco, mapeado em memória."""
+        with open(cls._caminho_indice(caminho), 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+        tensor = np.load(caminho, mmap_mode=modo)
+        return cls(pd.DatetimeIndex(indice['horas']), indice['variaveis'], tensor)
+    
+    @classmethod
+    def de_dicionario(cls, resultados, variaveis=None, dtype=None):
+        """Converte resultados no formato hora -> variável -> {'media', 'variancia'}."""
+        horas = pd.DatetimeIndex(sorted(resultados.keys()))
+        if variaveis is None:
+            variaveis = config.VARIAVEIS_AMBIENTAIS
+        num_pontos = len(next(iter(resultados[horas[0]].values()))['media']) if len(horas) else 0
+        convertidos = cls.criar(horas, variaveis, num_pontos, dtype=dtype)
+        for t, hora in enumerate(horas):
+            convertidos.definir_hora(t, resultados[hora])
+        return convertidos
+    
+    @classmethod
+    def concatenar(cls, partes, caminho=None):
+        """
+        Junta resultados de horas distintas em um tensor, em ordem cronológica.
+        
+        Se a primeira parte já está mapeada no próprio caminho e as demais só
+        trazem horas posteriores, o arquivo .npy é estendido no lugar: o
+        cabeçalho recebe a nova forma e apenas as linhas novas são escritas.
+        Caso contrário, o tensor é escrito em um arquivo temporário e movido
+        para o destino. Em ambos os casos o mapeamento das partes sobre o
+        caminho é fechado antes de o arquivo mudar, e essas partes deixam de
+        ser válidas.
+        
+        Args:
+            partes (list): ResultadosKrigagem com as mesmas variáveis e pontos
+            caminho (str): Arquivo .npy do resultado (padrão: em memória)
+            
+        Returns:
+            ResultadosKrigagem: Resultados de todas as horas
+        """
+        referencia = partes[0]
+        if any(parte.variaveis != referencia.variaveis or parte.num_pontos != referencia.num_pontos
+               for parte in partes):
+            raise ValueError("Resultados com variáveis ou pontos diferentes não podem ser concatenados")
+        horas = referencia.horas.append([parte.horas for parte in partes[1:]])
+        if horas.has_duplicates:
+            raise ValueError("Resultados com horas repetidas não podem ser concatenados")
+        horas = horas.sort_values()
+        covariancia = cls._concatenar_covariancias(partes, horas)
+        
+        if (caminho and len(partes) > 1 and cls._mapeia(referencia.tensor, caminho)
+                and horas[:len(referencia)].equals(referencia.horas)):
+            # Horas novas depois das armazenadas: só as linhas novas são escritas
+            forma, dtype = referencia.tensor.shape, referencia.tensor.dtype
+            referencia._liberar_mapeamento()
+            if cls._estender_arquivo(caminho, forma, len(horas), dtype):
+                concatenados = cls(horas, referencia.variaveis, np.load(caminho, mmap_mode='r+'))
+                cls._copiar_partes(concatenados, partes[1:])
+                concatenados.tensor.flush()
+                cls._gravar_indice(caminho, horas, referencia.variaveis)
+                concatenados.covariancia = covariancia
+                return concatenados
+            referencia.tensor = np.load(caminho, mmap_mode='r')
+        
+        temporario = os.path.splitext(caminho)[0] + '_temp.npy' if caminho else None
+        concatenados = cls.criar(horas, referencia.variaveis, referencia.num_pontos,
+                                 dtype=referencia.tensor.dtype, caminho=temporario)
+        cls._copiar_partes(concatenados, partes)
+        
+        if not caminho:
+            concatenados.covariancia = covariancia
+            return concatenados
+        concatenados.tensor.flush()
+        del concatenados
+        for parte in partes:
+            if cls._mapeia(parte.tensor, caminho):
+                parte._liberar_mapeamento()
+        os.replace(temporario, caminho)
+        os.replace(cls._caminho_indice(temporario), cls._caminho_indice(caminho))
+        concatenados = cls.carregar(caminho, modo='r+')
+        concatenados.covariancia = covariancia
+        return concatenados
+    
+    @staticmethod
+    def _concatenar_covariancias(partes, horas):
+        """Covariância posterior das horas concatenadas; partes sem covariância ficam sem fatores."""
+        covariancias = [parte.covariancia for parte in partes]
+        if all(covariancia is None for covariancia in covariancias):
+            return None
+        if len(partes) == 1:
+            return covariancias[0]
+        if any(covariancia is None for covariancia in covariancias):
+            logger.warning("Covariância posterior ausente em parte das horas concatenadas; "
+                           "essas horas ficam sem covariância")
+            covariancias = [
+                CovarianciaPosteriorKrigagem(parte.horas, parte.variaveis, parte.num_pontos)
+                if covariancia is None else covariancia
+                for parte, covariancia in zip(partes, covariancias)
+            ]
+        return CovarianciaPosteriorKrigagem.concatenar(covariancias, horas)
+    
+    @staticmethod
+    def _copiar_partes(concatenados, partes):
+        """Copia as horas de cada parte para as posições correspondentes, em blocos."""
+        for parte in partes:
+            posicoes = concatenados.horas.get_indexer(parte.horas)
+            for inicio in range(0, len(posicoes), config.TAMANHO_BLOCO_KRIGAGEM):
+                bloco = slice(inicio, inicio + config.TAMANHO_BLOCO_KRIGAGEM)
+                concatenados.tensor[posicoes[bloco]] = parte.tensor[bloco]
+    
+    @staticmethod
+    def _mapeia(tensor, caminho):
+        """Indica se o tensor é um np.memmap do arquivo em caminho."""
+        return (isinstance(tensor, np.memmap) and tensor.filename is not None
+                and os.path.exists(caminho)
+                and os.path.samefile(tensor.filename, caminho))
+    
+    def _liberar_mapeamento(self):
+        """Grava e fecha o mapeamento do tensor, que não pode estar aberto ao alterar o arquivo."""
+        self.tensor.flush()
+        self.tensor = None
+        gc.collect()
+    
+    @staticmethod
+    def _estender_arquivo(caminho, forma_atual, num_horas, dtype):
+        """
+        Estende o primeiro eixo de um arquivo .npy para num_horas, sem reescrever os dados.
+        
+        Args:
+            caminho (str): Arquivo .npy em ordem C, sem mapeamentos abertos
+            forma_atual (tuple): Forma esperada do tensor no arquivo
+            num_horas (int): Novo tamanho do primeiro eixo
+            dtype (np.dtype): Tipo dos dados do arquivo
+            
+        Returns:
+            bool: False se o formato não permitir a extensão (arquivo inalterado)
+        """
+        with open(caminho, 'r+b') as f:
+            versao = np.lib.format.read_magic(f)
+            if versao not in ((1, 0), (2, 0)):
+                return False
+            leitor = np.lib.format.read_array_header_1_0 if versao == (1, 0) else np.lib.format.read_array_header_2_0
+            forma, ordem_fortran, dtype_arquivo = leitor(f)
+            inicio_dados = f.tell()
+            if ordem_fortran or dtype_arquivo != dtype or tuple(forma) != tuple(forma_atual):
+                return False
+            
+            nova_forma = (num_horas,) + tuple(forma[1:])
+            cabecalho = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False,
+                              'shape': nova_forma})
+            inicio_cabecalho = 10 if versao == (1, 0) else 12
+            espaco = inicio_dados - inicio_cabecalho
+            if len(cabecalho) + 1 > espaco:
+                return False
+            
+            # O arquivo cresce antes da troca do cabeçalho, que nunca descreve mais dados que os existentes
+            f.truncate(inicio_dados + int(np.prod(nova_forma)) * dtype.itemsize)
+            f.seek(inicio_cabecalho)
+            f.write((cabecalho.ljust(espaco - 1) + '\n').encode('latin1'))
+        return True
+    
+    @classmethod
+    def _gravar_indice(cls, caminho, horas, variaveis):
+        with open(cls._caminho_indice(caminho), 'w', encoding='utf-8') as f:
+            json.dump({'horas': [h.isoformat() for h in pd.DatetimeIndex(horas)],
+                       'variaveis': list(variaveis)}, f)
+    
+    @staticmethod
+    def _caminho_indice(caminho):
+        return os.path.splitext(caminho)[0] + '_indice.json'
+    
+    @property
+    def num_pontos(self):
+        return self.tensor.shape[2]
+    
+    def media(self, variavel):
+        """Médias da variável em todas as horas (T, P), como visão do tensor."""
+        return self.tensor[:, self._indice_variaveis[variavel], :, 0]
+    
+    def variancia(self, variavel):
+        """Variâncias da variável em todas as horas (T, P), como visão do tensor."""
+        return self.tensor[:, self._indice_variaveis[variavel], :, 1]
+    
+    def definir_serie(self, variavel, medias, variancias, horas=slice(None)):
+        """Grava médias e variâncias (T, P) de uma variável nas horas indicadas."""
+        indice = self._indice_variaveis[variavel]
+        self.tensor[horas, indice, :, 0] = medias
+        self.tensor[horas, indice, :, 1] = variancias
+    
+    def definir_hora(self, posicao, resultados_hora):
+        """Grava os resultados de uma hora no formato variável -> {'media', 'variancia'}."""
+        for variavel, resultado in resultados_hora.items():
+            if variavel in self._indice_variaveis:
+                indice = self._indice_variaveis[variavel]
+                self.tensor[posicao, indice, :, 0] = resultado['media']
+                self.tensor[posicao, indice, :, 1] = resultado['variancia']
+    
+    def obter_hora(self, posicao):
+        """Resultados de uma hora como variável -> {'media', 'variancia', 'desvio_padrao'}."""
+        return {
+            variavel: {
+                'media': self.tensor[posicao, i, :, 0],
+                'variancia': self.tensor[posicao, i, :, 1],
+                'desvio_padrao': np.sqrt(self.tensor[posicao, i, :, 1])
+            }
+            for i, variavel in enumerate(self.variaveis)
+        }
+    
+    def __getitem__(self, hora):
+        try:
+            posicao = self.horas.get_loc(hora)
+        except KeyError:
+            raise KeyError(hora)
+        return self.obter_hora(posicao)
+    
+    def __iter__(self):
+        return iter(self.horas)
+    
+    def __len__(self):
+        return len(self.horas)
+
+
+# =============================================================================
+# COVARIÂNCIA POSTERIOR DA KRIGAGEM
+# =============================================================================
+
+class CovarianciaPosteriorKrigagem:
+    """
+    Covariância dos erros de krigagem entre os pontos da linha, por variável e hora.
+    
+    Com pesos fixos, a covariância normalizada depende apenas do variograma e
+    das estações presentes; cada combinação guarda um único fator L (P, r) e a
+    hora t usa Σ_t = escala_t · L·Lᵀ. A memória total dos fatores é limitada por
+    config.MEMORIA_MAXIMA_COVARIANCIA_MB; horas cujo fator não caberia ficam
+    sem covariância (fator None).
+    """
+    
+    def __init__(self, horas, variaveis, num_pontos, memoria_maxima_mb=None):
+        """
+        Args:
+            horas (pd.DatetimeIndex): Horas da série (T,)
+            variaveis (list): Variáveis ambientais (V,)
+            num_pontos (int): Número de pontos da linha
+            memoria_maxima_mb (float): Limite dos fatores (padrão: config.MEMORIA_MAXIMA_COVARIANCIA_MB)
+        """
+        self.horas = pd.DatetimeIndex(horas)
+        self.variaveis = list(variaveis)
+        self.num_pontos = num_pontos
+        if memoria_maxima_mb is None:
+            memoria_maxima_mb = config.MEMORIA_MAXIMA_COVARIANCIA_MB
+        self.memoria_maxima_bytes = memoria_maxima_mb * 1024**2
+        
+        self.fatores = []
+        self.indices = np.full((len(self.horas), len(self.variaveis)), -1, dtype=int)
+        self.escalas = np.full((len(self.horas), len(self.variaveis)), np.nan)
+        self._indice_variaveis = {variavel: i for i, variavel in enumerate(self.variaveis)}
+        self._chaves = {}
+        self._limite_atingido = False
+    
+    @property
+    def memoria_bytes(self):
+        return sum(fator.nbytes for fator in self.fatores)
+    
+    def registrar(self, variavel, chave, calcular_fator, horas, escalas):
+        """
+        Associa horas a um fator, calculado apenas na primeira vez que a chave aparece.
+        
+        Args:
+            variavel (str): Variável ambiental
+            chave (tuple): Identificação do fator (variograma e estações presentes)
+            calcular_fator (callable): Função sem argumentos que devolve o fator (P, r)
+            horas (np.array): Posições das horas (n,)
+            escalas (np.array): Fator de escala do variograma de cada hora (n,)
+            
+        Returns:
+            bool: True se as horas receberam o fator
+        """
+        if chave not in self._chaves:
+            estimativa = self.num_pontos * min(config.POSTO_COVARIANCIA_KRIGAGEM, self.num_pontos) * 8
+            if self.memoria_bytes + estimativa > self.memoria_maxima_bytes:
+                if not self._limite_atingido:
+                    logger.warning("Limite de memória da covariância posterior atingido; "
+                                   "horas restantes sem covariância")
+                    self._limite_atingido = True
+                return False
+            self._chaves[chave] = len(self.fatores)
+            self.fatores.append(calcular_fator())
+        
+        indice = self._indice_variaveis[variavel]
+        self.indices[horas, indice] = self._chaves[chave]
+        self.escalas[horas, indice] = escalas
+        return True
+    
+    def herdar_fatores(self, anterior):
+        """
+        Reaproveita os fatores já calculados de outra covariância das mesmas variáveis e pontos.
+        
+        Chaves já conhecidas não recalculam o fator; a concatenação posterior
+        com a covariância anterior identifica os fatores comuns pela chave.
+        
+        Args:
+            anterior (CovarianciaPosteriorKrigagem): Covariância de outras horas
+        """
+        self.fatores = list(anterior.fatores)
+        self._chaves = dict(anterior._chaves)
+    
+    @classmethod
+    def concatenar(cls, partes, horas):
+        """
+        Junta covariâncias de horas distintas, sem duplicar fatores de mesma chave.
+        
+        Args:
+            partes (list): CovarianciaPosteriorKrigagem com as mesmas variáveis e pontos
+            horas (pd.DatetimeIndex): Horas do resultado, contendo as horas de todas as partes
+            
+        Returns:
+            CovarianciaPosteriorKrigagem: Fatores, índices e escalas de todas as horas
+        """
+        referencia = partes[0]
+        concatenada = cls(horas, referencia.variaveis, referencia.num_pontos,
+                          memoria_maxima_mb=referencia.memoria_maxima_bytes / 1024**2)
+        for parte in partes:
+            # Índice de cada fator da parte no resultado; -1 continua sem fator
+            mapa = np.full(len(parte.fatores) + 1, -1, dtype=int)
+            for chave, k in parte._chaves.items():
+                if chave not in concatenada._chaves:
+                    concatenada._chaves[chave] = len(concatenada.fatores)
+                    concatenada.fatores.append(parte.fatores[k])
+                mapa[k] = concatenada._chaves[chave]
+            posicoes = concatenada.horas.get_indexer(parte.horas)
+            concatenada.indices[posicoes] = mapa[parte.indices]
+            concatenada.escalas[posicoes] = parte.escalas
+        return concatenada
+    
+    def fator(self, posicao, variavel):
+        """Fator L (P, r) da hora na posição dada, com Σ = L·Lᵀ, ou None se indisponível."""
+        indice = self._indice_variaveis[variavel]
+        k, escala = self.indices[posicao, indice], self.escalas[posicao, indice]
+        if k < 0 or not np.isfinite(escala):
+            return None
+        return self.fatores[k] * np.sqrt(max(escala, 0.0))
+    
+    def covariancia(self, posicao, variavel, pontos=None):
+        """Matriz de covariância densa da hora, opcionalmente restrita a alguns pontos."""
+        fator = self.fator(posicao, variavel)
+        if fator is None:
+            return None
+        if pontos is not None:
+            fator = fator[pontos]
+        return fator @ fator.T
+    
+    def salvar(self, caminho):
+        """Exporta fatores, índices, escalas e as chaves dos fatores em um arquivo .npz."""
+        chaves = [[modelo, list(parametros), padrao.hex(), k]
+                  for (modelo, parametros, padrao), k in self._chaves.items()]
+        np.savez_compressed(
+            caminho,
+            horas=self.horas.asi8, variaveis=np.array(self.variaveis), num_pontos=self.num_pontos,
+            num_fatores=len(self.fatores), indices=self.indices, escalas=self.escalas,
+            chaves=np.array(json.dumps(chaves)),
+            **{f'fator_{k}': fator for k, fator in enumerate(self.fatores)}
+        )
+    
+    @classmethod
+    def carregar(cls, caminho):
+        """Carrega fatores exportados com salvar()."""
+        with np.load(caminho) as dados:
+            covariancia = cls(pd.DatetimeIndex(dados['horas']), dados['variaveis'].tolist(),
+                              int(dados['num_pontos']), memoria_maxima_mb=np.inf)
+            covariancia.indices = dados['indices']
+            covariancia.escalas = dados['escalas']
+            covariancia.fatores = [dados[f'fator_{k}'] for k in range(int(dados['num_fatores']))]
+            if 'chaves' in dados:
+                covariancia._chaves = {(modelo, tuple(parametros), bytes.fromhex(padrao)): k
+                                       for modelo, parametros, padrao, k in json.loads(str(dados['chaves']))}
+            else:
+                # Arquivos sem chaves: cada fator é tratado como distinto
+                covariancia._chaves = {(caminho, k): k for k in range(len(covariancia.fatores))}
+        return covariancia
+
+
+# =============================================================================
+# ESTADO DA KRIGAGEM
+# =============================================================================
+
+class EstadoKrigagem:
+    """
+    Estado de uma krigagem, para acrescentar horas sem refazer a série.
+    
+    Reúne o método, as estações (nomes e coordenadas projetadas), os pontos da
+    linha, os variogramas ajustados à série e o registro por estrato, o motor
+    com os pesos já calculados e o tensor de resultados, com a covariância
+    posterior quando calculada. Em disco, o motor é serializado com pickle sem
+    os caches de pesos, o tensor fica em .npy mapeado em memória e os fatores
+    da covariância em .npz; o estado.json é gravado por último e marca um
+    estado completo.
+    """
+    
+    ARQUIVO_ESTADO = 'estado.json'
+    ARQUIVO_LINHA = 'coords_linha.npy'
+    ARQUIVO_MOTOR = 'motor.pkl'
+    ARQUIVO_RESULTADOS = 'resultados_krigagem.npy'
+    ARQUIVO_COVARIANCIA = 'covariancia_posterior.npz'
+    
+    def __init__(self, metodo, variaveis, nomes_estacoes, coords_estacoes, coords_linha,
+                 variogramas_series=None, registro_variogramas=None, motor=None, resultados=None):
+        """
+        Args:
+            metodo (str): Valor de config.METODO_KRIGAGEM usado
+            variaveis (list): Variáveis krigadas
+            nomes_estacoes (list): Estações do motor, na ordem das suas linhas
+            coords_estacoes (np.array): Coordenadas projetadas dessas estações (S, 2)
+            coords_linha (np.array): Coordenadas dos pontos da linha (P, 2)
+            variogramas_series (dict): Variável -> (modelo, parâmetros) ajustados à série
+            registro_variogramas (RegistroVariogramas): Registro por estrato em uso
+            motor (MotorKrigagemMatricial | InterpoladorEspacial): Motor com cache de pesos
+            resultados (ResultadosKrigagem): Resultados das horas já krigadas
+        """
+        self.metodo = metodo
+        self.variaveis = list(variaveis)
+        self.nomes_estacoes = list(nomes_estacoes)
+        self.coords_estacoes = np.asarray(coords_estacoes, dtype=float)
+        self.coords_linha = np.asarray(coords_linha, dtype=float)
+        self.variogramas_series = dict(variogramas_series or {})
+        self.registro_variogramas = registro_variogramas
+        self.motor = motor
+        self.resultados = resultados
+    
+    @staticmethod
+    def calcular_assinatura_linha(coords_linha):
+        """Assinatura dos pontos da linha, ao milímetro."""
+        return hashlib.sha1(np.round(np.asarray(coords_linha, dtype=float), 3).tobytes()).hexdigest()
+    
+    @classmethod
+    def caminho_resultados(cls, diretorio):
+        return os.path.join(diretorio, cls.ARQUIVO_RESULTADOS)
+    
+    @classmethod
+    def existe(cls, diretorio):
+        return os.path.exists(os.path.join(diretorio, cls.ARQUIVO_ESTADO))
+    
+    def salvar(self, diretorio):
+        """Salva o estado no diretório, copiando o tensor se ele ainda não estiver lá."""
+        os.makedirs(diretorio, exist_ok=True)
+        caminho = self.caminho_resultados(diretorio)
+        tensor = self.resultados.tensor
+        if (isinstance(tensor, np.memmap) and os.path.exists(caminho)
+                and os.path.samefile(tensor.filename, caminho)):
+            tensor.flush()
+        else:
+            self.resultados = ResultadosKrigagem.concatenar([self.resultados], caminho=caminho)
+        
+        caminho_covariancia = os.path.join(diretorio, self.ARQUIVO_COVARIANCIA)
+        if self.resultados.covariancia is not None:
+            self.resultados.covariancia.salvar(caminho_covariancia)
+        elif os.path.exists(caminho_covariancia):
+            os.remove(caminho_covariancia)
+        
+        np.save(os.path.join(diretorio, self.ARQUIVO_LINHA), self.coords_linha)
+        with open(os.path.join(diretorio, self.ARQUIVO_MOTOR), 'wb') as f:
+            pickle.dump(self.motor, f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        registro = None
+        if self.registro_variogramas is not None:
+            registro = {'assinatura': self.registro_variogramas.assinatura,
+                        'variogramas': self.registro_variogramas.variogramas}
+        caminho_estado = os.path.join(diretorio, self.ARQUIVO_ESTADO)
+        with open(caminho_estado + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({
+                'metodo': self.metodo,
+                'variaveis': self.variaveis,
+                'nomes_estacoes': self.nomes_estacoes,
+                'coords_estacoes': self.coords_estacoes.tolist(),
+                'assinatura_linha': self.calcular_assinatura_linha(self.coords_linha),
+                'variogramas_series': {v: [m, list(p)] for v, (m, p) in self.variogramas_series.items()},
+                'registro_variogramas': registro
+            }, f, indent=1)
+        os.replace(caminho_estado + '.tmp', caminho_estado)
+    
+    @classmethod
+    def carregar(cls, diretorio):
+        """Carrega um estado salvo com salvar(); o tensor é aberto mapeado em memória."""
+        with open(os.path.join(diretorio, cls.ARQUIVO_ESTADO), 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        coords_linha = np.load(os.path.join(diretorio, cls.ARQUIVO_LINHA))
+        if cls.calcular_assinatura_linha(coords_linha) != dados['assinatura_linha']:
+            raise ValueError("Pontos da linha salvos não correspondem ao estado")
+        with open(os.path.join(diretorio, cls.ARQUIVO_MOTOR), 'rb') as f:
+            motor = pickle.load(f)
+        
+        registro = dados['registro_variogramas']
+        if registro is not None:
+            registro = RegistroVariogramas(registro['assinatura'], registro['variogramas'])
+        
+        resultados = ResultadosKrigagem.carregar(cls.caminho_resultados(diretorio), modo='r+')
+        caminho_covariancia = os.path.join(diretorio, cls.ARQUIVO_COVARIANCIA)
+        if os.path.exists(caminho_covariancia):
+            covariancia = CovarianciaPosteriorKrigagem.carregar(caminho_covariancia)
+            if covariancia.horas.equals(resultados.horas) and covariancia.variaveis == resultados.variaveis:
+                resultados.covariancia = covariancia
+            else:
+                logger.warning("Covariância posterior salva não corresponde aos resultados; ignorada")
+        
+        return cls(
+            dados['metodo'], dados['variaveis'], dados['nomes_estacoes'], dados['coords_estacoes'],
+            coords_linha,
+            variogramas_series={v: (m, tuple(p)) for v, (m, p) in dados['variogramas_series'].items()},
+            registro_variogramas=registro,
+            motor=motor,
+            resultados=resultados
+        )
@@ -14,6 +14,7 @@ from data_loader import DataLoader
 from geoprocessing import GeoProcessor
 from thermal_model import CigreModeloTermico
 from simulation import MonteCarloSimulator
+from distributions import BancoResiduos
 from risk_analysis import RiskAnalyzer
 
 # Configurar logging
@@ -71,6 +72,8 @@ class AnalisadorRiscoTermico:
         
         # Resultados finais
         self.resultados_finais = []
+        self.resultados_linha = []
+        self.resultados_trajetorias = []
         
         self.logger = logging.getLogger(__name__)
 
@@ -118,6 +121,14 @@ class AnalisadorRiscoTermico:
             self.logger.info("Etapa 6: Executando simulações...")
             self._executar_simulacoes()
             
+            if config.SIMULACAO_CONJUNTA_LINHA:
+                self.logger.info("Etapa 6b: Executando simulação conjunta da linha...")
+                self._executar_simulacao_conjunta_linha()
+            
+            if config.SIMULACAO_TRAJETORIAS:
+                self.logger.info("Etapa 6c: Executando simulação de trajetórias temporais...")
+                self._executar_trajetorias_temporais()
+            
             # Etapa 7: Salvar resultados
             self.logger.info("Etapa 7: Salvando resultados...")
             self._salvar_resultados_finais()
@@ -178,10 +189,24 @@ class AnalisadorRiscoTermico:
         
         try:
             # Discretizar linha
-            self.pontos_linha = self.geo_processor.discretizar_linha(
-                self.dados_linha, 
-                config.DISTANCIA_DISCRETIZACAO
-            )
+            if config.DISCRETIZACAO_ADAPTATIVA:
+                self.pontos_linha = self.geo_processor.discretizar_linha_adaptativa(
+                    self.dados_linha,
+                    self.dados_sincronizados,
+                    config.DISTANCIA_DISCRETIZACAO_MINIMA,
+                    config.DISTANCIA_DISCRETIZACAO_MAXIMA,
+                    config.VARIAVEIS_AMBIENTAIS
+                )
+                resumo = self.geo_processor.resumo_discretizacao
+                self.logger.info(f"Discretização adaptativa: {resumo['pontos']} pontos "
+                               f"({resumo['reducao_percentual']:.1f}% a menos que o espaçamento fixo), "
+                               f"espaçamentos de {resumo['espacamento_minimo']:.0f}m a "
+                               f"{resumo['espacamento_maximo']:.0f}m")
+            else:
+                self.pontos_linha = self.geo_processor.discretizar_linha(
+                    self.dados_linha, 
+                    config.DISTANCIA_DISCRETIZACAO
+                )
             
             self.logger.info(f"Linha discretizada em {len(self.pontos_linha)} pontos")
             
@@ -192,11 +217,19 @@ class AnalisadorRiscoTermico:
     def _executar_krigagem(self):
         """Executa a krigagem para todas as horas e variáveis."""
         try:
-            self.resultados_krigagem = self.geo_processor.executar_krigagem_horaria(
-                self.dados_sincronizados,
-                self.pontos_linha,
-                config.VARIAVEIS_AMBIENTAIS
-            )
+            if config.DIRETORIO_ESTADO_KRIGAGEM:
+                # Reaproveita o estado salvo e kriga apenas as horas novas
+                self.resultados_krigagem = self.geo_processor.atualizar_krigagem(
+                    self.dados_sincronizados,
+                    self.pontos_linha,
+                    config.VARIAVEIS_AMBIENTAIS
+                )
+            else:
+                self.resultados_krigagem = self.geo_processor.executar_krigagem_horaria(
+                    self.dados_sincronizados,
+                    self.pontos_linha,
+                    config.VARIAVEIS_AMBIENTAIS
+                )
             
             # Validar resultados
             estatisticas_krigagem = self.geo_processor.validar_resultados_krigagem(
@@ -222,17 +255,26 @@ class AnalisadorRiscoTermico:
             stats_file = os.path.join(config.SAIDA_DIR, 'estatisticas_krigagem.csv')
             stats_data = []
             
-            for hora, resultados_hora in list(self.resultados_krigagem.items())[:10]:  # Apenas primeiras 10 horas
-                for variavel, resultado_var in resultados_hora.items():
+            num_horas_resumo = min(10, len(self.resultados_krigagem))  # Apenas primeiras 10 horas
+            for variavel in self.resultados_krigagem.variaveis:
+                medias = self.resultados_krigagem.media(variavel)[:num_horas_resumo]
+                variancias = self.resultados_krigagem.variancia(variavel)[:num_horas_resumo]
+                for idx_hora in range(num_horas_resumo):
                     stats_data.append({
-                        'hora': hora,
+                        'hora': self.resultados_krigagem.horas[idx_hora],
                         'variavel': variavel,
-                        'media_min': np.nanmin(resultado_var['media']),
-                        'media_max': np.nanmax(resultado_var['media']),
-                        'variancia_media': np.nanmean(resultado_var['variancia'])
+                        'media_min': np.nanmin(medias[idx_hora]),
+                        'media_max': np.nanmax(medias[idx_hora]),
+                        'variancia_media': np.nanmean(variancias[idx_hora])
                     })
             
             pd.DataFrame(stats_data).to_csv(stats_file, index=False)
+            
+            # Fatores da covariância posterior da krigagem entre os pontos da linha
+            if self.resultados_krigagem.covariancia is not None:
+                covariancia_file = os.path.join(config.SAIDA_DIR, 'covariancia_posterior_krigagem.npz')
+                self.resultados_krigagem.covariancia.salvar(covariancia_file)
+            
             self.logger.info("Dados intermediários salvos")
             
         except Exception as e:
@@ -244,8 +286,13 @@ class AnalisadorRiscoTermico:
             # Modelo térmico CIGRE
             self.modelo_termico = CigreModeloTermico(self.parametros_cabo)
             
+            # Banco de resíduos para o método 'bootstrap'
+            banco_residuos = None
+            if config.METODO_AMOSTRAGEM_MC == 'bootstrap':
+                banco_residuos = self._preparar_banco_residuos()
+            
             # Simulador Monte Carlo
-            self.simulador_mc = MonteCarloSimulator(self.modelo_termico)
+            self.simulador_mc = MonteCarloSimulator(self.modelo_termico, banco_residuos=banco_residuos)
             
             # Analisador de risco
             self.risk_analyzer = RiskAnalyzer()
@@ -256,74 +303,121 @@ class AnalisadorRiscoTermico:
             self.logger.error(f"Erro ao inicializar modelos: {e}")
             raise
 
+    def _preparar_banco_residuos(self):
+        """
+        Carrega o banco de resíduos de validação cruzada ou o constrói a partir dos dados.
+        
+        Returns:
+            BancoResiduos: Banco estratificado por hora do dia e estação do ano
+        """
+        if os.path.exists(config.ARQUIVO_BANCO_RESIDUOS):
+            self.logger.info(f"Carregando banco de resíduos de {config.ARQUIVO_BANCO_RESIDUOS}")
+            return BancoResiduos.carregar(config.ARQUIVO_BANCO_RESIDUOS)
+        
+        self.logger.info("Construindo banco de resíduos de validação cruzada da krigagem...")
+        timestamps, residuos = self.geo_processor.calcular_residuos_validacao_cruzada(
+            self.dados_sincronizados, config.VARIAVEIS_AMBIENTAIS
+        )
+        banco = BancoResiduos.construir(timestamps, residuos)
+        banco.salvar(config.ARQUIVO_BANCO_RESIDUOS)
+        return banco
+
     def _executar_simulacoes(self):
         """Executa as simulações Monte Carlo para todos os pontos e horas."""
         total_combinacoes = len(self.pontos_linha) * len(self.resultados_krigagem)
         combinacoes_processadas = 0
+        total_simulacoes = 0
+        total_pontos_validos = 0
         
         self.logger.info(f"Iniciando simulações para {total_combinacoes} combinações ponto-hora")
         
         # Configurações da simulação
         corrente_operacao = config.CORRENTE_PADRAO
         temperatura_max_projeto = config.TEMPERATURA_MAX_PROJETO
+        azimutes = self.pontos_linha['azimute'].values
+        
+        # Intervalo de log de progresso (~1000 combinações)
+        intervalo_log_horas = max(1, 1000 // max(1, len(self.pontos_linha)))
         
-        # Iterar sobre cada ponto da linha
-        for idx_ponto, ponto in self.pontos_linha.iterrows():
-            self.logger.info(f"=== PONTO {idx_ponto + 1}/{len(self.pontos_linha)} - Coordenadas: ({ponto['latitude']:.4f}, {ponto['longitude']:.4f}) ===")
+        # Iterar sobre cada hora (visões do tensor de resultados da krigagem)
+        for idx_hora, hora in enumerate(self.resultados_krigagem.horas):
+            dados_hora_krigagem = self.resultados_krigagem.obter_hora(idx_hora)
+            
+            # Agrupar pontos com entradas praticamente idênticas nesta hora
+            grupos = self._agrupar_pontos_hora(dados_hora_krigagem, azimutes)
+            
+            pontos_validos_hora = sum(len(membros) for membros in grupos)
+            total_pontos_validos += pontos_validos_hora
+            total_simulacoes += len(grupos)
             
-            temperaturas_calculadas_ponto = 0
+            if grupos:
+                self.logger.debug(f"Hora {hora}: {pontos_validos_hora} pontos válidos em {len(grupos)} grupos")
             
-            # Iterar sobre cada hora
-            for hora, dados_hora_krigagem in self.resultados_krigagem.items():
+            # Grupos simulados (não triados) aguardando a ampacidade probabilística
+            pendentes_ampacidade = []
+            
+            for membros in grupos:
+                idx_representante = membros[0]
+                ponto_representante = self.pontos_linha.iloc[idx_representante]
+                
                 try:
-                    # Verificar se há dados válidos para este ponto/hora
-                    if not self._verificar_dados_validos(dados_hora_krigagem, idx_ponto):
-                        combinacoes_processadas += 1
-                        continue
-                    
-                    # Extrair médias e desvios para este ponto
+                    # Extrair médias e desvios do representante do grupo
                     medias_ambientais, desvios_ambientais = self._extrair_dados_krigagem(
-                        dados_hora_krigagem, idx_ponto
+                        dados_hora_krigagem, idx_representante
                     )
                     
                     # Log dos valores da krigagem
                     data_hora = pd.to_datetime(hora)
                     self.logger.info(f"Timestamp: {data_hora.strftime('%Y-%m-%d %H:%M')} - "
+                                   f"Ponto {idx_representante + 1} ({len(membros)} no grupo) - "
                                    f"Temp: {medias_ambientais['temperatura_ar']:.1f}°C, "
                                    f"Rad: {medias_ambientais['radiacao_global']:.0f}W/m², "
                                    f"Vento: {np.sqrt(medias_ambientais['vento_u']**2 + medias_ambientais['vento_v']**2):.1f}m/s")
                     
-                    # Executar simulação Monte Carlo
+                    # Executar simulação Monte Carlo (uma vez por grupo)
                     resultado_mc = self.simulador_mc.executar_simulacao(
                         medias_ambientais=medias_ambientais,
                         desvios_ambientais=desvios_ambientais,
-                        azimute_linha=ponto['azimute'],
+                        azimute_linha=ponto_representante['azimute'],
                         corrente=corrente_operacao,
-                        num_iteracoes=config.NUM_ITERACOES_MC
+                        num_iteracoes=config.NUM_ITERACOES_MC,
+                        metodo_amostragem=config.METODO_AMOSTRAGEM_MC,
+                        hora=hora
                     )
                     
-                    temperaturas_calculadas_ponto += 1
+                    if resultado_mc['iteracoes_validas'] == 0 and not resultado_mc['triagem']:
+                        continue
                     
-                    # Análise de risco
-                    if resultado_mc['iteracoes_validas'] > 0:
-                        temp_p90 = resultado_mc['estatisticas']['percentil_90']
+                    # Análise de risco (compartilhada pelos membros do grupo)
+                    temp_p90 = resultado_mc['estatisticas']['percentil_90']
+                    if resultado_mc['triagem']:
+                        risco_termico = 0.0
+                    else:
                         risco_termico = self.risk_analyzer.calcular_risco_termico(
                             resultado_mc['temperaturas'], 
                             temperatura_max_projeto
                         )
+                    
+                    # Distribuir o resultado para cada membro do grupo
+                    registros_grupo = []
+                    for idx_ponto in membros:
+                        ponto = self.pontos_linha.iloc[idx_ponto]
+                        medias_ponto, desvios_ponto = self._extrair_dados_krigagem(
+                            dados_hora_krigagem, idx_ponto
+                        )
                         
                         # Calcular ampacidade
                         ampacidade = self.modelo_termico.calcular_ampacidade(
                             temperatura_max_projeto,
-                            medias_ambientais['radiacao_global'],
+                            medias_ponto['radiacao_global'],
                             ponto['azimute'],
-                            medias_ambientais['vento_velocidade'] if 'vento_velocidade' in medias_ambientais else 1.0,
+                            medias_ponto['vento_velocidade'] if 'vento_velocidade' in medias_ponto else 1.0,
                             0,  # Ângulo do vento (simplificado)
-                            medias_ambientais['temperatura_ar']
+                            medias_ponto['temperatura_ar']
                         )
                         
                         # Armazenar resultado
-                        self.resultados_finais.append({
+                        registros_grupo.append({
                             'hora': hora,
                             'ponto_id': idx_ponto,
                             'latitude': ponto['latitude'],
@@ -331,52 +425,280 @@ class AnalisadorRiscoTermico:
                             'progressiva': ponto.get('progressiva_aprox', idx_ponto),
                             'azimute': ponto['azimute'],
                             'corrente_operacao': corrente_operacao,
-                            'temperatura_ar_media': medias_ambientais['temperatura_ar'],
-                            'radiacao_media': medias_ambientais['radiacao_global'],
-                            'vento_u_media': medias_ambientais['vento_u'],
-                            'vento_v_media': medias_ambientais['vento_v'],
-                            'temperatura_ar_var': desvios_ambientais['temperatura_ar']**2,
-                            'radiacao_var': desvios_ambientais['radiacao_global']**2,
-                            'vento_u_var': desvios_ambientais['vento_u']**2,
-                            'vento_v_var': desvios_ambientais['vento_v']**2,
+                            'temperatura_ar_media': medias_ponto['temperatura_ar'],
+                            'radiacao_media': medias_ponto['radiacao_global'],
+                            'vento_u_media': medias_ponto['vento_u'],
+                            'vento_v_media': medias_ponto['vento_v'],
+                            'temperatura_ar_var': desvios_ponto['temperatura_ar']**2,
+                            'radiacao_var': desvios_ponto['radiacao_global']**2,
+                            'vento_u_var': desvios_ponto['vento_u']**2,
+                            'vento_v_var': desvios_ponto['vento_v']**2,
                             'temperatura_condutor_media': resultado_mc['estatisticas']['media'],
                             'temperatura_condutor_p90': temp_p90,
                             'temperatura_condutor_p95': resultado_mc['estatisticas']['percentil_95'],
                             'risco_termico': risco_termico,
                             'ampacidade_calculada': ampacidade,
                             'iteracoes_validas': resultado_mc['iteracoes_validas'],
-                            'taxa_sucesso_mc': resultado_mc['taxa_sucesso']
+                            'taxa_sucesso_mc': resultado_mc['taxa_sucesso'],
+                            'triagem': resultado_mc['triagem']
                         })
                     
+                    self.resultados_finais.extend(registros_grupo)
+                    if not resultado_mc['triagem']:
+                        pendentes_ampacidade.append((idx_representante, registros_grupo))
+                    
                 except Exception as e:
-                    self.logger.warning(f"Erro na simulação para ponto {idx_ponto}, hora {hora}: {e}")
-                
-                combinacoes_processadas += 1
-                
-                # Log de progresso a cada 1000 cálculos
-                if combinacoes_processadas % 1000 == 0:
-                    progresso = 100 * combinacoes_processadas / total_combinacoes
-                    self.logger.info(f"Progresso geral: {progresso:.1f}% "
-                                   f"({combinacoes_processadas}/{total_combinacoes})")
+                    self.logger.warning(f"Erro na simulação para ponto {idx_representante}, hora {hora}: {e}")
+            
+            # Ampacidade probabilística uma vez por representante de grupo simulado; grupos
+            # triados são claramente seguros na corrente de operação e ficam sem as colunas
+            if config.AMPACIDADE_PROBABILISTICA_ATIVA and pendentes_ampacidade:
+                self._calcular_ampacidades_risco(dados_hora_krigagem, azimutes, hora, pendentes_ampacidade)
             
-            # Log do progresso por ponto
-            self.logger.info(f"Ponto {idx_ponto + 1} concluído: {temperaturas_calculadas_ponto} temperaturas calculadas")
+            combinacoes_processadas += len(self.pontos_linha)
+            
+            # Log de progresso a cada ~1000 cálculos
+            if (idx_hora + 1) % intervalo_log_horas == 0:
+                progresso = 100 * combinacoes_processadas / total_combinacoes
+                self.logger.info(f"Progresso geral: {progresso:.1f}% "
+                               f"({combinacoes_processadas}/{total_combinacoes})")
+        
+        # Manter a ordenação ponto/hora dos resultados
+        self.resultados_finais.sort(key=lambda r: (r['ponto_id'], r['hora']))
         
         self.logger.info(f"Simulações concluídas: {len(self.resultados_finais)} resultados válidos")
+        
+        if total_simulacoes > 0:
+            self.logger.info(f"Agrupamento de pontos: {total_pontos_validos} combinações ponto-hora válidas "
+                           f"resolvidas com {total_simulacoes} simulações "
+                           f"(taxa de compressão {total_pontos_validos / total_simulacoes:.2f}x)")
+        
+        if config.TRIAGEM_DETERMINISTICA_ATIVA:
+            self.logger.info(f"Triagem determinística: {self.simulador_mc.cenarios_triados}/"
+                           f"{self.simulador_mc.cenarios_avaliados} cenários dispensaram o Monte Carlo "
+                           f"({self.simulador_mc.obter_fracao_triagem():.1%})")
+
+        # Estatísticas do cache de simulação
+        if self.simulador_mc.cache is not None:
+            stats_cache = self.simulador_mc.cache.obter_estatisticas()
+            self.logger.info(f"Cache de simulação: {stats_cache['acertos']} acertos "
+                           f"({stats_cache['acertos_disco']} do disco), {stats_cache['falhas']} falhas, "
+                           f"{stats_cache['remocoes']} remoções - taxa de acerto {stats_cache['taxa_acerto']:.1%}")
+            self.simulador_mc.cache.fechar()
+
+    def _calcular_ampacidades_risco(self, dados_hora_krigagem, azimutes, hora, pendentes):
+        """
+        Acrescenta a ampacidade por nível de risco aos registros dos grupos de uma hora.
+        
+        Args:
+            dados_hora_krigagem (dict): Médias e variâncias da hora por variável
+            azimutes (np.array): Azimute de cada ponto da linha
+            hora (pd.Timestamp): Hora dos cenários
+            pendentes (list): Pares (índice do representante, registros do grupo)
+        """
+        representantes = np.array([idx for idx, _ in pendentes])
+        try:
+            resultado_ampacidade = self.simulador_mc.calcular_ampacidade_probabilistica(
+                {v: dados_hora_krigagem[v]['media'][representantes] for v in config.VARIAVEIS_AMBIENTAIS},
+                {v: np.sqrt(dados_hora_krigagem[v]['variancia'][representantes])
+                 for v in config.VARIAVEIS_AMBIENTAIS},
+                azimutes[representantes],
+                niveis_risco=self.risk_analyzer.obter_niveis_risco_nbr_5422(),
+                temperatura_max=config.TEMPERATURA_MAX_PROJETO,
+                num_iteracoes=config.NUM_ITERACOES_MC,
+                metodo_amostragem=config.METODO_AMOSTRAGEM_MC,
+                hora=hora
+            )
+        except Exception as e:
+            self.logger.warning(f"Erro na ampacidade probabilística da hora {hora}: {e}")
+            return
+        
+        for posicao, (_, registros) in enumerate(pendentes):
+            colunas = {
+                f'ampacidade_risco_{nivel * 100:g}pct': resultado_ampacidade['ampacidades'][posicao, j]
+                for j, nivel in enumerate(resultado_ampacidade['niveis_risco'])
+            }
+            for registro in registros:
+                registro.update(colunas)
 
-    def _verificar_dados_validos(self, dados_hora_krigagem, idx_ponto):
-        """Verifica se há dados válidos para um ponto específico."""
+    def _executar_simulacao_conjunta_linha(self):
+        """
+        Executa, para cada hora, a simulação espacialmente correlacionada de toda a linha.
+        
+        Os resultados (probabilidade de excedência em algum vão e localização do
+        vão mais quente) são salvos em saida/risco_linha_horario.csv.
+        """
+        coordenadas = self.pontos_linha[['x', 'y']].values
+        azimutes = self.pontos_linha['azimute'].values
+        progressivas = self.pontos_linha.get('progressiva_aprox', pd.Series(np.arange(len(self.pontos_linha)))).values
+        
+        for idx_hora, hora in enumerate(self.resultados_krigagem.horas):
+            try:
+                medias_pontos = {}
+                desvios_pontos = {}
+                for variavel in config.VARIAVEIS_AMBIENTAIS:
+                    medias_pontos[variavel] = np.asarray(self.resultados_krigagem.media(variavel)[idx_hora], dtype=float)
+                    desvios_pontos[variavel] = np.sqrt(np.asarray(
+                        self.resultados_krigagem.variancia(variavel)[idx_hora], dtype=float
+                    ))
+                
+                # A simulação conjunta requer dados válidos em todos os pontos
+                validos = np.all([np.isfinite(medias_pontos[v]) & np.isfinite(desvios_pontos[v])
+                                  for v in config.VARIAVEIS_AMBIENTAIS], axis=0)
+                if not np.all(validos):
+                    self.logger.debug(f"Hora {hora}: pontos sem dados válidos, simulação conjunta ignorada")
+                    continue
+                
+                # Covariância posterior da krigagem, quando disponível para todas as variáveis
+                fatores_covariancia = None
+                if self.resultados_krigagem.covariancia is not None:
+                    fatores_covariancia = {
+                        variavel: self.resultados_krigagem.covariancia.fator(idx_hora, variavel)
+                        for variavel in config.VARIAVEIS_AMBIENTAIS
+                    }
+                    if any(fator is None for fator in fatores_covariancia.values()):
+                        fatores_covariancia = None
+                
+                resultado = self.simulador_mc.executar_simulacao_linha(
+                    medias_pontos, desvios_pontos, azimutes, config.CORRENTE_PADRAO,
+                    coordenadas=coordenadas, fatores_covariancia=fatores_covariancia,
+                    num_iteracoes=config.NUM_ITERACOES_MC
+                )
+                
+                vao_critico = resultado['vao_critico_mais_provavel']
+                self.resultados_linha.append({
+                    'hora': hora,
+                    'risco_termico_linha': resultado['probabilidade_excedencia_linha'],
+                    'risco_termico_maximo_ponto': np.nanmax(resultado['probabilidade_excedencia_pontos']),
+                    'ponto_critico_mais_provavel': vao_critico,
+                    'progressiva_critica': progressivas[vao_critico] if vao_critico >= 0 else np.nan,
+                    'frequencia_ponto_critico': resultado['distribuicao_vao_critico'][vao_critico] if vao_critico >= 0 else np.nan,
+                    'temperatura_maxima_linha_p90': resultado['estatisticas_maxima_linha']['percentil_90'],
+                    'amostras_validas': resultado['amostras_validas']
+                })
+                
+            except Exception as e:
+                self.logger.warning(f"Erro na simulação conjunta da linha para hora {hora}: {e}")
+        
+        if self.resultados_linha:
+            arquivo_linha = os.path.join(config.SAIDA_DIR, 'risco_linha_horario.csv')
+            pd.DataFrame(self.resultados_linha).to_csv(arquivo_linha, index=False)
+            self.logger.info(f"Simulação conjunta: {len(self.resultados_linha)} horas salvas em {arquivo_linha}")
+
+    def _executar_trajetorias_temporais(self):
+        """
+        Simula, para cada ponto da linha, trajetórias multi-horárias correlacionadas no tempo.
+        
+        As estatísticas de duração das excedências e de eventos por período são
+        salvas em saida/duracao_excedencias.csv.
+        """
+        horas = self.resultados_krigagem.horas
+        
+        # Persistência dos resíduos ajustada uma vez às séries de validação cruzada das estações
+        coeficientes_ar = None
+        try:
+            horas_residuos, residuos_series = self.geo_processor.calcular_series_residuos_validacao_cruzada(
+                self.dados_sincronizados, config.VARIAVEIS_AMBIENTAIS
+            )
+            coeficientes_ar = self.simulador_mc.ajustar_processos_ar(residuos_series, horas_residuos)
+        except Exception as e:
+            self.logger.warning(f"Processo AR dos resíduos indisponível; usando as anomalias da série krigada: {e}")
+        
+        for idx_ponto in range(len(self.pontos_linha)):
+            try:
+                # Série temporal do ponto lida diretamente do tensor (horas × pontos)
+                medias_series = {}
+                desvios_series = {}
+                for variavel in config.VARIAVEIS_AMBIENTAIS:
+                    medias_series[variavel] = np.asarray(
+                        self.resultados_krigagem.media(variavel)[:, idx_ponto], dtype=float
+                    )
+                    desvios_series[variavel] = np.sqrt(np.asarray(
+                        self.resultados_krigagem.variancia(variavel)[:, idx_ponto], dtype=float
+                    ))
+                
+                # Horas sem dados válidos viram lacunas na série
+                validas = np.all([np.isfinite(medias_series[v]) & np.isfinite(desvios_series[v])
+                                  for v in config.VARIAVEIS_AMBIENTAIS], axis=0)
+                timestamps = pd.DatetimeIndex(horas)[validas]
+                
+                resultado = self.simulador_mc.simular_trajetorias_temporais(
+                    {v: medias_series[v][validas] for v in config.VARIAVEIS_AMBIENTAIS},
+                    {v: desvios_series[v][validas] for v in config.VARIAVEIS_AMBIENTAIS},
+                    timestamps, self.pontos_linha.iloc[idx_ponto]['azimute'], config.CORRENTE_PADRAO,
+                    coeficientes_ar=coeficientes_ar
+                )
+                
+                estatisticas = resultado['estatisticas_duracao']
+                eventos = resultado['eventos_por_periodo']
+                self.resultados_trajetorias.append({
+                    'ponto_id': idx_ponto,
+                    'eventos_por_trajetoria': estatisticas['eventos_por_trajetoria'],
+                    'duracao_media_h': estatisticas['duracao_media'],
+                    'duracao_p90_h': estatisticas['duracao_p90'],
+                    'duracao_maxima_h': estatisticas['duracao_maxima'],
+                    'eventos_medio_por_periodo': eventos['eventos_medio'].mean(),
+                    'probabilidade_evento_por_periodo': eventos['probabilidade_evento'].mean()
+                })
+                
+            except Exception as e:
+                self.logger.warning(f"Erro na simulação de trajetórias para ponto {idx_ponto}: {e}")
+        
+        if self.resultados_trajetorias:
+            arquivo_trajetorias = os.path.join(config.SAIDA_DIR, 'duracao_excedencias.csv')
+            pd.DataFrame(self.resultados_trajetorias).to_csv(arquivo_trajetorias, index=False)
+            self.logger.info(f"Trajetórias: {len(self.resultados_trajetorias)} pontos salvos em {arquivo_trajetorias}")
+
+    def _agrupar_pontos_hora(self, dados_hora_krigagem, azimutes):
+        """
+        Agrupa os pontos da linha com entradas praticamente idênticas em uma hora.
+        
+        Pontos cujas médias, desvios e azimute caem na mesma célula de tolerância
+        (config.TOLERANCIAS_AGRUPAMENTO_*) são simulados uma única vez.
+        
+        Args:
+            dados_hora_krigagem (dict): Resultados da krigagem da hora
+            azimutes (np.array): Azimute de cada ponto da linha
+            
+        Returns:
+            list: Lista de grupos; cada grupo é a lista de índices dos pontos,
+                  sendo o primeiro o representante simulado
+        """
+        colunas = []
+        tolerancias = []
+        
         for variavel in config.VARIAVEIS_AMBIENTAIS:
             if variavel not in dados_hora_krigagem:
-                return False
-            
-            media = dados_hora_krigagem[variavel]['media'][idx_ponto]
-            variancia = dados_hora_krigagem[variavel]['variancia'][idx_ponto]
-            
-            if np.isnan(media) or np.isnan(variancia):
-                return False
+                return []
+            colunas.append(dados_hora_krigagem[variavel]['media'])
+            colunas.append(np.sqrt(dados_hora_krigagem[variavel]['variancia']))
+            tolerancias.append(config.TOLERANCIAS_AGRUPAMENTO_MEDIAS[variavel])
+            tolerancias.append(config.TOLERANCIAS_AGRUPAMENTO_DESVIOS[variavel])
+        
+        colunas.append(np.asarray(azimutes, dtype=float))
+        tolerancias.append(config.TOLERANCIA_AGRUPAMENTO_AZIMUTE)
+        
+        entradas = np.column_stack(colunas)
+        
+        # Descartar pontos sem dados válidos
+        indices_validos = np.where(np.all(np.isfinite(entradas), axis=1))[0]
+        if len(indices_validos) == 0:
+            return []
+        
+        if not config.AGRUPAMENTO_PONTOS_ATIVO:
+            return [[int(idx)] for idx in indices_validos]
+        
+        # Quantizar entradas pela tolerância e agrupar células idênticas
+        celulas = np.floor(entradas[indices_validos] / np.array(tolerancias)).astype(np.int64)
+        _, rotulos = np.unique(celulas, axis=0, return_inverse=True)
+        rotulos = rotulos.ravel()
+        
+        grupos = {}
+        for idx, rotulo in zip(indices_validos, rotulos):
+            grupos.setdefault(rotulo, []).append(int(idx))
         
-        return True
+        # Ordenar grupos pelo ponto representante
+        return sorted(grupos.values(), key=lambda membros: membros[0])
 
     def _extrair_dados_krigagem(self, dados_hora_krigagem, idx_ponto):
         """Extrai médias e desvios padrão dos resultados da krigagem."""
@@ -425,6 +747,10 @@ class AnalisadorRiscoTermico:
                 f.write(f"Data/Hora: {datetime.now()}\n")
                 f.write(f"Resultados válidos: {len(self.resultados_finais)}\n")
                 f.write(f"Pontos da linha: {len(self.pontos_linha)}\n")
+                resumo_discretizacao = self.geo_processor.resumo_discretizacao if self.geo_processor else None
+                if resumo_discretizacao:
+                    f.write(f"Discretização adaptativa: {resumo_discretizacao['pontos_espacamento_fixo']} pontos "
+                            f"com espaçamento fixo, redução de {resumo_discretizacao['reducao_percentual']:.1f}%\n")
                 f.write(f"Horas processadas: {len(self.resultados_krigagem)}\n")
                 f.write(f"Estações meteorológicas: {len(self.dados_estacoes)}\n")
                 f.write(f"Corrente de operação: {config.CORRENTE_PADRAO} A\n")
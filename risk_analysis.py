@@ -31,6 +31,16 @@ class RiskAnalyzer:
             'risco_critico': {'limite': float('inf'), 'descricao': 'Risco crítico (> 10%)'}
         }
 
+    def obter_niveis_risco_nbr_5422(self):
+        """
+        Retorna os limites finitos de probabilidade de excedência dos critérios NBR 5422.
+        
+        Returns:
+            list: Limites em ordem crescente (ex.: [0.01, 0.05, 0.10])
+        """
+        return sorted(criterio['limite'] for criterio in self.criterios_nbr_5422.values()
+                      if np.isfinite(criterio['limite']))
+
     def calcular_temperatura_confianca(self, temperaturas_distribuicao, percentil=None):
         """
         Calcula a temperatura do condutor correspondente a um percentil da distribuição.
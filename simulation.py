@@ -1,10 +1,21 @@
 # Módulo para a Simulação de Monte Carlo
+import hashlib
 import numpy as np
 import logging
+import itertools
+import math
+import os
+import shelve
+import time
+from collections import OrderedDict
 import config
 from thermal_model import CigreModeloTermico
+from distributions import AmostradorDistribuicoes, BancoResiduos
 import warnings
+import pandas as pd
 from scipy import stats
+from scipy.linalg import solve_toeplitz
+from scipy.signal import lfilter
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +25,17 @@ class MonteCarloSimulator:
     propagação de incertezas na temperatura do condutor.
     """
     
-    def __init__(self, modelo_termico):
+    def __init__(self, modelo_termico, cache=None, amostrador=None, banco_residuos=None):
         """
         Inicializa o simulador Monte Carlo.
         
         Args:
             modelo_termico (CigreModeloTermico): Instância do modelo térmico
+            cache (CacheSimulacao): Cache de resultados (opcional; criado conforme
+                config.CACHE_SIMULACAO_ATIVO quando omitido)
+            amostrador (AmostradorDistribuicoes): Motor de distribuições do método
+                'distribuicoes' (opcional; criado a partir do config quando omitido)
+            banco_residuos (BancoResiduos): Banco de resíduos do método 'bootstrap' (opcional)
         """
         if not isinstance(modelo_termico, CigreModeloTermico):
             raise TypeError("modelo_termico deve ser uma instância de CigreModeloTermico")
@@ -27,11 +43,32 @@ class MonteCarloSimulator:
         self.modelo_termico = modelo_termico
         self.num_iteracoes_padrao = config.NUM_ITERACOES_MC
         
+        if cache is None and config.CACHE_SIMULACAO_ATIVO:
+            cache = CacheSimulacao()
+        self.cache = cache
+        
+        if amostrador is None:
+            amostrador = AmostradorDistribuicoes()
+        self.amostrador = amostrador
+        self.banco_residuos = banco_residuos
+        
+        # Bloco de números aleatórios comuns (gerado sob demanda)
+        self._bloco_normal = None
+        self._buffer_amostras = None
+        
+        # Projeto experimental compartilhado do caos polinomial (gerado sob demanda)
+        self._projeto_caos = None
+        
+        # Contadores da triagem determinística
+        self.cenarios_avaliados = 0
+        self.cenarios_triados = 0
+        
         logger.info(f"Simulador Monte Carlo inicializado com {self.num_iteracoes_padrao} iterações padrão")
 
     def executar_simulacao(self, medias_ambientais, desvios_ambientais, azimute_linha,
                           corrente, num_iteracoes=None, metodo_amostragem='normal',
-                          semente_aleatoria=None):
+                          semente_aleatoria=None, usar_cache=True, numeros_comuns=None,
+                          forcar_simulacao=False, hora=None):
         """
         Executa a simulação de Monte Carlo.
         
@@ -41,28 +78,95 @@ class MonteCarloSimulator:
             azimute_linha (float): Azimute da linha em graus
             corrente (float): Corrente elétrica em A
             num_iteracoes (int): Número de iterações (opcional)
-            metodo_amostragem (str): Método de amostragem ('normal', 'lognormal', 'triangular')
+            metodo_amostragem (str): Método de amostragem ('normal', 'lognormal', 'triangular',
+                'distribuicoes', que usa o motor vetorizado de distribuições, ou
+                'bootstrap', que sorteia resíduos do banco de validação cruzada)
             semente_aleatoria (int): Semente para reprodutibilidade (opcional)
+            usar_cache (bool): Se deve consultar/alimentar o cache de resultados
+            numeros_comuns (bool): Se deve usar o bloco de números aleatórios comuns
+                (padrão: config.NUMEROS_ALEATORIOS_COMUNS)
+            forcar_simulacao (bool): Se deve ignorar a triagem determinística
+            hora (pd.Timestamp): Timestamp do cenário, usado para escolher o estrato
+                do banco de resíduos no método 'bootstrap' (opcional)
             
         Returns:
             dict: Resultados da simulação
         """
         if num_iteracoes is None:
             num_iteracoes = self.num_iteracoes_padrao
+        if numeros_comuns is None:
+            numeros_comuns = config.NUMEROS_ALEATORIOS_COMUNS
         
-        if semente_aleatoria is not None:
-            np.random.seed(semente_aleatoria)
+        estrato = None
+        if metodo_amostragem == 'bootstrap':
+            if self.banco_residuos is None:
+                raise ValueError("Método 'bootstrap' requer um banco de resíduos")
+            if hora is not None:
+                estrato = int(BancoResiduos.obter_estrato(pd.Timestamp(hora)))
         
-        logger.info(f"Iniciando simulação Monte Carlo com {num_iteracoes} iterações")
+        # Com números comuns o resultado depende apenas do bloco pré-gerado
+        semente_chave = semente_aleatoria
+        if numeros_comuns:
+            semente_chave = ('comum', config.SEMENTE_NUMEROS_COMUNS, config.AMOSTRAGEM_QUASI_ALEATORIA)
         
         # Validar dados de entrada
         self._validar_dados_entrada(medias_ambientais, desvios_ambientais)
+        self.cenarios_avaliados += 1
+        
+        # Triagem: cenários claramente seguros dispensam a amostragem
+        if config.TRIAGEM_DETERMINISTICA_ATIVA and not forcar_simulacao:
+            resultado_triagem = self.avaliar_triagem(
+                medias_ambientais, desvios_ambientais, azimute_linha, corrente,
+                metodo_amostragem=metodo_amostragem
+            )
+            if resultado_triagem is not None:
+                self.cenarios_triados += 1
+                return resultado_triagem
+        
+        # Consultar cache de resultados
+        chave_cache = None
+        if usar_cache and self.cache is not None:
+            chave_cache = self.cache.gerar_chave(
+                medias_ambientais, desvios_ambientais, azimute_linha, corrente,
+                (metodo_amostragem, estrato) if estrato is not None else metodo_amostragem,
+                num_iteracoes, semente_chave, self._assinatura_cache(metodo_amostragem)
+            )
+            resultado_cache = self.cache.obter(chave_cache)
+            if resultado_cache is not None:
+                logger.debug("Resultado da simulação obtido do cache")
+                return self._copiar_resultado_cache(resultado_cache, corrente, azimute_linha)
+        
+        logger.info(f"Iniciando simulação Monte Carlo com {num_iteracoes} iterações")
         
         # Executar simulação
-        resultados = self._executar_loop_simulacao(
-            medias_ambientais, desvios_ambientais, azimute_linha, corrente,
-            num_iteracoes, metodo_amostragem
-        )
+        if metodo_amostragem == 'bootstrap':
+            # Perturbações conjuntas sorteadas do banco (gather de índices)
+            rng = np.random.default_rng(semente_aleatoria)
+            residuos = self.banco_residuos.amostrar(num_iteracoes, estrato, rng)
+            variaveis_amostradas = {
+                var: medias_ambientais[var] + desvios_ambientais[var] * residuos[:, j]
+                for j, var in enumerate(['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v'])
+            }
+            resultados = self._resolver_cenario_vetorizado(variaveis_amostradas, azimute_linha, corrente)
+        elif numeros_comuns:
+            resultados = self._executar_simulacao_numeros_comuns(
+                medias_ambientais, desvios_ambientais, azimute_linha, corrente,
+                num_iteracoes, metodo_amostragem
+            )
+        elif metodo_amostragem == 'distribuicoes':
+            if semente_aleatoria is not None:
+                np.random.seed(semente_aleatoria)
+            
+            variaveis_amostradas = self.amostrador.amostrar(medias_ambientais, desvios_ambientais, num_iteracoes)
+            resultados = self._resolver_cenario_vetorizado(variaveis_amostradas, azimute_linha, corrente)
+        else:
+            if semente_aleatoria is not None:
+                np.random.seed(semente_aleatoria)
+            
+            resultados = self._executar_loop_simulacao(
+                medias_ambientais, desvios_ambientais, azimute_linha, corrente,
+                num_iteracoes, metodo_amostragem
+            )
         
         # Calcular estatísticas
         estatisticas = self._calcular_estatisticas(resultados['temperaturas'])
@@ -74,11 +178,13 @@ class MonteCarloSimulator:
             'iteracoes_validas': resultados['iteracoes_validas'],
             'iteracoes_com_erro': resultados['iteracoes_com_erro'],
             'taxa_sucesso': resultados['iteracoes_validas'] / num_iteracoes,
+            'triagem': False,
             'parametros': {
                 'num_iteracoes': num_iteracoes,
                 'corrente': corrente,
                 'azimute_linha': azimute_linha,
-                'metodo_amostragem': metodo_amostragem
+                'metodo_amostragem': metodo_amostragem,
+                'numeros_comuns': numeros_comuns
             }
         }
         
@@ -86,8 +192,153 @@ class MonteCarloSimulator:
         logger.info(f"Temperatura média: {estatisticas['media']:.2f}°C, "
                    f"P90: {estatisticas['percentil_90']:.2f}°C")
         
+        if chave_cache is not None:
+            self.cache.armazenar(chave_cache, resultado_final)
+        
         return resultado_final
 
+    def avaliar_triagem(self, medias_ambientais, desvios_ambientais, azimute_linha, corrente,
+                        temperatura_max=None, metodo_amostragem='normal'):
+        """
+        Triagem determinística de cenários claramente seguros.
+        
+        Resolve o balanço no canto pessimista da caixa média ± kσ: temperatura do ar
+        e radiação no limite superior e o menor vento da caixa incidindo paralelo à
+        linha. Como o resfriamento cresce com a velocidade e o ângulo do vento, esse
+        canto limita superiormente a temperatura em toda a caixa. Só vale para os
+        métodos de config.METODOS_AMOSTRAGEM_TRIAGEM, cujas caudas a caixa cobre, e
+        exige que o solver isole a raiz no canto pessimista.
+        
+        Args:
+            medias_ambientais (dict): Médias das variáveis ambientais
+            desvios_ambientais (dict): Desvios padrão das variáveis ambientais
+            azimute_linha (float): Azimute da linha em graus
+            corrente (float): Corrente elétrica em A
+            temperatura_max (float): Temperatura máxima (padrão: config.TEMPERATURA_MAX_PROJETO)
+            metodo_amostragem (str): Método de amostragem da simulação que a triagem dispensaria
+            
+        Returns:
+            dict: Resultado com risco nulo e estatísticas aproximadas, ou None se o
+                  cenário precisar de simulação completa
+        """
+        if metodo_amostragem not in config.METODOS_AMOSTRAGEM_TRIAGEM:
+            return None
+        if temperatura_max is None:
+            temperatura_max = config.TEMPERATURA_MAX_PROJETO
+        
+        k = config.K_SIGMA_TRIAGEM
+        
+        # Menor velocidade do vento dentro da caixa de (u, v)
+        vento_minimo = 0.0
+        for var in ['vento_u', 'vento_v']:
+            inferior = medias_ambientais[var] - k * desvios_ambientais[var]
+            superior = medias_ambientais[var] + k * desvios_ambientais[var]
+            vento_minimo += max(inferior, 0.0, -superior)**2
+        
+        pessimista = {
+            'temperatura_ar': medias_ambientais['temperatura_ar'] + k * desvios_ambientais['temperatura_ar'],
+            'radiacao_global': medias_ambientais['radiacao_global'] + k * desvios_ambientais['radiacao_global']
+        }
+        pessimista = {var: self._aplicar_limites_fisicos(var, valor) for var, valor in pessimista.items()}
+        
+        temp_pessimista, com_raiz = self.modelo_termico.resolver_temperatura_condutor_vetorizado(
+            corrente, np.array([pessimista['radiacao_global']]), azimute_linha,
+            np.array([np.sqrt(vento_minimo)]), np.array([0.0]),
+            np.array([pessimista['temperatura_ar']]), retornar_mascara=True
+        )
+        temp_pessimista = temp_pessimista[0]
+        
+        # Sem raiz isolada, a estimativa do solver não limita a temperatura
+        if (not com_raiz[0] or not np.isfinite(temp_pessimista)
+                or temp_pessimista > temperatura_max - config.MARGEM_TRIAGEM):
+            return None
+        
+        # Estatísticas aproximadas: valor central nas médias e desvio limitado pelo canto
+        temp_media = self._resolver_amostras_vetorizado(
+            {var: np.array([medias_ambientais[var]]) for var in
+             ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']},
+            azimute_linha, corrente
+        )[0]
+        if not np.isfinite(temp_media):
+            return None
+        
+        desvio = max(temp_pessimista - temp_media, 0.0) / k
+        
+        def percentil(p):
+            return min(temp_media + stats.norm.ppf(p / 100) * desvio, temp_pessimista)
+        
+        estatisticas = {
+            'media': temp_media,
+            'mediana': temp_media,
+            'desvio_padrao': desvio,
+            'minimo': temp_media - k * desvio,
+            'maximo': temp_pessimista,
+            'percentil_5': percentil(5),
+            'percentil_10': percentil(10),
+            'percentil_90': percentil(config.PERCENTIL_CONFIANCA),
+            'percentil_95': percentil(95),
+            'percentil_99': percentil(99)
+        }
+        
+        logger.debug(f"Cenário triado: pior caso {temp_pessimista:.1f}°C < {temperatura_max}°C")
+        
+        return {
+            'temperaturas': np.array([]),
+            'estatisticas': estatisticas,
+            'iteracoes_validas': 0,
+            'iteracoes_com_erro': 0,
+            'taxa_sucesso': 1.0,
+            'triagem': True,
+            'probabilidade_excedencia': 0.0,
+            'temperatura_pior_caso': temp_pessimista,
+            'parametros': {
+                'num_iteracoes': 0,
+                'corrente': corrente,
+                'azimute_linha': azimute_linha,
+                'metodo_amostragem': 'triagem',
+                'k_sigma': k
+            }
+        }
+
+    def obter_fracao_triagem(self):
+        """Retorna a fração dos cenários avaliados que foi resolvida pela triagem."""
+        if self.cenarios_avaliados == 0:
+            return 0.0
+        return self.cenarios_triados / self.cenarios_avaliados
+
+    def _assinatura_cache(self, metodo_amostragem):
+        """
+        Assinatura do modelo térmico e da amostragem que produzem um resultado.
+        
+        Entra na chave do cache para que resultados da camada persistente não sejam
+        reaproveitados após mudanças no cabo, nas constantes do modelo, nas
+        distribuições ou no banco de resíduos.
+        
+        Args:
+            metodo_amostragem (str): Método de amostragem da simulação
+            
+        Returns:
+            str: Hash hexadecimal
+        """
+        modelo = self.modelo_termico
+        resumo = hashlib.sha1(repr((
+            modelo.diametro, modelo.resistencia_ac_25, modelo.resistencia_ac_75,
+            modelo.emissividade, modelo.absortividade, modelo.sigma, modelo.g,
+            modelo.rho_ar_ref, modelo.nu_ar_ref, modelo.k_ar_ref
+        )).encode())
+        resumo.update(self.amostrador.assinatura().encode())
+        if metodo_amostragem == 'bootstrap' and self.banco_residuos is not None:
+            resumo.update(self.banco_residuos.assinatura().encode())
+        return resumo.hexdigest()
+
+    def _copiar_resultado_cache(self, resultado_cache, corrente, azimute_linha):
+        """Cria cópia rasa de um resultado do cache com os parâmetros da chamada atual."""
+        resultado = dict(resultado_cache)
+        resultado['parametros'] = dict(resultado_cache['parametros'])
+        resultado['parametros']['corrente'] = corrente
+        resultado['parametros']['azimute_linha'] = azimute_linha
+        return resultado
+
     def _validar_dados_entrada(self, medias_ambientais, desvios_ambientais):
         """Valida os dados de entrada da simulação."""
         variaveis_obrigatorias = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
@@ -160,6 +411,119 @@ class MonteCarloSimulator:
             'iteracoes_com_erro': iteracoes_com_erro
         }
 
+    def _executar_simulacao_numeros_comuns(self, medias_ambientais, desvios_ambientais,
+                                           azimute_linha, corrente, num_iteracoes, metodo_amostragem):
+        """
+        Executa a simulação reutilizando o bloco de números aleatórios comuns.
+        
+        Cada cenário aplica apenas sua transformação (média + desvio·z) ao bloco
+        pré-gerado, sem chamadas ao gerador aleatório, e resolve todas as amostras
+        com o solver vetorizado.
+        """
+        bloco = self.obter_bloco_normal(num_iteracoes)
+        variaveis = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
+        
+        if metodo_amostragem == 'distribuicoes':
+            variaveis_amostradas = self.amostrador.transformar(bloco, medias_ambientais, desvios_ambientais)
+        else:
+            variaveis_amostradas = {}
+            for j, var in enumerate(variaveis):
+                variaveis_amostradas[var] = self._transformar_bloco(
+                    var, bloco[:, j], self._buffer_amostras[j],
+                    medias_ambientais[var], desvios_ambientais[var], metodo_amostragem
+                )
+        
+        return self._resolver_cenario_vetorizado(variaveis_amostradas, azimute_linha, corrente)
+
+    def _resolver_cenario_vetorizado(self, variaveis_amostradas, azimute_linha, corrente):
+        """Resolve as amostras de um cenário e monta o resultado no formato do loop."""
+        temperaturas = self._resolver_amostras_vetorizado(variaveis_amostradas, azimute_linha, corrente)
+        validas = np.isfinite(temperaturas)
+        num_iteracoes = len(temperaturas)
+        
+        return {
+            'temperaturas': temperaturas[validas],
+            'iteracoes_validas': int(np.sum(validas)),
+            'iteracoes_com_erro': int(num_iteracoes - np.sum(validas))
+        }
+
+    def obter_bloco_normal(self, num_amostras):
+        """
+        Retorna o bloco (num_amostras, 4) de normais padrão comuns a todos os cenários.
+        
+        O bloco é gerado uma única vez com config.SEMENTE_NUMEROS_COMUNS (pseudoaleatório
+        ou Sobol embaralhado, conforme config.AMOSTRAGEM_QUASI_ALEATORIA) e só é
+        regenerado quando o número de amostras muda.
+        
+        Args:
+            num_amostras (int): Número de amostras do bloco
+            
+        Returns:
+            np.array: Bloco somente leitura de normais padrão
+        """
+        if self._bloco_normal is not None and self._bloco_normal.shape[0] == num_amostras:
+            return self._bloco_normal
+        
+        if config.AMOSTRAGEM_QUASI_ALEATORIA:
+            sobol = stats.qmc.Sobol(d=4, scramble=True, seed=config.SEMENTE_NUMEROS_COMUNS)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                uniformes = sobol.random(num_amostras)
+            bloco = stats.norm.ppf(np.clip(uniformes, 1e-12, 1 - 1e-12))
+        else:
+            rng = np.random.default_rng(config.SEMENTE_NUMEROS_COMUNS)
+            bloco = rng.standard_normal((num_amostras, 4))
+        
+        bloco.flags.writeable = False
+        self._bloco_normal = bloco
+        self._buffer_amostras = np.empty((4, num_amostras))
+        
+        logger.debug(f"Bloco de números aleatórios comuns gerado: {num_amostras} x 4")
+        return bloco
+
+    def _transformar_bloco(self, variavel, z, buffer, media, desvio, metodo):
+        """
+        Transforma uma coluna de normais padrão na distribuição da variável.
+        
+        Args:
+            variavel (str): Nome da variável ambiental
+            z (np.array): Normais padrão comuns
+            buffer (np.array): Buffer pré-alocado para o resultado
+            media (float): Média da variável
+            desvio (float): Desvio padrão da variável
+            metodo (str): Método de amostragem ('normal', 'lognormal', 'triangular')
+            
+        Returns:
+            np.array: Amostras da variável (no próprio buffer)
+        """
+        if metodo == 'normal' or (metodo == 'lognormal' and variavel != 'radiacao_global'):
+            np.multiply(z, desvio, out=buffer)
+            np.add(buffer, media, out=buffer)
+        elif metodo == 'lognormal':
+            if media > 0 and desvio > 0:
+                sigma = np.sqrt(np.log(1 + (desvio/media)**2))
+                mu = np.log(media**2 / np.sqrt(media**2 + desvio**2))
+                np.multiply(z, sigma, out=buffer)
+                np.add(buffer, mu, out=buffer)
+                np.exp(buffer, out=buffer)
+            else:
+                np.multiply(z, desvio, out=buffer)
+                np.add(buffer, media, out=buffer)
+                np.maximum(buffer, 0, out=buffer)
+        elif metodo == 'triangular':
+            # Inversa da CDF da triangular simétrica em [media - √6σ, media + √6σ]
+            meia_largura = np.sqrt(6) * desvio
+            u = stats.norm.cdf(z)
+            buffer[:] = np.where(
+                u < 0.5,
+                media - meia_largura + meia_largura * np.sqrt(2 * u),
+                media + meia_largura - meia_largura * np.sqrt(2 * (1 - u))
+            )
+        else:
+            raise ValueError(f"Método de amostragem desconhecido: {metodo}")
+        
+        return buffer
+
     def _amostrar_variaveis_ambientais(self, medias, desvios, metodo):
         """
         Amostra valores das variáveis ambientais usando o método especificado.
@@ -290,6 +654,55 @@ class MonteCarloSimulator:
         
         return True
 
+    def _reconstruir_vento_vetorizado(self, u, v):
+        """Versão vetorizada de _reconstruir_vento."""
+        velocidade = np.minimum(np.sqrt(u**2 + v**2), config.VENTO_VEL_MAX)
+        direcao = np.mod(np.degrees(np.arctan2(v, u)), 360)
+        
+        return {
+            'velocidade': velocidade,
+            'direcao': direcao
+        }
+
+    def _calcular_angulo_vento_vetorizado(self, direcao_vento, azimute_linha):
+        """Versão vetorizada de _calcular_angulo_vento."""
+        angulo = np.abs(direcao_vento - azimute_linha)
+        angulo = np.where(angulo > 180, 360 - angulo, angulo)
+        return np.where(angulo > 90, 180 - angulo, angulo)
+
+    def _resolver_amostras_vetorizado(self, variaveis_amostradas, azimute_linha, corrente,
+                                      tolerancia=0.01):
+        """
+        Resolve a temperatura do condutor para arrays de amostras ambientais.
+        
+        Args:
+            variaveis_amostradas (dict): Arrays amostrados de cada variável ambiental
+            azimute_linha (float or np.array): Azimute da linha (broadcast com as amostras)
+            corrente (float or np.array): Corrente elétrica em A
+            tolerancia (float): Tolerância do solver em °C
+            
+        Returns:
+            np.array: Temperaturas do condutor (NaN onde o resultado é inválido)
+        """
+        temperatura_ar = self._aplicar_limites_fisicos('temperatura_ar', variaveis_amostradas['temperatura_ar'])
+        radiacao = self._aplicar_limites_fisicos('radiacao_global', variaveis_amostradas['radiacao_global'])
+        u = self._aplicar_limites_fisicos('vento_u', variaveis_amostradas['vento_u'])
+        v = self._aplicar_limites_fisicos('vento_v', variaveis_amostradas['vento_v'])
+        
+        vento_info = self._reconstruir_vento_vetorizado(u, v)
+        angulo_vento = self._calcular_angulo_vento_vetorizado(vento_info['direcao'], azimute_linha)
+        
+        temperaturas = self.modelo_termico.resolver_temperatura_condutor_vetorizado(
+            corrente, radiacao, azimute_linha, vento_info['velocidade'], angulo_vento,
+            temperatura_ar, tolerancia=tolerancia
+        )
+        
+        # Mesmos critérios de _validar_temperatura_resultado
+        validas = (np.isfinite(temperaturas) & (temperaturas >= temperatura_ar - 5) &
+                   (temperaturas <= temperatura_ar + 200))
+        
+        return np.where(validas, temperaturas, np.nan)
+
     def _calcular_estatisticas(self, temperaturas):
         """
         Calcula estatísticas descritivas das temperaturas simuladas.
@@ -348,7 +761,7 @@ class MonteCarloSimulator:
         # Resultado base
         resultado_base = self.executar_simulacao(
             medias_ambientais, desvios_ambientais, azimute_linha, corrente, 
-            num_iteracoes_sensibilidade, semente_aleatoria=42
+            num_iteracoes_sensibilidade, semente_aleatoria=42, forcar_simulacao=True
         )
         
         temp_base = resultado_base['estatisticas']['percentil_90']
@@ -366,7 +779,7 @@ class MonteCarloSimulator:
                 try:
                     resultado_mod = self.executar_simulacao(
                         medias_modificadas, desvios_ambientais, azimute_linha, corrente,
-                        num_iteracoes_sensibilidade, semente_aleatoria=42
+                        num_iteracoes_sensibilidade, semente_aleatoria=42, forcar_simulacao=True
                     )
                     
                     temp_mod = resultado_mod['estatisticas']['percentil_90']
@@ -390,4 +803,1209 @@ class MonteCarloSimulator:
             'temperatura_base': temp_base,
             'sensibilidades': sensibilidades,
             'variavel_mais_sensivel': max(sensibilidades, key=lambda k: sensibilidades[k] if np.isfinite(sensibilidades[k]) else 0)
-        }
\ No newline at end of file
+        }
+
+    def executar_simulacao_multinivel(self, medias_ambientais, desvios_ambientais, azimute_linha,
+                                      corrente, temperatura_max=None, rmse_alvo=None,
+                                      tolerancias_niveis=None, semente_aleatoria=None):
+        """
+        Estima a probabilidade de excedência por Monte Carlo multinível (MLMC).
+        
+        O nível 0 resolve o balanço térmico com tolerância grosseira e muitas amostras;
+        cada nível l > 0 estima a correção entre as tolerâncias l e l-1 resolvendo as
+        mesmas amostras (números aleatórios comuns) nas duas precisões. O número de
+        amostras por nível é ajustado a partir das variâncias e custos observados
+        para atingir o RMSE alvo.
+        
+        Todos os níveis usam a bissecção vetorizada de
+        resolver_temperatura_condutor_vetorizado; a referência é o nível mais fino
+        (0,01 °C no padrão, a mesma xtol do brentq em resolver_temperatura_condutor),
+        e não o solver escalar brentq. A estimativa converge para a probabilidade
+        dessa bissecção, e o viés em relação ao brentq fica limitado pela
+        tolerância do último nível.
+        
+        Args:
+            medias_ambientais (dict): Médias das variáveis ambientais
+            desvios_ambientais (dict): Desvios padrão das variáveis ambientais
+            azimute_linha (float): Azimute da linha em graus
+            corrente (float): Corrente elétrica em A
+            temperatura_max (float): Temperatura máxima (padrão: config.TEMPERATURA_MAX_PROJETO)
+            rmse_alvo (float): RMSE alvo da probabilidade (padrão: config.MLMC_RMSE_ALVO)
+            tolerancias_niveis (list): Tolerâncias da bissecção por nível, da mais grosseira
+                à mais fina, que é a referência (padrão: config.MLMC_TOLERANCIAS)
+            semente_aleatoria (int): Semente para reprodutibilidade (opcional)
+            
+        Returns:
+            dict: Probabilidade de excedência, temperatura média, erro padrão e
+                  diagnóstico por nível (amostras, variâncias e custos)
+        """
+        if temperatura_max is None:
+            temperatura_max = config.TEMPERATURA_MAX_PROJETO
+        if rmse_alvo is None:
+            rmse_alvo = config.MLMC_RMSE_ALVO
+        if tolerancias_niveis is None:
+            tolerancias_niveis = config.MLMC_TOLERANCIAS
+        
+        self._validar_dados_entrada(medias_ambientais, desvios_ambientais)
+        
+        variaveis = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
+        num_niveis = len(tolerancias_niveis)
+        rng = np.random.default_rng(semente_aleatoria)
+        
+        # Somas acumuladas por nível: [indicador, indicador², temperatura, custo]
+        amostras = np.zeros(num_niveis, dtype=int)
+        soma_prob = np.zeros(num_niveis)
+        soma_prob2 = np.zeros(num_niveis)
+        soma_temp = np.zeros(num_niveis)
+        validas = np.zeros(num_niveis, dtype=int)
+        custo = np.zeros(num_niveis)
+        soma_fino = np.zeros(2)
+        
+        adicionais = np.full(num_niveis, config.MLMC_AMOSTRAS_PILOTO)
+        
+        logger.info(f"Iniciando MLMC com {num_niveis} níveis (RMSE alvo {rmse_alvo})")
+        
+        for _ in range(config.MLMC_MAX_RODADAS):
+            for nivel in np.flatnonzero(adicionais > 0):
+                n = int(adicionais[nivel])
+                variaveis_amostradas = {
+                    var: medias_ambientais[var] + desvios_ambientais[var] * rng.standard_normal(n)
+                    for var in variaveis
+                }
+                
+                inicio = time.perf_counter()
+                temp_fina = self._resolver_amostras_vetorizado(
+                    variaveis_amostradas, azimute_linha, corrente, tolerancia=tolerancias_niveis[nivel]
+                )
+                if nivel > 0:
+                    temp_grossa = self._resolver_amostras_vetorizado(
+                        variaveis_amostradas, azimute_linha, corrente, tolerancia=tolerancias_niveis[nivel - 1]
+                    )
+                else:
+                    temp_grossa = None
+                custo[nivel] += time.perf_counter() - inicio
+                
+                # Amostras inválidas em qualquer das precisões são descartadas do par
+                if temp_grossa is None:
+                    mascara = np.isfinite(temp_fina)
+                    correcao_prob = (temp_fina[mascara] > temperatura_max).astype(float)
+                    correcao_temp = temp_fina[mascara]
+                else:
+                    mascara = np.isfinite(temp_fina) & np.isfinite(temp_grossa)
+                    correcao_prob = ((temp_fina[mascara] > temperatura_max).astype(float) -
+                                     (temp_grossa[mascara] > temperatura_max).astype(float))
+                    correcao_temp = temp_fina[mascara] - temp_grossa[mascara]
+                
+                if nivel == num_niveis - 1:
+                    indicador_fino = temp_fina[mascara] > temperatura_max
+                    soma_fino += [np.sum(indicador_fino), len(indicador_fino)]
+                
+                amostras[nivel] += n
+                validas[nivel] += int(np.sum(mascara))
+                soma_prob[nivel] += np.sum(correcao_prob)
+                soma_prob2[nivel] += np.sum(correcao_prob**2)
+                soma_temp[nivel] += np.sum(correcao_temp)
+            
+            # Alocação ótima de Giles: N_l ∝ sqrt(V_l / C_l), metade do MSE para a variância
+            n_validas = np.maximum(validas, 1)
+            variancias = np.maximum(soma_prob2 / n_validas - (soma_prob / n_validas)**2, 1e-12)
+            custos = custo / amostras
+            
+            amostras_otimas = np.ceil(
+                2.0 / rmse_alvo**2 * np.sqrt(variancias / custos) * np.sum(np.sqrt(variancias * custos))
+            )
+            amostras_otimas = np.minimum(amostras_otimas, config.MLMC_MAX_AMOSTRAS_NIVEL)
+            adicionais = np.maximum(0, amostras_otimas - amostras).astype(int)
+            
+            if not np.any(adicionais > 0):
+                break
+        else:
+            logger.warning("MLMC atingiu o número máximo de rodadas de alocação")
+        
+        medias_nivel = soma_prob / n_validas
+        probabilidade = float(np.clip(np.sum(medias_nivel), 0.0, 1.0))
+        temperatura_media = float(np.sum(soma_temp / n_validas))
+        erro_padrao = float(np.sqrt(np.sum(variancias / n_validas)))
+        
+        # Custo equivalente de um Monte Carlo de nível único na precisão mais fina
+        prob_fina = soma_fino[0] / max(soma_fino[1], 1)
+        custo_fino = custo[-1] / amostras[-1] if num_niveis == 1 else custos[-1] / 2
+        custo_mono_nivel = max(prob_fina * (1 - prob_fina), 1e-12) / (rmse_alvo**2 / 2) * custo_fino
+        custo_total = float(np.sum(custo))
+        
+        logger.info(f"MLMC concluído: P(excedência)={probabilidade:.4f} ± {erro_padrao:.4f}, "
+                   f"amostras por nível {amostras.tolist()}")
+        
+        return {
+            'probabilidade_excedencia': probabilidade,
+            'temperatura_media': temperatura_media,
+            'erro_padrao': erro_padrao,
+            'amostras_por_nivel': amostras,
+            'variancias_nivel': variancias,
+            'custos_nivel': custos,
+            'custo_total': custo_total,
+            'custo_mono_nivel_estimado': custo_mono_nivel,
+            'parametros': {
+                'tolerancias_niveis': list(tolerancias_niveis),
+                'rmse_alvo': rmse_alvo,
+                'corrente': corrente,
+                'azimute_linha': azimute_linha,
+                'temperatura_max': temperatura_max
+            }
+        }
+
+    def executar_simulacao_caos_polinomial(self, medias_ambientais, desvios_ambientais, azimute_linha,
+                                           corrente, temperatura_max=None, ordem=None,
+                                           num_amostras=None, semente_aleatoria=None,
+                                           recorrer_monte_carlo=True):
+        """
+        Estima a distribuição da temperatura do condutor por caos polinomial.
+        
+        Ajusta uma expansão de Hermite de baixa ordem nas quatro entradas ambientais
+        padronizadas a partir de poucas soluções exatas em um projeto experimental
+        compartilhado entre cenários, e amostra o polinômio barato para obter
+        estatísticas e probabilidade de excedência. Se o erro de validação cruzada
+        do ajuste superar config.PCE_ERRO_MAXIMO, recorre ao Monte Carlo completo.
+        
+        Args:
+            medias_ambientais (dict): Médias das variáveis ambientais
+            desvios_ambientais (dict): Desvios padrão das variáveis ambientais
+            azimute_linha (float): Azimute da linha em graus
+            corrente (float): Corrente elétrica em A
+            temperatura_max (float): Temperatura máxima (padrão: config.TEMPERATURA_MAX_PROJETO)
+            ordem (int): Grau total da expansão (padrão: config.PCE_ORDEM)
+            num_amostras (int): Amostras do polinômio (padrão: config.PCE_AMOSTRAS_SUBSTITUTO)
+            semente_aleatoria (int): Semente para reprodutibilidade (opcional)
+            recorrer_monte_carlo (bool): Se deve executar o Monte Carlo quando o ajuste é ruim
+            
+        Returns:
+            dict: Estatísticas, probabilidade de excedência, erro do ajuste e
+                  coeficientes; 'substituto' indica se o resultado veio do polinômio
+        """
+        if temperatura_max is None:
+            temperatura_max = config.TEMPERATURA_MAX_PROJETO
+        if ordem is None:
+            ordem = config.PCE_ORDEM
+        if num_amostras is None:
+            num_amostras = config.PCE_AMOSTRAS_SUBSTITUTO
+        
+        self._validar_dados_entrada(medias_ambientais, desvios_ambientais)
+        
+        variaveis = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
+        projeto = self._obter_projeto_caos(ordem)
+        xi = projeto['pontos']
+        
+        # Soluções exatas nos pontos do projeto
+        entradas = {
+            var: medias_ambientais[var] + desvios_ambientais[var] * xi[:, j]
+            for j, var in enumerate(variaveis)
+        }
+        temperaturas_projeto = self._resolver_amostras_vetorizado(entradas, azimute_linha, corrente)
+        
+        erro_ajuste = np.inf
+        coeficientes = None
+        if np.all(np.isfinite(temperaturas_projeto)):
+            coeficientes = projeto['projetor'] @ temperaturas_projeto
+            residuos = temperaturas_projeto - projeto['base'] @ coeficientes
+            
+            # Erro de validação cruzada (deixa-um-fora) relativo à variância das respostas
+            residuos_loo = residuos / (1 - projeto['alavancagem'])
+            variancia_resposta = np.var(temperaturas_projeto)
+            if variancia_resposta > 1e-12:
+                erro_ajuste = float(np.mean(residuos_loo**2) / variancia_resposta)
+            else:
+                erro_ajuste = 0.0
+        
+        if erro_ajuste > config.PCE_ERRO_MAXIMO:
+            logger.debug(f"Caos polinomial rejeitado (erro {erro_ajuste:.3g}); usando Monte Carlo")
+            if not recorrer_monte_carlo:
+                return {'substituto': False, 'erro_ajuste': erro_ajuste, 'coeficientes': coeficientes}
+            resultado = self.executar_simulacao(
+                medias_ambientais, desvios_ambientais, azimute_linha, corrente,
+                semente_aleatoria=semente_aleatoria
+            )
+            resultado = dict(resultado)
+            resultado['substituto'] = False
+            resultado['erro_ajuste'] = erro_ajuste
+            resultado['probabilidade_excedencia'] = (
+                0.0 if resultado['triagem'] else
+                float(np.mean(resultado['temperaturas'] > temperatura_max))
+                if len(resultado['temperaturas']) else np.nan
+            )
+            return resultado
+        
+        # Amostragem do polinômio em blocos
+        rng = np.random.default_rng(semente_aleatoria)
+        tamanho_bloco = max(1, config.ELEMENTOS_BLOCO_SIMULACAO_LINHA // len(coeficientes))
+        temperaturas = np.empty(num_amostras)
+        for inicio in range(0, num_amostras, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, num_amostras)
+            base = self._base_caos_polinomial(rng.standard_normal((fim - inicio, 4)), projeto['indices'])
+            temperaturas[inicio:fim] = base @ coeficientes
+        
+        estatisticas = self._calcular_estatisticas(temperaturas)
+        
+        # Média e variância exatas da expansão (base de Hermite ortogonal)
+        normas = np.prod([[math.factorial(k) for k in alfa] for alfa in projeto['indices']], axis=1)
+        estatisticas['media'] = coeficientes[0]
+        estatisticas['desvio_padrao'] = float(np.sqrt(np.sum(coeficientes[1:]**2 * normas[1:])))
+        
+        return {
+            'temperaturas': temperaturas,
+            'estatisticas': estatisticas,
+            'probabilidade_excedencia': float(np.mean(temperaturas > temperatura_max)),
+            'substituto': True,
+            'erro_ajuste': erro_ajuste,
+            'coeficientes': coeficientes,
+            'solucoes_exatas': len(temperaturas_projeto),
+            'parametros': {
+                'ordem': ordem,
+                'num_amostras': num_amostras,
+                'corrente': corrente,
+                'azimute_linha': azimute_linha,
+                'temperatura_max': temperatura_max
+            }
+        }
+
+    def _obter_projeto_caos(self, ordem):
+        """
+        Retorna o projeto experimental compartilhado do caos polinomial.
+        
+        O projeto (hipercubo latino em variáveis normais padrão) e as matrizes que
+        dependem apenas dele — base, projetor de mínimos quadrados e alavancagens —
+        são calculados uma vez e reutilizados por todos os cenários.
+        
+        Args:
+            ordem (int): Grau total da expansão
+            
+        Returns:
+            dict: Pontos, índices multivariados, base, projetor e alavancagens
+        """
+        if self._projeto_caos is not None and self._projeto_caos['ordem'] == ordem:
+            return self._projeto_caos
+        
+        indices = [alfa for alfa in itertools.product(range(ordem + 1), repeat=4) if sum(alfa) <= ordem]
+        indices.sort(key=sum)
+        num_pontos = max(config.PCE_PONTOS_PROJETO, 2 * len(indices))
+        
+        amostrador = stats.qmc.LatinHypercube(d=4, seed=config.SEMENTE_NUMEROS_COMUNS)
+        pontos = stats.norm.ppf(amostrador.random(num_pontos))
+        
+        base = self._base_caos_polinomial(pontos, indices)
+        projetor = np.linalg.pinv(base)
+        alavancagem = np.clip(np.einsum('ij,ji->i', base, projetor), 0.0, 1.0 - 1e-9)
+        
+        self._projeto_caos = {
+            'ordem': ordem,
+            'indices': indices,
+            'pontos': pontos,
+            'base': base,
+            'projetor': projetor,
+            'alavancagem': alavancagem
+        }
+        
+        logger.debug(f"Projeto do caos polinomial: {num_pontos} pontos, {len(indices)} termos")
+        return self._projeto_caos
+
+    def _base_caos_polinomial(self, xi, indices):
+        """
+        Avalia a base de polinômios de Hermite (probabilistas) multivariados.
+        
+        Args:
+            xi (np.array): Pontos (n, 4) em variáveis normais padrão
+            indices (list): Índices multivariados dos termos
+            
+        Returns:
+            np.array: Matriz (n, termos) da base
+        """
+        ordem = max(sum(alfa) for alfa in indices)
+        hermite = np.ones((ordem + 1,) + xi.shape)
+        if ordem >= 1:
+            hermite[1] = xi
+        for k in range(1, ordem):
+            hermite[k + 1] = xi * hermite[k] - k * hermite[k - 1]
+        
+        base = np.empty((xi.shape[0], len(indices)))
+        for t, alfa in enumerate(indices):
+            base[:, t] = (hermite[alfa[0], :, 0] * hermite[alfa[1], :, 1] *
+                          hermite[alfa[2], :, 2] * hermite[alfa[3], :, 3])
+        
+        return base
+
+    def calcular_confiabilidade_form(self, medias_cenarios, desvios_cenarios, azimutes, corrente,
+                                     temperatura_max=None, amostras_verificacao=0,
+                                     semente_aleatoria=None):
+        """
+        Estima a probabilidade de excedência pelo método de confiabilidade de primeira ordem (FORM).
+        
+        Para cada cenário (ponto-hora) busca o ponto de projeto sobre a superfície
+        de estado limite Tc(x) = T_max no espaço normal padrão pela iteração HL-RF,
+        executada simultaneamente para todos os cenários com gradientes por
+        diferenças finitas. Opcionalmente verifica o resultado por amostragem por
+        importância centrada no ponto de projeto.
+        
+        Args:
+            medias_cenarios (dict): Arrays (K,) de médias por variável ambiental
+            desvios_cenarios (dict): Arrays (K,) de desvios padrão por variável ambiental
+            azimutes (float or np.array): Azimute da linha de cada cenário
+            corrente (float or np.array): Corrente elétrica em A
+            temperatura_max (float): Temperatura máxima (padrão: config.TEMPERATURA_MAX_PROJETO)
+            amostras_verificacao (int): Amostras por cenário da verificação por importância (0 desativa)
+            semente_aleatoria (int): Semente da verificação por importância (opcional)
+            
+        Returns:
+            dict: Índice de confiabilidade, probabilidade, ponto de projeto e
+                  convergência por cenário; estimativas por importância se solicitadas
+        """
+        if temperatura_max is None:
+            temperatura_max = config.TEMPERATURA_MAX_PROJETO
+        
+        variaveis = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
+        medias = np.column_stack([np.atleast_1d(medias_cenarios[var]).astype(float) for var in variaveis])
+        desvios = np.column_stack([np.atleast_1d(desvios_cenarios[var]).astype(float) for var in variaveis])
+        num_cenarios = medias.shape[0]
+        azimutes = np.broadcast_to(np.asarray(azimutes, dtype=float), (num_cenarios,))
+        correntes = np.broadcast_to(np.asarray(corrente, dtype=float), (num_cenarios,))
+        
+        passo = config.FORM_PASSO_GRADIENTE
+        perturbacoes = np.vstack([np.zeros(4), passo * np.eye(4)])  # (5, 4)
+        
+        u = np.zeros((num_cenarios, 4))
+        convergido = np.zeros(num_cenarios, dtype=bool)
+        g_inicial = None
+        
+        for iteracao in range(config.FORM_MAX_ITERACOES):
+            avaliacoes = self._estado_limite_form(
+                medias, desvios, azimutes, correntes, temperatura_max,
+                u[:, np.newaxis, :] + perturbacoes[np.newaxis, :, :]
+            )
+            g = avaliacoes[:, 0]
+            gradiente = (avaliacoes[:, 1:] - g[:, np.newaxis]) / passo
+            if g_inicial is None:
+                g_inicial = g.copy()
+            
+            norma2 = np.sum(gradiente**2, axis=1)
+            validos = np.isfinite(g) & np.all(np.isfinite(gradiente), axis=1) & (norma2 > 1e-12)
+            
+            # Passo HL-RF: u' = [(∇g·u - g) / |∇g|²] ∇g
+            escala = np.where(validos, (np.sum(gradiente * u, axis=1) - g) / np.where(validos, norma2, 1.0), 0.0)
+            u_novo = np.where(validos[:, np.newaxis], escala[:, np.newaxis] * gradiente, u)
+            
+            variacao = np.linalg.norm(u_novo - u, axis=1)
+            residuo = np.abs(g) / np.maximum(np.abs(g_inicial), 1.0)
+            convergido = validos & (variacao < config.FORM_TOLERANCIA) & (residuo < config.FORM_TOLERANCIA)
+            
+            u = np.where(convergido[:, np.newaxis], u, u_novo)
+            if np.all(convergido | ~validos):
+                break
+        
+        # Sinal de β: negativo quando a média já excede o limite
+        beta = np.sign(g_inicial) * np.linalg.norm(u, axis=1)
+        beta = np.where(np.isfinite(g_inicial), beta, np.nan)
+        probabilidade = stats.norm.cdf(-beta)
+        
+        # Cenários sem sensibilidade às incertezas: resultado determinístico
+        sem_gradiente = np.isfinite(g_inicial) & np.all(u == 0, axis=1) & (np.abs(g_inicial) > config.FORM_TOLERANCIA)
+        beta = np.where(sem_gradiente, np.sign(g_inicial) * np.inf, beta)
+        probabilidade = np.where(sem_gradiente, (g_inicial < 0).astype(float), probabilidade)
+        
+        logger.info(f"FORM concluído: {np.sum(convergido)}/{num_cenarios} cenários convergidos "
+                   f"em {iteracao + 1} iterações")
+        
+        resultado = {
+            'indice_confiabilidade': beta,
+            'probabilidade_excedencia': probabilidade,
+            'ponto_projeto': medias + desvios * u,
+            'ponto_projeto_padronizado': u,
+            'convergido': convergido,
+            'iteracoes': iteracao + 1,
+            'avaliacoes_modelo': 5 * (iteracao + 1)
+        }
+        
+        if amostras_verificacao > 0:
+            resultado.update(self._verificar_form_importancia(
+                medias, desvios, azimutes, correntes, temperatura_max, u,
+                amostras_verificacao, semente_aleatoria
+            ))
+        
+        return resultado
+
+    def _estado_limite_form(self, medias, desvios, azimutes, correntes, temperatura_max, u):
+        """
+        Avalia a função de estado limite g(u) = T_max - Tc(μ + σu).
+        
+        Args:
+            medias (np.array): Médias (K, 4) dos cenários
+            desvios (np.array): Desvios padrão (K, 4) dos cenários
+            azimutes (np.array): Azimutes (K,) dos cenários
+            correntes (np.array): Correntes (K,) dos cenários
+            temperatura_max (float): Temperatura máxima
+            u (np.array): Pontos (K, m, 4) no espaço normal padrão
+            
+        Returns:
+            np.array: Valores (K, m) de g (NaN onde o balanço não tem solução válida)
+        """
+        x = medias[:, np.newaxis, :] + desvios[:, np.newaxis, :] * u
+        temperaturas = self._resolver_amostras_vetorizado(
+            {var: x[..., j] for j, var in enumerate(['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v'])},
+            azimutes[:, np.newaxis], correntes[:, np.newaxis],
+            tolerancia=config.FORM_TOLERANCIA_SOLVER
+        )
+        return temperatura_max - temperaturas
+
+    def _verificar_form_importancia(self, medias, desvios, azimutes, correntes, temperatura_max,
+                                    ponto_projeto, num_amostras, semente_aleatoria):
+        """
+        Verifica a probabilidade FORM por amostragem por importância.
+        
+        Amostra u ~ N(u*, I) em torno do ponto de projeto de cada cenário e
+        pondera cada amostra pela razão de densidades φ(u) / φ(u - u*).
+        
+        Returns:
+            dict: Probabilidade por importância e seu erro padrão por cenário
+        """
+        rng = np.random.default_rng(semente_aleatoria)
+        num_cenarios = ponto_projeto.shape[0]
+        tamanho_bloco = max(1, config.ELEMENTOS_BLOCO_SIMULACAO_LINHA // num_amostras)
+        
+        probabilidade = np.empty(num_cenarios)
+        erro_padrao = np.empty(num_cenarios)
+        
+        for inicio in range(0, num_cenarios, tamanho_bloco):
+            bloco = slice(inicio, min(inicio + tamanho_bloco, num_cenarios))
+            centro = ponto_projeto[bloco, np.newaxis, :]
+            u = centro + rng.standard_normal((centro.shape[0], num_amostras, 4))
+            
+            pesos = np.exp(-np.sum(u * centro, axis=2) + 0.5 * np.sum(centro**2, axis=2))
+            g = self._estado_limite_form(
+                medias[bloco], desvios[bloco], azimutes[bloco], correntes[bloco], temperatura_max, u
+            )
+            contribuicoes = np.where(np.isfinite(g) & (g < 0), pesos, 0.0)
+            
+            probabilidade[bloco] = contribuicoes.mean(axis=1)
+            erro_padrao[bloco] = contribuicoes.std(axis=1) / np.sqrt(num_amostras)
+        
+        return {
+            'probabilidade_importancia': probabilidade,
+            'erro_padrao_importancia': erro_padrao
+        }
+
+    def calcular_ampacidade_probabilistica(self, medias_cenarios, desvios_cenarios, azimutes,
+                                           niveis_risco=None, temperatura_max=None,
+                                           num_iteracoes=None, metodo_amostragem='normal',
+                                           hora=None, semente_aleatoria=None):
+        """
+        Calcula a maior corrente cuja probabilidade de excedência fica abaixo de cada nível de risco.
+        
+        Como a temperatura do condutor cresce com a corrente, Tc(I) > T_max equivale
+        a I > I_amp(x), sendo I_amp(x) a ampacidade da amostra ambiental x. A corrente
+        com probabilidade de excedência α é então o quantil α da distribuição de
+        I_amp — o mesmo valor para o qual convergiria a bisseção na corrente com
+        números aleatórios comuns, obtido sem iterações. Todos os cenários usam as
+        mesmas perturbações: o bloco de números comuns do simulador ou, no método
+        'bootstrap', um único sorteio do banco de resíduos.
+        
+        Args:
+            medias_cenarios (dict): Arrays (K,) de médias por variável ambiental
+            desvios_cenarios (dict): Arrays (K,) de desvios padrão por variável ambiental
+            azimutes (float or np.array): Azimute da linha de cada cenário
+            niveis_risco (list): Probabilidades de excedência alvo (padrão: config.NIVEIS_RISCO_AMPACIDADE)
+            temperatura_max (float): Temperatura máxima (padrão: config.TEMPERATURA_MAX_PROJETO)
+            num_iteracoes (int): Número de amostras por cenário (padrão: self.num_iteracoes_padrao)
+            metodo_amostragem (str): Método de amostragem, como em executar_simulacao
+            hora (pd.Timestamp): Hora dos cenários, para o estrato do método 'bootstrap' (opcional)
+            semente_aleatoria (int): Semente do sorteio do banco de resíduos (opcional)
+            
+        Returns:
+            dict: Ampacidades (K, níveis) por nível de risco, ampacidade média (K,)
+                  e os níveis utilizados
+        """
+        if niveis_risco is None:
+            niveis_risco = config.NIVEIS_RISCO_AMPACIDADE
+        if temperatura_max is None:
+            temperatura_max = config.TEMPERATURA_MAX_PROJETO
+        if num_iteracoes is None:
+            num_iteracoes = self.num_iteracoes_padrao
+        
+        variaveis = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
+        medias = np.column_stack([np.atleast_1d(medias_cenarios[var]).astype(float) for var in variaveis])
+        desvios = np.column_stack([np.atleast_1d(desvios_cenarios[var]).astype(float) for var in variaveis])
+        num_cenarios = medias.shape[0]
+        azimutes = np.broadcast_to(np.asarray(azimutes, dtype=float), (num_cenarios,))
+        
+        if metodo_amostragem == 'bootstrap':
+            if self.banco_residuos is None:
+                raise ValueError("Método 'bootstrap' requer um banco de resíduos")
+            estrato = int(BancoResiduos.obter_estrato(pd.Timestamp(hora))) if hora is not None else None
+            perturbacoes = self.banco_residuos.amostrar(
+                num_iteracoes, estrato, np.random.default_rng(semente_aleatoria)
+            ).astype(float)
+        else:
+            perturbacoes = self.obter_bloco_normal(num_iteracoes)
+        tamanho_bloco = max(1, config.ELEMENTOS_BLOCO_SIMULACAO_LINHA // num_iteracoes)
+        
+        ampacidades = np.full((num_cenarios, len(niveis_risco)), np.nan)
+        ampacidade_media = np.full(num_cenarios, np.nan)
+        
+        for inicio in range(0, num_cenarios, tamanho_bloco):
+            bloco = slice(inicio, min(inicio + tamanho_bloco, num_cenarios))
+            
+            x = self._amostrar_cenarios(medias[bloco], desvios[bloco], perturbacoes, metodo_amostragem)
+            x = {var: self._aplicar_limites_fisicos(var, valores) for var, valores in x.items()}
+            
+            vento_info = self._reconstruir_vento_vetorizado(x['vento_u'], x['vento_v'])
+            angulo_vento = self._calcular_angulo_vento_vetorizado(
+                vento_info['direcao'], azimutes[bloco, np.newaxis]
+            )
+            
+            ampacidade_amostras = self.modelo_termico.calcular_ampacidade_vetorizado(
+                temperatura_max, x['radiacao_global'], azimutes[bloco, np.newaxis],
+                vento_info['velocidade'], angulo_vento, x['temperatura_ar']
+            )
+            
+            ampacidades[bloco] = np.quantile(ampacidade_amostras, niveis_risco, axis=1).T
+            ampacidade_media[bloco] = ampacidade_amostras.mean(axis=1)
+        
+        # Cenários com entradas inválidas não têm ampacidade definida
+        invalidos = ~np.all(np.isfinite(medias) & np.isfinite(desvios), axis=1)
+        ampacidades[invalidos] = np.nan
+        ampacidade_media[invalidos] = np.nan
+        
+        return {
+            'ampacidades': ampacidades,
+            'ampacidade_media': ampacidade_media,
+            'niveis_risco': list(niveis_risco),
+            'parametros': {
+                'num_iteracoes': num_iteracoes,
+                'temperatura_max': temperatura_max,
+                'metodo_amostragem': metodo_amostragem
+            }
+        }
+
+    def _amostrar_cenarios(self, medias, desvios, perturbacoes, metodo_amostragem):
+        """
+        Amostras (K, N) das variáveis ambientais de K cenários com perturbações comuns.
+        
+        Segue os métodos de executar_simulacao: no 'bootstrap' as perturbações são
+        resíduos do banco, no 'distribuicoes' normais transformadas pelo motor de
+        distribuições e nos demais normais transformadas por _transformar_bloco.
+        
+        Args:
+            medias (np.array): Médias (K, 4) na ordem das variáveis ambientais
+            desvios (np.array): Desvios padrão (K, 4)
+            perturbacoes (np.array): Normais padrão ou resíduos padronizados (N, 4)
+            metodo_amostragem (str): Método de amostragem
+            
+        Returns:
+            dict: Arrays (K, N) de cada variável
+        """
+        variaveis = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
+        
+        if metodo_amostragem == 'bootstrap':
+            return {var: medias[:, j, np.newaxis] + desvios[:, j, np.newaxis] * perturbacoes[np.newaxis, :, j]
+                    for j, var in enumerate(variaveis)}
+        
+        if metodo_amostragem == 'distribuicoes':
+            return self.amostrador.transformar(
+                perturbacoes[np.newaxis, :, :],
+                {var: medias[:, j, np.newaxis] for j, var in enumerate(variaveis)},
+                {var: desvios[:, j, np.newaxis] for j, var in enumerate(variaveis)}
+            )
+        
+        amostras = {var: np.empty((medias.shape[0], perturbacoes.shape[0])) for var in variaveis}
+        for k in range(medias.shape[0]):
+            for j, var in enumerate(variaveis):
+                self._transformar_bloco(var, perturbacoes[:, j], amostras[var][k],
+                                        medias[k, j], desvios[k, j], metodo_amostragem)
+        return amostras
+
+    def executar_simulacao_linha(self, medias_pontos, desvios_pontos, azimutes, corrente,
+                                 coordenadas=None, fatores_covariancia=None,
+                                 num_iteracoes=None, temperatura_max=None,
+                                 semente_aleatoria=None):
+        """
+        Executa a simulação conjunta de todos os pontos da linha em uma hora.
+        
+        Os campos ambientais são amostrados em conjunto ao longo da linha a partir
+        de uma covariância espacial por variável, e todos os pontos são resolvidos
+        para cada amostra de forma vetorizada. Isso permite estimar a probabilidade
+        de que algum vão da linha exceda a temperatura máxima.
+        
+        Args:
+            medias_pontos (dict): Arrays (P,) de médias por variável ambiental
+            desvios_pontos (dict): Arrays (P,) de desvios padrão por variável ambiental
+            azimutes (np.array): Azimute de cada ponto (P,)
+            corrente (float): Corrente elétrica em A
+            coordenadas (np.array): Coordenadas projetadas (P, 2) dos pontos, usadas
+                no modelo de correlação exponencial quando fatores_covariancia é omitido
+            fatores_covariancia (dict): Fator L (P, r) por variável com Σ ≈ L·Lᵀ (opcional)
+            num_iteracoes (int): Número de amostras (opcional)
+            temperatura_max (float): Temperatura máxima (padrão: config.TEMPERATURA_MAX_PROJETO)
+            semente_aleatoria (int): Semente para reprodutibilidade (opcional)
+            
+        Returns:
+            dict: Probabilidade de excedência da linha, excedência por ponto e
+                  distribuição da localização do vão mais quente
+        """
+        if num_iteracoes is None:
+            num_iteracoes = self.num_iteracoes_padrao
+        if temperatura_max is None:
+            temperatura_max = config.TEMPERATURA_MAX_PROJETO
+        
+        variaveis = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
+        azimutes = np.asarray(azimutes, dtype=float)
+        num_pontos = len(azimutes)
+        
+        for var in variaveis:
+            if not np.all(np.isfinite(medias_pontos[var])) or not np.all(np.isfinite(desvios_pontos[var])):
+                raise ValueError(f"Médias/desvios de '{var}' contêm valores inválidos")
+        
+        if fatores_covariancia is None:
+            if coordenadas is None:
+                raise ValueError("Informe coordenadas ou fatores_covariancia")
+            fatores_covariancia = self._fatorar_covariancia_linha(desvios_pontos, coordenadas)
+        
+        rng = np.random.default_rng(semente_aleatoria)
+        
+        logger.info(f"Iniciando simulação conjunta da linha: {num_pontos} pontos, {num_iteracoes} amostras")
+        
+        # Processar as amostras em blocos para limitar a memória (amostras x pontos)
+        tamanho_bloco = max(1, config.ELEMENTOS_BLOCO_SIMULACAO_LINHA // max(1, num_pontos))
+        
+        maximas = np.full(num_iteracoes, np.nan)
+        vao_critico = np.full(num_iteracoes, -1, dtype=int)
+        excedencias_pontos = np.zeros(num_pontos)
+        validas_pontos = np.zeros(num_pontos)
+        amostras_validas = np.zeros(num_iteracoes, dtype=bool)
+        
+        for inicio in range(0, num_iteracoes, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, num_iteracoes)
+            n_bloco = fim - inicio
+            
+            amostras = {}
+            for var in variaveis:
+                fator = fatores_covariancia[var]
+                z = rng.standard_normal((n_bloco, fator.shape[1]))
+                amostras[var] = np.asarray(medias_pontos[var])[np.newaxis, :] + z @ fator.T
+            
+            temperaturas = self._resolver_amostras_vetorizado(amostras, azimutes[np.newaxis, :], corrente)
+            
+            # Uma amostra da linha só é válida se todos os pontos forem válidos
+            linha_valida = np.all(np.isfinite(temperaturas), axis=1)
+            amostras_validas[inicio:fim] = linha_valida
+            
+            temps_validas = temperaturas[linha_valida]
+            if len(temps_validas) > 0:
+                maximas[inicio:fim][linha_valida] = np.max(temps_validas, axis=1)
+                vao_critico[inicio:fim][linha_valida] = np.argmax(temps_validas, axis=1)
+            
+            finitas = np.isfinite(temperaturas)
+            excedencias_pontos += np.sum(finitas & (np.nan_to_num(temperaturas) > temperatura_max), axis=0)
+            validas_pontos += np.sum(finitas, axis=0)
+        
+        maximas_validas = maximas[amostras_validas]
+        num_validas = len(maximas_validas)
+        
+        if num_validas > 0:
+            prob_linha = np.mean(maximas_validas > temperatura_max)
+            distribuicao_vao = np.bincount(vao_critico[amostras_validas], minlength=num_pontos) / num_validas
+        else:
+            prob_linha = np.nan
+            distribuicao_vao = np.full(num_pontos, np.nan)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            prob_pontos = np.where(validas_pontos > 0, excedencias_pontos / validas_pontos, np.nan)
+        
+        logger.info(f"Simulação conjunta concluída: P(excedência na linha) = {prob_linha:.4f}, "
+                   f"máximo individual por ponto = {np.nanmax(prob_pontos) if num_pontos else np.nan:.4f}")
+        
+        return {
+            'probabilidade_excedencia_linha': prob_linha,
+            'probabilidade_excedencia_pontos': prob_pontos,
+            'distribuicao_vao_critico': distribuicao_vao,
+            'vao_critico_mais_provavel': int(np.argmax(distribuicao_vao)) if num_validas > 0 else -1,
+            'temperaturas_maximas_linha': maximas_validas,
+            'estatisticas_maxima_linha': self._calcular_estatisticas(maximas_validas),
+            'amostras_validas': num_validas,
+            'taxa_sucesso': num_validas / num_iteracoes,
+            'parametros': {
+                'num_iteracoes': num_iteracoes,
+                'num_pontos': num_pontos,
+                'corrente': corrente,
+                'temperatura_max': temperatura_max
+            }
+        }
+
+    def _fatorar_covariancia_linha(self, desvios_pontos, coordenadas):
+        """
+        Constrói e fatora a covariância espacial de cada variável ao longo da linha.
+        
+        Usa correlação exponencial com comprimento config.COMPRIMENTO_CORRELACAO_LINHA
+        escalada pelos desvios da krigagem. As quatro matrizes são fatoradas por
+        Cholesky em lote; se alguma não for positiva definida, ou se o número de
+        pontos exceder config.POSTO_MAXIMO_COVARIANCIA_LINHA, usa um fator de posto
+        reduzido pelos maiores autovalores.
+        
+        Args:
+            desvios_pontos (dict): Arrays (P,) de desvios padrão por variável
+            coordenadas (np.array): Coordenadas projetadas (P, 2)
+            
+        Returns:
+            dict: Fator L (P, r) por variável com Σ ≈ L·Lᵀ
+        """
+        variaveis = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
+        coordenadas = np.asarray(coordenadas, dtype=float)
+        num_pontos = len(coordenadas)
+        
+        diferencas = coordenadas[:, np.newaxis, :] - coordenadas[np.newaxis, :, :]
+        distancias = np.sqrt(np.sum(diferencas**2, axis=-1))
+        
+        covariancias = np.empty((len(variaveis), num_pontos, num_pontos))
+        for k, var in enumerate(variaveis):
+            desvios = np.asarray(desvios_pontos[var], dtype=float)
+            correlacao = np.exp(-distancias / config.COMPRIMENTO_CORRELACAO_LINHA[var])
+            covariancias[k] = correlacao * np.outer(desvios, desvios)
+        
+        posto_maximo = config.POSTO_MAXIMO_COVARIANCIA_LINHA
+        
+        if num_pontos <= posto_maximo:
+            try:
+                # Pequeno reforço na diagonal para estabilidade numérica
+                escala = np.maximum(np.trace(covariancias, axis1=1, axis2=2) / num_pontos, 1e-12)
+                reforco = 1e-10 * escala[:, np.newaxis, np.newaxis] * np.eye(num_pontos)
+                fatores = np.linalg.cholesky(covariancias + reforco)
+                return {var: fatores[k] for k, var in enumerate(variaveis)}
+            except np.linalg.LinAlgError:
+                logger.debug("Covariância não positiva definida; usando fator por autovalores")
+        
+        autovalores, autovetores = np.linalg.eigh(covariancias)
+        posto = min(num_pontos, posto_maximo)
+        fatores = {}
+        for k, var in enumerate(variaveis):
+            valores = np.clip(autovalores[k, -posto:], 0, None)
+            fatores[var] = autovetores[k, :, -posto:] * np.sqrt(valores)[np.newaxis, :]
+        
+        return fatores
+
+    def simular_trajetorias_temporais(self, medias_series, desvios_series, timestamps,
+                                      azimute_linha, corrente, ordem_ar=None,
+                                      num_trajetorias=None, temperatura_max=None,
+                                      periodo_eventos=None, semente_aleatoria=None,
+                                      coeficientes_ar=None):
+        """
+        Simula trajetórias horárias temporalmente correlacionadas para um ponto da linha.
+        
+        Os resíduos ambientais (em unidades de desvio da krigagem) seguem um processo
+        AR(p) por variável, de modo que a persistência das condições entre horas
+        consecutivas é preservada. Com isso é possível estimar a duração das
+        excedências e o número de eventos por período.
+        
+        Os coeficientes devem vir de ajustar_processos_ar sobre as séries de resíduos
+        de validação cruzada das estações; sem eles, o processo é ajustado às
+        anomalias da própria série krigada, que medem a persistência do tempo e
+        não a dos resíduos (aproximação).
+        
+        Args:
+            medias_series (dict): Arrays (T,) de médias horárias por variável ambiental
+            desvios_series (dict): Arrays (T,) de desvios padrão horários por variável
+            timestamps (array-like): Timestamps (T,) das horas, em ordem crescente
+            azimute_linha (float): Azimute da linha em graus
+            corrente (float): Corrente elétrica em A
+            ordem_ar (int): Ordem do processo AR (padrão: config.ORDEM_PROCESSO_AR)
+            num_trajetorias (int): Número de trajetórias (padrão: config.NUM_TRAJETORIAS)
+            temperatura_max (float): Temperatura máxima (padrão: config.TEMPERATURA_MAX_PROJETO)
+            periodo_eventos (str): Período de contagem de eventos ('D' diário ou 'M' mensal)
+            semente_aleatoria (int): Semente para reprodutibilidade (opcional)
+            coeficientes_ar (dict): Variável -> {'phi', 'variancia_inovacao'} de
+                ajustar_processos_ar (opcional)
+            
+        Returns:
+            dict: Distribuição das durações de excedência, eventos por período,
+                  probabilidade horária de excedência e coeficientes AR usados
+        """
+        if coeficientes_ar is not None:
+            ordem_ar = len(coeficientes_ar['temperatura_ar']['phi'])
+        if ordem_ar is None:
+            ordem_ar = config.ORDEM_PROCESSO_AR
+        if num_trajetorias is None:
+            num_trajetorias = config.NUM_TRAJETORIAS
+        if temperatura_max is None:
+            temperatura_max = config.TEMPERATURA_MAX_PROJETO
+        if periodo_eventos is None:
+            periodo_eventos = config.PERIODO_CONTAGEM_EVENTOS
+        
+        variaveis = ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']
+        timestamps = pd.DatetimeIndex(timestamps)
+        num_horas = len(timestamps)
+        
+        if num_horas < ordem_ar + 2:
+            raise ValueError(f"Série muito curta ({num_horas} horas) para um processo AR({ordem_ar})")
+        
+        for var in variaveis:
+            if not np.all(np.isfinite(medias_series[var])) or not np.all(np.isfinite(desvios_series[var])):
+                raise ValueError(f"Série de '{var}' contém valores inválidos")
+        
+        # Sem coeficientes dos resíduos: AR(p) das anomalias da série krigada
+        if coeficientes_ar is None:
+            horas_dia = np.asarray(timestamps.hour)
+            coeficientes_ar = {}
+            for var in variaveis:
+                serie = np.asarray(medias_series[var], dtype=float)
+                ciclo_diario = pd.Series(serie).groupby(horas_dia).transform('mean').values
+                coeficientes_ar[var] = self._ajustar_processo_ar(serie - ciclo_diario, timestamps, ordem_ar)
+        
+        # Inícios de trechos contínuos (lacunas maiores que 1 h interrompem as excedências)
+        inicio_trecho = np.ones(num_horas, dtype=bool)
+        inicio_trecho[1:] = np.diff(timestamps.values) != np.timedelta64(1, 'h')
+        
+        rng = np.random.default_rng(semente_aleatoria)
+        aquecimento = 10 * ordem_ar + 50
+        tamanho_bloco = max(1, config.ELEMENTOS_BLOCO_SIMULACAO_LINHA // num_horas)
+        
+        logger.info(f"Simulando {num_trajetorias} trajetórias de {num_horas} horas (AR({ordem_ar}))")
+        
+        excedencias_horarias = np.zeros(num_horas)
+        validas_horarias = np.zeros(num_horas)
+        duracoes = []
+        eventos = np.zeros((num_trajetorias, num_horas), dtype=bool)
+        
+        for inicio in range(0, num_trajetorias, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, num_trajetorias)
+            n_bloco = fim - inicio
+            
+            amostras = {}
+            for var in variaveis:
+                phi, variancia_inovacao = coeficientes_ar[var]['phi'], coeficientes_ar[var]['variancia_inovacao']
+                inovacoes = rng.standard_normal((n_bloco, num_horas + aquecimento)) * np.sqrt(variancia_inovacao)
+                residuos = lfilter([1.0], np.concatenate([[1.0], -phi]), inovacoes, axis=1)[:, aquecimento:]
+                amostras[var] = (np.asarray(medias_series[var])[np.newaxis, :] +
+                                 np.asarray(desvios_series[var])[np.newaxis, :] * residuos)
+            
+            temperaturas = self._resolver_amostras_vetorizado(amostras, azimute_linha, corrente)
+            
+            finitas = np.isfinite(temperaturas)
+            excede = finitas & (np.nan_to_num(temperaturas) > temperatura_max)
+            excedencias_horarias += np.sum(excede, axis=0)
+            validas_horarias += np.sum(finitas, axis=0)
+            
+            duracoes_bloco, inicios_bloco = self._identificar_eventos_excedencia(excede, inicio_trecho)
+            duracoes.append(duracoes_bloco)
+            eventos[inicio:fim] = inicios_bloco
+        
+        duracoes = np.concatenate(duracoes) if duracoes else np.array([])
+        
+        # Contagem de eventos por período (dia ou mês) em cada trajetória
+        periodos = timestamps.to_period(periodo_eventos)
+        rotulos_periodo, indice_periodo = np.unique(periodos.astype(str), return_inverse=True)
+        contagem = np.zeros((num_trajetorias, len(rotulos_periodo)))
+        for k in range(len(rotulos_periodo)):
+            contagem[:, k] = np.sum(eventos[:, indice_periodo == k], axis=1)
+        
+        eventos_por_periodo = pd.DataFrame({
+            'periodo': rotulos_periodo,
+            'eventos_medio': contagem.mean(axis=0),
+            'eventos_p90': np.percentile(contagem, 90, axis=0),
+            'eventos_maximo': contagem.max(axis=0),
+            'probabilidade_evento': np.mean(contagem > 0, axis=0)
+        })
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            prob_horaria = np.where(validas_horarias > 0, excedencias_horarias / validas_horarias, np.nan)
+        
+        estatisticas_duracao = {
+            'numero_eventos': len(duracoes),
+            'eventos_por_trajetoria': len(duracoes) / num_trajetorias,
+            'duracao_media': np.mean(duracoes) if len(duracoes) else 0.0,
+            'duracao_p90': np.percentile(duracoes, 90) if len(duracoes) else 0.0,
+            'duracao_maxima': np.max(duracoes) if len(duracoes) else 0.0
+        }
+        
+        logger.info(f"Trajetórias concluídas: {estatisticas_duracao['eventos_por_trajetoria']:.2f} eventos "
+                   f"por trajetória, duração média {estatisticas_duracao['duracao_media']:.1f} h")
+        
+        return {
+            'duracoes_excedencia': duracoes,
+            'estatisticas_duracao': estatisticas_duracao,
+            'eventos_por_periodo': eventos_por_periodo,
+            'probabilidade_excedencia_horaria': prob_horaria,
+            'coeficientes_ar': coeficientes_ar,
+            'parametros': {
+                'num_trajetorias': num_trajetorias,
+                'num_horas': num_horas,
+                'ordem_ar': ordem_ar,
+                'corrente': corrente,
+                'azimute_linha': azimute_linha,
+                'temperatura_max': temperatura_max,
+                'periodo_eventos': periodo_eventos
+            }
+        }
+
+    def ajustar_processos_ar(self, residuos_series, timestamps, ordem_ar=None):
+        """
+        Ajusta o processo AR(p) de cada variável às séries de resíduos das estações.
+        
+        Args:
+            residuos_series (dict): Variável -> resíduos padronizados (S, T) ou (T,),
+                NaN nas faltas (ex.: GeoProcessor.calcular_series_residuos_validacao_cruzada)
+            timestamps (array-like): Timestamps (T,) das colunas, em ordem crescente
+            ordem_ar (int): Ordem do processo AR (padrão: config.ORDEM_PROCESSO_AR)
+            
+        Returns:
+            dict: Variável -> {'phi', 'variancia_inovacao'}
+        """
+        if ordem_ar is None:
+            ordem_ar = config.ORDEM_PROCESSO_AR
+        
+        timestamps = pd.DatetimeIndex(timestamps)
+        coeficientes_ar = {}
+        for var in ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']:
+            if var not in residuos_series:
+                raise ValueError(f"Resíduos de '{var}' ausentes para o ajuste do processo AR")
+            coeficientes_ar[var] = self._ajustar_processo_ar(residuos_series[var], timestamps, ordem_ar)
+            logger.info(f"Processo AR({ordem_ar}) dos resíduos de {var}: "
+                        f"phi={np.round(coeficientes_ar[var]['phi'], 3).tolist()}")
+        
+        return coeficientes_ar
+
+    def _ajustar_processo_ar(self, series, timestamps, ordem):
+        """
+        Ajusta um processo AR(p) de variância unitária por Yule-Walker.
+        
+        Cada série é centrada na sua média e as autocovariâncias são agregadas
+        sobre as séries usando apenas pares de horas separadas exatamente pela
+        defasagem e ambas presentes, de modo que lacunas e faltas não produzem
+        produtos espúrios. Se o ajuste resultar não estacionário, recai para AR(1).
+        
+        Args:
+            series (np.array): Séries (S, T) ou série (T,), NaN nas faltas
+            timestamps (pd.DatetimeIndex): Timestamps (T,) das colunas
+            ordem (int): Ordem p do processo
+            
+        Returns:
+            dict: Coeficientes 'phi' (p,) e 'variancia_inovacao'
+        """
+        series = np.atleast_2d(np.asarray(series, dtype=float))
+        presentes = np.isfinite(series)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            centradas = np.where(presentes, series - np.nanmean(series, axis=1, keepdims=True), 0.0)
+        
+        horas = (timestamps.values - timestamps.values[0]) / np.timedelta64(1, 'h')
+        num_horas = series.shape[1]
+        autocovariancias = np.zeros(ordem + 1)
+        for k in range(min(ordem, num_horas - 1) + 1):
+            consecutivas = (horas[k:] - horas[:num_horas - k]) == k
+            pares = presentes[:, :num_horas - k] & presentes[:, k:] & consecutivas[np.newaxis, :]
+            if np.any(pares):
+                produtos = centradas[:, :num_horas - k] * centradas[:, k:]
+                autocovariancias[k] = np.sum(produtos[pares]) / np.sum(pares)
+        
+        if autocovariancias[0] < 1e-12:
+            return {'phi': np.zeros(ordem), 'variancia_inovacao': 1.0}
+        autocorrelacoes = autocovariancias / autocovariancias[0]
+        
+        phi = solve_toeplitz(autocorrelacoes[:ordem], autocorrelacoes[1:ordem + 1])
+        variancia_inovacao = 1.0 - np.dot(phi, autocorrelacoes[1:ordem + 1])
+        
+        raizes = np.roots(np.concatenate([[1.0], -phi]))
+        if variancia_inovacao <= 0 or np.any(np.abs(raizes) >= 1):
+            rho = np.clip(autocorrelacoes[1], -0.99, 0.99)
+            phi = np.zeros(ordem)
+            phi[0] = rho
+            variancia_inovacao = 1.0 - rho**2
+        
+        return {'phi': phi, 'variancia_inovacao': variancia_inovacao}
+
+    def _identificar_eventos_excedencia(self, excede, inicio_trecho):
+        """
+        Identifica eventos (sequências de horas consecutivas em excedência).
+        
+        Args:
+            excede (np.array): Matriz booleana (trajetórias, horas) de excedência
+            inicio_trecho (np.array): Marca (horas,) do início de cada trecho contínuo
+            
+        Returns:
+            tuple: (durações em horas de todos os eventos, matriz booleana dos inícios de evento)
+        """
+        anterior = np.zeros_like(excede)
+        anterior[:, 1:] = excede[:, :-1]
+        anterior[:, inicio_trecho] = False
+        
+        posterior = np.zeros_like(excede)
+        posterior[:, :-1] = excede[:, 1:]
+        fim_trecho = np.roll(inicio_trecho, -1)
+        fim_trecho[-1] = True
+        posterior[:, fim_trecho] = False
+        
+        inicios = excede & ~anterior
+        fins = excede & ~posterior
+        
+        # Em ordem linha-a-linha cada início corresponde ao próximo fim
+        duracoes = np.flatnonzero(fins) - np.flatnonzero(inicios) + 1
+        
+        return duracoes, inicios
+
+class CacheSimulacao:
+    """
+    Cache LRU de resultados da simulação Monte Carlo.
+    
+    A chave é formada pelas entradas quantizadas (médias, desvios, azimute,
+    corrente e método), de modo que estados ambientais praticamente idênticos
+    reutilizam o mesmo resultado. Opcionalmente mantém uma camada persistente
+    em disco para reaproveitamento entre execuções.
+    """
+    
+    def __init__(self, resolucoes_medias=None, resolucoes_desvios=None,
+                 resolucao_azimute=None, resolucao_corrente=None,
+                 max_entradas=None, max_memoria_mb=None, diretorio_persistente=None):
+        """
+        Inicializa o cache.
+        
+        Args:
+            resolucoes_medias (dict): Resolução de quantização por variável para as médias
+            resolucoes_desvios (dict): Resolução de quantização por variável para os desvios
+            resolucao_azimute (float): Resolução do azimute em graus
+            resolucao_corrente (float): Resolução da corrente em A
+            max_entradas (int): Número máximo de entradas em memória
+            max_memoria_mb (float): Memória máxima ocupada pelas entradas em MB
+            diretorio_persistente (str): Diretório da camada em disco (opcional)
+        """
+        self.resolucoes_medias = resolucoes_medias or config.CACHE_RESOLUCAO_MEDIAS
+        self.resolucoes_desvios = resolucoes_desvios or config.CACHE_RESOLUCAO_DESVIOS
+        self.resolucao_azimute = resolucao_azimute or config.CACHE_RESOLUCAO_AZIMUTE
+        self.resolucao_corrente = resolucao_corrente or config.CACHE_RESOLUCAO_CORRENTE
+        self.max_entradas = max_entradas or config.CACHE_MAX_ENTRADAS
+        self.max_memoria_bytes = (max_memoria_mb or config.CACHE_MAX_MEMORIA_MB) * 1024**2
+        
+        self._entradas = OrderedDict()
+        self._memoria_bytes = 0
+        
+        self.acertos = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        self.remocoes = 0
+        
+        if diretorio_persistente is None:
+            diretorio_persistente = config.CACHE_DIRETORIO_PERSISTENTE
+        
+        self._disco = None
+        if diretorio_persistente:
+            os.makedirs(diretorio_persistente, exist_ok=True)
+            self._disco = shelve.open(os.path.join(diretorio_persistente, 'cache_simulacao'))
+            logger.info(f"Cache persistente de simulação em: {diretorio_persistente}")
+
+    def gerar_chave(self, medias_ambientais, desvios_ambientais, azimute_linha, corrente,
+                    metodo_amostragem, num_iteracoes, semente_aleatoria=None, assinatura=None):
+        """
+        Gera a chave quantizada de um cenário de simulação.
+        
+        A assinatura identifica o modelo térmico e a configuração de amostragem;
+        sem ela, a camada persistente devolveria resultados de outro cabo ou
+        de outras distribuições.
+        
+        Returns:
+            tuple: Chave hashável do cenário
+        """
+        chave = []
+        for variavel in ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']:
+            chave.append(int(round(medias_ambientais[variavel] / self.resolucoes_medias[variavel])))
+            chave.append(int(round(desvios_ambientais[variavel] / self.resolucoes_desvios[variavel])))
+        
+        chave.append(int(round((azimute_linha % 360) / self.resolucao_azimute)))
+        chave.append(int(round(corrente / self.resolucao_corrente)))
+        chave.extend([metodo_amostragem, int(num_iteracoes), semente_aleatoria, assinatura])
+        
+        return tuple(chave)
+
+    def obter(self, chave):
+        """
+        Busca um resultado no cache, promovendo-o a mais recente.
+        
+        Args:
+            chave (tuple): Chave gerada por gerar_chave
+            
+        Returns:
+            dict: Resultado armazenado ou None se ausente
+        """
+        if chave in self._entradas:
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return self._entradas[chave]
+        
+        if self._disco is not None:
+            resultado = self._disco.get(repr(chave))
+            if resultado is not None:
+                self.acertos += 1
+                self.acertos_disco += 1
+                self._inserir_memoria(chave, resultado)
+                return resultado
+        
+        self.falhas += 1
+        return None
+
+    def armazenar(self, chave, resultado):
+        """
+        Armazena um resultado no cache (memória e, se ativa, camada em disco).
+        
+        Args:
+            chave (tuple): Chave gerada por gerar_chave
+            resultado (dict): Resultado da simulação
+        """
+        # Cópia somente leitura: o array devolvido ao chamador permanece dele
+        temperaturas = np.array(resultado['temperaturas'])
+        temperaturas.flags.writeable = False
+        armazenado = dict(resultado, temperaturas=temperaturas,
+                          estatisticas=dict(resultado['estatisticas']),
+                          parametros=dict(resultado['parametros']))
+        self._inserir_memoria(chave, armazenado)
+        
+        if self._disco is not None:
+            self._disco[repr(chave)] = armazenado
+
+    def _inserir_memoria(self, chave, resultado):
+        """Insere na camada em memória aplicando os limites de ocupação."""
+        if chave in self._entradas:
+            self._memoria_bytes -= self._tamanho_entrada(self._entradas.pop(chave))
+        
+        self._entradas[chave] = resultado
+        self._memoria_bytes += self._tamanho_entrada(resultado)
+        
+        while self._entradas and (len(self._entradas) > self.max_entradas or
+                                  self._memoria_bytes > self.max_memoria_bytes):
+            _, removido = self._entradas.popitem(last=False)
+            self._memoria_bytes -= self._tamanho_entrada(removido)
+            self.remocoes += 1
+
+    def _tamanho_entrada(self, resultado):
+        """Estima a memória ocupada por uma entrada (array + metadados)."""
+        return resultado['temperaturas'].nbytes + 1024
+
+    def obter_estatisticas(self):
+        """
+        Retorna os contadores do cache.
+        
+        Returns:
+            dict: Acertos, falhas, remoções e ocupação
+        """
+        consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'acertos_disco': self.acertos_disco,
+            'falhas': self.falhas,
+            'remocoes': self.remocoes,
+            'taxa_acerto': self.acertos / consultas if consultas > 0 else 0.0,
+            'entradas': len(self._entradas),
+            'memoria_mb': self._memoria_bytes / 1024**2
+        }
+
+    def limpar(self):
+        """Remove todas as entradas em memória e zera os contadores."""
+        self._entradas.clear()
+        self._memoria_bytes = 0
+        self.acertos = self.acertos_disco = self.falhas = self.remocoes = 0
+
+    def fechar(self):
+        """Sincroniza e fecha a camada persistente em disco."""
+        if self._disco is not None:
+            self._disco.close()
+            self._disco = None
@@ -9,6 +9,7 @@ import pandas as pd
 import logging
 import tempfile
 import json
+import pickle
 from datetime import datetime, timedelta
 
 # Adicionar o diretório atual ao path
@@ -203,6 +204,1795 @@ def teste_monte_carlo():
         logger.error(f"✗ Erro no teste Monte Carlo: {e}")
         return False
 
+def teste_cache_simulacao():
+    """Testa o cache LRU de resultados da simulação."""
+    logger.info("=== Teste do Cache de Simulação ===")
+
+    try:
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator, CacheSimulacao
+
+        parametros_teste = {
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = CacheSimulacao(max_entradas=1, diretorio_persistente=temp_dir)
+            simulador = MonteCarloSimulator(CigreModeloTermico(parametros_teste), cache=cache)
+
+            medias = {'temperatura_ar': 25.0, 'radiacao_global': 0.0, 'vento_u': 1.0, 'vento_v': 0.5}
+            desvios = {'temperatura_ar': 1.0, 'radiacao_global': 0.0, 'vento_u': 0.3, 'vento_v': 0.3}
+
+            resultado_1 = simulador.executar_simulacao(medias, desvios, 90, 400, num_iteracoes=50,
+                                                       forcar_simulacao=True)
+
+            # Estado praticamente idêntico deve reutilizar o resultado
+            medias_proximas = dict(medias, temperatura_ar=25.001)
+            resultado_2 = simulador.executar_simulacao(medias_proximas, desvios, 90, 400, num_iteracoes=50,
+                                                       forcar_simulacao=True)
+
+            if (not np.array_equal(resultado_2['temperaturas'], resultado_1['temperaturas']) or
+                    resultado_2['temperaturas'].flags.writeable or
+                    not resultado_1['temperaturas'].flags.writeable):
+                logger.error("✗ Estado repetido não foi obtido do cache como cópia somente leitura")
+                return False
+
+            # Novo estado remove o anterior da memória (max_entradas=1), mas o disco o preserva
+            simulador.executar_simulacao(dict(medias, temperatura_ar=30.0), desvios, 90, 400, num_iteracoes=50,
+                                         forcar_simulacao=True)
+            simulador.executar_simulacao(medias, desvios, 90, 400, num_iteracoes=50,
+                                         forcar_simulacao=True)
+
+            estatisticas = cache.obter_estatisticas()
+            cache.fechar()
+
+            if estatisticas['remocoes'] < 1 or estatisticas['acertos_disco'] != 1:
+                logger.error(f"✗ Contadores inesperados: {estatisticas}")
+                return False
+
+            # Outro cabo sobre a mesma camada persistente não reaproveita resultados
+            cache_outro_cabo = CacheSimulacao(diretorio_persistente=temp_dir)
+            simulador_outro_cabo = MonteCarloSimulator(
+                CigreModeloTermico(dict(parametros_teste, diametro=0.03)), cache=cache_outro_cabo
+            )
+            simulador_outro_cabo.executar_simulacao(medias, desvios, 90, 400, num_iteracoes=50,
+                                                    forcar_simulacao=True)
+            acertos_outro_cabo = cache_outro_cabo.obter_estatisticas()['acertos']
+            cache_outro_cabo.fechar()
+            if acertos_outro_cabo != 0:
+                logger.error("✗ Cache persistente reaproveitou resultado de outro cabo")
+                return False
+
+            logger.info(f"✓ Cache: {estatisticas['acertos']} acertos, {estatisticas['falhas']} falhas, "
+                        f"{estatisticas['remocoes']} remoções")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do cache de simulação: {e}")
+        return False
+
+def teste_agrupamento_pontos():
+    """Testa o agrupamento horário de pontos com entradas praticamente idênticas."""
+    logger.info("=== Teste de Agrupamento de Pontos ===")
+
+    try:
+        import config
+        from main import AnalisadorRiscoTermico
+
+        num_pontos = 10
+        dados_hora = {
+            variavel: {'media': np.full(num_pontos, media), 'variancia': np.full(num_pontos, 1.0)}
+            for variavel, media in zip(config.VARIAVEIS_AMBIENTAIS, [25.0, 300.0, 1.0, 1.0])
+        }
+        dados_hora['temperatura_ar']['media'][5:] = 30.0  # Segundo trecho mais quente
+        dados_hora['radiacao_global']['media'][7] = np.nan  # Ponto sem dados
+
+        azimutes = np.zeros(num_pontos)
+        grupos = AnalisadorRiscoTermico()._agrupar_pontos_hora(dados_hora, azimutes)
+
+        if grupos != [[0, 1, 2, 3, 4], [5, 6, 8, 9]]:
+            logger.error(f"✗ Grupos inesperados: {grupos}")
+            return False
+
+        pontos_validos = sum(len(membros) for membros in grupos)
+        logger.info(f"✓ {pontos_validos} pontos em {len(grupos)} grupos "
+                    f"(compressão {pontos_validos / len(grupos):.1f}x)")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste de agrupamento de pontos: {e}")
+        return False
+
+def teste_simulacao_linha():
+    """Testa o solver vetorizado e a simulação conjunta da linha."""
+    logger.info("=== Teste da Simulação Conjunta da Linha ===")
+
+    try:
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+
+        parametros_teste = {
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }
+
+        modelo = CigreModeloTermico(parametros_teste)
+
+        # Solver vetorizado deve concordar com o solver escalar
+        temp_escalar = modelo.resolver_temperatura_condutor(50, 800, 600, 90, 1.5, 60, 30)
+        temp_vetorizada = modelo.resolver_temperatura_condutor_vetorizado(
+            800, np.array([600.0]), 90, np.array([1.5]), np.array([60.0]), np.array([30.0])
+        )[0]
+
+        if abs(temp_escalar - temp_vetorizada) > 0.05:
+            logger.error(f"✗ Solver vetorizado divergente: {temp_vetorizada:.3f} vs {temp_escalar:.3f}")
+            return False
+
+        logger.info(f"✓ Solver vetorizado: {temp_vetorizada:.2f}°C (escalar {temp_escalar:.2f}°C)")
+
+        simulador = MonteCarloSimulator(modelo)
+        num_pontos = 5
+        medias = {
+            'temperatura_ar': np.full(num_pontos, 30.0),
+            'radiacao_global': np.full(num_pontos, 700.0),
+            'vento_u': np.linspace(0.3, 1.5, num_pontos),
+            'vento_v': np.full(num_pontos, 0.3)
+        }
+        desvios = {
+            'temperatura_ar': np.full(num_pontos, 2.0),
+            'radiacao_global': np.full(num_pontos, 80.0),
+            'vento_u': np.full(num_pontos, 0.5),
+            'vento_v': np.full(num_pontos, 0.5)
+        }
+        coordenadas = np.column_stack([np.arange(num_pontos) * 1000.0, np.zeros(num_pontos)])
+
+        resultado = simulador.executar_simulacao_linha(
+            medias, desvios, np.full(num_pontos, 90.0), 900,
+            coordenadas=coordenadas, num_iteracoes=300, semente_aleatoria=1
+        )
+
+        prob_linha = resultado['probabilidade_excedencia_linha']
+        prob_max_ponto = np.nanmax(resultado['probabilidade_excedencia_pontos'])
+
+        # A excedência em algum vão nunca é menor que a de qualquer vão isolado
+        if prob_linha < prob_max_ponto:
+            logger.error(f"✗ Probabilidade da linha ({prob_linha:.3f}) menor que a de um ponto ({prob_max_ponto:.3f})")
+            return False
+
+        if not np.isclose(np.sum(resultado['distribuicao_vao_critico']), 1.0):
+            logger.error("✗ Distribuição do vão crítico não soma 1")
+            return False
+
+        logger.info(f"✓ P(excedência na linha): {prob_linha:.3f} (máximo por ponto: {prob_max_ponto:.3f})")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da simulação conjunta da linha: {e}")
+        return False
+
+def teste_trajetorias_temporais():
+    """Testa a simulação de trajetórias temporalmente correlacionadas."""
+    logger.info("=== Teste das Trajetórias Temporais ===")
+
+    try:
+        import pandas as pd
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+
+        parametros_teste = {
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }
+
+        simulador = MonteCarloSimulator(CigreModeloTermico(parametros_teste))
+
+        # Eventos devem ser interrompidos em lacunas da série
+        excede = np.array([[True, True, False, True, True, True],
+                           [False, True, True, True, True, False]])
+        inicio_trecho = np.array([True, False, False, False, True, False])
+        duracoes, inicios = simulador._identificar_eventos_excedencia(excede, inicio_trecho)
+
+        if sorted(duracoes.tolist()) != [1, 1, 2, 2, 3] or inicios.sum() != 5:
+            logger.error(f"✗ Durações de eventos incorretas: {duracoes.tolist()}")
+            return False
+
+        logger.info(f"✓ Identificação de eventos: durações {duracoes.tolist()}")
+
+        timestamps = pd.date_range('2024-01-01', periods=72, freq='h')
+        horas_dia = timestamps.hour.values
+        medias = {
+            'temperatura_ar': 28 + 6 * np.sin((horas_dia - 9) / 24 * 2 * np.pi),
+            'radiacao_global': np.clip(800 * np.sin((horas_dia - 6) / 12 * np.pi), 0, None),
+            'vento_u': np.full(72, 1.0),
+            'vento_v': np.full(72, 0.5)
+        }
+        desvios = {
+            'temperatura_ar': np.full(72, 1.5),
+            'radiacao_global': np.full(72, 60.0),
+            'vento_u': np.full(72, 0.5),
+            'vento_v': np.full(72, 0.5)
+        }
+
+        resultado = simulador.simular_trajetorias_temporais(
+            medias, desvios, timestamps, 90, 850, num_trajetorias=200, semente_aleatoria=0
+        )
+
+        eventos = resultado['eventos_por_periodo']
+        if len(eventos) != 3:
+            logger.error(f"✗ Esperados 3 períodos diários, obtidos {len(eventos)}")
+            return False
+
+        # Horas em excedência estimadas pelas durações e pela probabilidade horária
+        horas_excedencia = resultado['duracoes_excedencia'].sum() / 200
+        horas_esperadas = np.nansum(resultado['probabilidade_excedencia_horaria'])
+        if not np.isclose(horas_excedencia, horas_esperadas, rtol=0.05):
+            logger.error(f"✗ Durações inconsistentes: {horas_excedencia:.2f} vs {horas_esperadas:.2f} h")
+            return False
+
+        # Processo AR ajustado a resíduos de estações com faltas e lacuna temporal
+        rng = np.random.default_rng(5)
+        horas_residuos = pd.date_range('2024-01-01', periods=1500, freq='h').append(
+            pd.date_range('2024-04-01', periods=1500, freq='h'))
+        residuos = np.zeros((4, 3000))
+        for t in range(1, 3000):
+            residuos[:, t] = 0.7 * residuos[:, t - 1] + np.sqrt(1 - 0.49) * rng.standard_normal(4)
+        residuos[rng.random(residuos.shape) < 0.2] = np.nan
+        coeficientes = simulador.ajustar_processos_ar(
+            {v: residuos for v in ['temperatura_ar', 'radiacao_global', 'vento_u', 'vento_v']}, horas_residuos
+        )
+        if not np.isclose(coeficientes['vento_u']['phi'][0], 0.7, atol=0.05):
+            logger.error(f"✗ Coeficiente AR dos resíduos incorreto: {coeficientes['vento_u']['phi']}")
+            return False
+
+        resultado_residuos = simulador.simular_trajetorias_temporais(
+            medias, desvios, timestamps, 90, 850, num_trajetorias=50, semente_aleatoria=0,
+            coeficientes_ar=coeficientes
+        )
+        if resultado_residuos['coeficientes_ar'] is not coeficientes:
+            logger.error("✗ Coeficientes AR informados não foram usados")
+            return False
+
+        logger.info(f"✓ Trajetórias: duração média {resultado['estatisticas_duracao']['duracao_media']:.1f} h, "
+                    f"{eventos['eventos_medio'].mean():.2f} eventos/dia, "
+                    f"phi dos resíduos {coeficientes['vento_u']['phi'][0]:.3f}")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste das trajetórias temporais: {e}")
+        return False
+
+def teste_monte_carlo_multinivel():
+    """Testa o estimador de Monte Carlo multinível."""
+    logger.info("=== Teste do Monte Carlo Multinível ===")
+
+    try:
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+
+        parametros_teste = {
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }
+
+        simulador = MonteCarloSimulator(CigreModeloTermico(parametros_teste))
+
+        medias = {'temperatura_ar': 30.0, 'radiacao_global': 700.0, 'vento_u': 1.0, 'vento_v': 0.3}
+        desvios = {'temperatura_ar': 2.0, 'radiacao_global': 80.0, 'vento_u': 0.5, 'vento_v': 0.5}
+
+        resultado = simulador.executar_simulacao_multinivel(
+            medias, desvios, 90, 800, rmse_alvo=0.01, semente_aleatoria=0
+        )
+
+        # Referência: Monte Carlo de nível único na precisão mais fina
+        rng = np.random.default_rng(1)
+        amostras = {var: medias[var] + desvios[var] * rng.standard_normal(50000) for var in medias}
+        temperaturas = simulador._resolver_amostras_vetorizado(amostras, 90, 800)
+        prob_referencia = np.mean(temperaturas[np.isfinite(temperaturas)] > 75)
+
+        prob_mlmc = resultado['probabilidade_excedencia']
+        if abs(prob_mlmc - prob_referencia) > 4 * resultado['erro_padrao'] + 0.005:
+            logger.error(f"✗ MLMC divergente: {prob_mlmc:.4f} vs referência {prob_referencia:.4f}")
+            return False
+
+        if len(resultado['amostras_por_nivel']) != 3 or resultado['amostras_por_nivel'][0] <= resultado['amostras_por_nivel'][-1]:
+            logger.error(f"✗ Alocação inesperada: {resultado['amostras_por_nivel']}")
+            return False
+
+        logger.info(f"✓ MLMC: P={prob_mlmc:.4f} ± {resultado['erro_padrao']:.4f} "
+                    f"(referência {prob_referencia:.4f}), amostras {resultado['amostras_por_nivel'].tolist()}")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do Monte Carlo multinível: {e}")
+        return False
+
+def teste_numeros_aleatorios_comuns():
+    """Testa a simulação com bloco de números aleatórios comuns."""
+    logger.info("=== Teste dos Números Aleatórios Comuns ===")
+
+    try:
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+
+        parametros_teste = {
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }
+
+        simulador = MonteCarloSimulator(CigreModeloTermico(parametros_teste))
+
+        medias = {'temperatura_ar': 30.0, 'radiacao_global': 700.0, 'vento_u': 1.0, 'vento_v': 0.3}
+        desvios = {'temperatura_ar': 2.0, 'radiacao_global': 80.0, 'vento_u': 0.5, 'vento_v': 0.5}
+
+        bloco = simulador.obter_bloco_normal(2000)
+
+        # Mesma corrente duas vezes: resultados idênticos sem semente explícita
+        percentis = []
+        for corrente in [700, 700, 750, 800]:
+            resultado = simulador.executar_simulacao(
+                medias, desvios, 90, corrente, num_iteracoes=2000,
+                usar_cache=False, numeros_comuns=True
+            )
+            percentis.append(resultado['estatisticas']['percentil_90'])
+
+        if simulador.obter_bloco_normal(2000) is not bloco:
+            logger.error("✗ Bloco de números comuns regenerado entre cenários")
+            return False
+
+        if percentis[0] != percentis[1]:
+            logger.error("✗ Cenários idênticos com resultados diferentes")
+            return False
+
+        # Com números comuns a curva em função da corrente é monotônica
+        if not (percentis[1] < percentis[2] < percentis[3]):
+            logger.error(f"✗ P90 não monotônico com a corrente: {percentis}")
+            return False
+
+        logger.info(f"✓ Números comuns: P90 = {[round(p, 2) for p in percentis]}")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste dos números aleatórios comuns: {e}")
+        return False
+
+def teste_triagem_deterministica():
+    """Testa a triagem determinística de cenários claramente seguros."""
+    logger.info("=== Teste da Triagem Determinística ===")
+
+    try:
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+
+        parametros_teste = {
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }
+
+        simulador = MonteCarloSimulator(CigreModeloTermico(parametros_teste))
+
+        # Noite com vento: claramente seguro
+        medias_noite = {'temperatura_ar': 20.0, 'radiacao_global': 0.0, 'vento_u': 3.0, 'vento_v': 1.0}
+        desvios_noite = {'temperatura_ar': 1.0, 'radiacao_global': 0.0, 'vento_u': 0.5, 'vento_v': 0.5}
+
+        resultado = simulador.executar_simulacao(medias_noite, desvios_noite, 90, 400, num_iteracoes=500,
+                                                 usar_cache=False)
+        if not resultado['triagem'] or resultado['probabilidade_excedencia'] != 0.0:
+            logger.error("✗ Cenário seguro não foi triado")
+            return False
+
+        # O pior caso deve limitar as temperaturas do Monte Carlo completo
+        completo = simulador.executar_simulacao(medias_noite, desvios_noite, 90, 400, num_iteracoes=500,
+                                                forcar_simulacao=True, usar_cache=False)
+        if completo['triagem'] or np.max(completo['temperaturas']) > resultado['temperatura_pior_caso']:
+            logger.error("✗ Pior caso da triagem excedido pelo Monte Carlo")
+            return False
+
+        # Dia quente com vento fraco e corrente alta: exige simulação
+        medias_dia = {'temperatura_ar': 32.0, 'radiacao_global': 800.0, 'vento_u': 0.5, 'vento_v': 0.2}
+        desvios_dia = {'temperatura_ar': 2.0, 'radiacao_global': 80.0, 'vento_u': 0.5, 'vento_v': 0.5}
+        resultado_dia = simulador.executar_simulacao(medias_dia, desvios_dia, 90, 900, num_iteracoes=200,
+                                                     usar_cache=False)
+        if resultado_dia['triagem']:
+            logger.error("✗ Cenário crítico foi triado indevidamente")
+            return False
+
+        # Corrente sem solução no intervalo do solver: a estimativa de recurso não é um limite
+        medias_calmo = {'temperatura_ar': 5.0, 'radiacao_global': 0.0, 'vento_u': 0.0, 'vento_v': 0.0}
+        desvios_calmo = {'temperatura_ar': 0.5, 'radiacao_global': 0.0, 'vento_u': 0.1, 'vento_v': 0.1}
+        _, com_raiz = simulador.modelo_termico.resolver_temperatura_condutor_vetorizado(
+            3000, np.array([0.0]), 90, np.array([0.0]), np.array([0.0]), np.array([6.5]),
+            retornar_mascara=True
+        )
+        if com_raiz[0] or simulador.avaliar_triagem(medias_calmo, desvios_calmo, 90, 3000) is not None:
+            logger.error("✗ Cenário sem raiz no solver foi triado")
+            return False
+
+        # Métodos com caudas fora da caixa ± kσ sempre simulam
+        if any(simulador.avaliar_triagem(medias_noite, desvios_noite, 90, 400, metodo_amostragem=metodo)
+               is not None for metodo in ['lognormal', 'triangular', 'distribuicoes', 'bootstrap']):
+            logger.error("✗ Triagem aplicada a método sem caudas limitadas")
+            return False
+
+        logger.info(f"✓ Triagem: pior caso {resultado['temperatura_pior_caso']:.1f}°C, "
+                    f"fração triada {simulador.obter_fracao_triagem():.0%}")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da triagem determinística: {e}")
+        return False
+
+def teste_caos_polinomial():
+    """Testa o substituto por caos polinomial e o recurso ao Monte Carlo."""
+    logger.info("=== Teste do Caos Polinomial ===")
+
+    try:
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+
+        parametros_teste = {
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }
+
+        simulador = MonteCarloSimulator(CigreModeloTermico(parametros_teste))
+
+        medias = {'temperatura_ar': 30.0, 'radiacao_global': 700.0, 'vento_u': 1.2, 'vento_v': 0.8}
+        desvios = {'temperatura_ar': 2.0, 'radiacao_global': 80.0, 'vento_u': 0.2, 'vento_v': 0.2}
+
+        resultado = simulador.executar_simulacao_caos_polinomial(
+            medias, desvios, 90, 800, num_amostras=200000, semente_aleatoria=0
+        )
+
+        if not resultado['substituto']:
+            logger.error(f"✗ Expansão rejeitada em cenário suave (erro {resultado['erro_ajuste']:.3g})")
+            return False
+
+        rng = np.random.default_rng(1)
+        amostras = {var: medias[var] + desvios[var] * rng.standard_normal(50000) for var in medias}
+        temperaturas = simulador._resolver_amostras_vetorizado(amostras, 90, 800)
+        p90_referencia = np.percentile(temperaturas[np.isfinite(temperaturas)], 90)
+
+        if abs(resultado['estatisticas']['percentil_90'] - p90_referencia) > 0.3:
+            logger.error(f"✗ P90 do substituto divergente: {resultado['estatisticas']['percentil_90']:.2f} "
+                         f"vs {p90_referencia:.2f}")
+            return False
+
+        # Vento cruzando a transição de regime de Reynolds: resposta descontínua
+        medias_transicao = dict(medias, vento_u=2.2, vento_v=1.3)
+        desvios_transicao = dict(desvios, vento_u=0.4, vento_v=0.4)
+        resultado_transicao = simulador.executar_simulacao_caos_polinomial(
+            medias_transicao, desvios_transicao, 90, 800, recorrer_monte_carlo=False
+        )
+
+        if resultado_transicao['substituto']:
+            logger.error("✗ Expansão aceita para resposta descontínua")
+            return False
+
+        logger.info(f"✓ Caos polinomial: P90 {resultado['estatisticas']['percentil_90']:.2f}°C "
+                    f"(referência {p90_referencia:.2f}°C), erro {resultado['erro_ajuste']:.2e}; "
+                    f"transição rejeitada (erro {resultado_transicao['erro_ajuste']:.2f})")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do caos polinomial: {e}")
+        return False
+
+def teste_confiabilidade_form():
+    """Testa o método FORM em lote com verificação por importância."""
+    logger.info("=== Teste do Método FORM ===")
+
+    try:
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+
+        parametros_teste = {
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }
+
+        simulador = MonteCarloSimulator(CigreModeloTermico(parametros_teste))
+
+        # Último cenário com a média já acima do limite
+        num_cenarios = 4
+        medias = {
+            'temperatura_ar': np.array([26.0, 30.0, 34.0, 30.0]),
+            'radiacao_global': np.full(num_cenarios, 700.0),
+            'vento_u': np.array([1.2, 1.2, 1.2, 0.3]),
+            'vento_v': np.array([0.8, 0.8, 0.8, 0.1])
+        }
+        desvios = {
+            'temperatura_ar': np.full(num_cenarios, 2.0),
+            'radiacao_global': np.full(num_cenarios, 80.0),
+            'vento_u': np.full(num_cenarios, 0.2),
+            'vento_v': np.full(num_cenarios, 0.2)
+        }
+        correntes = np.array([850, 850, 850, 1000])
+
+        resultado = simulador.calcular_confiabilidade_form(
+            medias, desvios, 90, correntes, amostras_verificacao=2000, semente_aleatoria=0
+        )
+
+        beta = resultado['indice_confiabilidade']
+        if not np.all(resultado['convergido'][:3]) or not np.all(np.diff(beta[:3]) < 0):
+            logger.error(f"✗ Índices de confiabilidade inesperados: {beta}")
+            return False
+
+        if beta[3] >= 0 or resultado['probabilidade_excedencia'][3] < 0.5:
+            logger.error(f"✗ Cenário com média acima do limite deveria ter β < 0: {beta[3]:.2f}")
+            return False
+
+        prob_form = resultado['probabilidade_excedencia'][:3]
+        prob_is = resultado['probabilidade_importancia'][:3]
+        if np.any(np.abs(prob_form - prob_is) > 0.3 * prob_is + 4 * resultado['erro_padrao_importancia'][:3]):
+            logger.error(f"✗ FORM divergente da amostragem por importância: {prob_form} vs {prob_is}")
+            return False
+
+        logger.info(f"✓ FORM: β = {np.round(beta, 2)}, P = {np.array2string(prob_form, precision=5)} "
+                    f"em {resultado['avaliacoes_modelo']} avaliações por cenário")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do método FORM: {e}")
+        return False
+
+def teste_ampacidade_probabilistica():
+    """Testa a ampacidade por nível de risco."""
+    logger.info("=== Teste da Ampacidade Probabilística ===")
+
+    try:
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+        from distributions import BancoResiduos
+        from risk_analysis import RiskAnalyzer
+
+        parametros_teste = {
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }
+
+        simulador = MonteCarloSimulator(CigreModeloTermico(parametros_teste))
+        niveis = RiskAnalyzer().obter_niveis_risco_nbr_5422()
+
+        medias = {
+            'temperatura_ar': np.array([26.0, 34.0]),
+            'radiacao_global': np.array([0.0, 900.0]),
+            'vento_u': np.array([2.0, 0.5]),
+            'vento_v': np.array([1.0, 0.2])
+        }
+        desvios = {
+            'temperatura_ar': np.full(2, 2.0),
+            'radiacao_global': np.full(2, 80.0),
+            'vento_u': np.full(2, 0.5),
+            'vento_v': np.full(2, 0.5)
+        }
+
+        resultado = simulador.calcular_ampacidade_probabilistica(
+            medias, desvios, 90, niveis_risco=niveis, num_iteracoes=4000
+        )
+        ampacidades = resultado['ampacidades']
+
+        # Maior risco aceito permite maior corrente; cenário frio e ventoso suporta mais
+        if not np.all(np.diff(ampacidades, axis=1) > 0) or ampacidades[0, 0] <= ampacidades[1, 0]:
+            logger.error(f"✗ Ampacidades inconsistentes: {ampacidades}")
+            return False
+
+        # Na corrente de 5% a excedência simulada com os mesmos números deve ser ~5%
+        bloco = simulador.obter_bloco_normal(4000)
+        amostras = {var: medias[var][1] + desvios[var][1] * bloco[:, j] for j, var in enumerate(medias)}
+        temperaturas = simulador._resolver_amostras_vetorizado(amostras, 90, ampacidades[1, 1])
+        excedencia = np.mean(temperaturas[np.isfinite(temperaturas)] > 75)
+
+        if abs(excedencia - niveis[1]) > 0.005:
+            logger.error(f"✗ Excedência na ampacidade de {niveis[1]:.0%}: {excedencia:.3f}")
+            return False
+
+        # Motor de distribuições: mesma transformação do bloco comum usada em executar_simulacao
+        resultado_distribuicoes = simulador.calcular_ampacidade_probabilistica(
+            medias, desvios, 90, niveis_risco=niveis, num_iteracoes=4000, metodo_amostragem='distribuicoes'
+        )
+        amostras = simulador.amostrador.transformar(bloco, {v: medias[v][1] for v in medias},
+                                                    {v: desvios[v][1] for v in desvios})
+        temperaturas = simulador._resolver_amostras_vetorizado(
+            amostras, 90, resultado_distribuicoes['ampacidades'][1, 1]
+        )
+        if abs(np.mean(temperaturas[np.isfinite(temperaturas)] > 75) - niveis[1]) > 0.005:
+            logger.error("✗ Ampacidade não seguiu o motor de distribuições")
+            return False
+
+        # Bootstrap: perturbações sorteadas do banco de resíduos do estrato
+        rng = np.random.default_rng(2)
+        simulador.banco_residuos = BancoResiduos.construir(
+            pd.date_range('2024-01-01', periods=2000, freq='h'), rng.standard_t(4, (2000, 4))
+        )
+        resultado_bootstrap = simulador.calcular_ampacidade_probabilistica(
+            medias, desvios, 90, niveis_risco=niveis, num_iteracoes=4000, metodo_amostragem='bootstrap',
+            hora=pd.Timestamp('2024-01-15 14:00'), semente_aleatoria=0
+        )
+        if not np.all(np.diff(resultado_bootstrap['ampacidades'], axis=1) > 0):
+            logger.error(f"✗ Ampacidades do bootstrap inconsistentes: {resultado_bootstrap['ampacidades']}")
+            return False
+
+        logger.info(f"✓ Ampacidade probabilística ({niveis}): {np.round(ampacidades, 0).tolist()} A")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da ampacidade probabilística: {e}")
+        return False
+
+def teste_distribuicoes():
+    """Testa o motor vetorizado de distribuições."""
+    logger.info("=== Teste do Motor de Distribuições ===")
+
+    try:
+        from distributions import AmostradorDistribuicoes
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+
+        rng = np.random.default_rng(0)
+        medias = {'temperatura_ar': 25.0, 'radiacao_global': 0.0, 'vento_u': 2.0, 'vento_v': 1.0}
+        desvios = {'temperatura_ar': 2.0, 'radiacao_global': 50.0, 'vento_u': 0.5, 'vento_v': 0.5}
+
+        # Normal truncada: radiação noturna sem massa acumulada em zero
+        amostras = AmostradorDistribuicoes().amostrar(medias, desvios, 100000, rng)
+        radiacao = amostras['radiacao_global']
+        if np.any(radiacao < 0) or np.mean(radiacao == 0) > 0 or abs(radiacao.mean() - 50 * np.sqrt(2 / np.pi)) > 1:
+            logger.error("✗ Normal truncada da radiação incorreta")
+            return False
+
+        logger.info(f"✓ Normal truncada: radiação média noturna {radiacao.mean():.1f} W/m²")
+
+        # Weibull polar: velocidade média igual à magnitude do vento médio
+        amostrador_polar = AmostradorDistribuicoes(representacao_vento='weibull_polar')
+        amostras_polar = amostrador_polar.amostrar(medias, desvios, 100000, rng)
+        velocidade = np.hypot(amostras_polar['vento_u'], amostras_polar['vento_v'])
+        if abs(velocidade.mean() - np.hypot(2.0, 1.0)) > 0.02 or np.any(velocidade < 0):
+            logger.error(f"✗ Velocidade Weibull média incorreta: {velocidade.mean():.3f}")
+            return False
+
+        # Empírica: amostras limitadas ao suporte dos resíduos registrados
+        amostrador_polar.registrar_empirica('temperatura_ar', rng.uniform(-1.5, 1.5, 5000))
+        temperatura = amostrador_polar.amostrar(medias, desvios, 50000, rng)['temperatura_ar']
+        if temperatura.min() < 25 - 3.01 or temperatura.max() > 25 + 3.01:
+            logger.error("✗ Distribuição empírica fora do suporte dos resíduos")
+            return False
+
+        logger.info(f"✓ Weibull polar: velocidade média {velocidade.mean():.2f} m/s; empírica limitada")
+
+        # Integração com o simulador
+        modelo = CigreModeloTermico({
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        })
+        simulador = MonteCarloSimulator(modelo, amostrador=amostrador_polar)
+        resultado = simulador.executar_simulacao(
+            dict(medias, radiacao_global=600.0), desvios, 90, 600, num_iteracoes=2000,
+            metodo_amostragem='distribuicoes', semente_aleatoria=0, usar_cache=False,
+            forcar_simulacao=True
+        )
+        if resultado['iteracoes_validas'] < 1900:
+            logger.error(f"✗ Poucas iterações válidas: {resultado['iteracoes_validas']}")
+            return False
+
+        logger.info(f"✓ Simulação com distribuições configuradas: P90 {resultado['estatisticas']['percentil_90']:.2f}°C")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do motor de distribuições: {e}")
+        return False
+
+def teste_banco_residuos():
+    """Testa o banco de resíduos e a amostragem por bootstrap."""
+    logger.info("=== Teste do Banco de Resíduos ===")
+
+    try:
+        from distributions import BancoResiduos
+        from geoprocessing import GeoProcessor
+        from thermal_model import CigreModeloTermico
+        from simulation import MonteCarloSimulator
+
+        rng = np.random.default_rng(0)
+
+        # Resíduos de validação cruzada de uma hora com quatro estações
+        hora = pd.Timestamp('2024-01-15 12:00')
+        dados = pd.DataFrame({
+            'latitude': [-20.0, -20.3, -20.1, -19.8],
+            'longitude': [-45.0, -44.7, -44.4, -44.9],
+            'temperatura_ar': [25.0, 26.5, 24.2, 25.8],
+            'radiacao_global': [600.0, 650.0, 580.0, 700.0],
+            'vento_u': [1.0, 1.5, 0.4, 1.1],
+            'vento_v': [0.2, -0.3, 0.5, 0.0]
+        }, index=pd.DatetimeIndex([hora] * 4))
+
+        geo = GeoProcessor()
+        timestamps, residuos = geo.calcular_residuos_validacao_cruzada(dados)
+        if residuos.shape != (4, 4) or not np.any(np.isfinite(residuos)):
+            logger.error(f"✗ Resíduos de validação cruzada inválidos: {residuos.shape}")
+            return False
+
+        # Mesmos resíduos das séries usadas no ajuste do processo AR
+        _, series = geo.calcular_series_residuos_validacao_cruzada(dados)
+        if not np.allclose(residuos[:, 0], series['temperatura_ar'][:, 0], equal_nan=True):
+            logger.error("✗ Banco e séries de resíduos divergem")
+            return False
+
+        logger.info(f"✓ Validação cruzada: {np.sum(np.isfinite(residuos))} resíduos padronizados")
+
+        # Banco sintético: meio-dia de verão (aquecimento) e madrugada de inverno (resfriamento)
+        assinatura_quente = np.array([1.0, 1.0, -1.0, -1.0])
+        timestamps = pd.DatetimeIndex([pd.Timestamp('2023-01-10 12:00')] * 50 +
+                                      [pd.Timestamp('2023-07-10 03:00')] * 50)
+        residuos = np.vstack([np.tile(assinatura_quente, (50, 1)), np.tile(-assinatura_quente, (50, 1))])
+        residuos[0, 2] = np.nan
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'banco.npz')
+            BancoResiduos.construir(timestamps, residuos).salvar(caminho)
+            banco = BancoResiduos.carregar(caminho)
+
+        if len(banco.residuos) != 99:
+            logger.error("✗ Linhas incompletas não foram descartadas do banco")
+            return False
+
+        estrato_verao = BancoResiduos.obter_estrato(pd.Timestamp('2024-02-01 12:00'))
+        estrato_vazio = BancoResiduos.obter_estrato(pd.Timestamp('2024-04-01 12:00'))
+        if not (np.all(banco.amostrar(200, estrato_verao, rng) == assinatura_quente) and
+                np.all(banco.amostrar(200, estrato_vazio, rng) == assinatura_quente)):
+            logger.error("✗ Amostragem estratificada incorreta")
+            return False
+
+        simulador = MonteCarloSimulator(CigreModeloTermico({
+            'diametro': 0.02814,
+            'resistencia_ac_25': 7.28e-5,
+            'resistencia_ac_75': 9.09e-5,
+            'emissividade': 0.8,
+            'absortividade': 0.8
+        }), banco_residuos=banco)
+
+        medias = {'temperatura_ar': 30.0, 'radiacao_global': 700.0, 'vento_u': 1.0, 'vento_v': 0.3}
+        desvios = {'temperatura_ar': 2.0, 'radiacao_global': 80.0, 'vento_u': 0.5, 'vento_v': 0.5}
+        resultados = {}
+        for rotulo, hora_cenario in [('verao', '2024-01-20 12:00'), ('inverno', '2024-07-20 03:00')]:
+            resultados[rotulo] = simulador.executar_simulacao(
+                medias, desvios, 90, 800, num_iteracoes=100, metodo_amostragem='bootstrap',
+                hora=pd.Timestamp(hora_cenario), semente_aleatoria=0, forcar_simulacao=True
+            )
+
+        # O estrato de verão deve aquecer o condutor em relação ao de inverno
+        if resultados['verao']['estatisticas']['media'] <= resultados['inverno']['estatisticas']['media']:
+            logger.error("✗ Estratos do banco não afetaram a simulação")
+            return False
+
+        logger.info(f"✓ Bootstrap: {resultados['verao']['estatisticas']['media']:.1f}°C (verão) vs "
+                    f"{resultados['inverno']['estatisticas']['media']:.1f}°C (inverno)")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do banco de resíduos: {e}")
+        return False
+
+def teste_discretizacao_linha():
+    """Testa a discretização vetorizada do traçado da linha."""
+    logger.info("=== Teste da Discretização da Linha ===")
+
+    try:
+        from geoprocessing import GeoProcessor
+
+        geo = GeoProcessor()
+        dados_linha = pd.DataFrame({
+            'Progressiva': [0, 5000, 7000],
+            'azimute': [30, 90, 90],
+            'latitude': [-20.0, -20.03, -20.03],
+            'longitude': [-45.0, -45.02, -45.04]
+        })
+        pontos = geo.discretizar_linha(dados_linha, distancia_entre_pontos=250)
+
+        x, y = geo.converter_coordenadas_lote(dados_linha['latitude'].values, dados_linha['longitude'].values)
+        esperados = [int(np.hypot(np.diff(x)[i], np.diff(y)[i]) / 250) for i in range(2)]
+        contagens = pontos.groupby('segmento').size().tolist()
+        if contagens != esperados + [1] or not np.array_equal(pontos['ponto_id'], np.arange(len(pontos))):
+            logger.error(f"✗ Pontos por segmento incorretos: {contagens} vs {esperados}")
+            return False
+
+        segundo = pontos[pontos['segmento'] == 1]
+        if not (np.isclose(segundo['fracao_segmento'].iloc[1], 1 / esperados[1]) and
+                np.allclose(segundo['azimute'], 90.0) and
+                pontos['progressiva_aprox'].iloc[-1] == 7000 and
+                np.isclose(pontos['x'].iloc[-1], x[-1])):
+            logger.error("✗ Interpolação dos pontos incorreta")
+            return False
+
+        logger.info(f"✓ Linha discretizada em {len(pontos)} pontos")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da discretização da linha: {e}")
+        return False
+
+def teste_discretizacao_adaptativa():
+    """Testa a discretização adaptativa por geometria e campos climatológicos."""
+    logger.info("=== Teste da Discretização Adaptativa ===")
+
+    try:
+        import config
+        from geoprocessing import GeoProcessor
+
+        geo = GeoProcessor()
+        # 40 km para leste, curva de 90° e 20 km para norte
+        dados_linha = pd.DataFrame({
+            'Progressiva': [0, 20000, 40000, 60000],
+            'azimute': [90, 90, 0, 0],
+            'latitude': [-20.0, -20.0, -20.0, -19.82],
+            'longitude': [-45.0, -44.81, -44.62, -44.62]
+        })
+        pontos = geo.discretizar_linha_adaptativa(dados_linha, distancia_minima=250, distancia_maxima=5000)
+        espacamentos = np.hypot(np.diff(pontos['x']), np.diff(pontos['y']))
+
+        # Limites respeitados, vértice da curva mantido e pontos concentrados perto dele
+        curva = np.flatnonzero((pontos['segmento'] == 2) & (pontos['fracao_segmento'] == 0))
+        if (espacamentos.min() < 250 or espacamentos.max() > 5000 or len(curva) != 1 or
+                espacamentos[curva[0]] > 300 or espacamentos[0] < 4000 or
+                not np.array_equal(pontos['ponto_id'], np.arange(len(pontos)))):
+            logger.error(f"✗ Espaçamentos adaptativos incorretos: {np.round(espacamentos).tolist()}")
+            return False
+
+        resumo = geo.resumo_discretizacao
+        if resumo['pontos'] != len(pontos) or resumo['pontos'] >= resumo['pontos_espacamento_fixo']:
+            logger.error(f"✗ Resumo da discretização incorreto: {resumo}")
+            return False
+
+        # Gradiente climatológico de temperatura (oeste-leste) refina o trecho reto
+        rng = np.random.default_rng(3)
+        horas = pd.date_range('2024-01-15 00:00', periods=24, freq='h')
+        latitudes = np.array([-20.1, -19.9, -19.95, -20.2, -20.0])
+        longitudes = np.array([-45.1, -44.9, -44.85, -44.7, -44.5])
+        n = len(horas) * len(latitudes)
+        dados = pd.DataFrame({
+            'estacao': np.tile([f'E{k}' for k in range(len(latitudes))], len(horas)),
+            'latitude': np.tile(latitudes, len(horas)),
+            'longitude': np.tile(longitudes, len(horas)),
+            'temperatura_ar': np.tile(20.0 + 20.0 * (longitudes + 45.1), len(horas)) + rng.normal(0, 1, n),
+            'radiacao_global': rng.uniform(200, 800, n),
+            'vento_u': rng.normal(1, 0.5, n),
+            'vento_v': rng.normal(0, 0.5, n)
+        }, index=pd.DatetimeIndex(np.repeat(horas, len(latitudes))))
+        refinados = geo.discretizar_linha_adaptativa(dados_linha, dados, distancia_minima=250, distancia_maxima=5000)
+        espacamentos_refinados = np.hypot(np.diff(refinados['x']), np.diff(refinados['y']))
+        if len(refinados) <= len(pontos) or espacamentos_refinados.min() < 250 or espacamentos_refinados.max() > 5000:
+            logger.error("✗ Campos climatológicos não refinaram a discretização")
+            return False
+
+        try:
+            geo.discretizar_linha_adaptativa(dados_linha, distancia_minima=1000, distancia_maxima=1500)
+            logger.error("✗ Limites de espaçamento inconsistentes aceitos")
+            return False
+        except ValueError:
+            pass
+
+        logger.info(f"✓ Discretização adaptativa: {len(pontos)} pontos (geometria), {len(refinados)} "
+                    f"(com climatologia), {resumo['pontos_espacamento_fixo']} com espaçamento fixo")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da discretização adaptativa: {e}")
+        return False
+
+def teste_krigagem_matricial():
+    """Testa a krigagem matricial contra o pykrige e a montagem da série."""
+    logger.info("=== Teste da Krigagem Matricial ===")
+
+    try:
+        import config
+        from geoprocessing import GeoProcessor, MotorKrigagemMatricial
+        from pykrige.ok import OrdinaryKriging
+
+        rng = np.random.default_rng(1)
+        coords_estacoes = rng.uniform(0, 50000, size=(6, 2))
+        coords_pontos = np.column_stack([np.linspace(5000, 45000, 15), np.linspace(10000, 40000, 15)])
+        valores = rng.normal(25, 2, size=6)
+        motor = MotorKrigagemMatricial(coords_estacoes, coords_pontos)
+
+        # Pesos e variâncias devem reproduzir o pykrige com o mesmo variograma
+        for modelo, parametros in [('linear', (3e-5, 0.1)), ('spherical', (1.0, 30000.0, 0.1)),
+                                   ('exponential', (1.0, 20000.0, 0.05))]:
+            pesos, variancia = motor.calcular_pesos(modelo, parametros)
+            if len(parametros) == 2:
+                parametros_pykrige = {'slope': parametros[0], 'nugget': parametros[1]}
+            else:
+                parametros_pykrige = {'psill': parametros[0], 'range': parametros[1], 'nugget': parametros[2]}
+            OK = OrdinaryKriging(coords_estacoes[:, 0], coords_estacoes[:, 1], valores,
+                                 variogram_model=modelo, variogram_parameters=parametros_pykrige,
+                                 coordinates_type='euclidean')
+            z_pykrige, ss_pykrige = OK.execute('points', coords_pontos[:, 0], coords_pontos[:, 1])
+            if not (np.allclose(pesos @ valores, z_pykrige) and np.allclose(variancia, ss_pykrige)):
+                logger.error(f"✗ Krigagem matricial difere do pykrige ({modelo})")
+                return False
+
+        logger.info("✓ Pesos e variâncias equivalentes ao pykrige")
+
+        # Série completa com uma estação faltante em uma das horas
+        horas = pd.date_range('2024-01-15 10:00', periods=3, freq='h')
+        latitudes = np.array([-20.0, -20.3, -20.1, -19.8, -20.2])
+        longitudes = np.array([-45.0, -44.7, -44.4, -44.9, -44.6])
+        registros = []
+        for t, hora in enumerate(horas):
+            for k in range(len(latitudes)):
+                registros.append({
+                    'data_hora': hora, 'estacao': f'E{k}',
+                    'latitude': latitudes[k], 'longitude': longitudes[k],
+                    'temperatura_ar': 24.0 + t + k * 0.5, 'radiacao_global': 600.0 + 20 * k,
+                    'vento_u': 1.0 + 0.1 * k, 'vento_v': 0.5 - 0.2 * k
+                })
+        dados = pd.DataFrame(registros).set_index('data_hora')
+        dados.iloc[1, dados.columns.get_loc('vento_u')] = np.nan
+
+        geo = GeoProcessor()
+        x, y = geo.converter_coordenadas_lote(np.array([-20.2, -19.9]), np.array([-44.9, -44.5]))
+        pontos = pd.DataFrame({'x': np.linspace(x[0], x[1], 10), 'y': np.linspace(y[0], y[1], 10)})
+
+        metodo_original, registro_original = config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO
+        config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO = 'matricial', False
+        try:
+            resultados = geo.executar_krigagem_horaria(dados, pontos)
+        finally:
+            config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO = metodo_original, registro_original
+
+        if list(resultados.keys()) != list(horas):
+            logger.error("✗ Horas da krigagem matricial incorretas")
+            return False
+        for hora in horas:
+            for variavel in config.VARIAVEIS_AMBIENTAIS:
+                resultado = resultados[hora][variavel]
+                if resultado['media'].shape != (10,) or not np.all(np.isfinite(resultado['media'])):
+                    logger.error(f"✗ Resultado inválido para {variavel} em {hora}")
+                    return False
+
+        # Temperatura cresce 1 °C por hora em todas as estações: a média krigada acompanha
+        medias_temperatura = np.array([resultados[h]['temperatura_ar']['media'] for h in horas])
+        if not np.allclose(np.diff(medias_temperatura, axis=0), 1.0):
+            logger.error("✗ Médias da série não acompanham os dados das estações")
+            return False
+
+        logger.info(f"✓ Série de {len(horas)} horas krigada com pesos pré-calculados")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da krigagem matricial: {e}")
+        return False
+
+def teste_registro_variogramas():
+    """Testa o registro de variogramas por estrato e sua persistência."""
+    logger.info("=== Teste do Registro de Variogramas ===")
+
+    try:
+        import config
+        from geoprocessing import GeoProcessor, RegistroVariogramas
+
+        rng = np.random.default_rng(2)
+        latitudes = np.array([-20.0, -20.3, -20.1, -19.8, -20.2, -19.9])
+        longitudes = np.array([-45.0, -44.7, -44.4, -44.9, -44.6, -44.3])
+        horas = pd.date_range('2024-01-01', periods=72, freq='h')
+        horas = horas[horas.hour < 6]
+        num_estacoes = len(latitudes)
+        ciclo = np.sin(horas.hour.values / 24 * 2 * np.pi)[:, None]
+        dados = pd.DataFrame({
+            'estacao': np.tile([f'E{k}' for k in range(num_estacoes)], len(horas)),
+            'latitude': np.tile(latitudes, len(horas)),
+            'longitude': np.tile(longitudes, len(horas)),
+            'temperatura_ar': (25 + 3 * ciclo + 5 * (latitudes + 20) + rng.normal(0, 0.5, (len(horas), num_estacoes))).ravel(),
+            'radiacao_global': (500 + 200 * ciclo + rng.normal(0, 30, (len(horas), num_estacoes))).ravel(),
+            'vento_u': rng.normal(1.0, 0.8, len(horas) * num_estacoes),
+            'vento_v': rng.normal(0.0, 0.8, len(horas) * num_estacoes)
+        }, index=pd.DatetimeIndex(np.repeat(horas, num_estacoes)))
+
+        geo = GeoProcessor()
+        x, y = geo.converter_coordenadas_lote(np.array([-20.2, -19.9]), np.array([-44.9, -44.5]))
+        pontos = pd.DataFrame({'x': np.linspace(x[0], x[1], 8), 'y': np.linspace(y[0], y[1], 8)})
+
+        originais = (config.ARQUIVO_REGISTRO_VARIOGRAMAS, config.VARIOGRAMA_MIN_HORAS_ESTRATO,
+                     config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO)
+        with tempfile.TemporaryDirectory() as diretorio:
+            try:
+                config.ARQUIVO_REGISTRO_VARIOGRAMAS = os.path.join(diretorio, 'registro.json')
+                config.VARIOGRAMA_MIN_HORAS_ESTRATO = 3
+                config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO = 'matricial', True
+
+                resultados_matricial = geo.executar_krigagem_horaria(dados, pontos)
+                registro = geo.registro_variogramas
+
+                # 6 estratos de janeiro (um por hora do dia) mais o global
+                estratos_temperatura = registro.variogramas['temperatura_ar']
+                if len(estratos_temperatura) != 7 or not os.path.exists(config.ARQUIVO_REGISTRO_VARIOGRAMAS):
+                    logger.error(f"✗ Registro incompleto: {len(estratos_temperatura)} estratos")
+                    return False
+
+                modelo, parametros = registro.obter('temperatura_ar', pd.Timestamp('2025-01-05 03:00'))
+                if [modelo, list(parametros)] != [estratos_temperatura['01-03']['modelo'],
+                                                  estratos_temperatura['01-03']['parametros']]:
+                    logger.error("✗ Consulta ao estrato incorreta")
+                    return False
+                if registro.obter('temperatura_ar', pd.Timestamp('2025-06-05 13:00'))[0] != \
+                        estratos_temperatura['global']['modelo']:
+                    logger.error("✗ Estrato ausente não recorreu ao variograma global")
+                    return False
+
+                logger.info(f"✓ Registro com {len(estratos_temperatura)} variogramas por variável")
+
+                # Nova execução reaproveita o registro salvo, sem reajuste
+                geo_reuso = GeoProcessor()
+                geo_reuso._construir_registro_variogramas = None
+                registro_reuso = geo_reuso.preparar_registro_variogramas(dados)
+                if registro_reuso.variogramas != registro.variogramas:
+                    logger.error("✗ Registro salvo não foi reutilizado")
+                    return False
+
+                # Conjunto de estações diferente invalida o registro salvo
+                assinatura_outra = RegistroVariogramas.calcular_assinatura(['X'], np.zeros((1, 2)))
+                RegistroVariogramas(assinatura_outra, registro.variogramas).salvar(config.ARQUIVO_REGISTRO_VARIOGRAMAS)
+                if GeoProcessor().preparar_registro_variogramas(dados).assinatura != registro.assinatura:
+                    logger.error("✗ Registro de outras estações foi reutilizado")
+                    return False
+
+                # Caminho hora a hora apenas consulta o registro e coincide com o matricial
+                config.METODO_KRIGAGEM = 'pykrige'
+                resultados_horarios = geo.executar_krigagem_horaria(dados.loc[dados.index < horas[6]], pontos)
+            finally:
+                (config.ARQUIVO_REGISTRO_VARIOGRAMAS, config.VARIOGRAMA_MIN_HORAS_ESTRATO,
+                 config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO) = originais
+
+        for hora in horas[:6]:
+            for variavel in config.VARIAVEIS_AMBIENTAIS:
+                if not (np.allclose(resultados_horarios[hora][variavel]['media'],
+                                    resultados_matricial[hora][variavel]['media']) and
+                        np.allclose(resultados_horarios[hora][variavel]['variancia'],
+                                    resultados_matricial[hora][variavel]['variancia'])):
+                    logger.error(f"✗ Krigagem horária com registro difere da matricial ({variavel})")
+                    return False
+
+        logger.info("✓ Registro persistido, reutilizado e consultado na krigagem horária")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do registro de variogramas: {e}")
+        return False
+
+def teste_validacao_cruzada_fechada():
+    """Testa a validação cruzada deixa-uma-estação-fora em forma fechada."""
+    logger.info("=== Teste da Validação Cruzada em Forma Fechada ===")
+
+    try:
+        from geoprocessing import GeoProcessor, MotorKrigagemMatricial
+        from pykrige.ok import OrdinaryKriging
+
+        rng = np.random.default_rng(3)
+        coords_estacoes = rng.uniform(0, 60000, size=(8, 2))
+        valores = rng.normal(25, 2, size=(8, 5))
+        motor = MotorKrigagemMatricial(coords_estacoes)
+
+        # Resíduos e variâncias devem coincidir com a krigagem explícita sem cada estação
+        modelo, parametros = 'spherical', (1.5, 40000.0, 0.2)
+        residuos, variancias = motor.residuos_validacao_cruzada(modelo, parametros, valores)
+        for k in range(len(coords_estacoes)):
+            demais = np.arange(len(coords_estacoes)) != k
+            for t in range(valores.shape[1]):
+                OK = OrdinaryKriging(coords_estacoes[demais, 0], coords_estacoes[demais, 1], valores[demais, t],
+                                     variogram_model=modelo,
+                                     variogram_parameters={'psill': 1.5, 'range': 40000.0, 'nugget': 0.2},
+                                     coordinates_type='euclidean')
+                z, ss = OK.execute('points', coords_estacoes[k:k + 1, 0], coords_estacoes[k:k + 1, 1])
+                if not (np.isclose(valores[k, t] - z[0], residuos[k, t]) and np.isclose(ss[0], variancias[k])):
+                    logger.error(f"✗ Resíduo em forma fechada difere do explícito (estação {k}, hora {t})")
+                    return False
+
+        logger.info("✓ Resíduos em forma fechada equivalentes à krigagem explícita")
+
+        # Seleção determinística e sem consumir o gerador aleatório global
+        geo = GeoProcessor()
+        np.random.seed(123)
+        estado = np.random.get_state()[1].copy()
+        selecoes = {geo._ajustar_variograma_automatico(coords_estacoes, valores[:, 0], 'temperatura_ar')
+                    for _ in range(3)}
+        if len(selecoes) != 1 or not np.array_equal(np.random.get_state()[1], estado):
+            logger.error(f"✗ Seleção de variograma não determinística: {selecoes}")
+            return False
+
+        logger.info(f"✓ Seleção determinística: {selecoes.pop()}")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da validação cruzada em forma fechada: {e}")
+        return False
+
+def teste_registro_estacoes():
+    """Testa o registro de estações com coordenadas projetadas e distâncias pré-calculadas."""
+    logger.info("=== Teste do Registro de Estações ===")
+
+    try:
+        from geoprocessing import GeoProcessor
+
+        horas = pd.date_range('2024-01-15 10:00', periods=4, freq='h')
+        dados = pd.DataFrame({
+            'estacao': np.tile(['A', 'B', 'C'], len(horas)),
+            'latitude': np.tile([-20.0, -20.3, -20.1], len(horas)),
+            'longitude': np.tile([-45.0, -44.7, -44.4], len(horas)),
+            'temperatura_ar': np.arange(12, dtype=float)
+        }, index=pd.DatetimeIndex(np.repeat(horas, 3)))
+
+        geo = GeoProcessor()
+        chamadas = []
+        converter_original = geo.converter_coordenadas_lote
+        geo.converter_coordenadas_lote = lambda lat, lon: chamadas.append(len(lat)) or converter_original(lat, lon)
+
+        indices = geo.registrar_estacoes(dados)
+        indices_repetidos = geo.registrar_estacoes(dados.iloc[::-1])
+        if chamadas != [3] or not np.array_equal(indices_repetidos, indices[::-1]):
+            logger.error(f"✗ Estações projetadas mais de uma vez: {chamadas}")
+            return False
+
+        x, y = converter_original(np.array([-20.3]), np.array([-44.7]))
+        if not np.allclose(geo.coords_estacoes[indices[1]], [x[0], y[0]]):
+            logger.error("✗ Coordenadas projetadas do registro incorretas")
+            return False
+
+        # Nova estação amplia o registro e as matrizes de distância
+        geo.registrar_estacoes(pd.DataFrame({'estacao': ['D'], 'latitude': [-19.8], 'longitude': [-44.9]}))
+        coords_linha = geo.coords_estacoes[:2] + 100.0
+        distancias_linha = geo.obter_distancias_estacoes_linha(coords_linha)
+        esperado = np.linalg.norm(coords_linha[:, None, :] - geo.coords_estacoes[None, :, :], axis=2)
+        if (geo.distancias_estacoes.shape != (4, 4) or chamadas != [3, 1] or
+                not np.allclose(distancias_linha, esperado)):
+            logger.error("✗ Matrizes de distância do registro incorretas")
+            return False
+
+        logger.info(f"✓ Registro com {len(geo.nomes_estacoes)} estações projetadas uma única vez")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do registro de estações: {e}")
+        return False
+
+def teste_krigagem_paralela():
+    """Testa a krigagem hora a hora em processos paralelos."""
+    logger.info("=== Teste da Krigagem Paralela ===")
+
+    try:
+        import config
+        from geoprocessing import GeoProcessor
+
+        rng = np.random.default_rng(4)
+        horas = pd.date_range('2024-01-15 10:00', periods=4, freq='h')
+        latitudes = np.array([-20.0, -20.3, -20.1, -19.8, -20.2])
+        longitudes = np.array([-45.0, -44.7, -44.4, -44.9, -44.6])
+        n = len(horas) * len(latitudes)
+        dados = pd.DataFrame({
+            'estacao': np.tile([f'E{k}' for k in range(len(latitudes))], len(horas)),
+            'latitude': np.tile(latitudes, len(horas)),
+            'longitude': np.tile(longitudes, len(horas)),
+            'temperatura_ar': rng.normal(25, 2, n),
+            'radiacao_global': rng.normal(600, 50, n),
+            'vento_u': rng.normal(1, 0.5, n),
+            'vento_v': rng.normal(0, 0.5, n)
+        }, index=pd.DatetimeIndex(np.repeat(horas, len(latitudes))))
+
+        geo = GeoProcessor()
+        x, y = geo.converter_coordenadas_lote(np.array([-20.2, -19.9]), np.array([-44.9, -44.5]))
+        pontos = pd.DataFrame({'x': np.linspace(x[0], x[1], 6), 'y': np.linspace(y[0], y[1], 6)})
+
+        originais = (config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO,
+                     config.NUM_PROCESSOS_KRIGAGEM, config.TAMANHO_BLOCO_KRIGAGEM)
+        resultados = {}
+        try:
+            config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO = 'pykrige', False
+            config.TAMANHO_BLOCO_KRIGAGEM = 1
+            for num_processos in [1, 2]:
+                config.NUM_PROCESSOS_KRIGAGEM = num_processos
+                resultados[num_processos] = GeoProcessor().executar_krigagem_horaria(dados, pontos)
+        finally:
+            (config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO,
+             config.NUM_PROCESSOS_KRIGAGEM, config.TAMANHO_BLOCO_KRIGAGEM) = originais
+
+        # Mesmas horas, na mesma ordem, com resultados idênticos
+        if list(resultados[2].keys()) != list(horas):
+            logger.error("✗ Ordem das horas alterada pela execução paralela")
+            return False
+        for hora in horas:
+            for variavel in config.VARIAVEIS_AMBIENTAIS:
+                for chave in ['media', 'variancia', 'desvio_padrao']:
+                    if not np.array_equal(resultados[1][hora][variavel][chave],
+                                          resultados[2][hora][variavel][chave], equal_nan=True):
+                        logger.error(f"✗ Resultado paralelo difere do sequencial ({variavel}, {hora})")
+                        return False
+
+        logger.info(f"✓ Krigagem paralela idêntica à sequencial em {len(horas)} horas")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da krigagem paralela: {e}")
+        return False
+
+def teste_resultados_krigagem():
+    """Testa o tensor denso de resultados da krigagem e o mapeamento em disco."""
+    logger.info("=== Teste do Tensor de Resultados da Krigagem ===")
+
+    try:
+        import config
+        from geoprocessing import GeoProcessor, ResultadosKrigagem
+
+        horas = pd.date_range('2024-01-15 00:00', periods=5, freq='h')
+        variaveis = config.VARIAVEIS_AMBIENTAIS
+        rng = np.random.default_rng(5)
+        medias = rng.normal(25, 2, size=(5, 3))
+        variancias = rng.uniform(0.5, 1.5, size=(5, 3))
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'krigagem.npy')
+            resultados = ResultadosKrigagem.criar(horas, variaveis, 3, dtype='float32', caminho=caminho)
+            resultados.definir_serie('temperatura_ar', medias, variancias)
+            resultados.tensor.flush()
+            del resultados
+
+            reaberto = ResultadosKrigagem.carregar(caminho)
+            if not isinstance(reaberto.tensor, np.memmap) or reaberto.tensor.shape != (5, len(variaveis), 3, 2):
+                logger.error("✗ Tensor em disco não foi reaberto mapeado em memória")
+                return False
+
+            # Visões compatíveis com o formato hora -> variável -> {'media', 'variancia', 'desvio_padrao'}
+            hora = horas[2]
+            resultado_hora = reaberto[hora]['temperatura_ar']
+            if not (np.allclose(resultado_hora['media'], medias[2], rtol=1e-6) and
+                    np.allclose(resultado_hora['desvio_padrao'], np.sqrt(variancias[2]), rtol=1e-6) and
+                    list(reaberto.keys()) == list(horas) and np.all(np.isnan(reaberto[hora]['vento_u']['media']))):
+                logger.error("✗ Leitura do tensor pelo mapeamento incorreta")
+                return False
+
+            estatisticas = GeoProcessor().validar_resultados_krigagem(reaberto, pd.DataFrame({'x': np.zeros(3)}))
+            if (estatisticas['horas_com_erro'] != 5 or
+                    not np.isclose(estatisticas['variaveis']['temperatura_ar']['media_min'], medias.min(), rtol=1e-6)):
+                logger.error("✗ Validação a partir do tensor incorreta")
+                return False
+            del reaberto, resultado_hora
+
+        # Conversão do formato de dicionários
+        dicionario = {h: {v: {'media': np.full(3, float(t)), 'variancia': np.ones(3)} for v in variaveis}
+                      for t, h in enumerate(horas)}
+        convertido = ResultadosKrigagem.de_dicionario(dicionario)
+        if not np.array_equal(convertido.media('vento_v')[:, 0], np.arange(5.0)):
+            logger.error("✗ Conversão de dicionário para tensor incorreta")
+            return False
+
+        logger.info(f"✓ Tensor {convertido.tensor.shape} em memória e mapeado em disco")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do tensor de resultados da krigagem: {e}")
+        return False
+
+def teste_interpoladores_alternativos():
+    """Testa os interpoladores IDW, vizinho mais próximo e baricêntrico."""
+    logger.info("=== Teste dos Interpoladores Alternativos ===")
+
+    try:
+        import config
+        from geoprocessing import GeoProcessor, InterpoladorEspacial, InterpoladorBaricentrico, INTERPOLADORES
+
+        rng = np.random.default_rng(6)
+        horas = pd.date_range('2024-01-15 10:00', periods=6, freq='h')
+        latitudes = np.array([-20.0, -20.3, -20.1, -19.8, -20.2, -19.9])
+        longitudes = np.array([-45.0, -44.7, -44.4, -44.9, -44.6, -44.3])
+        n = len(horas) * len(latitudes)
+        dados = pd.DataFrame({
+            'estacao': np.tile([f'E{k}' for k in range(len(latitudes))], len(horas)),
+            'latitude': np.tile(latitudes, len(horas)),
+            'longitude': np.tile(longitudes, len(horas)),
+            'temperatura_ar': rng.normal(25, 2, n),
+            'radiacao_global': rng.normal(600, 50, n),
+            'vento_u': rng.normal(1, 0.5, n),
+            'vento_v': rng.normal(0, 0.5, n)
+        }, index=pd.DatetimeIndex(np.repeat(horas, len(latitudes))))
+        dados.iloc[3, dados.columns.get_loc('temperatura_ar')] = np.nan
+
+        geo = GeoProcessor()
+        x, y = geo.converter_coordenadas_lote(latitudes, longitudes)
+        # Pontos sobre as estações E0 e E1 e entre elas
+        pontos = pd.DataFrame({'x': np.linspace(x[0], x[1], 5), 'y': np.linspace(y[0], y[1], 5)})
+
+        metodo_original = config.METODO_KRIGAGEM
+        resultados = {}
+        try:
+            for metodo in INTERPOLADORES:
+                config.METODO_KRIGAGEM = metodo
+                resultados[metodo] = geo.executar_krigagem_horaria(dados, pontos)
+        finally:
+            config.METODO_KRIGAGEM = metodo_original
+
+        observados = dados[dados['estacao'] == 'E0']['temperatura_ar'].to_numpy()
+        for metodo, resultado in resultados.items():
+            medias = resultado.media('temperatura_ar')
+            variancias = resultado.variancia('temperatura_ar')
+            # Interpoladores exatos: valor e variância nula sobre a estação
+            if (list(resultado.keys()) != list(horas) or not np.allclose(medias[:, 0], observados) or
+                    not np.allclose(variancias[:, 0], 0.0) or np.any(variancias[:, 2] <= 0) or
+                    np.any(np.isnan(medias))):
+                logger.error(f"✗ Contrato de saída violado pelo interpolador '{metodo}'")
+                return False
+
+        # Reprodução exata de um campo linear dentro do fecho convexo
+        interpolador = InterpoladorBaricentrico(np.column_stack([x, y]), pontos[['x', 'y']].values)
+        pesos, _ = interpolador.calcular_pesos()
+        campo = lambda c: 0.002 * c[:, 0] - 0.001 * c[:, 1] + 10.0
+        if not np.allclose(pesos @ campo(interpolador.coords_estacoes), campo(interpolador.coords_pontos)):
+            logger.error("✗ Interpolação baricêntrica não reproduz campo linear")
+            return False
+
+        comparacao = geo.comparar_interpoladores(dados, pontos, ['temperatura_ar'])
+        if (sorted(comparacao['metodo']) != sorted(['matricial'] + list(INTERPOLADORES)) or
+                not np.all(np.isfinite(comparacao['rmse_validacao_cruzada']))):
+            logger.error("✗ Comparação de interpoladores incompleta")
+            return False
+
+        # Subclasse sem pesos falha já na criação
+        class InterpoladorIncompleto(InterpoladorEspacial):
+            pass
+        try:
+            InterpoladorIncompleto(np.zeros((3, 2)))
+            logger.error("✗ Interpolador sem _calcular_pesos_alvos foi instanciado")
+            return False
+        except TypeError:
+            pass
+
+        logger.info(f"✓ {len(INTERPOLADORES)} interpoladores alternativos com o contrato da krigagem")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste dos interpoladores alternativos: {e}")
+        return False
+
+def teste_krigagem_vizinhanca_movel():
+    """Testa a krigagem em vizinhança móvel das k estações mais próximas."""
+    logger.info("=== Teste da Krigagem em Vizinhança Móvel ===")
+
+    try:
+        import config
+        from pykrige.ok import OrdinaryKriging
+        from geoprocessing import GeoProcessor, MotorKrigagemMatricial
+
+        rng = np.random.default_rng(7)
+        coords_estacoes = rng.uniform(0, 100000, (40, 2))
+        coords_pontos = rng.uniform(10000, 90000, (25, 2))
+        valores = rng.normal(25, 2, 40)
+        parametros = (2e-5, 0.1)
+
+        # Mesmo resultado do pykrige com n_closest_points
+        motor = MotorKrigagemMatricial(coords_estacoes, coords_pontos, num_vizinhos=8)
+        pesos, variancia = motor.calcular_pesos('linear', parametros)
+        ok = OrdinaryKriging(coords_estacoes[:, 0], coords_estacoes[:, 1], valores, variogram_model='linear',
+                             variogram_parameters={'slope': parametros[0], 'nugget': parametros[1]})
+        z_ref, ss_ref = ok.execute('points', coords_pontos[:, 0], coords_pontos[:, 1],
+                                   backend='loop', n_closest_points=8)
+        if (pesos.getnnz(axis=1).max() != 8 or not np.allclose(pesos @ valores, z_ref) or
+                not np.allclose(variancia, ss_ref)):
+            logger.error("✗ Pesos da vizinhança móvel diferem do pykrige")
+            return False
+
+        # Inversas reaproveitadas entre padrões de ausência com as mesmas vizinhanças
+        num_inversas = len(motor._inversas_locais)
+        mascara = np.ones(40, dtype=bool)
+        mascara[np.argmax(np.linalg.norm(coords_estacoes - 50000, axis=1))] = False
+        motor.calcular_pesos('linear', parametros, mascara)
+        if len(motor._inversas_locais) >= 2 * num_inversas:
+            logger.error("✗ Sistemas locais não reaproveitados entre padrões de ausência")
+            return False
+
+        # Cache de inversas limitado e fora do pickle do motor
+        original = config.CACHE_INVERSAS_LOCAIS_MAX_ENTRADAS
+        try:
+            config.CACHE_INVERSAS_LOCAIS_MAX_ENTRADAS = 5
+            motor.calcular_pesos('linear', (3e-5, 0.1))
+        finally:
+            config.CACHE_INVERSAS_LOCAIS_MAX_ENTRADAS = original
+        restaurado = pickle.loads(pickle.dumps(motor))
+        if len(motor._inversas_locais) != 5 or restaurado._inversas_locais or restaurado._pesos:
+            logger.error("✗ Cache de inversas locais sem limite ou serializado")
+            return False
+        pesos_restaurados, _ = restaurado.calcular_pesos('linear', parametros)
+        if not np.allclose((pesos_restaurados - pesos).toarray(), 0):
+            logger.error("✗ Pesos do motor restaurado diferem")
+            return False
+
+        # Pipeline com a vizinhança configurada, sem a matriz completa de distâncias
+        horas = pd.date_range('2024-01-15 10:00', periods=3, freq='h')
+        latitudes = -20.0 + rng.uniform(-0.5, 0.5, 12)
+        longitudes = -45.0 + rng.uniform(-0.5, 0.5, 12)
+        n = len(horas) * len(latitudes)
+        dados = pd.DataFrame({
+            'estacao': np.tile([f'E{k}' for k in range(len(latitudes))], len(horas)),
+            'latitude': np.tile(latitudes, len(horas)),
+            'longitude': np.tile(longitudes, len(horas)),
+            'temperatura_ar': rng.normal(25, 2, n),
+            'radiacao_global': rng.normal(600, 50, n),
+            'vento_u': rng.normal(1, 0.5, n),
+            'vento_v': rng.normal(0, 0.5, n)
+        }, index=pd.DatetimeIndex(np.repeat(horas, len(latitudes))))
+        geo = GeoProcessor()
+        x, y = geo.converter_coordenadas_lote(np.array([-20.3, -19.7]), np.array([-45.3, -44.7]))
+        pontos = pd.DataFrame({'x': np.linspace(x[0], x[1], 20), 'y': np.linspace(y[0], y[1], 20)})
+
+        originais = (config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO, config.NUM_VIZINHOS_KRIGAGEM)
+        try:
+            config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO = 'matricial', False
+            config.NUM_VIZINHOS_KRIGAGEM = 5
+            resultados = geo.executar_krigagem_horaria(dados, pontos)
+        finally:
+            config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO, config.NUM_VIZINHOS_KRIGAGEM = originais
+
+        if geo._distancias_linha is not None or np.any(np.isnan(resultados.media('temperatura_ar'))):
+            logger.error("✗ Krigagem em vizinhança móvel pela configuração incorreta")
+            return False
+
+        logger.info(f"✓ Vizinhança móvel de 8 estações idêntica ao pykrige ({num_inversas} sistemas locais)")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da krigagem em vizinhança móvel: {e}")
+        return False
+
+def teste_sincronizacao_estacoes_ausentes():
+    """Testa a sincronização com estações ausentes e o cache LRU de pesos por máscara."""
+    logger.info("=== Teste da Sincronização com Estações Ausentes ===")
+
+    try:
+        import config
+        from data_loader import DataLoader
+        from geoprocessing import GeoProcessor, MotorKrigagemMatricial
+
+        rng = np.random.default_rng(8)
+        latitudes = -20.0 + rng.uniform(-0.5, 0.5, 6)
+        longitudes = -45.0 + rng.uniform(-0.5, 0.5, 6)
+
+        # Períodos parcialmente sobrepostos: 24 horas com todas as estações
+        carregador = DataLoader()
+        for k in range(6):
+            inicio = '2024-01-01' if k < 3 else '2024-01-02'
+            indice = pd.date_range(inicio, periods=48, freq='h')
+            carregador.dados_estacoes[f'E{k}'] = pd.DataFrame({
+                'latitude': latitudes[k], 'longitude': longitudes[k],
+                'temperatura_ar': rng.normal(25, 2, 48), 'radiacao_global': rng.uniform(0, 800, 48),
+                'vento_u': rng.normal(0, 1, 48), 'vento_v': rng.normal(0, 1, 48)
+            }, index=indice)
+
+        minimo_original = config.MIN_ESTACOES_SINCRONIZACAO
+        try:
+            config.MIN_ESTACOES_SINCRONIZACAO = None
+            completas = carregador.sincronizar_dados_estacoes()
+            config.MIN_ESTACOES_SINCRONIZACAO = 3
+            dados = carregador.sincronizar_dados_estacoes()
+        finally:
+            config.MIN_ESTACOES_SINCRONIZACAO = minimo_original
+
+        if (completas.index.nunique() != 24 or dados.index.nunique() != 72 or
+                list(dados['estacao'].iloc[:3]) != ['E0', 'E1', 'E2'] or not dados.index.is_monotonic_increasing):
+            logger.error("✗ Sincronização com mínimo de estações incorreta")
+            return False
+
+        # Krigagem das horas com subconjuntos de estações
+        geo = GeoProcessor()
+        x, y = geo.converter_coordenadas_lote(np.array([-20.3, -19.7]), np.array([-45.3, -44.7]))
+        pontos = pd.DataFrame({'x': np.linspace(x[0], x[1], 10), 'y': np.linspace(y[0], y[1], 10)})
+        originais = (config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO)
+        try:
+            config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO = 'matricial', False
+            resultados = geo.executar_krigagem_horaria(dados, pontos)
+        finally:
+            config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO = originais
+        if len(resultados) != 72 or np.any(np.isnan(resultados.media('temperatura_ar'))):
+            logger.error("✗ Krigagem de horas com estações ausentes incorreta")
+            return False
+
+        # Cache LRU: a máscara menos recente é descartada ao atingir o limite
+        motor = MotorKrigagemMatricial(
+            np.column_stack(geo.converter_coordenadas_lote(latitudes, longitudes)), pontos[['x', 'y']].values
+        )
+        mascaras = [np.arange(6) != k for k in range(3)]
+        limite_original = config.CACHE_PESOS_KRIGAGEM_MAX_ENTRADAS
+        try:
+            config.CACHE_PESOS_KRIGAGEM_MAX_ENTRADAS = 2
+            primeiros = motor.calcular_pesos('linear', (1e-5, 0.1), mascaras[0])
+            motor.calcular_pesos('linear', (1e-5, 0.1), mascaras[1])
+            reutilizados = motor.calcular_pesos('linear', (1e-5, 0.1), mascaras[0])
+            motor.calcular_pesos('linear', (1e-5, 0.1), mascaras[2])
+        finally:
+            config.CACHE_PESOS_KRIGAGEM_MAX_ENTRADAS = limite_original
+
+        chaves = [np.packbits(m).tobytes() for m in mascaras]
+        if (reutilizados is not primeiros or len(motor._pesos) != 2 or
+                [chave[2] for chave in motor._pesos] != [chaves[0], chaves[2]]):
+            logger.error("✗ Cache LRU de pesos por máscara de estações incorreto")
+            return False
+
+        logger.info(f"✓ {dados.index.nunique()} horas sincronizadas (antes {completas.index.nunique()})")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da sincronização com estações ausentes: {e}")
+        return False
+
+def teste_registro_periodos_disjuntos():
+    """Testa o registro de variogramas e o benchmark com estações de períodos disjuntos."""
+    logger.info("=== Teste do Registro com Períodos Disjuntos ===")
+
+    try:
+        import config
+        from data_loader import DataLoader
+        from geoprocessing import GeoProcessor
+
+        rng = np.random.default_rng(12)
+        latitudes = -20.0 + rng.uniform(-0.5, 0.5, 8)
+        longitudes = -45.0 + rng.uniform(-0.5, 0.5, 8)
+
+        # E0-E3 em janeiro, E4-E7 em fevereiro: nenhuma hora com todas as estações
+        carregador = DataLoader()
+        for k in range(8):
+            indice = pd.date_range('2024-01-01' if k < 4 else '2024-02-01', periods=240, freq='h')
+            ciclo = np.sin(indice.hour.values / 24 * 2 * np.pi)
+            carregador.dados_estacoes[f'E{k}'] = pd.DataFrame({
+                'latitude': latitudes[k], 'longitude': longitudes[k],
+                'temperatura_ar': 25 + 3 * ciclo + 5 * (latitudes[k] + 20) + rng.normal(0, 0.5, 240),
+                'radiacao_global': 500 + 200 * ciclo + rng.normal(0, 30, 240),
+                'vento_u': rng.normal(1, 0.8, 240), 'vento_v': rng.normal(0, 0.8, 240)
+            }, index=indice)
+
+        originais = (config.MIN_ESTACOES_SINCRONIZACAO, config.ARQUIVO_REGISTRO_VARIOGRAMAS,
+                     config.VARIOGRAMA_MIN_HORAS_ESTRATO)
+        with tempfile.TemporaryDirectory() as diretorio:
+            try:
+                config.MIN_ESTACOES_SINCRONIZACAO = 3
+                config.ARQUIVO_REGISTRO_VARIOGRAMAS = os.path.join(diretorio, 'registro.json')
+                config.VARIOGRAMA_MIN_HORAS_ESTRATO = 5
+                dados = carregador.sincronizar_dados_estacoes()
+                geo = GeoProcessor()
+                registro = geo.preparar_registro_variogramas(dados)
+            finally:
+                (config.MIN_ESTACOES_SINCRONIZACAO, config.ARQUIVO_REGISTRO_VARIOGRAMAS,
+                 config.VARIOGRAMA_MIN_HORAS_ESTRATO) = originais
+
+        # Variograma global e por estrato ajustados com as horas parciais
+        for variavel in config.VARIAVEIS_AMBIENTAIS:
+            estratos = registro.variogramas.get(variavel, {})
+            if 'global' not in estratos or len(estratos) < 48:
+                logger.error(f"✗ Registro de {variavel} sem estratos: {len(estratos)}")
+                return False
+
+        x, y = geo.converter_coordenadas_lote(np.array([-20.3, -19.7]), np.array([-45.3, -44.7]))
+        pontos = pd.DataFrame({'x': np.linspace(x[0], x[1], 10), 'y': np.linspace(y[0], y[1], 10)})
+        comparacao = geo.comparar_interpoladores(dados, pontos, ['temperatura_ar'])
+        if comparacao['rmse_validacao_cruzada'].isna().any():
+            logger.error("✗ Benchmark dos interpoladores sem horas parciais")
+            return False
+
+        logger.info(f"✓ Registro com {len(registro.variogramas['temperatura_ar']) - 1} estratos de temperatura "
+                    f"em {dados.index.nunique()} horas parciais")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste do registro com períodos disjuntos: {e}")
+        return False
+
+def teste_krigagem_incremental():
+    """Testa a krigagem incremental a partir do estado salvo."""
+    logger.info("=== Teste da Krigagem Incremental ===")
+
+    try:
+        import config
+        from geoprocessing import GeoProcessor, EstadoKrigagem, ResultadosKrigagem
+
+        rng = np.random.default_rng(9)
+        horas = pd.date_range('2024-01-15 00:00', periods=30, freq='h')
+        latitudes = -20.0 + rng.uniform(-0.5, 0.5, 6)
+        longitudes = -45.0 + rng.uniform(-0.5, 0.5, 6)
+        n = len(horas) * len(latitudes)
+        dados = pd.DataFrame({
+            'estacao': np.tile([f'E{k}' for k in range(len(latitudes))], len(horas)),
+            'latitude': np.tile(latitudes, len(horas)),
+            'longitude': np.tile(longitudes, len(horas)),
+            'temperatura_ar': rng.normal(25, 2, n),
+            'radiacao_global': rng.uniform(0, 800, n),
+            'vento_u': rng.normal(1, 0.5, n),
+            'vento_v': rng.normal(0, 0.5, n)
+        }, index=pd.DatetimeIndex(np.repeat(horas, len(latitudes))))
+        dados.iloc[40, dados.columns.get_loc('vento_u')] = np.nan
+
+        geo = GeoProcessor()
+        x, y = geo.converter_coordenadas_lote(np.array([-20.3, -19.7]), np.array([-45.3, -44.7]))
+        pontos = pd.DataFrame({'x': np.linspace(x[0], x[1], 15), 'y': np.linspace(y[0], y[1], 15)})
+
+        originais = (config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO, config.ARQUIVO_REGISTRO_VARIOGRAMAS,
+                     config.DIRETORIO_ESTADO_KRIGAGEM, config.COVARIANCIA_POSTERIOR_KRIGAGEM)
+        with tempfile.TemporaryDirectory() as diretorio:
+            try:
+                config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO = 'matricial', True
+                config.ARQUIVO_REGISTRO_VARIOGRAMAS = os.path.join(diretorio, 'registro.json')
+                config.COVARIANCIA_POSTERIOR_KRIGAGEM = True
+                completa = GeoProcessor().executar_krigagem_horaria(dados, pontos)
+                completos = np.array(completa.tensor)
+
+                config.DIRETORIO_ESTADO_KRIGAGEM = os.path.join(diretorio, 'estado')
+                geo.atualizar_krigagem(dados[dados.index < horas[20]], pontos)
+                caminho = EstadoKrigagem.caminho_resultados(config.DIRETORIO_ESTADO_KRIGAGEM)
+                arquivo_original = os.stat(caminho).st_ino
+
+                # Novo processador: estado carregado do disco, apenas as 10 horas novas krigadas
+                atualizador = GeoProcessor()
+                atualizados = atualizador.atualizar_krigagem(dados)
+                tensor_atualizado = np.array(atualizados.tensor)
+                no_lugar = (os.stat(caminho).st_ino == arquivo_original
+                            and os.path.samefile(atualizados.tensor.filename, caminho))
+
+                # Covariância posterior preservada no estado e calculada para as horas novas
+                covariancia = atualizados.covariancia
+                covariancia_preservada = covariancia is not None and all(
+                    np.allclose(covariancia.covariancia(t, variavel), completa.covariancia.covariancia(t, variavel))
+                    for t in range(len(horas)) for variavel in config.VARIAVEIS_AMBIENTAIS
+                ) and len(covariancia.fatores) == len(completa.covariancia.fatores)
+                repetidos = atualizador.atualizar_krigagem(dados)
+
+                # Horas anteriores às armazenadas: arquivo reescrito após fechar o mapeamento
+                anteriores = ResultadosKrigagem.de_dicionario(
+                    {horas[0] - pd.Timedelta(hours=1): repetidos[horas[0]]})
+                prefixados = ResultadosKrigagem.concatenar([repetidos, anteriores], caminho=caminho)
+                prefixo_correto = (repetidos.tensor is None and len(prefixados) == len(horas) + 1
+                                   and np.array_equal(prefixados.tensor[1:], completos, equal_nan=True))
+                del prefixados
+
+                # Estação deslocada invalida o estado
+                deslocados = dados.copy()
+                deslocados.loc[deslocados['estacao'] == 'E0', 'latitude'] += 0.05
+                atualizador.atualizar_krigagem(deslocados[deslocados.index < horas[5]], pontos)
+                invalidado = len(atualizador.estado_krigagem.resultados)
+                del atualizados, repetidos
+                atualizador.estado_krigagem = geo.estado_krigagem = None
+            finally:
+                (config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO, config.ARQUIVO_REGISTRO_VARIOGRAMAS,
+                 config.DIRETORIO_ESTADO_KRIGAGEM, config.COVARIANCIA_POSTERIOR_KRIGAGEM) = originais
+
+        if not np.array_equal(tensor_atualizado, completos, equal_nan=True):
+            logger.error("✗ Krigagem incremental difere da krigagem completa")
+            return False
+        if not covariancia_preservada:
+            logger.error("✗ Covariância posterior perdida na krigagem incremental")
+            return False
+        if not no_lugar or not prefixo_correto:
+            logger.error("✗ Arquivo de resultados não estendido no lugar")
+            return False
+        if invalidado != 5:
+            logger.error("✗ Estado não invalidado após mudança de coordenadas")
+            return False
+
+        logger.info(f"✓ {len(horas) - 20} horas acrescentadas a 20 armazenadas, idênticas à krigagem completa")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da krigagem incremental: {e}")
+        return False
+
+def teste_covariancia_posterior_krigagem():
+    """Testa a covariância posterior da krigagem entre os pontos da linha."""
+    logger.info("=== Teste da Covariância Posterior da Krigagem ===")
+
+    try:
+        import config
+        from geoprocessing import GeoProcessor, MotorKrigagemMatricial, CovarianciaPosteriorKrigagem
+
+        # Fator completo igual à forma fechada -(W Γ Wᵀ - W γ - γᵀ Wᵀ + Γ_pontos)
+        rng = np.random.default_rng(10)
+        coords_estacoes = rng.uniform(0, 100000, (8, 2))
+        coords_pontos = np.column_stack([np.linspace(10000, 90000, 30), np.linspace(20000, 80000, 30)])
+        parametros = (2e-5, 0.1)
+        motor = MotorKrigagemMatricial(coords_estacoes, coords_pontos)
+        pesos, variancia = motor.calcular_pesos('linear', parametros)
+        todos = np.vstack([coords_estacoes, coords_pontos])
+        distancias = np.linalg.norm(todos[:, None, :] - todos[None, :, :], axis=2)
+        gamma = np.where(distancias <= 1e-10, 0.0, parametros[0] * distancias + parametros[1])
+        g_ee, g_ep, g_pp = gamma[:8, :8], gamma[:8, 8:], gamma[8:, 8:]
+        esperada = -(pesos @ g_ee @ pesos.T - pesos @ g_ep - g_ep.T @ pesos.T + g_pp)
+        fator = motor.fator_covariancia_posterior('linear', parametros)
+        reduzido = motor.fator_covariancia_posterior('linear', parametros, posto=10)
+        if (not np.allclose(fator @ fator.T, esperada, atol=1e-10) or reduzido.shape[1] > 10 or
+                not np.allclose(np.sum(reduzido ** 2, axis=1), variancia)):
+            logger.error("✗ Fator da covariância posterior incorreto")
+            return False
+
+        # Pipeline matricial: diagonal de cada hora igual à variância da krigagem
+        horas = pd.date_range('2024-01-15 10:00', periods=6, freq='h')
+        latitudes = -20.0 + rng.uniform(-0.5, 0.5, 6)
+        longitudes = -45.0 + rng.uniform(-0.5, 0.5, 6)
+        n = len(horas) * len(latitudes)
+        dados = pd.DataFrame({
+            'estacao': np.tile([f'E{k}' for k in range(len(latitudes))], len(horas)),
+            'latitude': np.tile(latitudes, len(horas)),
+            'longitude': np.tile(longitudes, len(horas)),
+            'temperatura_ar': rng.normal(25, 2, n),
+            'radiacao_global': rng.uniform(200, 800, n),
+            'vento_u': rng.normal(1, 0.5, n),
+            'vento_v': rng.normal(0, 0.5, n)
+        }, index=pd.DatetimeIndex(np.repeat(horas, len(latitudes))))
+        dados.iloc[7, dados.columns.get_loc('temperatura_ar')] = np.nan
+        geo = GeoProcessor()
+        x, y = geo.converter_coordenadas_lote(np.array([-20.3, -19.7]), np.array([-45.3, -44.7]))
+        pontos = pd.DataFrame({'x': np.linspace(x[0], x[1], 12), 'y': np.linspace(y[0], y[1], 12)})
+
+        originais = (config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO, config.COVARIANCIA_POSTERIOR_KRIGAGEM)
+        try:
+            config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO = 'matricial', False
+            config.COVARIANCIA_POSTERIOR_KRIGAGEM = True
+            resultados = geo.executar_krigagem_horaria(dados, pontos)
+        finally:
+            config.METODO_KRIGAGEM, config.REGISTRO_VARIOGRAMAS_ATIVO, config.COVARIANCIA_POSTERIOR_KRIGAGEM = originais
+
+        covariancia = resultados.covariancia
+        # Dois padrões de estações para a temperatura, um para as demais variáveis
+        if len(covariancia.fatores) != 5:
+            logger.error(f"✗ Número de fatores inesperado: {len(covariancia.fatores)}")
+            return False
+        for t in range(len(horas)):
+            for variavel in config.VARIAVEIS_AMBIENTAIS:
+                if not np.allclose(np.diag(covariancia.covariancia(t, variavel)), resultados.variancia(variavel)[t]):
+                    logger.error(f"✗ Diagonal da covariância difere da variância ({variavel}, hora {t})")
+                    return False
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'covariancia.npz')
+            covariancia.salvar(caminho)
+            recarregada = CovarianciaPosteriorKrigagem.carregar(caminho)
+        if not np.array_equal(recarregada.fator(1, 'vento_u'), covariancia.fator(1, 'vento_u')):
+            logger.error("✗ Exportação da covariância posterior incorreta")
+            return False
+
+        # Limite de memória: fatores recusados deixam as horas sem covariância
+        limitada = CovarianciaPosteriorKrigagem(horas, config.VARIAVEIS_AMBIENTAIS, 12, memoria_maxima_mb=1e-6)
+        if limitada.registrar('vento_u', 'chave', lambda: np.ones((12, 2)), np.arange(6), np.ones(6)) or \
+                limitada.fator(0, 'vento_u') is not None:
+            logger.error("✗ Limite de memória da covariância posterior não respeitado")
+            return False
+
+        logger.info(f"✓ Covariância posterior em {len(covariancia.fatores)} fatores "
+                    f"({covariancia.memoria_bytes / 1024:.1f} kB)")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Erro no teste da covariância posterior da krigagem: {e}")
+        return False
+
 def teste_analise_risco():
     """Testa o analisador de risco."""
     logger.info("=== Teste de Análise de Risco ===")
@@ -395,6 +2185,32 @@ def executar_todos_testes():
         ("Configuração", teste_configuracao),
         ("Modelo Térmico", teste_modelo_termico),
         ("Monte Carlo", teste_monte_carlo),
+        ("Cache de Simulação", teste_cache_simulacao),
+        ("Agrupamento de Pontos", teste_agrupamento_pontos),
+        ("Simulação Conjunta da Linha", teste_simulacao_linha),
+        ("Trajetórias Temporais", teste_trajetorias_temporais),
+        ("Monte Carlo Multinível", teste_monte_carlo_multinivel),
+        ("Números Aleatórios Comuns", teste_numeros_aleatorios_comuns),
+        ("Triagem Determinística", teste_triagem_deterministica),
+        ("Caos Polinomial", teste_caos_polinomial),
+        ("Método FORM", teste_confiabilidade_form),
+        ("Ampacidade Probabilística", teste_ampacidade_probabilistica),
+        ("Motor de Distribuições", teste_distribuicoes),
+        ("Banco de Resíduos", teste_banco_residuos),
+        ("Discretização da Linha", teste_discretizacao_linha),
+        ("Discretização Adaptativa", teste_discretizacao_adaptativa),
+        ("Krigagem Matricial", teste_krigagem_matricial),
+        ("Registro de Variogramas", teste_registro_variogramas),
+        ("Validação Cruzada em Forma Fechada", teste_validacao_cruzada_fechada),
+        ("Registro de Estações", teste_registro_estacoes),
+        ("Krigagem Paralela", teste_krigagem_paralela),
+        ("Tensor de Resultados da Krigagem", teste_resultados_krigagem),
+        ("Interpoladores Alternativos", teste_interpoladores_alternativos),
+        ("Krigagem em Vizinhança Móvel", teste_krigagem_vizinhanca_movel),
+        ("Sincronização com Estações Ausentes", teste_sincronizacao_estacoes_ausentes),
+        ("Registro com Períodos Disjuntos", teste_registro_periodos_disjuntos),
+        ("Krigagem Incremental", teste_krigagem_incremental),
+        ("Covariância Posterior da Krigagem", teste_covariancia_posterior_krigagem),
         ("Análise de Risco", teste_analise_risco),
         ("Validador de Dados", teste_validador_dados),
         ("DataLoader Melhorado", teste_data_loader_melhorado),
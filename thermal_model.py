@@ -364,6 +364,188 @@ class CigreModeloTermico:
             # Retornar estimativa conservadora em caso de erro
             return temperatura_ar + 50
 
+    def calcular_resistencia_ac_vetorizado(self, temperatura_condutor):
+        """
+        Versão vetorizada de calcular_resistencia_ac.
+        
+        Args:
+            temperatura_condutor (np.array): Temperaturas do condutor em °C
+            
+        Returns:
+            np.array: Resistência AC em ohm/m
+        """
+        fator = np.clip((np.asarray(temperatura_condutor) - 25) / (75 - 25), 0.0, 1.0)
+        return self.resistencia_ac_25 + fator * (self.resistencia_ac_75 - self.resistencia_ac_25)
+
+    def calcular_resfriamento_convectivo_vetorizado(self, velocidade_vento, angulo_vento,
+                                                   temperatura_ar, temperatura_condutor):
+        """
+        Versão vetorizada de calcular_resfriamento_convectivo.
+        
+        Args:
+            velocidade_vento (np.array): Velocidade do vento em m/s
+            angulo_vento (np.array): Ângulo do vento relativo ao condutor em graus
+            temperatura_ar (np.array): Temperatura do ar em °C
+            temperatura_condutor (np.array): Temperatura do condutor em °C
+            
+        Returns:
+            np.array: Potência de resfriamento convectivo em W/m
+        """
+        temp_filme = (temperatura_ar + temperatura_condutor) / 2 + 273.15  # K
+        
+        nu_ar = self._viscosidade_cinematica_ar(temp_filme)
+        k_ar = self._condutividade_termica_ar(temp_filme)
+        
+        T_ar_abs = temperatura_ar + 273.15
+        T_c_abs = temperatura_condutor + 273.15
+        
+        v_perp = velocidade_vento * np.sin(np.radians(angulo_vento))
+        
+        Re = np.maximum(1e-6, v_perp * self.diametro / nu_ar)
+        
+        beta = 1 / temp_filme
+        Gr = (self.g * beta * np.abs(T_c_abs - T_ar_abs) * self.diametro**3) / nu_ar**2
+        Pr = 0.7
+        
+        Nu_nat = self._nusselt_conveccao_natural_vetorizado(Gr, Pr)
+        Nu_forc = self._nusselt_conveccao_forcada_vetorizado(Re, Pr)
+        
+        # Convecção natural dominante para vento perpendicular fraco, mista caso contrário
+        Nu = np.where(v_perp < 0.1, Nu_nat, np.maximum(Nu_forc, Nu_nat))
+        
+        h_c = Nu * k_ar / self.diametro
+        
+        return np.pi * self.diametro * h_c * (T_c_abs - T_ar_abs)
+
+    def _nusselt_conveccao_natural_vetorizado(self, Gr, Pr):
+        """Versão vetorizada de _nusselt_conveccao_natural."""
+        Ra = Gr * Pr
+        return np.select(
+            [Ra < 1e-5, Ra < 1e3, Ra < 1e9],
+            [0.4, 0.675 * Ra**0.058, 1.02 * Ra**0.148],
+            default=0.85 * Ra**0.188
+        )
+
+    def _nusselt_conveccao_forcada_vetorizado(self, Re, Pr):
+        """Versão vetorizada de _nusselt_conveccao_forcada."""
+        return np.select(
+            [Re < 0.4, Re < 4, Re < 40, Re < 4000],
+            [0.8, 0.821 * Re**0.385, 0.615 * Re**0.466, 0.174 * Re**0.618],
+            default=0.0239 * Re**0.805
+        )
+
+    def equacao_balanco_termico_vetorizada(self, temperatura_condutor, corrente, radiacao_solar,
+                                          azimute_linha, velocidade_vento, angulo_vento,
+                                          temperatura_ar):
+        """
+        Versão vetorizada da equação de balanço térmico.
+        
+        Todos os argumentos podem ser arrays com formatos compatíveis por broadcasting.
+        
+        Returns:
+            np.array: Diferença de potência (deve ser zero na solução)
+        """
+        P_joule = corrente**2 * self.calcular_resistencia_ac_vetorizado(temperatura_condutor)
+        P_solar = self.calcular_aquecimento_solar(radiacao_solar, azimute_linha)
+        P_convectivo = self.calcular_resfriamento_convectivo_vetorizado(
+            velocidade_vento, angulo_vento, temperatura_ar, temperatura_condutor
+        )
+        P_radiativo = self.calcular_resfriamento_radiativo(temperatura_ar, temperatura_condutor)
+        
+        return P_joule + P_solar - P_convectivo - P_radiativo
+
+    def resolver_temperatura_condutor_vetorizado(self, corrente, radiacao_solar, azimute_linha,
+                                                velocidade_vento, angulo_vento, temperatura_ar,
+                                                tolerancia=0.01, retornar_mascara=False):
+        """
+        Resolve o balanço térmico para arrays de condições ambientais.
+        
+        Usa o mesmo intervalo inicial de resolver_temperatura_condutor e bissecção
+        simultânea em todos os elementos até a tolerância pedida. Elementos sem
+        mudança de sinal recebem a mesma estimativa conservadora do método escalar,
+        que não é um limite da temperatura; retornar_mascara permite identificá-los.
+        
+        Args:
+            corrente (float or np.array): Corrente elétrica em A
+            radiacao_solar (np.array): Radiação solar em W/m²
+            azimute_linha (float or np.array): Azimute da linha em graus
+            velocidade_vento (np.array): Velocidade do vento em m/s
+            angulo_vento (np.array): Ângulo do vento em graus
+            temperatura_ar (np.array): Temperatura do ar em °C
+            tolerancia (float): Largura final do intervalo em °C
+            retornar_mascara (bool): Devolve também a máscara dos elementos com raiz isolada
+            
+        Returns:
+            np.array: Temperatura do condutor em °C, ou a tupla (temperaturas,
+                      com_raiz) se retornar_mascara
+        """
+        corrente, radiacao_solar, azimute_linha, velocidade_vento, angulo_vento, temperatura_ar = \
+            np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in (
+                corrente, radiacao_solar, azimute_linha, velocidade_vento,
+                angulo_vento, temperatura_ar
+            )])
+        
+        def funcao_objetivo(T_c):
+            return self.equacao_balanco_termico_vetorizada(
+                T_c, corrente, radiacao_solar, azimute_linha,
+                velocidade_vento, angulo_vento, temperatura_ar
+            )
+        
+        T_min = temperatura_ar.copy()
+        T_max = temperatura_ar + 200
+        f_min = funcao_objetivo(T_min)
+        f_max = funcao_objetivo(T_max)
+        
+        # Ajustar limites onde não há mudança de sinal (mesma regra do método escalar)
+        sem_mudanca = f_min * f_max > 0
+        ajustar_min = sem_mudanca & (f_min > 0)
+        ajustar_max = sem_mudanca & ~(f_min > 0)
+        T_min = np.where(ajustar_min, temperatura_ar - 10, T_min)
+        T_max = np.where(ajustar_max, temperatura_ar + 300, T_max)
+        f_min = np.where(ajustar_min, funcao_objetivo(T_min), f_min)
+        f_max = np.where(ajustar_max, funcao_objetivo(T_max), f_max)
+        
+        com_raiz = f_min * f_max <= 0
+        
+        num_iteracoes = int(np.ceil(np.log2(max(float(np.max(T_max - T_min, initial=0.0)), tolerancia)
+                                            / tolerancia)))
+        for _ in range(num_iteracoes):
+            T_meio = 0.5 * (T_min + T_max)
+            f_meio = funcao_objetivo(T_meio)
+            mesmo_sinal = f_meio * f_min > 0
+            T_min = np.where(mesmo_sinal, T_meio, T_min)
+            f_min = np.where(mesmo_sinal, f_meio, f_min)
+            T_max = np.where(mesmo_sinal, T_max, T_meio)
+        
+        T_condutor = 0.5 * (T_min + T_max)
+        
+        # Estimativa conservadora onde não foi possível isolar a raiz
+        temperaturas = np.where(com_raiz, T_condutor, temperatura_ar + 50)
+        if retornar_mascara:
+            return temperaturas, com_raiz
+        return temperaturas
+
+    def calcular_ampacidade_vetorizado(self, temperatura_maxima, radiacao_solar, azimute_linha,
+                                      velocidade_vento, angulo_vento, temperatura_ar):
+        """
+        Versão vetorizada de calcular_ampacidade.
+        
+        Todos os argumentos podem ser arrays com formatos compatíveis por broadcasting.
+        
+        Returns:
+            np.array: Ampacidade em A (zero onde as condições não permitem operação)
+        """
+        P_convectivo = self.calcular_resfriamento_convectivo_vetorizado(
+            velocidade_vento, angulo_vento, temperatura_ar, temperatura_maxima
+        )
+        P_radiativo = self.calcular_resfriamento_radiativo(temperatura_ar, temperatura_maxima)
+        P_solar = self.calcular_aquecimento_solar(radiacao_solar, azimute_linha)
+        
+        P_joule_max = np.maximum(P_convectivo + P_radiativo - P_solar, 0.0)
+        R_ac = self.calcular_resistencia_ac_vetorizado(temperatura_maxima)
+        
+        return np.sqrt(P_joule_max / R_ac)
+
     def calcular_ampacidade(self, temperatura_maxima, radiacao_solar, azimute_linha,
                            velocidade_vento, angulo_vento, temperatura_ar):
         """